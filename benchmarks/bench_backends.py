@@ -0,0 +1,63 @@
+"""
+Parser Backend Benchmark: pages/sec per HTML parser backend
+
+Runs the full per-page extraction (parse, title, main content, noise
+removal, text) with every registered backend over the same generated
+docs pages, and checks the backends agree before timing them.
+
+Usage:
+    python -m benchmarks.bench_backends [--pages 100] [--sections 12] [--nav-links 80] [--main-content-only]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.html_backends import PARSER_BACKENDS, DEFAULT_PARSER_BACKEND
+from benchmarks.fixtures import docs_dataset
+
+
+def bench(backend, items, main_content_only: bool) -> float:
+    start = time.perf_counter()
+    for item in items:
+        backend.extract(item['html'], item['url'], main_content_only)
+    pages_per_sec = len(items) / (time.perf_counter() - start)
+    print(f"  {backend.name:<16} {pages_per_sec:8.1f} pages/sec")
+    return pages_per_sec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--sections', type=int, default=12)
+    parser.add_argument('--nav-links', type=int, default=80)
+    parser.add_argument('--main-content-only', action='store_true')
+    args = parser.parse_args()
+
+    items = docs_dataset(args.pages, sections=args.sections, nav_links=args.nav_links)
+    size = sum(len(item['html']) for item in items) / len(items)
+    print(f"Parser backend benchmark: {args.pages} pages, ~{size / 1024:.0f}KB each")
+
+    sample = items[0]
+    outputs = {
+        name: backend.extract(sample['html'], sample['url'], args.main_content_only)
+        for name, backend in PARSER_BACKENDS.items()
+    }
+    if len(set(outputs.values())) != 1:
+        sys.exit("Backends disagree on the sample page - fix parity before comparing speed")
+
+    rates = {
+        name: bench(backend, items, args.main_content_only)
+        for name, backend in PARSER_BACKENDS.items()
+    }
+    baseline = rates[DEFAULT_PARSER_BACKEND]
+    for name, rate in rates.items():
+        if name != DEFAULT_PARSER_BACKEND:
+            print(f"  {name} speedup: {rate / baseline:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Chunker Benchmark: legacy splitter vs streaming chunker on multi-MB documents
+
+Builds one long document by concatenating the text of generated docs
+pages (an API reference scraped as a single page), then splits it with
+the previous split_long_document algorithm (re-estimates every overlap
+paragraph, rebuilds the overlap list with insert(0)) and with the
+streaming chunker, at growing document sizes. Each size is run twice:
+as extracted, and with blank lines removed (text the legacy splitter
+cannot split at all - see the largest chunk column).
+
+Usage:
+    python -m benchmarks.bench_chunker [--sizes 1 2 4 8] [--max-tokens 10000] [--overlap 500]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.chunker import iter_chunks
+from tools.document_converter import clean_html_text, estimate_tokens
+from benchmarks.fixtures import docs_dataset
+
+
+def legacy_split(text: str, max_tokens: int, overlap: int):
+    """split_long_document before the streaming chunker."""
+    chunks, current_chunk, current_tokens = [], [], 0
+    for para in text.split('\n\n'):
+        para_tokens = estimate_tokens(para)
+        if current_tokens + para_tokens > max_tokens and current_chunk:
+            chunks.append('\n\n'.join(current_chunk))
+            overlap_paras, overlap_tokens = [], 0
+            for prev_para in reversed(current_chunk):
+                prev_tokens = estimate_tokens(prev_para)
+                if overlap_tokens + prev_tokens <= overlap:
+                    overlap_paras.insert(0, prev_para)
+                    overlap_tokens += prev_tokens
+                else:
+                    break
+            current_chunk, current_tokens = overlap_paras, overlap_tokens
+        current_chunk.append(para)
+        current_tokens += para_tokens
+    if current_chunk:
+        chunks.append('\n\n'.join(current_chunk))
+    return chunks
+
+
+def bench(name: str, split, text: str):
+    start = time.perf_counter()
+    chunks = split(text)
+    elapsed = time.perf_counter() - start
+    mb = len(text) / 1024 / 1024
+    largest = max(map(estimate_tokens, chunks))
+    print(
+        f"    {name:<10} {len(chunks):>5} chunks | largest {largest:>9,} tokens"
+        f" | {elapsed * 1000:>8.1f}ms | {mb / elapsed:>7.1f} MB/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 2, 4, 8], help='Document sizes in MB')
+    parser.add_argument('--max-tokens', type=int, default=10000)
+    parser.add_argument('--overlap', type=int, default=500)
+    args = parser.parse_args()
+
+    page_text = '\n\n'.join(clean_html_text(item['html']) for item in docs_dataset(50, sections=12))
+    print(f"Chunker benchmark: max_tokens={args.max_tokens}, overlap={args.overlap}")
+
+    for size in args.sizes:
+        text = page_text * (size * 1024 * 1024 // len(page_text) + 1)
+        for layout, document in (('paragraphs', text), ('no blank lines', text.replace('\n\n', '\n'))):
+            print(f"  {len(document) / 1024 / 1024:.1f}MB document, {layout} ({estimate_tokens(document):,} tokens)")
+            bench('legacy', lambda t: legacy_split(t, args.max_tokens, args.overlap), document)
+            bench('streaming', lambda t: list(iter_chunks(t, args.max_tokens, args.overlap)), document)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Converter Benchmark
+
+1. Single-parse conversion vs one parse per step: before, converting a
+   page parsed it once for extract_title(), once for clean_html_text() and
+   (with main-content selection) once more for extract_main_content().
+   convert_html_to_document() now parses once and runs every step over
+   the same tree.
+2. Worker scaling: convert_dataset_to_documents() throughput with 1..N
+   conversion processes.
+
+Usage:
+    python -m benchmarks.bench_converter [--pages 50] [--workers 1,2,4]
+"""
+
+from pathlib import Path
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.document_converter import (
+    available_cpus,
+    clean_html_text,
+    convert_dataset_to_documents,
+    convert_html_to_document,
+    create_metadata_header,
+    extract_main_content,
+    extract_title
+)
+from benchmarks.fixtures import docs_dataset
+
+
+def convert_per_step(html: str, url: str, output_path: Path, main_content_only: bool):
+    """Reference implementation: every step parses the page again."""
+    title = extract_title(html, url)
+    if main_content_only:
+        html = extract_main_content(html)
+    text = clean_html_text(html)
+    output_path.write_text(create_metadata_header(url, title) + text, encoding='utf-8')
+
+
+def bench(label: str, convert, items, output_dir: Path) -> float:
+    start = time.perf_counter()
+    for i, item in enumerate(items):
+        convert(item['html'], item['url'], output_dir / f'doc_{i:04d}.txt')
+    per_page = (time.perf_counter() - start) / len(items)
+    print(f"  {label:<40} {per_page * 1000:8.2f} ms/page  {1 / per_page:8.1f} pages/s")
+    return per_page
+
+
+def bench_workers(items, output_dir: Path, worker_counts):
+    """Pages/sec of convert_dataset_to_documents per worker count."""
+    print(f"\nWorker scaling ({available_cpus()} CPUs available)")
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        # Per-page progress lines would drown the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            convert_dataset_to_documents(items, output_dir / f'workers-{workers}', workers=workers)
+        pages_per_second = len(items) / (time.perf_counter() - start)
+        baseline = baseline or pages_per_second
+        print(f"  workers={workers:<3} {pages_per_second:8.1f} pages/s  {pages_per_second / baseline:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--workers', default=None,
+                        help='Comma-separated worker counts to compare (default: 1 and all CPUs)')
+    args = parser.parse_args()
+    worker_counts = (
+        [int(w) for w in args.workers.split(',')] if args.workers
+        else sorted({1, available_cpus()})
+    )
+
+    items = docs_dataset(args.pages)
+    size_kb = sum(len(item['html']) for item in items) / len(items) / 1024
+    print(f"Converter benchmark: {args.pages} docs pages, {size_kb:.0f}KB avg")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        for main_content_only in (False, True):
+            print(f"\nmain_content_only={main_content_only}")
+            before = bench(
+                'one parse per step',
+                lambda html, url, path: convert_per_step(html, url, path, main_content_only),
+                items, output_dir
+            )
+            after = bench(
+                'single parse (convert_html_to_document)',
+                lambda html, url, path: convert_html_to_document(html, url, path, main_content_only=main_content_only),
+                items, output_dir
+            )
+            print(f"  speedup: {before / after:.2f}x")
+
+        bench_workers(items, output_dir, worker_counts)
+
+
+if __name__ == '__main__':
+    main()
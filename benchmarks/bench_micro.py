@@ -0,0 +1,216 @@
+"""
+Microbenchmarks: per-call cost of the converter and scraper filter hot paths
+
+Times each function on each fixture page (benchmarks/fixtures.py: a small
+blog post, a 500KB single-page API reference, a table-heavy page and
+malformed HTML) and the scraper filter on a store-search result list.
+Each case reports ops/sec (best of --repeat batches of auto-sized
+length, like timeit) and the peak Python memory of one call (tracemalloc;
+lxml's C-level allocations are not traced).
+
+Results are written as JSON so runs can be compared: pass an earlier
+results file to --compare to print the change per case. The exit status
+is 1 if any case got slower (or its peak memory grew) by more than
+--threshold.
+
+Usage:
+    python -m benchmarks.bench_micro [--output results.json] [--compare baseline.json]
+                                     [--functions clean_html_text ...] [--fixtures blog_post ...]
+"""
+
+from typing import Callable, Dict, List, Optional
+from datetime import datetime
+from pathlib import Path
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from bs4 import BeautifulSoup
+from tools.document_converter import (
+    clean_html_text,
+    estimate_tokens,
+    extract_title,
+    normalize_whitespace,
+    split_long_document
+)
+from tools.scraper_selector import BANNED_PATTERNS, filter_banned_scrapers, is_scraper_banned
+from benchmarks.fixtures import WORDS, micro_corpus
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+# Page functions: name → (input prepared once per fixture, timed call)
+PAGE_FUNCTIONS: Dict[str, Callable[[Dict], Callable[[], object]]] = {
+    'clean_html_text': lambda page: lambda: clean_html_text(page['html']),
+    'extract_title': lambda page: lambda: extract_title(page['html'], page['url']),
+    'normalize_whitespace': lambda page: lambda: normalize_whitespace(page['raw_text']),
+    'split_long_document': lambda page: lambda: split_long_document(page['text']),
+    'estimate_tokens': lambda page: lambda: estimate_tokens(page['text'])
+}
+
+SCRAPER_FUNCTIONS = ('is_scraper_banned', 'filter_banned_scrapers')
+
+
+def store_search_results(count: int = 200, seed: int = 0) -> List[Dict]:
+    """Actor dicts shaped like an Apify Store search (about 1 in 4 banned)."""
+    import random
+
+    rng = random.Random(seed)
+    actors = []
+    for i in range(count):
+        topic = rng.choice(BANNED_PATTERNS) if i % 4 == 0 else rng.choice(WORDS)
+        actors.append({
+            'id': f'user{i}/{topic}-{rng.choice(WORDS)}-scraper',
+            'title': f'{topic.title()} {rng.choice(WORDS).title()} Scraper',
+            'description': ' '.join(rng.choice(WORDS) for _ in range(30))
+        })
+    return actors
+
+
+def measure(fn: Callable[[], object], min_time: float, repeat: int) -> Dict:
+    """
+    Time fn: find a batch size that runs for at least min_time / repeat,
+    take the best of `repeat` batches, then trace one call's peak memory.
+    """
+    batch_time = min_time / repeat
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= batch_time:
+            break
+        number *= 10 if elapsed < batch_time / 10 else 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': number * repeat,
+        'seconds_per_op': best / number,
+        'ops_per_sec': number / best,
+        'peak_memory_bytes': peak
+    }
+
+
+def run(functions: List[str], fixtures: List[str], min_time: float, repeat: int) -> List[Dict]:
+    """Measure every selected function × fixture; prints a row per case."""
+    corpus = micro_corpus()
+    results = []
+
+    def record(function: str, fixture: str, input_bytes: int, fn: Callable[[], object]):
+        # split_long_document / filter_banned_scrapers log as they go
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            result = measure(fn, min_time, repeat)
+        result = {'name': f'{function}[{fixture}]', 'function': function, 'fixture': fixture,
+                  'input_bytes': input_bytes, **result}
+        results.append(result)
+        mb_per_sec = input_bytes * result['ops_per_sec'] / 1024 / 1024
+        print(
+            f"  {result['name']:<42} {result['ops_per_sec']:>12,.1f} ops/sec"
+            f" | {result['seconds_per_op'] * 1000:>9.3f}ms/op | {mb_per_sec:>8.1f} MB/s"
+            f" | peak {result['peak_memory_bytes'] / 1024:>9,.1f}KB"
+        )
+
+    for fixture in fixtures:
+        page = dict(corpus[fixture])
+        page['raw_text'] = BeautifulSoup(page['html'], 'lxml').get_text()
+        page['text'] = clean_html_text(page['html'])
+        for function in functions:
+            if function in PAGE_FUNCTIONS:
+                source = page['raw_text'] if function == 'normalize_whitespace' else (
+                    page['html'] if function in ('clean_html_text', 'extract_title') else page['text'])
+                record(function, fixture, len(source.encode('utf-8')), PAGE_FUNCTIONS[function](page))
+
+    actors = store_search_results()
+    actors_bytes = len(json.dumps(actors).encode('utf-8'))
+    if 'is_scraper_banned' in functions:
+        record('is_scraper_banned', 'store_search', actors_bytes, lambda: [is_scraper_banned(a) for a in actors])
+    if 'filter_banned_scrapers' in functions:
+        record('filter_banned_scrapers', 'store_search', actors_bytes, lambda: filter_banned_scrapers(actors))
+
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict], baseline_path: Path, threshold: float) -> int:
+    """Print the change per case against a baseline file; returns the number of regressions."""
+    baseline = {r['name']: r for r in json.loads(baseline_path.read_text(encoding='utf-8'))['results']}
+    regressions = 0
+    print(f"\nCompared with {baseline_path} (threshold {threshold:.0%}):")
+    for result in results:
+        previous = baseline.get(result['name'])
+        if previous is None:
+            print(f"  {result['name']:<42} new")
+            continue
+        speed = result['ops_per_sec'] / previous['ops_per_sec'] - 1
+        memory = result['peak_memory_bytes'] / max(previous['peak_memory_bytes'], 1) - 1
+        regressed = speed < -threshold or memory > threshold
+        regressions += regressed
+        print(f"  {result['name']:<42} speed {speed:>+7.1%} | memory {memory:>+7.1%}{'  ⚠️  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    all_functions = list(PAGE_FUNCTIONS) + list(SCRAPER_FUNCTIONS)
+    parser.add_argument('--functions', nargs='+', choices=all_functions, default=all_functions)
+    parser.add_argument('--fixtures', nargs='+', choices=list(micro_corpus()), default=list(micro_corpus()))
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds of timing per case')
+    parser.add_argument('--repeat', type=int, default=5, help='Batches per case (best is kept)')
+    parser.add_argument('--output', type=Path, help='Results file (default: benchmarks/results/micro-<time>.json)')
+    parser.add_argument('--compare', type=Path, help='Earlier results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Slowdown/memory growth counted as a regression')
+    args = parser.parse_args()
+
+    print(f"Microbenchmarks: {len(args.functions)} functions × {len(args.fixtures)} fixtures")
+    results = run(args.functions, args.fixtures, args.min_time, args.repeat)
+
+    output = args.output or RESULTS_DIR / f"micro-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'benchmark': 'micro',
+        'created_at': datetime.now().isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'min_time': args.min_time, 'repeat': args.repeat},
+        'results': results
+    }, indent=2), encoding='utf-8')
+    print(f"\nResults written to {output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
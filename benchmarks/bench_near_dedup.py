@@ -0,0 +1,89 @@
+"""
+Near-Duplicate Detection Benchmark: LSH lookup scaling
+
+Indexes N synthetic pages (10% of them near copies of earlier pages) and
+reports signature time per page, index time per page and the number of
+signature comparisons - which grows with the number of pages, not pages²
+(an all-pairs check would need N × (N - 1) / 2).
+
+Usage:
+    python -m benchmarks.bench_near_dedup [--sizes 1000 5000 20000] [--words 300]
+"""
+
+from pathlib import Path
+import argparse
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools import near_dedup
+from tools.near_dedup import NearDuplicateIndex
+
+VOCABULARY = [f'term{i}' for i in range(20000)]
+
+
+def corpus(count: int, words: int, seed: int = 0):
+    """Pages as word lists: every 10th page is an edited copy of an earlier one."""
+    rng = random.Random(seed)
+    pages = []
+    for i in range(count):
+        if i % 10 == 9:
+            copy = list(pages[rng.randrange(i)])
+            copy[rng.randrange(words)] = 'edited'
+            pages.append(copy)
+        else:
+            pages.append([rng.choice(VOCABULARY) for _ in range(words)])
+    return [' '.join(page) for page in pages]
+
+
+def bench(count: int, words: int):
+    texts = corpus(count, words)
+    index = NearDuplicateIndex()
+
+    start = time.perf_counter()
+    signatures = [index.hasher.signature(text) for text in texts]
+    signature_seconds = time.perf_counter() - start
+
+    # Count signature comparisons made by the index
+    comparisons = 0
+    estimate = near_dedup.estimate_similarity
+
+    def counting_estimate(a, b):
+        nonlocal comparisons
+        comparisons += 1
+        return estimate(a, b)
+
+    near_dedup.estimate_similarity = counting_estimate
+    try:
+        start = time.perf_counter()
+        for i, signature in enumerate(signatures):
+            index.add(f'page-{i}', signature)
+        index_seconds = time.perf_counter() - start
+    finally:
+        near_dedup.estimate_similarity = estimate
+
+    print(
+        f"  {count:>7,} pages | signature {signature_seconds / count * 1000:6.2f} ms/page"
+        f" | index {index_seconds / count * 1e6:7.1f} µs/page"
+        f" | comparisons {comparisons:>9,} (all pairs: {count * (count - 1) // 2:>12,})"
+        f" | dropped {index.summary()['dropped']:,}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--words', type=int, default=300)
+    args = parser.parse_args()
+
+    index = NearDuplicateIndex()
+    print(f"Near-duplicate benchmark: {args.words} words/page, threshold {index.threshold}, "
+          f"{index.bands} bands × {index.rows} rows")
+    for count in args.sizes:
+        bench(count, args.words)
+
+
+if __name__ == '__main__':
+    main()
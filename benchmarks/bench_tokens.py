@@ -0,0 +1,63 @@
+"""
+Token Counter Benchmark: tokens/sec per token counter
+
+Extracts the text of generated docs pages once, then counts it with every
+token counter: a cold pass (everything tokenized) and a warm pass (same
+documents again, served from the content-hash memo - what the cost
+report pays after the uploader has counted). Totals are printed next to
+the heuristic's; only a sentencepiece model's counts are exact, so with
+--model they show how far the estimates drift.
+
+Usage:
+    python -m benchmarks.bench_tokens [--pages 200] [--sections 12] [--model tokenizer.model]
+"""
+
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.document_converter import clean_html_text
+from tools.token_counter import TOKEN_COUNTERS, get_token_counter
+from benchmarks.fixtures import docs_dataset
+
+
+def bench(counter, texts, heuristic_total: int):
+    start = time.perf_counter()
+    total = sum(counter.count_many(texts))
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    counter.count_many(texts)
+    warm = time.perf_counter() - start
+
+    print(
+        f"  {counter.name:<14} {total:>10,} tokens ({total / heuristic_total:5.2f}x heuristic)"
+        f" | cold {total / cold:>12,.0f} tokens/sec | warm {total / warm:>12,.0f} tokens/sec"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--sections', type=int, default=12)
+    parser.add_argument('--model', type=Path, help='SentencePiece .model file (needs sentencepiece)')
+    args = parser.parse_args()
+
+    texts = [clean_html_text(item['html']) for item in docs_dataset(args.pages, sections=args.sections)]
+    chars = sum(map(len, texts))
+    print(f"Token counter benchmark: {args.pages} documents, {chars / 1024 / 1024:.1f}MB of text")
+
+    counters = [get_token_counter(name) for name in TOKEN_COUNTERS if name != 'sentencepiece']
+    if args.model:
+        counters.append(get_token_counter('sentencepiece', args.model))
+
+    heuristic_total = sum(get_token_counter('heuristic').count_many(texts))
+    for counter in counters:
+        bench(counter, texts, heuristic_total)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Benchmark Fixtures for Gemini Knowledge Scraper
+
+Generates realistic, deterministic HTML pages (no network, nothing
+checked in), shaped like the documentation sites the actor is pointed at.
+
+Key functions:
+- docs_page(): Documentation page with header/nav/sidebar/footer chrome,
+  ads and tracking scripts around an article of prose, lists and code
+- docs_dataset(): Apify-style dataset items ({url, html}) of docs pages
+- blog_post(), api_reference(), table_page(), malformed_page(): the page
+  shapes the microbenchmarks cover (small post, one 500KB reference
+  page, data tables, broken markup)
+- micro_corpus(): those four as {name: {url, html}}
+"""
+
+from typing import Dict, List
+import random
+
+WORDS = (
+    'component state render props hook effect context reducer server client '
+    'request response cache stream token index query store document upload '
+    'import function module package install configure deploy build test'
+).split()
+
+
+def _sentence(rng: random.Random, length: int = 14) -> str:
+    words = [rng.choice(WORDS) for _ in range(length)]
+    return ' '.join(words).capitalize() + '.'
+
+
+def _paragraph(rng: random.Random, sentences: int = 5) -> str:
+    return ' '.join(_sentence(rng) for _ in range(sentences))
+
+
+def docs_page(seed: int = 0, sections: int = 12, nav_links: int = 80) -> str:
+    """
+    Build a documentation page (~20-25KB with the defaults).
+
+    Args:
+        seed: Random seed (same seed → same page)
+        sections: Number of <h2> sections in the article
+        nav_links: Number of links in the header/sidebar navigation
+
+    Returns:
+        HTML string
+    """
+    rng = random.Random(seed)
+    links = [f'<li><a href="/docs/{rng.choice(WORDS)}-{i}">{rng.choice(WORDS).title()}</a></li>' for i in range(nav_links)]
+    nav = ''.join(links)
+
+    body = []
+    for i in range(sections):
+        body.append(f'<h2 id="section-{i}">{_sentence(rng, 4)}</h2>')
+        body.append(f'<p>{_paragraph(rng)}</p>')
+        body.append('<ul>' + ''.join(f'<li>{_sentence(rng, 8)}</li>' for _ in range(4)) + '</ul>')
+        code = '\n'.join(f'const {rng.choice(WORDS)} = use{rng.choice(WORDS).title()}({i});' for _ in range(6))
+        body.append(f'<pre><code class="language-js">{code}</code></pre>')
+        body.append(f'<p>{_paragraph(rng, 3)}</p>')
+        if i % 4 == 3:
+            body.append('<div class="ad-container sponsored"><p>Sponsored: try our cloud.</p></div>')
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{_sentence(rng, 3)[:-1]} – Docs</title>
+<meta property="og:title" content="Docs page {seed}">
+<style>body {{ font-family: sans-serif; }} .sidebar {{ width: 240px; }}</style>
+<script>window.analytics = {{ track: function() {{}} }};</script>
+</head>
+<body>
+<header class="site-header"><nav class="top-nav"><ul>{''.join(links[:nav_links // 4])}</ul></nav></header>
+<div class="cookie-banner popup">We use cookies. <button>Accept</button></div>
+<div class="layout">
+<aside class="sidebar"><nav aria-label="Docs"><ul>{nav}</ul></nav></aside>
+<main class="main-content">
+<article>
+<h1>{_sentence(rng, 5)[:-1]}</h1>
+{''.join(body)}
+</article>
+</main>
+</div>
+<footer class="site-footer"><p>© 2025 Example Inc.</p><ul>{''.join(links[:nav_links // 8])}</ul></footer>
+<script src="/static/tracking.js"></script>
+<iframe class="tracking-pixel" src="/pixel"></iframe>
+</body>
+</html>"""
+
+
+def docs_dataset(count: int, **page_options) -> List[Dict]:
+    """Dataset items ({url, html}) for `count` distinct docs pages."""
+    return [
+        {'url': f'https://docs.example.com/page-{i}', 'html': docs_page(seed=i, **page_options)}
+        for i in range(count)
+    ]
+
+
+def blog_post(seed: int = 0, paragraphs: int = 8) -> str:
+    """Short blog post (~5KB): article, quotes and comments inside site chrome."""
+    rng = random.Random(seed)
+    body = ''.join(
+        f'<p>{_paragraph(rng, 4)}</p>' + (f'<blockquote>{_sentence(rng)}</blockquote>' if i % 3 == 2 else '')
+        for i in range(paragraphs)
+    )
+    comments = ''.join(
+        f'<li class="comment"><span class="author">user{i}</span><p>{_sentence(rng, 10)}</p></li>'
+        for i in range(4)
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{_sentence(rng, 6)[:-1]} | Example Blog</title>
+<script>window.dataLayer = [];</script></head>
+<body>
+<header class="site-header"><nav><a href="/">Blog</a> <a href="/about">About</a> <a href="/rss">RSS</a></nav></header>
+<main><article class="post">
+<h1>{_sentence(rng, 6)[:-1]}</h1>
+<p class="byline">By Example Author · 5 min read</p>
+<img src="/hero.png" alt="{_sentence(rng, 4)}">
+{body}
+<div class="share-buttons"><a href="#">Share</a> <a href="#">Tweet</a></div>
+</article>
+<section class="comments"><h2>Comments</h2><ul>{comments}</ul></section></main>
+<footer class="site-footer"><p>© 2025 Example Blog</p></footer>
+</body>
+</html>"""
+
+
+def api_reference(seed: int = 0, target_bytes: int = 500 * 1024) -> str:
+    """
+    Single-page API reference of about `target_bytes` (classes → methods,
+    each with a signature, parameter table, prose and an example).
+    """
+    rng = random.Random(seed)
+    parts, size, cls = [], 0, 0
+    while size < target_bytes:
+        name = f'{rng.choice(WORDS).title()}{rng.choice(WORDS).title()}{cls}'
+        section = [f'<h2 id="{name}">class {name}</h2><p>{_paragraph(rng, 3)}</p>']
+        for m in range(6):
+            method = f'{rng.choice(WORDS)}_{rng.choice(WORDS)}'
+            params = [rng.choice(WORDS) for _ in range(3)]
+            rows = ''.join(
+                f'<tr><td><code>{p}</code></td><td>str</td><td>{_sentence(rng, 9)}</td></tr>' for p in params
+            )
+            section.append(
+                f'<h3 id="{name}.{method}">{name}.{method}()</h3>'
+                f'<pre><code>def {method}(self, {", ".join(params)}) -&gt; {name}</code></pre>'
+                f'<p>{_paragraph(rng, 2)}</p>'
+                f'<table><thead><tr><th>Parameter</th><th>Type</th><th>Description</th></tr></thead><tbody>{rows}</tbody></table>'
+                f'<pre><code class="language-python">result = {name.lower()}.{method}({params[0]}="{rng.choice(WORDS)}")</code></pre>'
+            )
+        chunk = ''.join(section)
+        parts.append(chunk)
+        size += len(chunk)
+        cls += 1
+
+    toc = ''.join(f'<li><a href="#c{i}">Class {i}</a></li>' for i in range(cls))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>API Reference – Example SDK</title></head>
+<body>
+<nav class="sidebar"><ul>{toc}</ul></nav>
+<main><h1>API Reference</h1>{''.join(parts)}</main>
+<footer class="site-footer"><p>Generated by sphinx</p></footer>
+</body>
+</html>"""
+
+
+def table_page(seed: int = 0, tables: int = 6, rows: int = 60, columns: int = 6) -> str:
+    """Comparison/pricing page dominated by data tables (~60KB with the defaults)."""
+    rng = random.Random(seed)
+    blocks = []
+    for t in range(tables):
+        head = ''.join(f'<th>{rng.choice(WORDS).title()}</th>' for _ in range(columns))
+        body = ''.join(
+            '<tr>' + f'<td><a href="/item/{t}-{r}">{rng.choice(WORDS)}-{r}</a></td>' + ''.join(
+                f'<td>{rng.randint(0, 10_000)}</td>' if c % 2 else f'<td><code>{rng.choice(WORDS)}</code></td>'
+                for c in range(columns - 1)
+            ) + '</tr>'
+            for r in range(rows)
+        )
+        blocks.append(
+            f'<h2>{_sentence(rng, 4)[:-1]}</h2><p>{_sentence(rng)}</p>'
+            f'<table class="data-table"><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>'
+        )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Plan Comparison – Example</title></head>
+<body>
+<header class="site-header"><nav><a href="/">Home</a> <a href="/pricing">Pricing</a></nav></header>
+<main><h1>Compare Plans</h1>{''.join(blocks)}</main>
+<footer class="site-footer"><p>Prices in USD</p></footer>
+</body>
+</html>"""
+
+
+def malformed_page(seed: int = 0, sections: int = 12) -> str:
+    """
+    Docs-sized page with broken markup (~14KB): unclosed and misnested
+    tags, stray closing tags, unquoted attributes, bare ampersands and
+    unknown entities, markup inside <title>, no <html>/<body> closers.
+    """
+    rng = random.Random(seed)
+    body = []
+    for i in range(sections):
+        body.append(f'<H2 class=section-{i}>{_sentence(rng, 4)}')  # Never closed
+        body.append(f'<p>{_paragraph(rng)}<p>{_paragraph(rng, 2)}')  # Nested/unclosed paragraphs
+        body.append(f'<b><i>{_sentence(rng, 6)}</b></i>')  # Misnested
+        body.append(f'<ul><li>{_sentence(rng, 8)}<li>{_sentence(rng, 8)}</ul></div></span>')  # Stray closers
+        body.append(f'<p>R&D costs &amp; fees &nbsp &copy 2025 &bogus; a < b && c > d</p>')
+        body.append(f'<pre><code>if (x < {i} && y > 0) {{ return "</div>"; }}</code></pre>')
+        body.append(f'<table><tr><td>{rng.choice(WORDS)}<td>{rng.randint(0, 99)}<tr><td>{rng.choice(WORDS)}</table>')
+    return (
+        f'<title>{_sentence(rng, 3)[:-1]} <b>Docs</b></title>'
+        '<div id=header class=site-header><nav><a href=/docs>Docs</a><a href=/api>API</nav>'
+        f'<div class="content"><h1>{_sentence(rng, 5)[:-1]}</h2>'
+        + ''.join(body)
+        + '<script>document.write("<p>injected")</script><footer>© Example'
+    )
+
+
+def micro_corpus() -> Dict[str, Dict]:
+    """The microbenchmark fixtures: {name: {url, html}}."""
+    return {
+        'blog_post': {'url': 'https://blog.example.com/posts/hello', 'html': blog_post()},
+        'api_reference': {'url': 'https://docs.example.com/api', 'html': api_reference()},
+        'table_page': {'url': 'https://example.com/pricing', 'html': table_page()},
+        'malformed': {'url': 'https://legacy.example.com/page', 'html': malformed_page()}
+    }
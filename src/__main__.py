@@ -1,6 +1,11 @@
-"""Apify Actor entrypoint for CLI compatibility."""
+"""Apify Actor entrypoint for CLI compatibility (offline commands: see cli.py)."""
 import asyncio
-from src.main import main
+import sys
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] in ('replay', 'simulate'):
+        from src.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
+    from src.main import main
     asyncio.run(main())
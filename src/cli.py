@@ -0,0 +1,314 @@
+"""
+Offline CLI for Gemini Knowledge Scraper
+
+`replay` runs a saved dataset through document conversion and the
+Gemini upload path without the Apify Actor runtime, and prints how long
+each phase took. With the local File Search stand-in (--store fake) no credentials
+or network access are needed, so conversion and upload performance can
+be profiled and compared on real crawl data.
+
+Phases run one after another (the actor streams them into each other),
+so each one is timed on its own:
+1. load     read the dataset file
+2. convert  convert_dataset_to_documents
+3. split    split oversized documents / pack small ones (if enabled)
+4. upload   upload_to_gemini against the selected store
+5. cost     indexing cost estimate
+
+`simulate` load-tests scraper fallback and uploads against the
+in-process fake Apify and Gemini services (see simulator/).
+
+Usage:
+    python -m src replay --dataset items.jsonl --store fake
+    python -m src replay --dataset items.json.gz --store fake --workers 1 --profile replay.prof
+    GEMINI_API_KEY=... python -m src replay --dataset items.jsonl --store gemini
+    python -m src simulate --pages 10000 --throttle-rate 0.01 --import-failure-rate 0.02
+"""
+
+from typing import Callable, Dict, List, Optional
+from contextlib import contextmanager
+from pathlib import Path
+import argparse
+import asyncio
+import contextlib
+import cProfile
+import io
+import json
+import os
+import tempfile
+import time
+
+from .tools.dataset_reader import read_dataset_file
+from .tools.document_converter import (
+    available_cpus,
+    calculate_indexing_cost,
+    convert_dataset_to_documents
+)
+from .tools.gemini_uploader import upload_to_gemini, DEFAULT_UPLOAD_CONCURRENCY, DEFAULT_DOCUMENT_ATTEMPTS
+from .tools.rate_limit import DEFAULT_RATE_LIMIT, DEFAULT_MAX_RETRIES
+from .tools.html_backends import get_parser_backend
+from .tools.output_adapters import get_output_adapter
+from .tools.token_counter import get_token_counter
+from .tools.document_packer import DocumentPacker, DEFAULT_PACK_BYTES
+from .tools.chunker import DocumentSplitter, DEFAULT_SPLIT_THRESHOLD
+from .tools.local_store import LocalFileSearchClient
+
+
+def _gemini_client(args: argparse.Namespace):
+    from google import genai
+
+    api_key = os.environ.get('GEMINI_API_KEY')
+    if not api_key:
+        raise ValueError("--store gemini needs the GEMINI_API_KEY environment variable")
+    return genai.Client(api_key=api_key)
+
+
+# File Search backends for --store: name → factory(args) returning a
+# genai.Client or a stand-in with the same client.aio surface
+STORES: Dict[str, Callable[[argparse.Namespace], object]] = {
+    'fake': lambda args: LocalFileSearchClient(args.store_dir),
+    'gemini': _gemini_client
+}
+
+
+@contextmanager
+def _phase(timings: Dict[str, float], name: str):
+    """Time a block into timings[name]."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+def print_timings(timings: Dict[str, float], counts: Dict[str, int]):
+    """Per-phase timing table (items/sec where a phase has a count)."""
+    total = sum(timings.values())
+    print(f"\n⏱️  Phase timings:")
+    for name, seconds in timings.items():
+        rate = ''
+        if counts.get(name) and seconds > 0:
+            rate = f" | {counts[name]:>6} items | {counts[name] / seconds:>9.1f}/s"
+        share = seconds / total * 100 if total else 0
+        print(f"   {name:<8} {seconds:>9.3f}s {share:>5.1f}%{rate}")
+    print(f"   {'total':<8} {total:>9.3f}s")
+
+
+async def replay(args: argparse.Namespace, output_dir: Path) -> Dict:
+    """
+    Convert a saved dataset and upload it, timing each phase.
+
+    Args:
+        args: Parsed `replay` arguments
+        output_dir: Directory documents are written to (with --write-documents)
+
+    Returns:
+        Dict with timings (seconds per phase), counts and the upload result
+    """
+    timings: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    corpus_name = args.corpus_name or args.dataset.name.split('.')[0]
+    token_counter = get_token_counter(args.token_counter)
+    client = STORES[args.store](args)
+
+    with _phase(timings, 'load'):
+        items = list(read_dataset_file(args.dataset))
+    counts['load'] = len(items)
+    print(f"📂 Loaded {len(items)} items from {args.dataset}")
+
+    with _phase(timings, 'convert'):
+        documents = convert_dataset_to_documents(
+            items,
+            output_dir,
+            workers=args.workers or available_cpus(),
+            backend=get_parser_backend(args.backend),
+            adapter=get_output_adapter(args.scraper),
+            token_counter=token_counter,
+            in_memory=not args.write_documents
+        )
+    counts['convert'] = len(items)
+    del items
+
+    splitter = DocumentSplitter(threshold=args.split_threshold, token_counter=token_counter) if args.split_threshold else None
+    packer = DocumentPacker(output_dir, max_bytes=args.pack_kb * 1024) if args.pack else None
+    if splitter is not None or packer is not None:
+        with _phase(timings, 'split'):
+            ready: List = []
+            for record in documents:
+                for part in splitter.split(record) if splitter is not None else [record]:
+                    ready.extend(packer.add(part) if packer is not None else [part])
+            if packer is not None:
+                ready.extend(packer.flush())
+        counts['split'] = len(documents)
+        documents = ready
+
+    with _phase(timings, 'upload'):
+        rate_limit = args.rate_limit
+        if rate_limit is None:
+            # The local store has no quota - don't let the limiter dominate the timing
+            rate_limit = 0 if args.store != 'gemini' else DEFAULT_RATE_LIMIT
+        upload_result = await upload_to_gemini(
+            gemini_api_key='',
+            document_paths=documents,
+            corpus_name=corpus_name,
+            upload_concurrency=args.upload_concurrency,
+            rate_limit=rate_limit,
+            client=client,
+            token_counter=token_counter
+        )
+    counts['upload'] = upload_result['files_indexed']
+
+    with _phase(timings, 'cost'):
+        calculate_indexing_cost(documents, token_counter)
+
+    if hasattr(client, 'summary'):
+        print(f"\n🗂️  Store: {client.summary()}")
+    print_timings(timings, counts)
+
+    return {'timings': timings, 'counts': counts, 'upload_result': upload_result}
+
+
+async def simulate(args: argparse.Namespace) -> Dict:
+    """
+    Run the simulator's load test with the command-line settings.
+
+    Args:
+        args: Parsed `simulate` arguments
+
+    Returns:
+        Load test report (see simulator.load_test.run_load_test)
+    """
+    # The simulator imports the actor module (execute_scraper_with_fallback)
+    from .simulator.apify import FakeApifyClient
+    from .simulator.file_search import SimulatedFileSearchClient
+    from .simulator.latency import LogNormalLatency, NO_LATENCY
+    from .simulator.load_test import default_scrapers, print_report, run_load_test
+
+    def latency(median: float):
+        return LogNormalLatency(median, maximum=median * 20) if median > 0 else NO_LATENCY
+
+    apify = FakeApifyClient(
+        default_scrapers(page_bytes=args.page_kb * 1024, pages_per_second=args.pages_per_second),
+        seed=args.seed
+    )
+    file_search = SimulatedFileSearchClient(
+        request_latency=latency(args.request_latency),
+        upload_latency=latency(args.upload_latency),
+        import_latency=latency(args.import_latency),
+        throttle_rate=args.throttle_rate,
+        burst_seconds=args.burst_seconds,
+        server_error_rate=args.server_error_rate,
+        import_failure_rate=args.import_failure_rate,
+        seed=args.seed
+    )
+
+    # The upload engine logs every document - too much at 10k pages
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        report = await run_load_test(
+            pages=args.pages,
+            apify=apify,
+            file_search=file_search,
+            concurrency=args.upload_concurrency,
+            rate_limit=args.rate_limit or 0,
+            max_retries=args.max_retries,
+            max_attempts=args.max_attempts,
+            retry_base_delay=args.retry_base_delay,
+            min_poll_interval=args.poll_interval,
+            max_poll_interval=max(args.poll_interval, args.import_latency * 4)
+        )
+
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"📄 Report written to {args.json}")
+    return report
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m src', description=__doc__.split('\n')[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    replay_parser = commands.add_parser('replay', help='Convert and upload a saved dataset, timing each phase')
+    replay_parser.add_argument('--dataset', type=Path, required=True, help='Dataset export (.json or .jsonl, optionally .gz)')
+    replay_parser.add_argument('--store', choices=sorted(STORES), default='fake', help='File Search backend (default: fake)')
+    replay_parser.add_argument('--store-dir', type=Path, help='fake store: write uploaded documents here')
+    replay_parser.add_argument('--corpus-name', help='Knowledge base name (default: dataset file name)')
+    replay_parser.add_argument('--scraper', help='Scraper that produced the dataset (selects the output adapter)')
+    replay_parser.add_argument('--workers', type=int, help='Conversion processes (default: all CPUs; 1 for --profile)')
+    replay_parser.add_argument('--backend', choices=['beautifulsoup', 'lxml'], help='HTML parser backend')
+    replay_parser.add_argument('--token-counter', choices=['subword', 'heuristic'], help='Token counter')
+    replay_parser.add_argument('--split-threshold', type=int, default=DEFAULT_SPLIT_THRESHOLD, help='Split documents above this many tokens (0 = off)')
+    replay_parser.add_argument('--pack', action='store_true', help='Pack small pages into larger documents')
+    replay_parser.add_argument('--pack-kb', type=int, default=DEFAULT_PACK_BYTES // 1024, help='Pack size target (KB)')
+    replay_parser.add_argument('--write-documents', action='store_true', help='Write documents to disk instead of keeping them in memory')
+    replay_parser.add_argument('--output-dir', type=Path, help='Document directory (default: a temporary directory)')
+    replay_parser.add_argument('--upload-concurrency', type=int, default=DEFAULT_UPLOAD_CONCURRENCY)
+    replay_parser.add_argument('--rate-limit', type=float, help=f'Requests/sec (default: unlimited for fake, {DEFAULT_RATE_LIMIT} for gemini)')
+    replay_parser.add_argument('--profile', type=Path, help='Write cProfile stats of the whole replay to this file')
+
+    simulate_parser = commands.add_parser('simulate', help='Load-test scraper fallback and uploads against fake services')
+    simulate_parser.add_argument('--pages', type=int, default=10_000)
+    simulate_parser.add_argument('--page-kb', type=int, default=20, help='Mean page size (KB)')
+    simulate_parser.add_argument('--pages-per-second', type=float, default=2_000, help='Scraper output rate (0 = all at once)')
+    simulate_parser.add_argument('--request-latency', type=float, default=0.02, help='Median API call latency (s)')
+    simulate_parser.add_argument('--upload-latency', type=float, default=0.1, help='Median upload latency (s)')
+    simulate_parser.add_argument('--import-latency', type=float, default=0.5, help='Median import time (s)')
+    simulate_parser.add_argument('--throttle-rate', type=float, default=0.0, help='Probability a request starts a 429 burst')
+    simulate_parser.add_argument('--burst-seconds', type=float, default=1.0, help='Length of a 429 burst (s)')
+    simulate_parser.add_argument('--server-error-rate', type=float, default=0.0, help='Probability of a 503 per request')
+    simulate_parser.add_argument('--import-failure-rate', type=float, default=0.0, help='Probability an import fails')
+    simulate_parser.add_argument('--upload-concurrency', type=int, default=DEFAULT_UPLOAD_CONCURRENCY)
+    simulate_parser.add_argument('--rate-limit', type=float, help='Requests/sec (default: unlimited)')
+    simulate_parser.add_argument('--max-retries', type=int, default=DEFAULT_MAX_RETRIES, help='Attempts per API call')
+    simulate_parser.add_argument('--max-attempts', type=int, default=DEFAULT_DOCUMENT_ATTEMPTS, help='Attempts per document')
+    simulate_parser.add_argument('--retry-base-delay', type=float, default=1.0, help='First retry backoff ceiling (s)')
+    simulate_parser.add_argument('--poll-interval', type=float, default=0.25, help='First import poll delay (s)')
+    simulate_parser.add_argument('--seed', type=int, default=0)
+    simulate_parser.add_argument('--json', type=Path, help='Write the report to this file')
+    simulate_parser.add_argument('--verbose', action='store_true', help='Show the upload engine\'s per-document output')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    CLI entry point (python -m src <command> ...).
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'simulate':
+        try:
+            asyncio.run(simulate(args))
+        except (ValueError, RuntimeError) as e:
+            print(f"❌ Simulation failed: {e}")
+            return 1
+        return 0
+
+    if not args.dataset.exists():
+        parser.error(f"dataset not found: {args.dataset}")
+
+    with tempfile.TemporaryDirectory(prefix='replay-') as scratch:
+        output_dir = args.output_dir or Path(scratch)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        profiler = cProfile.Profile() if args.profile else None
+        if profiler is not None:
+            profiler.enable()
+        try:
+            asyncio.run(replay(args, output_dir))
+        except (ValueError, RuntimeError) as e:
+            print(f"❌ Replay failed: {e}")
+            return 1
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(args.profile)
+                print(f"📈 Profile written to {args.profile} (python -m pstats {args.profile})")
+
+    return 0
@@ -3,13 +3,16 @@ Gemini Knowledge Scraper - Main Entry Point
 
 Complete workflow:
 1. Select optimal scraper (banned filter applied)
-2. Execute scraping with automatic fallback
-3. Convert HTML → clean text documents
-4. Upload to Gemini File Search Store
+2. Start scraping with automatic fallback
+3. Convert HTML → clean text documents  ┐ streaming pipeline: pages flow
+4. Upload to Gemini File Search Store    ┘ from the live run to Gemini
 5. Charge per page processed (pay-per-event)
 6. Generate query guide
 7. Return knowledge base metadata + pricing
 
+Raw dataset items are archived per corpus (see crawl_archive.py); replay
+mode skips steps 1-2 and rebuilds the knowledge base from the archive.
+
 Architecture:
 - Modular design (scraper library, converter, uploader)
 - Challenge compliance (100% banned scraper filtering)
@@ -17,44 +20,89 @@ Architecture:
 """
 
 from apify import Actor
-from apify_client import ApifyClient
+from apify_client import ApifyClientAsync
+from google import genai
 from pathlib import Path
 from datetime import datetime
 from typing import List
 import asyncio
 
 # Import our tools
-from .tools.scraper_selector import (
-    find_and_select_scrapers,
-    is_scraper_banned
-)
+from .tools.scraper_selector import find_and_select_scrapers
 from .tools.document_converter import (
-    convert_dataset_to_documents,
-    calculate_indexing_cost
+    calculate_indexing_cost,
+    available_cpus
+)
+from .tools.dataset_reader import (
+    iterate_run_dataset_items,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_FOLLOW_INTERVAL,
+    TERMINAL_RUN_STATUSES
+)
+from .tools.pipeline import (
+    run_document_pipeline,
+    DEFAULT_QUEUE_SIZE
 )
 from .tools.gemini_uploader import (
     upload_to_gemini,
-    generate_query_guide
+    get_file_search_store,
+    load_store_manifest,
+    generate_query_guide,
+    DEFAULT_UPLOAD_CONCURRENCY,
+    DEFAULT_DOCUMENT_ATTEMPTS
+)
+from .tools.rate_limit import (
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_MAX_RETRIES
+)
+from .tools.noise_filter import NoiseFilter
+from .tools.html_backends import get_parser_backend
+from .tools.output_adapters import get_output_adapter
+from .tools.near_dedup import NearDuplicateIndex, DEFAULT_SIMILARITY_THRESHOLD
+from .tools.boilerplate import BoilerplateFilter, DEFAULT_BOILERPLATE_THRESHOLD
+from .tools.exact_dedup import ExactDuplicateFilter
+from .tools.token_counter import get_token_counter
+from .tools.document_packer import DocumentPacker, DEFAULT_PACK_BYTES
+from .tools.chunker import DocumentSplitter, DEFAULT_SPLIT_THRESHOLD
+from .tools.crawl_archive import (
+    CrawlArchive,
+    get_archive_codec,
+    iterate_archived_items,
+    load_archive_index,
+    ARCHIVE_STORE_NAME
+)
+from .tools.manifest import (
+    ManifestTracker,
+    load_manifest,
+    save_manifest,
+    MANIFEST_STORE_NAME
 )
 
 
 async def execute_scraper_with_fallback(
-    apify_client: ApifyClient,
+    apify_client: ApifyClientAsync,
     selected_scrapers: List[dict],
     target: str,
-    max_pages: int
+    max_pages: int,
+    poll_interval: float = DEFAULT_FOLLOW_INTERVAL
 ) -> dict:
     """
-    Execute scraper with automatic fallback on failure.
+    Start scraper with automatic fallback on failure.
+
+    The scraper run is started, not awaited to completion: this returns as
+    soon as the run has pushed its first item, so conversion and upload can
+    follow the live run with iterate_run_dataset_items(). A run that finishes
+    (or fails) without producing any item triggers the next fallback.
 
     Args:
-        apify_client: Apify client instance
+        apify_client: Async Apify client instance
         selected_scrapers: List of scrapers (primary + fallbacks)
         target: Target URL
         max_pages: Maximum pages to scrape
+        poll_interval: Seconds between checks for the first item
 
     Returns:
-        Dict with success, data, scraper_used, errors
+        Dict with success, run_id, dataset_id, scraper_used, errors
     """
     last_error = None
 
@@ -64,8 +112,8 @@ async def execute_scraper_with_fallback(
         try:
             Actor.log.info(f"Attempting scraper {i+1}/{len(selected_scrapers)}: {scraper_id}")
 
-            # Run scraper (HTML/web pages only)
-            run = apify_client.actor(scraper_id).call(
+            # Start scraper (HTML/web pages only)
+            run = await apify_client.actor(scraper_id).start(
                 run_input={
                     'startUrls': [{'url': target}],
                     'maxCrawlPages': max_pages,
@@ -74,22 +122,31 @@ async def execute_scraper_with_fallback(
                 }
             )
 
-            # Get dataset
-            dataset_items = apify_client.dataset(run['defaultDatasetId']).list_items()
-            items = list(dataset_items.items)
+            run_client = apify_client.run(run['id'])
+            dataset_client = apify_client.dataset(run['defaultDatasetId'])
 
-            if items:
-                Actor.log.info(f"✅ Scraper succeeded: {scraper_id} ({len(items)} items)")
+            # Wait for the first item (success) or a finish without items (fallback)
+            while True:
+                run = await run_client.get()
+                probe = await dataset_client.list_items(limit=1)
 
-                return {
-                    'success': True,
-                    'data': items,
-                    'scraper_used': scraper_id,
-                    'errors': []
-                }
-            else:
-                last_error = f"No data returned from {scraper_id}"
-                Actor.log.warning(f"⚠️  {last_error}")
+                if probe.items:
+                    Actor.log.info(f"✅ Scraper producing data: {scraper_id} (status: {run['status']})")
+
+                    return {
+                        'success': True,
+                        'run_id': run['id'],
+                        'dataset_id': run['defaultDatasetId'],
+                        'scraper_used': scraper_id,
+                        'errors': []
+                    }
+
+                if run['status'] in TERMINAL_RUN_STATUSES:
+                    last_error = f"No data returned from {scraper_id} (status: {run['status']})"
+                    Actor.log.warning(f"⚠️  {last_error}")
+                    break
+
+                await asyncio.sleep(poll_interval)
 
         except Exception as e:
             last_error = str(e)
@@ -99,7 +156,8 @@ async def execute_scraper_with_fallback(
     # All scrapers failed
     return {
         'success': False,
-        'data': [],
+        'run_id': None,
+        'dataset_id': None,
         'scraper_used': None,
         'errors': [last_error] if last_error else ['All scrapers failed']
     }
@@ -113,96 +171,265 @@ async def main():
 
         input_data = await Actor.get_input()
 
-        # Validate required inputs
-        required = ['target', 'gemini_api_key', 'apify_token']
+        # Validate required inputs (replay needs no scraper, so no target/token)
+        replay = input_data.get('replay', False)
+        required = ['corpus_name', 'gemini_api_key']
+        if not replay:
+            required += ['target', 'apify_token']
         for field in required:
-            if field not in input_data:
+            if not input_data.get(field):
                 raise ValueError(f"Missing required input: {field}")
 
+        # Compile noise rules and resolve the parser up front (bad config fails before scraping)
+        noise_filter = NoiseFilter.from_config(input_data.get('noise_rules'))
+        parser_backend = get_parser_backend(input_data.get('parser_backend'))
+        token_counter = get_token_counter(input_data.get('token_counter'), input_data.get('tokenizer_model'))
+        duplicates = ExactDuplicateFilter() if input_data.get('remove_duplicates', True) else None
+        near_duplicates = None
+        if input_data.get('remove_near_duplicates', False):
+            near_duplicates = NearDuplicateIndex(
+                threshold=input_data.get('near_duplicate_threshold', DEFAULT_SIMILARITY_THRESHOLD)
+            )
+        boilerplate = None
+        if input_data.get('remove_boilerplate', False):
+            boilerplate = BoilerplateFilter(
+                threshold=input_data.get('boilerplate_threshold', DEFAULT_BOILERPLATE_THRESHOLD)
+            )
+
         # Setup workspace
         workspace = Path("/tmp/scraper-workspace")
         workspace.mkdir(parents=True, exist_ok=True)
         docs_dir = workspace / "documents"
         docs_dir.mkdir(exist_ok=True)
 
-        # ========== PHASE 1: SCRAPER SELECTION ==========
+        corpus_name = input_data.get('corpus_name', 'scraped-knowledge')
+        archive_store = None
+        if replay or input_data.get('archive_crawl', True):
+            archive_store = await Actor.open_key_value_store(name=ARCHIVE_STORE_NAME)
 
-        Actor.log.info(f"\n📋 Phase 1: Scraper Selection")
-        Actor.log.info(f"Target: {input_data['target']}")
+        if replay:
+            # ========== PHASES 1+2: REPLAY THE ARCHIVED CRAWL ==========
 
-        # Initialize Apify client
-        apify_client = ApifyClient(input_data['apify_token'])
+            Actor.log.info(f"\n🗄️  Phases 1+2: Replaying the archived crawl of '{corpus_name}' (no scraping)")
 
-        # Find and select best scrapers (banned filter applied)
-        selected_scrapers, target_type = await find_and_select_scrapers(
-            apify_client=apify_client,
-            target=input_data['target'],
-            budget_mode=input_data.get('scraper_budget', 'optimal'),
-            top_n=3  # Primary + 2 fallbacks
-        )
+            archive_index = await load_archive_index(archive_store, corpus_name)
+            if archive_index is None:
+                raise RuntimeError(f"No crawl archive for '{corpus_name}' - run once with archive_crawl enabled")
+            if not archive_index['complete']:
+                Actor.log.warning(f"⚠️  The archived crawl ended early: {archive_index['items']} pages")
 
-        Actor.log.info(f"Target type: {target_type}")
-        Actor.log.info(f"Selected {len(selected_scrapers)} scrapers (with fallbacks)")
+            target = input_data.get('target', archive_index['target'])
+            target_type = archive_index['target_type']
+            scraper_used = archive_index['scraper_used']
+            Actor.log.info(f"Archive: {archive_index['items']} pages from {scraper_used} ({archive_index['created_at']})")
+        else:
+            target = input_data['target']
 
-        # ========== PHASE 2: SCRAPE WITH FALLBACK ==========
+            # ========== PHASE 1: SCRAPER SELECTION ==========
 
-        Actor.log.info(f"\n🕷️  Phase 2: Web Scraping")
+            Actor.log.info(f"\n📋 Phase 1: Scraper Selection")
+            Actor.log.info(f"Target: {target}")
 
-        scrape_result = await execute_scraper_with_fallback(
-            apify_client=apify_client,
-            selected_scrapers=selected_scrapers,
-            target=input_data['target'],
-            max_pages=input_data.get('max_pages', 100)
-        )
+            # Initialize Apify client (async - never block the actor's event loop)
+            apify_client = ApifyClientAsync(input_data['apify_token'])
 
-        if not scrape_result['success']:
-            raise RuntimeError(f"All scrapers failed: {scrape_result['errors']}")
+            # Find and select best scrapers (banned filter applied)
+            selected_scrapers, target_type = await find_and_select_scrapers(
+                apify_client=apify_client,
+                target=target,
+                budget_mode=input_data.get('scraper_budget', 'optimal'),
+                top_n=3  # Primary + 2 fallbacks
+            )
 
-        scraped_items = scrape_result['data']
-        scraper_used = scrape_result['scraper_used']
+            Actor.log.info(f"Target type: {target_type}")
+            Actor.log.info(f"Selected {len(selected_scrapers)} scrapers (with fallbacks)")
 
-        Actor.log.info(f"✅ Scraped {len(scraped_items)} pages using {scraper_used}")
+            # ========== PHASE 2: SCRAPE WITH FALLBACK ==========
 
-        # ========== PHASE 3: DOCUMENT CONVERSION ==========
+            Actor.log.info(f"\n🕷️  Phase 2: Web Scraping")
 
-        Actor.log.info(f"\n📄 Phase 3: Document Conversion")
+            scrape_result = await execute_scraper_with_fallback(
+                apify_client=apify_client,
+                selected_scrapers=selected_scrapers,
+                target=target,
+                max_pages=input_data.get('max_pages', 100)
+            )
 
-        documents = convert_dataset_to_documents(
-            dataset_items=scraped_items,
-            output_dir=docs_dir,
-            url_field='url',
-            html_field='html'
-        )
+            if not scrape_result['success']:
+                raise RuntimeError(f"All scrapers failed: {scrape_result['errors']}")
 
-        if not documents:
-            raise RuntimeError("No valid documents created from scraped data")
+            scraper_used = scrape_result['scraper_used']
 
-        Actor.log.info(f"✅ Created {len(documents)} documents")
+        gemini_client = genai.Client(api_key=input_data['gemini_api_key'])
 
-        # Calculate indexing cost estimate
-        indexing_cost = calculate_indexing_cost(documents)
+        # Incremental re-indexing / update existing store: only new/changed
+        # pages are converted and uploaded, into the existing store
+        incremental = input_data.get('incremental', False)
+        update_existing_store = input_data.get('update_existing_store', False)
+        manifest = None
+        if incremental or update_existing_store:
+            manifest_store = await Actor.open_key_value_store(name=MANIFEST_STORE_NAME)
+            previous = None
 
-        # ========== PHASE 4: UPLOAD TO GEMINI ==========
+            if incremental:
+                previous = await load_manifest(manifest_store, corpus_name)
+                if previous and not await get_file_search_store(gemini_client, previous['file_search_store_name']):
+                    Actor.log.warning(f"⚠️  Store {previous['file_search_store_name']} no longer exists")
+                    previous = None
 
-        Actor.log.info(f"\n🧠 Phase 4: Gemini File Search Upload")
+            if previous is None and update_existing_store:
+                # No manifest: find the store by name and list what's in it
+                previous = await load_store_manifest(gemini_client, corpus_name)
 
-        gemini_corpus = await upload_to_gemini(
-            gemini_api_key=input_data['gemini_api_key'],
-            document_paths=documents,
-            corpus_name=input_data.get('corpus_name', 'scraped-knowledge')
-        )
+            manifest = ManifestTracker(corpus_name, previous)
+            if previous:
+                Actor.log.info(f"♻️  Updating {previous['file_search_store_name']}: {len(previous['pages'])} pages already indexed")
+            else:
+                Actor.log.info(f"♻️  No existing knowledge base '{corpus_name}' - indexing everything")
+
+        # ========== PHASES 3+4: CONVERT + UPLOAD (STREAMING) ==========
+
+        Actor.log.info(f"\n📄🧠 Phases 3+4: Document Conversion + Gemini Upload (streaming from {scraper_used})")
+
+        # Read the dataset the way this scraper writes it (markdown/text
+        # output skips HTML parsing)
+        output_adapter = get_output_adapter(scraper_used)
+        Actor.log.info(f"Output format: {output_adapter.output_format}")
+
+        # Bundle small pages into fewer upload documents. The manifest tracks
+        # one document per page, so incremental runs upload pages singly.
+        packer = None
+        if input_data.get('pack_documents', False):
+            if manifest is not None:
+                Actor.log.warning("⚠️  pack_documents is ignored for incremental/upsert runs (one document per page)")
+            else:
+                packer = DocumentPacker(
+                    docs_dir,
+                    max_bytes=input_data.get('pack_target_kb', DEFAULT_PACK_BYTES // 1024) * 1024,
+                    max_tokens=input_data.get('pack_target_tokens') or None
+                )
+
+        # Split very large pages (API references) into sections, same
+        # one-document-per-page restriction as packing
+        splitter = None
+        split_threshold = input_data.get('split_threshold_tokens', DEFAULT_SPLIT_THRESHOLD)
+        if split_threshold:
+            if manifest is not None:
+                Actor.log.warning("⚠️  split_threshold_tokens is ignored for incremental/upsert runs (one document per page)")
+            else:
+                splitter = DocumentSplitter(threshold=split_threshold, token_counter=token_counter)
+
+        # Follow the live run: pages are converted as they are scraped and
+        # uploaded as they are converted (bounded queues = backpressure).
+        # Raw items are archived on the way, so the crawl can be replayed.
+        archive = None
+        if replay:
+            dataset_items = iterate_archived_items(archive_store, archive_index)
+        else:
+            dataset_items = iterate_run_dataset_items(
+                apify_client.run(scrape_result['run_id']),
+                apify_client.dataset(scrape_result['dataset_id']),
+                page_size=input_data.get('dataset_page_size', DEFAULT_PAGE_SIZE)
+            )
+            if archive_store is not None:
+                archive = CrawlArchive(
+                    archive_store,
+                    corpus_name,
+                    codec=get_archive_codec(input_data.get('archive_codec')),
+                    metadata={'target': target, 'target_type': target_type, 'scraper_used': scraper_used}
+                )
+                dataset_items = archive.tee(dataset_items)
+
+        async def upload(documents):
+            return await upload_to_gemini(
+                gemini_api_key=input_data['gemini_api_key'],
+                document_paths=documents,
+                corpus_name=corpus_name,
+                upload_concurrency=input_data.get('upload_concurrency', DEFAULT_UPLOAD_CONCURRENCY),
+                rate_limit=input_data.get('gemini_rate_limit', DEFAULT_RATE_LIMIT),
+                max_retries=input_data.get('gemini_max_retries', DEFAULT_MAX_RETRIES),
+                max_attempts=input_data.get('document_max_attempts', DEFAULT_DOCUMENT_ATTEMPTS),
+                client=gemini_client,
+                manifest=manifest,
+                token_counter=token_counter
+            )
+
+        try:
+            pipeline_result = await run_document_pipeline(
+                dataset_items=dataset_items,
+                output_dir=docs_dir,
+                upload=upload,
+                url_field='url',
+                html_field='html',
+                queue_size=input_data.get('pipeline_queue_size', DEFAULT_QUEUE_SIZE),
+                manifest=manifest,
+                workers=input_data.get('conversion_workers') or available_cpus(),
+                noise_filter=noise_filter,
+                backend=parser_backend,
+                adapter=output_adapter,
+                near_duplicates=near_duplicates,
+                boilerplate=boilerplate,
+                duplicates=duplicates,
+                token_counter=token_counter,
+                packer=packer,
+                splitter=splitter,
+                in_memory=not input_data.get('write_documents', False)
+            )
+        except Exception:
+            # Keep what was crawled (replayable), and don't leave the scraper
+            # running (and billing) after a failed pipeline
+            if archive is not None:
+                await archive.close(complete=False)
+            if not replay:
+                await apify_client.run(scrape_result['run_id']).abort()
+            raise
+
+        scraped_count = pipeline_result['items']
+        documents = pipeline_result['documents']
+        gemini_corpus = pipeline_result['upload_result']
+
+        Actor.log.info(f"✅ {'Replayed' if replay else 'Scraped'} {scraped_count} pages using {scraper_used}")
+        Actor.log.info(f"✅ Created {len(documents)} documents")
+
+        # Calculate indexing cost estimate (token counts recorded at conversion - no disk reads)
+        indexing_cost = calculate_indexing_cost(documents, token_counter)
 
         Actor.log.info(f"✅ Knowledge base ready!")
         Actor.log.info(f"   Store: {gemini_corpus['file_search_store_name']}")
         Actor.log.info(f"   Files: {gemini_corpus['files_indexed']}")
         Actor.log.info(f"   Cost: ${gemini_corpus['cost_estimate_usd']:.4f}")
 
+        if gemini_corpus['failed_documents']:
+            Actor.log.warning(f"⚠️  {len(gemini_corpus['failed_documents'])} documents failed to upload (see failed_documents in output)")
+
+        if manifest is not None:
+            await save_manifest(manifest_store, manifest.to_manifest(gemini_corpus['file_search_store_name']))
+            Actor.log.info(f"   Incremental: {gemini_corpus['incremental']}")
+
+        if archive is not None:
+            Actor.log.info(f"   Archived: {archive.summary()}")
+
+        if splitter is not None and splitter.documents_split:
+            Actor.log.info(f"   Split: {splitter.summary()}")
+
+        if packer is not None:
+            Actor.log.info(f"   Packed: {packer.summary()}")
+
+        if duplicates is not None:
+            Actor.log.info(f"   Duplicates dropped: {len(duplicates.duplicates)} (see duplicates in output)")
+
+        if boilerplate is not None:
+            Actor.log.info(f"   Boilerplate: {boilerplate.summary()}")
+
+        if near_duplicates is not None:
+            Actor.log.info(f"   Near duplicates dropped: {len(near_duplicates.duplicates)} (see near_duplicates in output)")
+
         # ========== PHASE 5: PRICING (PER-PAGE MODEL) ==========
 
         Actor.log.info(f"\n💰 Phase 5: Per-Page Charging")
 
         # Charge per page processed (pay-per-event)
-        pages_count = len(scraped_items)
+        pages_count = scraped_count
         price_per_page = 0.0015  # Base price (volume-focused), Store discounts applied automatically
 
         Actor.log.info(f"  Pages indexed: {pages_count}")
@@ -234,20 +461,29 @@ async def main():
 
         # Save to dataset (structured data)
         await Actor.push_data({
-            'target': input_data['target'],
+            'target': target,
             'target_type': target_type,
             'scraper_used': scraper_used,
-            'pages_scraped': len(scraped_items),
+            'pages_scraped': scraped_count,
+            'replayed': replay,
+            'archive': archive.summary() if archive is not None else None,
             'documents_created': len(documents),
+            'duplicates': duplicates.duplicates if duplicates is not None else [],
+            'near_duplicates': near_duplicates.duplicates if near_duplicates is not None else [],
+            'boilerplate': boilerplate.summary() if boilerplate is not None else None,
+            'splitting': splitter.summary() if splitter is not None else None,
+            'packing': {**packer.summary(), 'packs': packer.packs} if packer is not None else None,
             'gemini_corpus': {
                 'file_search_store_name': gemini_corpus['file_search_store_name'],
-                'corpus_name': input_data.get('corpus_name', 'scraped-knowledge'),
+                'corpus_name': corpus_name,
                 'files_indexed': gemini_corpus['files_indexed'],
                 'storage_type': gemini_corpus['storage_type'],
                 'storage_persistence': gemini_corpus['storage_persistence'],
                 'globally_accessible': gemini_corpus['globally_accessible'],
                 'estimated_tokens': gemini_corpus['estimated_tokens'],
-                'cost_estimate_usd': gemini_corpus['cost_estimate_usd']
+                'cost_estimate_usd': gemini_corpus['cost_estimate_usd'],
+                'failed_documents': gemini_corpus['failed_documents'],
+                'incremental': gemini_corpus.get('incremental')
             },
             'pricing': {
                 'model': 'pay-per-page',
@@ -261,7 +497,7 @@ async def main():
             'query_instructions': 'See query-guide.md in Key-Value Store for detailed usage instructions'
         })
 
-        # Note: Query guide already saved to KV Store at line 270 as QUERY_GUIDE.md
+        # Query guide already saved to the KV Store above (Save query guide step) as QUERY_GUIDE.md
 
         # Save corpus metadata to KV Store for reference
         await Actor.set_value('gemini-corpus.json', gemini_corpus)
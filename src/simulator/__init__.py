@@ -0,0 +1,12 @@
+"""
+In-process simulator of the Apify and Gemini services the actor calls.
+
+Fakes for load and failure testing without credentials or network:
+- apify.py: ApifyClientAsync stand-in with scraper profiles and
+  synthetic datasets (size, page weight, production rate, failures)
+- file_search.py: genai.Client stand-in with latency distributions,
+  429 bursts, 5xx errors and failed imports
+- latency.py: delay distributions
+- load_test.py: runs execute_scraper_with_fallback and
+  upload_documents_to_store against both (python -m src simulate)
+"""
@@ -0,0 +1,284 @@
+"""
+Fake Apify Platform for the Service Simulator
+
+In-process stand-in for the ApifyClientAsync calls the actor makes
+(actor().start/call, run().get/abort/wait_for_finish,
+dataset().list_items), backed by scraper profiles instead of real runs.
+
+Key functions:
+- Scraper profiles: pages produced, page weight, production rate,
+  startup delay, final run status, start errors (to exercise fallback)
+- Synthetic dataset items: docs-like HTML + markdown of a configurable
+  size, generated on demand from (seed, index) - a 10k-page dataset
+  never sits in memory
+- Live runs: items appear over time at the profile's rate, like a
+  crawler pushing to its dataset
+
+Usage:
+    >>> apify = FakeApifyClient({
+    ...     'apify/broken-crawler': ScraperProfile(start_error='Actor not found'),
+    ...     'apify/website-content-crawler': ScraperProfile(pages_per_second=500)
+    ... })
+    >>> result = await execute_scraper_with_fallback(apify, scrapers, target, max_pages=10_000)
+"""
+
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+import asyncio
+import itertools
+import random
+import time
+from .latency import Latency, NO_LATENCY
+
+# Apify run statuses after which no more items are pushed
+TERMINAL_STATUSES = {'SUCCEEDED', 'FAILED', 'TIMED-OUT', 'ABORTED'}
+
+_WORDS = (
+    'request', 'response', 'client', 'server', 'token', 'index', 'query', 'document',
+    'store', 'upload', 'import', 'config', 'option', 'value', 'default', 'error',
+    'retry', 'limit', 'page', 'field', 'schema', 'record', 'stream', 'batch',
+    'cache', 'session', 'handler', 'event', 'method', 'parameter', 'returns', 'the',
+    'a', 'is', 'to', 'of', 'and', 'for', 'with', 'when', 'each', 'this',
+)
+
+
+@dataclass
+class ScraperProfile:
+    """How a simulated scraper behaves."""
+
+    # Items the run produces (None = the run input's maxCrawlPages)
+    pages: Optional[int] = None
+    # Mean HTML size per item and its log-normal spread (0 = all the same)
+    page_bytes: int = 20_000
+    page_bytes_sigma: float = 0.5
+    # Items pushed per second once started (0 = all at once)
+    pages_per_second: float = 0.0
+    # Delay before the first item
+    startup: Latency = field(default_factory=lambda: NO_LATENCY)
+    # Status once every item is pushed ('FAILED' with pages=0 = a run that yields nothing)
+    final_status: str = 'SUCCEEDED'
+    # start() raises RuntimeError with this message (actor missing, no credit, ...)
+    start_error: Optional[str] = None
+
+
+def synthetic_item(index: int, page_bytes: int, seed: int = 0, base_url: str = 'https://docs.example.com') -> Dict:
+    """
+    Generate a docs-style dataset item (deterministic for a seed and index).
+
+    Args:
+        index: Item position (URL and content derive from it)
+        page_bytes: Approximate HTML size
+        seed: Dataset seed
+        base_url: URL prefix
+
+    Returns:
+        Dataset item with url, html, markdown and metadata.title
+    """
+    rng = random.Random(f'{seed}:{index}')
+    title = ' '.join(word.title() for word in rng.choices(_WORDS, k=3)) + f' {index}'
+    html = [f'<html><head><title>{title}</title></head><body>',
+            '<nav class="sidebar"><a href="/">Home</a> <a href="/api">API</a></nav>',
+            f'<main><h1>{title}</h1>']
+    markdown = [f'# {title}']
+    size = sum(map(len, html))
+
+    while size < page_bytes:
+        heading = ' '.join(rng.choices(_WORDS, k=3)).capitalize()
+        paragraphs = [
+            ' '.join(rng.choices(_WORDS, k=rng.randint(30, 80))).capitalize() + '.'
+            for _ in range(rng.randint(2, 4))
+        ]
+        section = [f'<h2>{heading}</h2>'] + [f'<p>{p}</p>' for p in paragraphs]
+        markdown += [f'## {heading}'] + paragraphs
+        if rng.random() < 0.3:
+            code = f'client.{rng.choice(_WORDS)}({rng.choice(_WORDS)}={rng.randint(1, 100)})'
+            section.append(f'<pre><code>{code}</code></pre>')
+            markdown.append(f'```\n{code}\n```')
+        html += section
+        size += sum(map(len, section))
+
+    html.append('</main><footer>© Example Docs</footer></body></html>')
+    return {
+        'url': f'{base_url}/page/{index}',
+        'html': ''.join(html),
+        'markdown': '\n\n'.join(markdown),
+        'metadata': {'title': title}
+    }
+
+
+class _SimulatedRun:
+    """One scraper run: items appear over time according to its profile."""
+
+    def __init__(self, run_id: str, actor_id: str, profile: ScraperProfile, pages: int, seed: int, startup: float):
+        self.id = run_id
+        self.dataset_id = f'{run_id}-dataset'
+        self.actor_id = actor_id
+        self.profile = profile
+        self.pages = pages
+        self.seed = seed
+        self.started_at = time.monotonic()
+        self.startup = startup
+        self.aborted: Optional[int] = None  # Items pushed before abort()
+        rng = random.Random(f'{seed}:{run_id}:sizes')
+        sigma = profile.page_bytes_sigma
+        self._sizes = [
+            max(200, int(profile.page_bytes * rng.lognormvariate(0, sigma))) if sigma else profile.page_bytes
+            for _ in range(pages)
+        ]
+
+    def produced(self) -> int:
+        """Items pushed so far."""
+        if self.aborted is not None:
+            return self.aborted
+        elapsed = time.monotonic() - self.started_at - self.startup
+        if elapsed < 0:
+            return 0
+        if self.profile.pages_per_second <= 0:
+            return self.pages
+        return min(self.pages, int(elapsed * self.profile.pages_per_second))
+
+    def finishes_at(self) -> float:
+        """Monotonic time the last item is pushed."""
+        rate = self.profile.pages_per_second
+        return self.started_at + self.startup + (self.pages / rate if rate > 0 else 0)
+
+    def status(self) -> str:
+        if self.aborted is not None:
+            return 'ABORTED'
+        if self.produced() >= self.pages and time.monotonic() >= self.started_at + self.startup:
+            return self.profile.final_status
+        return 'RUNNING'
+
+    def item(self, index: int) -> Dict:
+        return synthetic_item(index, self._sizes[index], self.seed)
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'actId': self.actor_id,
+            'status': self.status(),
+            'defaultDatasetId': self.dataset_id,
+            'stats': {'itemCount': self.produced()}
+        }
+
+
+class _FakeActorClient:
+    def __init__(self, apify: 'FakeApifyClient', actor_id: str):
+        self._apify = apify
+        self.actor_id = actor_id
+
+    async def start(self, run_input: Optional[Dict] = None, **kwargs) -> Dict:
+        await self._apify.request('actor.start')
+        profile = self._apify.scrapers.get(self.actor_id)
+        if profile is None:
+            raise RuntimeError(f"Actor {self.actor_id} was not found")
+        if profile.start_error:
+            raise RuntimeError(profile.start_error)
+
+        pages = profile.pages if profile.pages is not None else (run_input or {}).get('maxCrawlPages', 10)
+        run_id = f'run-{next(self._apify._ids)}'
+        run = _SimulatedRun(
+            run_id, self.actor_id, profile, pages, self._apify.seed,
+            startup=profile.startup.sample(self._apify.rng)
+        )
+        self._apify.runs[run_id] = run
+        self._apify.datasets[run.dataset_id] = run
+        return run.to_dict()
+
+    async def call(self, run_input: Optional[Dict] = None, wait_secs: Optional[float] = None, **kwargs) -> Dict:
+        run = await self.start(run_input=run_input)
+        return await self._apify.run(run['id']).wait_for_finish(wait_secs=wait_secs)
+
+
+class _FakeRunClient:
+    def __init__(self, apify: 'FakeApifyClient', run_id: str):
+        self._apify = apify
+        self.run_id = run_id
+
+    async def get(self) -> Optional[Dict]:
+        await self._apify.request('run.get')
+        run = self._apify.runs.get(self.run_id)
+        return run.to_dict() if run is not None else None
+
+    async def abort(self) -> Dict:
+        await self._apify.request('run.abort')
+        run = self._apify.runs[self.run_id]
+        if run.status() not in TERMINAL_STATUSES:
+            run.aborted = run.produced()
+        return run.to_dict()
+
+    async def wait_for_finish(self, wait_secs: Optional[float] = None) -> Optional[Dict]:
+        run = self._apify.runs.get(self.run_id)
+        if run is None:
+            return None
+        remaining = run.finishes_at() - time.monotonic()
+        if wait_secs is not None:
+            remaining = min(remaining, wait_secs)
+        if remaining > 0 and run.aborted is None:
+            await asyncio.sleep(remaining)
+        return run.to_dict()
+
+
+class _FakeDatasetClient:
+    def __init__(self, apify: 'FakeApifyClient', dataset_id: str):
+        self._apify = apify
+        self.dataset_id = dataset_id
+
+    async def list_items(self, offset: int = 0, limit: Optional[int] = None, **kwargs):
+        await self._apify.request('dataset.list_items')
+        run = self._apify.datasets.get(self.dataset_id)
+        if run is None:
+            raise LookupError(f"Dataset {self.dataset_id} was not found")
+
+        total = run.produced()
+        end = total if limit is None else min(total, offset + limit)
+        items = [run.item(i) for i in range(offset, end)]
+        self._apify.items_served += len(items)
+        return SimpleNamespace(items=items, total=total, offset=offset, limit=limit, count=len(items))
+
+
+class FakeApifyClient:
+    """
+    ApifyClientAsync stand-in running simulated scrapers.
+
+    Actors not in `scrapers` fail to start, like an actor id that
+    doesn't exist.
+    """
+
+    def __init__(self, scrapers: Dict[str, ScraperProfile], request_latency: Latency = NO_LATENCY, seed: int = 0):
+        """
+        Args:
+            scrapers: Actor id → behaviour
+            request_latency: Delay of every API call
+            seed: Seed for page content, sizes and sampled delays
+        """
+        self.scrapers = scrapers
+        self.request_latency = request_latency
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.runs: Dict[str, _SimulatedRun] = {}
+        self.datasets: Dict[str, _SimulatedRun] = {}
+        self.requests: Dict[str, int] = {}
+        self.items_served = 0
+        self._ids = itertools.count(1)
+
+    async def request(self, method: str):
+        """Count an API call and wait out its latency."""
+        self.requests[method] = self.requests.get(method, 0) + 1
+        delay = self.request_latency.sample(self.rng)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def actor(self, actor_id: str) -> _FakeActorClient:
+        return _FakeActorClient(self, actor_id)
+
+    def run(self, run_id: str) -> _FakeRunClient:
+        return _FakeRunClient(self, run_id)
+
+    def dataset(self, dataset_id: str) -> _FakeDatasetClient:
+        return _FakeDatasetClient(self, dataset_id)
+
+    def started(self) -> List[str]:
+        """Actor ids of the runs started so far, in order."""
+        return [run.actor_id for run in self.runs.values()]
@@ -0,0 +1,167 @@
+"""
+Simulated Gemini File Search for the Service Simulator
+
+LocalFileSearchClient with the behaviour that matters under load:
+request and upload latency, slow imports, 429 bursts, transient 5xx
+errors and imports that finish with an error. All randomness comes from
+one seeded generator, so a scenario can be replayed.
+
+Key functions:
+- Per-request latency (every file_search_stores / operations call)
+- Upload latency (+ optional bandwidth limit) and import latency
+  distributions (see latency.py)
+- 429 bursts: a throttled request starts a window in which every
+  request is rejected, like a quota being exhausted
+- Import failures: the operation completes with an error and no
+  document (exercises re-queueing and dead-lettering)
+- Counters: throttled requests, bursts, server errors, failed imports,
+  peak concurrent uploads
+"""
+
+from typing import Dict, Optional
+from pathlib import Path
+import asyncio
+import random
+import time
+from google.genai import errors
+from ..tools.local_store import LocalFileSearchClient, LocalOperation
+from .latency import Latency, NO_LATENCY
+
+
+class SimulatedOperation(LocalOperation):
+    """Import operation that finishes at ready_at."""
+
+    def __init__(self, name: str, ready_at: float, document_name: Optional[str] = None, error: Optional[str] = None):
+        super().__init__(name, document_name, error)
+        self.ready_at = ready_at
+        self._outcome = (self.error, self.response)
+        self.done = False
+        self.error = None
+        self.response = None
+
+    def update(self) -> 'SimulatedOperation':
+        if not self.done and time.monotonic() >= self.ready_at:
+            self.done = True
+            self.error, self.response = self._outcome
+        return self
+
+
+class SimulatedFileSearchClient(LocalFileSearchClient):
+    """
+    genai.Client stand-in with configurable latency and failures.
+
+    Example:
+        >>> client = SimulatedFileSearchClient(
+        ...     upload_latency=LogNormalLatency(0.3),
+        ...     import_latency=LogNormalLatency(2.0, maximum=30),
+        ...     throttle_rate=0.01,
+        ...     import_failure_rate=0.02
+        ... )
+        >>> await upload_documents_to_store(client, store_name, documents)
+        >>> client.summary()['throttled']
+    """
+
+    def __init__(
+        self,
+        request_latency: Latency = NO_LATENCY,
+        upload_latency: Latency = NO_LATENCY,
+        import_latency: Latency = NO_LATENCY,
+        upload_bytes_per_second: Optional[float] = None,
+        throttle_rate: float = 0.0,
+        burst_seconds: float = 1.0,
+        server_error_rate: float = 0.0,
+        import_failure_rate: float = 0.0,
+        seed: int = 0,
+        directory: Optional[Path] = None
+    ):
+        """
+        Args:
+            request_latency: Delay of every API call
+            upload_latency: Extra delay of an upload request
+            import_latency: Time from upload until the import operation is done
+            upload_bytes_per_second: Upload bandwidth (None = unlimited)
+            throttle_rate: Probability that a request starts a 429 burst
+            burst_seconds: Length of a 429 burst (every request in it is rejected)
+            server_error_rate: Probability of a 503 per request
+            import_failure_rate: Probability that an import finishes with an error
+            seed: Seed for every sampled delay and failure
+            directory: Write uploaded documents here (see LocalFileSearchClient)
+
+        Raises:
+            ValueError: If a rate is outside [0, 1]
+        """
+        for name, rate in (('throttle_rate', throttle_rate), ('server_error_rate', server_error_rate),
+                           ('import_failure_rate', import_failure_rate)):
+            if not 0 <= rate <= 1:
+                raise ValueError(f"{name} must be between 0 and 1, got {rate}")
+
+        super().__init__(directory)
+        self.request_latency = request_latency
+        self.upload_latency = upload_latency
+        self.import_latency = import_latency
+        self.upload_bytes_per_second = upload_bytes_per_second
+        self.throttle_rate = throttle_rate
+        self.burst_seconds = burst_seconds
+        self.server_error_rate = server_error_rate
+        self.import_failure_rate = import_failure_rate
+        self.rng = random.Random(seed)
+
+        self.throttled_until = 0.0
+        self.bursts = 0
+        self.throttled = 0
+        self.server_errors = 0
+        self.import_failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, method: str):
+        await super().request(method)
+        delay = self.request_latency.sample(self.rng)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        now = time.monotonic()
+        if now >= self.throttled_until and self.throttle_rate and self.rng.random() < self.throttle_rate:
+            self.throttled_until = now + self.burst_seconds
+            self.bursts += 1
+        if now < self.throttled_until:
+            self.throttled += 1
+            raise errors.ClientError(429, {'error': {'code': 429, 'message': 'Resource has been exhausted (simulated)', 'status': 'RESOURCE_EXHAUSTED'}})
+
+        if self.server_error_rate and self.rng.random() < self.server_error_rate:
+            self.server_errors += 1
+            raise errors.ServerError(503, {'error': {'code': 503, 'message': 'The service is currently unavailable (simulated)', 'status': 'UNAVAILABLE'}})
+
+    async def import_document(self, store_name: str, data: bytes, config: Dict) -> SimulatedOperation:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay = self.upload_latency.sample(self.rng)
+            if self.upload_bytes_per_second:
+                delay += len(data) / self.upload_bytes_per_second
+            if delay > 0:
+                await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+
+        ready_at = time.monotonic() + self.import_latency.sample(self.rng)
+        if self.import_failure_rate and self.rng.random() < self.import_failure_rate:
+            self.import_failures += 1
+            name = f'{store_name}/operations/failed-{next(self._ids)}'
+            return SimulatedOperation(name, ready_at, error='INTERNAL: document import failed (simulated)')
+
+        operation = await super().import_document(store_name, data, config)
+        return SimulatedOperation(operation.name, ready_at, document_name=operation.response.document_name)
+
+    async def poll_operation(self, operation: SimulatedOperation) -> SimulatedOperation:
+        return operation.update()
+
+    def summary(self) -> Dict:
+        return {
+            **super().summary(),
+            'throttled': self.throttled,
+            'bursts': self.bursts,
+            'server_errors': self.server_errors,
+            'import_failures': self.import_failures,
+            'max_in_flight': self.max_in_flight
+        }
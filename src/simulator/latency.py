@@ -0,0 +1,74 @@
+"""
+Latency Distributions for the Service Simulator
+
+Each distribution draws a delay in seconds from a caller-supplied
+random.Random, so a seeded simulation replays the same delays.
+
+Key functions:
+- FixedLatency: constant delay (0 = instant)
+- UniformLatency: delay spread evenly between two bounds
+- LogNormalLatency: long-tailed delay around a median, optionally
+  capped (the usual shape of API response times)
+"""
+
+from typing import Optional
+from abc import ABC, abstractmethod
+import math
+import random
+
+
+class Latency(ABC):
+    """Delay distribution (seconds)."""
+
+    @abstractmethod
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay."""
+
+
+class FixedLatency(Latency):
+    """Always the same delay."""
+
+    def __init__(self, seconds: float = 0.0):
+        if seconds < 0:
+            raise ValueError(f"seconds must be >= 0, got {seconds}")
+        self.seconds = seconds
+
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+
+
+class UniformLatency(Latency):
+    """Delay drawn uniformly from [low, high]."""
+
+    def __init__(self, low: float, high: float):
+        if not 0 <= low <= high:
+            raise ValueError(f"need 0 <= low <= high, got {low}, {high}")
+        self.low = low
+        self.high = high
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+
+class LogNormalLatency(Latency):
+    """Long-tailed delay: median * e^N(0, sigma), capped at maximum."""
+
+    def __init__(self, median: float, sigma: float = 0.5, maximum: Optional[float] = None):
+        """
+        Args:
+            median: Typical delay (seconds)
+            sigma: Spread; 0.5 puts ~1 in 20 calls above 2.3x the median
+            maximum: Upper bound (None = unbounded)
+        """
+        if median < 0 or sigma < 0:
+            raise ValueError(f"median and sigma must be >= 0, got {median}, {sigma}")
+        self.median = median
+        self.sigma = sigma
+        self.maximum = maximum
+
+    def sample(self, rng: random.Random) -> float:
+        delay = self.median * math.exp(rng.gauss(0, self.sigma))
+        return min(delay, self.maximum) if self.maximum is not None else delay
+
+
+NO_LATENCY = FixedLatency(0.0)
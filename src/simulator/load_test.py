@@ -0,0 +1,180 @@
+"""
+Load Test Scenario for the Service Simulator
+
+Drives the actor's own scrape and upload code against the fake services:
+execute_scraper_with_fallback picks a scraper from a fallback chain on
+the fake Apify platform, the run's dataset is streamed with
+iterate_run_dataset_items while it is still being produced, and the pages
+are uploaded with upload_documents_to_store to the simulated File Search
+(latency, 429 bursts, failed imports).
+
+Pages become in-memory documents straight from their markdown - HTML
+conversion is CPU-bound and measured separately (benchmarks/, replay CLI).
+
+Usage:
+    >>> report = await run_load_test(pages=10_000, file_search=SimulatedFileSearchClient(...))
+    >>> print_report(report)
+"""
+
+from typing import Dict, List, Optional
+from pathlib import Path
+import time
+from ..main import execute_scraper_with_fallback
+from ..tools.dataset_reader import iterate_run_dataset_items, DEFAULT_PAGE_SIZE
+from ..tools.document_converter import create_metadata_header, estimate_tokens
+from ..tools.document_record import DocumentRecord
+from ..tools.gemini_uploader import (
+    create_file_search_store,
+    upload_documents_to_store,
+    DEFAULT_UPLOAD_CONCURRENCY,
+    DEFAULT_DOCUMENT_ATTEMPTS
+)
+from ..tools.import_poller import ImportPoller, DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL
+from ..tools.rate_limit import RetryPolicy, TokenBucket, DEFAULT_MAX_RETRIES
+from .apify import FakeApifyClient, ScraperProfile
+from .file_search import SimulatedFileSearchClient
+from .latency import FixedLatency
+
+
+def default_scrapers(page_bytes: int = 20_000, pages_per_second: float = 2_000) -> Dict[str, ScraperProfile]:
+    """
+    Fallback chain where only the third scraper delivers.
+
+    Returns:
+        Actor id → profile: one that can't start, one that finishes
+        without items, one that produces the crawl
+    """
+    return {
+        'sim/unavailable-crawler': ScraperProfile(start_error='Actor is under maintenance (simulated)'),
+        'sim/empty-crawler': ScraperProfile(pages=0, final_status='FAILED', startup=FixedLatency(0.1)),
+        'sim/website-crawler': ScraperProfile(page_bytes=page_bytes, pages_per_second=pages_per_second)
+    }
+
+
+def _document(index: int, item: Dict) -> DocumentRecord:
+    text = create_metadata_header(item['url'], item['metadata']['title']) + item['markdown']
+    return DocumentRecord.from_text(
+        Path(f'doc_{index:05d}.txt'), item['url'], item['metadata']['title'],
+        text, estimate_tokens(text), in_memory=True
+    )
+
+
+async def run_load_test(
+    pages: int = 10_000,
+    apify: Optional[FakeApifyClient] = None,
+    file_search: Optional[SimulatedFileSearchClient] = None,
+    concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    rate_limit: float = 0,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    max_attempts: int = DEFAULT_DOCUMENT_ATTEMPTS,
+    retry_base_delay: float = 1.0,
+    min_poll_interval: float = DEFAULT_MIN_INTERVAL,
+    max_poll_interval: float = DEFAULT_MAX_INTERVAL,
+    scrape_poll_interval: float = 0.05,
+    dataset_page_size: int = DEFAULT_PAGE_SIZE,
+    max_wait: float = 300
+) -> Dict:
+    """
+    Scrape (with fallback) and upload `pages` simulated pages.
+
+    Args:
+        pages: Pages to crawl (maxCrawlPages)
+        apify: Fake Apify platform (default: default_scrapers())
+        file_search: Simulated File Search (default: no latency or failures)
+        concurrency: Uploads in flight
+        rate_limit: Client-side requests/sec (0 = unlimited)
+        max_retries: Attempts per API call
+        max_attempts: Upload+import attempts per document
+        retry_base_delay: First retry's backoff ceiling (seconds)
+        min_poll_interval: First import poll delay (seconds)
+        max_poll_interval: Longest import poll interval (seconds)
+        scrape_poll_interval: Seconds between checks for a scraper's first item
+        dataset_page_size: Items per dataset request
+        max_wait: Import timeout per document (seconds)
+
+    Returns:
+        Report dict: scrape, dataset and upload sections (timings,
+        counts) and the simulated File Search's counters
+
+    Raises:
+        RuntimeError: If every scraper in the chain fails
+    """
+    apify = apify or FakeApifyClient(default_scrapers())
+    client = file_search or SimulatedFileSearchClient()
+    limiter = TokenBucket(rate_limit) if rate_limit > 0 else None
+    policy = RetryPolicy(max_attempts=max_retries, base_delay=retry_base_delay)
+
+    start = time.perf_counter()
+    scrapers = [{'id': actor_id} for actor_id in apify.scrapers]
+    scrape = await execute_scraper_with_fallback(
+        apify, scrapers, 'https://docs.example.com', pages, poll_interval=scrape_poll_interval
+    )
+    if not scrape['success']:
+        raise RuntimeError(f"All scrapers failed: {scrape['errors']}")
+    scrape_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    documents: List[DocumentRecord] = []
+    async for item in iterate_run_dataset_items(
+        apify.run(scrape['run_id']), apify.dataset(scrape['dataset_id']),
+        page_size=dataset_page_size, follow_interval=scrape_poll_interval
+    ):
+        documents.append(_document(len(documents), item))
+    dataset_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store_name = await create_file_search_store(client, 'load-test', limiter=limiter, policy=policy)
+    poller = ImportPoller(
+        client, max_wait=max_wait, min_interval=min_poll_interval, max_interval=max_poll_interval,
+        limiter=limiter, max_poll_errors=max_retries
+    )
+    dead_letters: List[Dict] = []
+    try:
+        uploaded = await upload_documents_to_store(
+            client, store_name, documents, concurrency=concurrency, poller=poller,
+            limiter=limiter, policy=policy, max_attempts=max_attempts, dead_letters=dead_letters
+        )
+    finally:
+        await poller.close()
+    upload_seconds = time.perf_counter() - start
+    upload_bytes = sum(document.size for document in documents)
+
+    return {
+        'pages': pages,
+        'scrape': {
+            'scraper_used': scrape['scraper_used'],
+            'runs_started': apify.started(),
+            'seconds': round(scrape_seconds, 3)
+        },
+        'dataset': {
+            'items': len(documents),
+            'list_requests': apify.requests.get('dataset.list_items', 0),
+            'seconds': round(dataset_seconds, 3)
+        },
+        'upload': {
+            'documents': len(documents),
+            'uploaded': len(uploaded),
+            'dead_lettered': len(dead_letters),
+            'seconds': round(upload_seconds, 3),
+            'documents_per_second': round(len(uploaded) / upload_seconds, 1) if upload_seconds else None,
+            'mb_per_second': round(upload_bytes / 1024 / 1024 / upload_seconds, 2) if upload_seconds else None,
+            'import_polls': poller.polls,
+            'poll_cycles': poller.cycles
+        },
+        'file_search': client.summary()
+    }
+
+
+def print_report(report: Dict):
+    """Human-readable load test summary."""
+    scrape, dataset, upload, service = report['scrape'], report['dataset'], report['upload'], report['file_search']
+    print(f"\n🧪 Load test: {report['pages']} pages")
+    print(f"   Scrape:  {scrape['scraper_used']} after {len(scrape['runs_started'])} run(s) in {scrape['seconds']:.2f}s")
+    print(f"   Dataset: {dataset['items']} items, {dataset['list_requests']} requests in {dataset['seconds']:.2f}s")
+    print(f"   Upload:  {upload['uploaded']}/{upload['documents']} in {upload['seconds']:.2f}s"
+          f" ({upload['documents_per_second']}/s, {upload['mb_per_second']} MB/s)")
+    print(f"            peak {service['max_in_flight']} in flight | {service['throttled']} throttled in {service['bursts']} bursts"
+          f" | {service['server_errors']} 5xx | {service['import_failures']} failed imports"
+          f" | {upload['dead_lettered']} dead-lettered")
+    print(f"            {service['documents']} documents in the store ({service['requests']['upload']} upload requests)")
+    print(f"            {upload['import_polls']} import polls in {upload['poll_cycles']} cycles")
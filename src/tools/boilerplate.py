@@ -0,0 +1,211 @@
+"""
+Cross-Page Boilerplate Removal for Gemini Knowledge Scraper
+
+Noise rules (noise_filter.py) only catch boilerplate recognisable by tag,
+class or id. Site-specific headers, sidebars, "Edit this page" blocks and
+cookie text survive them and get indexed once per page. This module finds
+them by frequency instead: a line that appears on more than a set fraction
+of the crawled pages is boilerplate.
+
+Key functions:
+- Normalized line keys (case and whitespace insensitive)
+- Document frequency per line with lossy counting (memory bounded by the
+  error rate, not by the crawl size)
+- Streaming: the first pages are held back until enough pages have been
+  counted, later pages are stripped as they arrive
+- Documents rewritten in place (metadata header kept); converter
+  DocumentRecords are accepted in place of paths and handed back
+
+Fractions are taken over the pages counted so far, so the first pages of
+a crawl are judged on a smaller sample than later ones.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import math
+import re
+from .document_record import Document, document_data, document_path, read_document, save_document, split_header
+
+# Fraction of pages a line must appear on (strictly more) to be boilerplate
+DEFAULT_BOILERPLATE_THRESHOLD = 0.5
+
+# Pages counted before anything is stripped (smaller crawls are left alone)
+DEFAULT_MIN_PAGES = 10
+
+# Lossy counting error (fraction of pages) - bounds memory to ~1/error pages of lines
+DEFAULT_COUNT_ERROR = 0.01
+
+# Shorter lines ("Parameters", "Example") are headings, not boilerplate
+DEFAULT_MIN_WORDS = 2
+
+# Released document: (url, path or DocumentRecord, metadata header, body)
+Released = Tuple[str, Document, str, str]
+
+
+class BoilerplateFilter:
+    """
+    Strips lines repeated across a crawl's pages.
+
+    Feed documents in crawl order with add(); it returns the documents that
+    are ready (stripped and rewritten). Call flush() after the last one.
+
+    Example:
+        >>> boilerplate = BoilerplateFilter(threshold=0.5)
+        >>> for url, path in converted:
+        ...     for url, path, header, body in boilerplate.add(url, path):
+        ...         upload(path)
+        >>> for url, path, header, body in boilerplate.flush():
+        ...     upload(path)
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_BOILERPLATE_THRESHOLD,
+        min_pages: int = DEFAULT_MIN_PAGES,
+        error: float = DEFAULT_COUNT_ERROR,
+        min_words: int = DEFAULT_MIN_WORDS
+    ):
+        """
+        Args:
+            threshold: Fraction of pages (0-1) a line must exceed
+            min_pages: Pages counted before stripping starts
+            error: Lossy counting error as a fraction of pages (0-threshold)
+            min_words: Lines with fewer words are never boilerplate
+
+        Raises:
+            ValueError: If a value is out of range
+        """
+        if not 0 < threshold < 1:
+            raise ValueError(f"threshold must be in (0, 1), got {threshold}")
+        if not 0 < error < threshold:
+            raise ValueError(f"error must be in (0, threshold), got {error}")
+        if min_pages < 1:
+            raise ValueError(f"min_pages must be >= 1, got {min_pages}")
+
+        self.threshold = threshold
+        self.min_pages = min_pages
+        self.min_words = min_words
+        self.bucket_width = math.ceil(1 / error)
+
+        self.pages = 0
+        # line key -> [count, max undercount]
+        self._counts: Dict[int, List[int]] = {}
+        self._pending: List[Released] = []
+
+        self.lines_removed = 0
+        self.chars_removed = 0
+        self.chars_total = 0
+
+    def _key(self, line: str) -> Optional[int]:
+        words = line.lower().split()
+        if len(words) < self.min_words:
+            return None
+        return hash(' '.join(words))
+
+    def _observe(self, body: str):
+        """Count a page's distinct lines (lossy counting, one page = one transaction)."""
+        self.pages += 1
+        bucket = math.ceil(self.pages / self.bucket_width)
+
+        keys = {key for key in map(self._key, body.split('\n')) if key is not None}
+        for key in keys:
+            entry = self._counts.get(key)
+            if entry is None:
+                self._counts[key] = [1, bucket - 1]
+            else:
+                entry[0] += 1
+
+        # End of bucket: forget lines too rare to ever reach the threshold
+        if self.pages % self.bucket_width == 0:
+            self._counts = {
+                key: entry for key, entry in self._counts.items()
+                if entry[0] + entry[1] > bucket
+            }
+
+    def is_boilerplate(self, line: str) -> bool:
+        """True if the line appears on more than `threshold` of the pages counted so far."""
+        key = self._key(line)
+        if key is None:
+            return False
+        entry = self._counts.get(key)
+        return entry is not None and entry[0] > self.threshold * self.pages
+
+    def strip(self, body: str) -> str:
+        """
+        Remove boilerplate lines from a document body.
+
+        Args:
+            body: Document text (without metadata header)
+
+        Returns:
+            Text without boilerplate lines (blank runs collapsed)
+        """
+        kept = []
+        for line in body.split('\n'):
+            if self.is_boilerplate(line):
+                self.lines_removed += 1
+                self.chars_removed += len(line) + 1
+            else:
+                kept.append(line)
+        self.chars_total += len(body)
+        return re.sub(r'\n{3,}', '\n\n', '\n'.join(kept)).strip()
+
+    def _release(self, url: str, doc_path: Document, header: str, body: str) -> Released:
+        """Strip a document and rewrite its file."""
+        if self.pages >= self.min_pages:
+            stripped = self.strip(body)
+            if stripped != body:
+                # In-memory records are rebuilt from (header, body) by the converter
+                save_document(document_path(doc_path), header + stripped, document_data(doc_path) is not None)
+                body = stripped
+        else:
+            self.chars_total += len(body)
+        return url, doc_path, header, body
+
+    def add(self, url: str, doc_path: Document) -> List[Released]:
+        """
+        Count a converted document and release the documents now ready.
+
+        Args:
+            url: Page URL
+            doc_path: Converted document (path or DocumentRecord)
+
+        Returns:
+            (url, doc_path, header, body) of released documents, in input
+            order (empty while the first min_pages pages are being counted)
+        """
+        header, body = split_header(read_document(doc_path))
+        self._observe(body)
+
+        if self.pages < self.min_pages:
+            self._pending.append((url, doc_path, header, body))
+            return []
+
+        released = [self._release(*pending) for pending in self._pending]
+        self._pending = []
+        released.append(self._release(url, doc_path, header, body))
+        return released
+
+    def flush(self) -> List[Released]:
+        """
+        Release documents still held back (crawls smaller than min_pages
+        are released unchanged).
+
+        Returns:
+            (url, doc_path, header, body) of released documents, in input order
+        """
+        released = [self._release(*pending) for pending in self._pending]
+        self._pending = []
+        return released
+
+    def tracked_lines(self) -> int:
+        """Lines currently counted (memory use)."""
+        return len(self._counts)
+
+    def summary(self) -> Dict:
+        """Counts for logs and run output."""
+        return {
+            'pages': self.pages,
+            'lines_removed': self.lines_removed,
+            'chars_removed': self.chars_removed,
+            'reduction': round(self.chars_removed / self.chars_total, 3) if self.chars_total else 0.0
+        }
@@ -0,0 +1,258 @@
+"""
+Structure-Aware Document Chunking for Gemini Knowledge Scraper
+
+Gemini File Search chunks documents itself, but very large pages (API
+references, changelogs) index better when pre-split into sections, and a
+multi-megabyte page uploads as one giant file otherwise.
+
+Key functions:
+- Streaming chunker: a generator over the text's paragraph blocks with a
+  running token count (every block counted once)
+- Breaks at headings first, then paragraph boundaries; blocks longer than
+  a chunk break at lines, lines longer than a chunk are cut
+- Linear-time overlap (trailing blocks of the previous chunk)
+- Document splitting: oversized converted documents become part files
+  that each keep the page's metadata header
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import re
+from .document_record import DocumentRecord, read_document, save_document, split_header
+from .token_counter import HeuristicTokenCounter, TokenCounter
+
+# Tokens per chunk
+DEFAULT_CHUNK_TOKENS = 10000
+
+# Tokens repeated from the end of the previous chunk
+DEFAULT_OVERLAP_TOKENS = 500
+
+# Documents above this many tokens are split (Gemini chunks smaller ones well)
+DEFAULT_SPLIT_THRESHOLD = 50000
+
+# Break preference before a unit
+_LINE, _PARAGRAPH, _HEADING = 0, 1, 2
+
+_HEADING_LINE = re.compile(r'#{1,6}[ \t]')
+
+# (separator before it, text, tokens, break preference)
+_Unit = Tuple[str, str, int, int]
+
+
+def _iter_blocks(text: str) -> Iterator[str]:
+    """Paragraph blocks of text (split at blank lines), without materializing a list."""
+    start = 0
+    while True:
+        end = text.find('\n\n', start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 2
+
+
+def _cut_line(line: str, tokens: int, max_tokens: int) -> Iterator[str]:
+    """Pieces of a line longer than a chunk (proportional character cuts)."""
+    size = max(1, len(line) * max_tokens // (tokens + 1))
+    for start in range(0, len(line), size):
+        yield line[start:start + size]
+
+
+def _iter_units(text: str, max_tokens: int, count: Callable[[str], int]) -> Iterator[_Unit]:
+    """
+    Paragraph blocks with their token counts; blocks longer than a chunk
+    become lines, lines longer than a chunk become pieces.
+    """
+    for block in _iter_blocks(text):
+        if not block.strip():
+            continue
+        kind = _HEADING if _HEADING_LINE.match(block) else _PARAGRAPH
+        tokens = count(block)
+        if tokens <= max_tokens:
+            yield '\n\n', block, tokens, kind
+            continue
+
+        sep = '\n\n'
+        for line in block.split('\n'):
+            line_tokens = count(line)
+            if line_tokens <= max_tokens:
+                yield sep, line, line_tokens, _HEADING if _HEADING_LINE.match(line) else kind
+            else:
+                for piece in _cut_line(line, line_tokens, max_tokens):
+                    yield sep, piece, count(piece), kind
+                    sep, kind = '', _LINE
+            sep, kind = '\n', _LINE
+
+
+def _break_index(buffer: List[_Unit], fresh: int, total: int) -> int:
+    """
+    Where the next chunk should start: the last heading in the buffer's
+    second half, else the last paragraph start there, else the end.
+    Never inside the overlap (index > fresh), so every chunk makes progress.
+    """
+    best, best_kind = len(buffer), -1
+    before = total
+    for index in range(len(buffer) - 1, fresh, -1):
+        before -= buffer[index][2]
+        if before * 2 < total:
+            break
+        kind = buffer[index][3]
+        if kind > best_kind and kind > _LINE:
+            best, best_kind = index, kind
+            if kind == _HEADING:
+                break
+    return best
+
+
+def iter_chunk_tokens(
+    text: str,
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap: int = DEFAULT_OVERLAP_TOKENS,
+    count: Optional[Callable[[str], int]] = None
+) -> Iterator[Tuple[str, int]]:
+    """
+    Split text into chunks of at most ~max_tokens, as (chunk, tokens).
+
+    Args:
+        text: Document text
+        max_tokens: Tokens per chunk
+        overlap: Tokens of the previous chunk repeated at the start of the next
+        count: Token count of a text block (None = characters / 5)
+
+    Yields:
+        (chunk text, chunk tokens)
+
+    Raises:
+        ValueError: If overlap is not smaller than half of max_tokens
+    """
+    if max_tokens < 1:
+        raise ValueError(f"max_tokens must be >= 1, got {max_tokens}")
+    if not 0 <= overlap * 2 < max_tokens:
+        raise ValueError(f"overlap must be in [0, max_tokens / 2), got {overlap}")
+    if count is None:
+        count = HeuristicTokenCounter().measure
+
+    buffer: List[_Unit] = []
+    total = 0
+    # Leading buffer units repeated from the previous chunk
+    fresh = -1
+
+    def emit(cut: int) -> Tuple[str, int]:
+        nonlocal buffer, total, fresh
+        chunk = buffer[:cut]
+        chunk_tokens = sum(unit[2] for unit in chunk)
+
+        # Overlap: trailing units of this chunk, up to `overlap` tokens
+        start, kept = cut, 0
+        while start > fresh + 1 and kept + chunk[start - 1][2] <= overlap:
+            start -= 1
+            kept += chunk[start][2]
+
+        buffer = buffer[start:]
+        fresh = cut - start - 1
+        total -= chunk_tokens - kept
+        return chunk[0][1] + ''.join(sep + text for sep, text, _, _ in chunk[1:]), chunk_tokens
+
+    for unit in _iter_units(text, max_tokens, count):
+        tokens = unit[2]
+        # A break in the buffer's second half leaves fresh units behind: keep emitting
+        while total + tokens > max_tokens and len(buffer) > fresh + 1:
+            yield emit(_break_index(buffer, fresh, total))
+        if total + tokens > max_tokens and len(buffer) == fresh + 1:
+            # Only overlap left and still no room: drop it
+            buffer, total, fresh = [], 0, -1
+        buffer.append(unit)
+        total += tokens
+
+    if len(buffer) > fresh + 1:
+        yield emit(len(buffer))
+
+
+def iter_chunks(
+    text: str,
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap: int = DEFAULT_OVERLAP_TOKENS,
+    count: Optional[Callable[[str], int]] = None
+) -> Iterator[str]:
+    """
+    Split text into chunks of at most ~max_tokens (see iter_chunk_tokens).
+
+    Example:
+        >>> for chunk in iter_chunks(api_reference, max_tokens=8000):
+        ...     index(chunk)
+    """
+    for chunk, _ in iter_chunk_tokens(text, max_tokens, overlap, count):
+        yield chunk
+
+
+class DocumentSplitter:
+    """
+    Splits converted documents above a token threshold into part documents.
+
+    Parts are written next to the original (doc_0007_part01.txt, ...), each
+    with the page's metadata header; the original file is removed. Parts of
+    in-memory documents stay in memory.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_SPLIT_THRESHOLD,
+        max_tokens: int = DEFAULT_CHUNK_TOKENS,
+        overlap: int = DEFAULT_OVERLAP_TOKENS,
+        token_counter: Optional[TokenCounter] = None
+    ):
+        """
+        Args:
+            threshold: Documents with more tokens than this are split
+            max_tokens: Tokens per part (at most threshold)
+            overlap: Tokens repeated between consecutive parts (less than
+                half a part)
+            token_counter: Counts block tokens (None = characters / 5)
+
+        Raises:
+            ValueError: If threshold < 1
+        """
+        if threshold < 1:
+            raise ValueError(f"threshold must be >= 1, got {threshold}")
+        self.threshold = threshold
+        self.max_tokens = min(max_tokens, threshold)
+        self.overlap = min(overlap, (self.max_tokens - 1) // 2)
+        self.token_counter = token_counter or HeuristicTokenCounter()
+        self.documents_split = 0
+        self.parts = 0
+
+    def split(self, record: DocumentRecord) -> List[DocumentRecord]:
+        """
+        Split a document if it is above the threshold.
+
+        Args:
+            record: Converted document
+
+        Returns:
+            Part documents, or [record] if it is small enough
+        """
+        if record.tokens <= self.threshold:
+            return [record]
+
+        header, body = split_header(read_document(record))
+        header_tokens = self.token_counter.measure(header) if header else 0
+        chunks = iter_chunk_tokens(body, self.max_tokens, self.overlap, self.token_counter.measure)
+
+        parts = []
+        for number, (chunk, tokens) in enumerate(chunks, 1):
+            path = record.path.with_name(f"{record.path.stem}_part{number:02d}{record.path.suffix}")
+            document = header + chunk
+            save_document(path, document, record.in_memory)
+            parts.append(DocumentRecord.from_text(
+                path, record.url, f"{record.title} (part {number})", document, header_tokens + tokens,
+                record.in_memory
+            ))
+        record.path.unlink(missing_ok=True)
+
+        self.documents_split += 1
+        self.parts += len(parts)
+        print(f"📚 Split {record.name} into {len(parts)} parts ({record.tokens:,} tokens)")
+        return parts
+
+    def summary(self) -> Dict:
+        """Counts for logs and run output."""
+        return {'documents_split': self.documents_split, 'parts': self.parts}
@@ -0,0 +1,363 @@
+"""
+Raw Crawl Archive for Gemini Knowledge Scraper
+
+Streams the scraper's raw dataset items into a compressed JSONL archive in
+a named Apify Key-Value Store (one archive per corpus_name), so documents
+can be rebuilt and re-uploaded later without calling any scraper: when
+conversion rules change or an upload fails, re-indexing is CPU-only.
+
+Key functions:
+- Compressed, chunked JSONL records (gzip, or zstd with the `zstandard`
+  package); compression runs off the event loop
+- Tee: archives items while they stream into conversion
+- Generations: a new archive's chunks never overwrite the previous one's;
+  the index record is switched only once the new chunks are stored, and
+  only by a complete crawl (a crawl that ended early is kept beside the
+  previous complete archive, under the partial index)
+- Replay: streams archived items back, in crawl order
+
+Key-Value Store records:
+    archive-<corpus>                      index (JSON, see below)
+    archive-<corpus>-partial              index of a crawl that ended early
+                                          (while a complete archive exists)
+    archive-<corpus>-<generation>-00000   chunk 0 (compressed JSONL)
+    archive-<corpus>-<generation>-00001   chunk 1 ...
+
+Index format:
+    {
+        "corpus_name": "python-docs",
+        "generation": "20250101T000000000000",
+        "codec": "gzip",
+        "complete": true,
+        "items": 1250,
+        "raw_bytes": 98000000,
+        "compressed_bytes": 14000000,
+        "chunks": ["archive-python-docs-20250101T000000000000-00000", ...],
+        "created_at": "2025-01-01T00:00:00",
+        "scraper_used": "apify/website-content-crawler",
+        ...
+    }
+"""
+
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional
+from abc import ABC, abstractmethod
+from datetime import datetime
+import asyncio
+import gzip
+import json
+from .manifest import store_key
+
+# Named Key-Value Store (persists across runs, unlike the run's default store)
+ARCHIVE_STORE_NAME = 'gemini-file-search-archives'
+
+# Uncompressed JSONL bytes per chunk record (compressed HTML stays well
+# under the Key-Value Store's record size limit)
+DEFAULT_ARCHIVE_CHUNK_BYTES = 8 * 1024 * 1024
+
+DEFAULT_ARCHIVE_CODEC = 'gzip'
+
+# gzip level: 6 is zlib's default - most of level 9's ratio at a fraction of the CPU
+GZIP_LEVEL = 6
+
+ZSTD_LEVEL = 3
+
+
+class ArchiveCodec(ABC):
+    """Compression format of archive chunks."""
+
+    name = ''
+    content_type = 'application/octet-stream'
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress one chunk."""
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress one chunk."""
+
+
+class GzipCodec(ArchiveCodec):
+    """gzip (standard library)."""
+
+    name = 'gzip'
+    content_type = 'application/gzip'
+
+    def compress(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+
+
+class ZstdCodec(ArchiveCodec):
+    """Zstandard: faster and smaller than gzip (needs the `zstandard` package)."""
+
+    name = 'zstd'
+    content_type = 'application/zstd'
+
+    def __init__(self):
+        """
+        Raises:
+            ImportError: If zstandard is not installed
+        """
+        import zstandard
+
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        # Chunks are written whole, so the frame header carries the size
+        return self._decompressor.decompress(data)
+
+
+ARCHIVE_CODECS = {codec.name: codec for codec in (GzipCodec, ZstdCodec)}
+
+
+def get_archive_codec(name: Optional[str] = None) -> ArchiveCodec:
+    """
+    Create an archive codec (zstd falls back to gzip if zstandard is missing).
+
+    Args:
+        name: Codec name (None = DEFAULT_ARCHIVE_CODEC)
+
+    Returns:
+        ArchiveCodec instance
+
+    Raises:
+        ValueError: If no codec has that name
+    """
+    name = name or DEFAULT_ARCHIVE_CODEC
+    if name not in ARCHIVE_CODECS:
+        raise ValueError(f"Unknown archive codec '{name}' (available: {', '.join(ARCHIVE_CODECS)})")
+
+    try:
+        return ARCHIVE_CODECS[name]()
+    except ImportError as e:
+        print(f"⚠️  {name} unavailable ({e}) - archiving with {DEFAULT_ARCHIVE_CODEC}")
+        return ARCHIVE_CODECS[DEFAULT_ARCHIVE_CODEC]()
+
+
+def archive_key(corpus_name: str) -> str:
+    """Key-Value Store key of a corpus's archive index (chunk keys append -<generation>-NNNNN)."""
+    return store_key('archive', corpus_name, reserve=28)
+
+
+def partial_archive_key(corpus_name: str) -> str:
+    """Key-Value Store key of the index of a corpus's latest partial archive."""
+    return f"{archive_key(corpus_name)}-partial"
+
+
+async def load_archive_index(kv_store, corpus_name: str) -> Optional[Dict]:
+    """
+    Load a corpus's archive index.
+
+    Args:
+        kv_store: Apify Key-Value Store (Actor.open_key_value_store(name=ARCHIVE_STORE_NAME))
+        corpus_name: Knowledge base name
+
+    Returns:
+        Index dict, or None if the corpus was never archived
+    """
+    return await kv_store.get_value(archive_key(corpus_name))
+
+
+class CrawlArchive:
+    """
+    Writes raw dataset items to a compressed, chunked archive.
+
+    Example:
+        >>> archive = CrawlArchive(kv_store, 'python-docs', metadata={'scraper_used': scraper_id})
+        >>> async for item in archive.tee(dataset_items):
+        ...     convert(item)
+        >>> archive.summary()
+        {'items': 1250, 'chunks': 12, 'raw_bytes': ..., 'compressed_bytes': ...}
+    """
+
+    def __init__(
+        self,
+        kv_store,
+        corpus_name: str,
+        codec: Optional[ArchiveCodec] = None,
+        chunk_bytes: int = DEFAULT_ARCHIVE_CHUNK_BYTES,
+        metadata: Optional[Dict] = None
+    ):
+        """
+        Args:
+            kv_store: Apify Key-Value Store (named ARCHIVE_STORE_NAME)
+            corpus_name: Knowledge base name (one archive per corpus)
+            codec: Chunk compression (None = gzip)
+            chunk_bytes: Uncompressed JSONL bytes per chunk
+            metadata: Extra index fields (scraper_used, target, ...)
+
+        Raises:
+            ValueError: If chunk_bytes < 1
+        """
+        if chunk_bytes < 1:
+            raise ValueError(f"chunk_bytes must be >= 1, got {chunk_bytes}")
+
+        self.kv_store = kv_store
+        self.corpus_name = corpus_name
+        self.codec = codec or get_archive_codec()
+        self.chunk_bytes = chunk_bytes
+        self.metadata = metadata or {}
+        self.generation = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+
+        self._lines: List[bytes] = []
+        self._buffered = 0
+        self.chunks: List[str] = []
+        self.items = 0
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.closed = False
+
+    async def _write_chunk(self):
+        data = b''.join(self._lines)
+        self._lines, self._buffered = [], 0
+
+        # Compressing MBs takes long enough to stall the pipeline's event loop
+        compressed = await asyncio.to_thread(self.codec.compress, data)
+        key = f"{archive_key(self.corpus_name)}-{self.generation}-{len(self.chunks):05d}"
+        await self.kv_store.set_value(key, compressed, content_type=self.codec.content_type)
+
+        self.chunks.append(key)
+        self.raw_bytes += len(data)
+        self.compressed_bytes += len(compressed)
+
+    async def add(self, item: Dict):
+        """Archive one dataset item (a chunk is stored when the buffer fills)."""
+        line = json.dumps(item, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+        self._lines.append(line)
+        self._buffered += len(line)
+        self.items += 1
+        if self._buffered >= self.chunk_bytes:
+            await self._write_chunk()
+
+    async def close(self, complete: bool = True) -> Dict:
+        """
+        Store the last chunk and switch the index to this archive; the
+        replaced archive's chunks are deleted. Closing twice is a no-op.
+
+        A partial archive never replaces a complete one: it is indexed
+        under partial_archive_key() instead (replacing an older partial
+        archive), and the complete archive stays replayable.
+
+        Args:
+            complete: False if the crawl ended early (index is marked partial)
+
+        Returns:
+            Index dict
+        """
+        if self.closed:
+            return self.index(complete)
+        self.closed = True
+
+        if self._lines:
+            await self._write_chunk()
+
+        main_key = archive_key(self.corpus_name)
+        partial_key = partial_archive_key(self.corpus_name)
+        previous = await load_archive_index(self.kv_store, self.corpus_name)
+        previous_partial = await self.kv_store.get_value(partial_key)
+
+        index = self.index(complete)
+        if complete or not (previous and previous['complete']):
+            await self.kv_store.set_value(main_key, index)
+            replaced = [previous, previous_partial]
+            if previous_partial is not None:
+                await self.kv_store.delete_value(partial_key)
+        else:
+            await self.kv_store.set_value(partial_key, index)
+            replaced = [previous_partial]
+
+        for record in replaced:
+            for key in (record or {}).get('chunks', []):
+                if key not in self.chunks:
+                    await self.kv_store.delete_value(key)
+
+        print(f"🗄️  Archived {self.items} items: {self.raw_bytes / 1024 / 1024:.1f}MB → {self.compressed_bytes / 1024 / 1024:.1f}MB ({self.codec.name})")
+        return index
+
+    def index(self, complete: bool = True) -> Dict:
+        """Index record of this archive."""
+        return {
+            **self.metadata,
+            'corpus_name': self.corpus_name,
+            'generation': self.generation,
+            'codec': self.codec.name,
+            'complete': complete,
+            'items': self.items,
+            'raw_bytes': self.raw_bytes,
+            'compressed_bytes': self.compressed_bytes,
+            'chunks': self.chunks,
+            'created_at': datetime.now().isoformat()
+        }
+
+    async def tee(self, dataset_items: AsyncIterable[Dict]) -> AsyncIterator[Dict]:
+        """
+        Pass dataset items through, archiving each; the archive is closed
+        when the items run out.
+
+        Args:
+            dataset_items: Async iterator of dataset items
+
+        Yields:
+            The same items, unchanged
+        """
+        async for item in dataset_items:
+            await self.add(item)
+            yield item
+        await self.close()
+
+    def summary(self) -> Dict:
+        """Counts for logs and run output."""
+        return {
+            'items': self.items,
+            'chunks': len(self.chunks),
+            'raw_bytes': self.raw_bytes,
+            'compressed_bytes': self.compressed_bytes,
+            'codec': self.codec.name
+        }
+
+
+async def iterate_archived_items(kv_store, index: Dict) -> AsyncIterator[Dict]:
+    """
+    Stream a crawl archive's items back (crawl order).
+
+    The next chunk is fetched and decompressed while the current one's
+    items are being consumed.
+
+    Args:
+        kv_store: Apify Key-Value Store holding the archive
+        index: Archive index (load_archive_index)
+
+    Yields:
+        Dataset items, as the scraper wrote them
+
+    Raises:
+        ImportError: If the archive's codec needs a missing package
+        LookupError: If a chunk record is missing
+    """
+    codec = ARCHIVE_CODECS[index['codec']]()
+
+    async def fetch(key: str) -> bytes:
+        data = await kv_store.get_value(key)
+        if data is None:
+            raise LookupError(f"Archive chunk {key} is missing")
+        return await asyncio.to_thread(codec.decompress, data)
+
+    chunks = list(index['chunks'])
+    pending = asyncio.create_task(fetch(chunks[0])) if chunks else None
+    try:
+        for position in range(len(chunks)):
+            data = await pending
+            pending = asyncio.create_task(fetch(chunks[position + 1])) if position + 1 < len(chunks) else None
+            for line in data.splitlines():
+                if line:
+                    yield json.loads(line)
+    finally:
+        if pending is not None:
+            pending.cancel()
@@ -0,0 +1,150 @@
+"""
+Dataset Streaming Module for Gemini Knowledge Scraper
+
+Reads Apify datasets page-by-page instead of materializing them with a single
+list_items() call, so peak memory stays flat regardless of crawl size.
+
+Key functions:
+- Async generator over paginated dataset items
+- Live reader that follows a still-running scraper's dataset
+- Configurable page size (items fetched per API request)
+- Saved dataset files (JSON/JSONL exports, optionally gzipped) for
+  offline replays
+"""
+
+from typing import AsyncIterator, Dict, Iterator
+from pathlib import Path
+import asyncio
+import gzip
+import json
+
+# Items fetched per dataset API request. Scraped pages carry full HTML and
+# markdown, so keep pages small enough that one batch stays cheap in RAM.
+DEFAULT_PAGE_SIZE = 100
+
+# Seconds between checks for new items while a scraper is still running
+DEFAULT_FOLLOW_INTERVAL = 5.0
+
+# Apify run statuses after which no more items will be pushed
+TERMINAL_RUN_STATUSES = {'SUCCEEDED', 'FAILED', 'TIMED-OUT', 'ABORTED'}
+
+
+async def iterate_dataset_items(
+    dataset_client,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    offset: int = 0
+) -> AsyncIterator[Dict]:
+    """
+    Stream items from an Apify dataset one page at a time.
+
+    Only the current page is held in memory. Consumers can start processing
+    the first items as soon as the first batch arrives.
+
+    Args:
+        dataset_client: Async Apify dataset client (ApifyClientAsync.dataset(<id>))
+        page_size: Number of items fetched per request
+        offset: Index of the first item to read
+
+    Yields:
+        Dataset items (dicts), in dataset order
+
+    Example:
+        >>> dataset = apify_client.dataset(run['defaultDatasetId'])
+        >>> async for item in iterate_dataset_items(dataset, page_size=50):
+        ...     print(item['url'])
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be >= 1, got {page_size}")
+
+    while True:
+        page = await dataset_client.list_items(offset=offset, limit=page_size)
+        items = page.items
+
+        for item in items:
+            yield item
+
+        offset += len(items)
+
+        # Short page = end of dataset
+        if len(items) < page_size:
+            break
+
+
+async def iterate_run_dataset_items(
+    run_client,
+    dataset_client,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    follow_interval: float = DEFAULT_FOLLOW_INTERVAL
+) -> AsyncIterator[Dict]:
+    """
+    Stream items from the dataset of a scraper run that may still be running.
+
+    Items are yielded as soon as the scraper pushes them, so downstream
+    conversion overlaps with scraping. When the reader catches up with the
+    scraper it waits `follow_interval` seconds and checks again; once the run
+    reaches a terminal status the remaining items are drained and the stream
+    ends.
+
+    Args:
+        run_client: Async Apify run client (ApifyClientAsync.run(<run id>))
+        dataset_client: Async Apify dataset client for the run's default dataset
+        page_size: Number of items fetched per request
+        follow_interval: Seconds to wait for new items while the run is active
+
+    Yields:
+        Dataset items (dicts), in dataset order
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be >= 1, got {page_size}")
+
+    offset = 0
+    while True:
+        # Check status BEFORE reading: if the run was already finished, the
+        # read below is guaranteed to see every item it pushed
+        run = await run_client.get()
+        finished = run is None or run.get('status') in TERMINAL_RUN_STATUSES
+
+        async for item in iterate_dataset_items(dataset_client, page_size, offset):
+            yield item
+            offset += 1
+
+        if finished:
+            break
+
+        await asyncio.sleep(follow_interval)
+
+
+def read_dataset_file(path: Path) -> Iterator[Dict]:
+    """
+    Read dataset items from a saved export.
+
+    Accepts the formats Apify exports datasets in: a JSON array (.json) or
+    one item per line (.jsonl), either optionally gzipped (.gz). JSONL is
+    read line by line; a JSON array is loaded whole.
+
+    Args:
+        path: Dataset file
+
+    Yields:
+        Dataset items (dicts), in file order
+
+    Raises:
+        ValueError: If a .json file doesn't hold an array of items
+    """
+    path = Path(path)
+    suffixes = path.suffixes
+    opener = gzip.open if suffixes[-1:] == ['.gz'] else open
+    if suffixes[-1:] == ['.gz']:
+        suffixes = suffixes[:-1]
+
+    with opener(path, 'rt', encoding='utf-8') as f:
+        if suffixes[-1:] == ['.json']:
+            items = json.load(f)
+            if not isinstance(items, list):
+                raise ValueError(f"{path} is not a JSON array of dataset items")
+            yield from items
+            return
+
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -4,24 +4,60 @@ Document Conversion Module for Gemini Knowledge Scraper
 Converts scraped HTML/JSON data into clean text documents suitable for Gemini File Search.
 
 Key functions:
-- HTML → Text extraction (BeautifulSoup)
+- HTML → Text extraction (one parse per page, pluggable parser backend -
+  see html_backends.py)
+- Markdown/text passthrough (no HTML parsing - see output_adapters.py)
+- Noise removal in one tree walk (see noise_filter.py)
 - Metadata header generation (source, date, title)
 - Text cleaning (remove noise, normalize whitespace)
 - Document formatting for optimal RAG indexing
+- Parallel conversion across CPU cores (process pool, deterministic order)
+- Cross-page boilerplate removal (see boilerplate.py)
+- Near-duplicate page removal (MinHash/LSH - see near_dedup.py)
+- Per-document records (size, chars, tokens, hash) measured while
+  writing, so later stages never re-read documents (see document_record.py)
+- Exact duplicate removal before parsing (canonical URLs, content
+  hashes - see exact_dedup.py)
+- Structure-aware splitting of very long documents (see chunker.py)
 """
 
-from typing import Dict, List, Optional
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 from bs4 import BeautifulSoup
+import asyncio
+import math
+import multiprocessing
+import os
 import re
-
-
-def clean_html_text(html: str) -> str:
+from .manifest import ManifestTracker
+from .noise_filter import NoiseFilter
+from .html_backends import (
+    BeautifulSoupBackend,
+    ParserBackend,
+    get_parser_backend,
+    title_from_url
+)
+from .output_adapters import FieldResolver, OutputAdapter, DEFAULT_OUTPUT_ADAPTER
+from .near_dedup import MinHasher, NearDuplicateIndex
+from .boilerplate import BoilerplateFilter, Released
+from .exact_dedup import ExactDuplicateFilter
+from .token_counter import TokenCounter, get_token_counter
+from .document_record import Document, DocumentRecord, document_path, document_tokens, save_document, split_header
+from .chunker import DEFAULT_CHUNK_TOKENS, DEFAULT_OVERLAP_TOKENS, iter_chunks
+
+
+def clean_html_text(
+    html: str,
+    noise_filter: Optional[NoiseFilter] = None,
+    backend: Optional[ParserBackend] = None
+) -> str:
     """
-    Extract clean text from HTML using BeautifulSoup.
+    Extract clean text from HTML.
 
-    Removes:
+    Removes (see noise_filter.py):
     - Script tags
     - Style tags
     - Navigation elements
@@ -30,33 +66,14 @@ def clean_html_text(html: str) -> str:
 
     Args:
         html: Raw HTML string
+        noise_filter: Noise rules (None = defaults)
+        backend: Parser backend (None = BeautifulSoup)
 
     Returns:
         Clean text string with normalized whitespace
     """
-    # Parse HTML
-    soup = BeautifulSoup(html, 'lxml')
-
-    # Remove unwanted elements
-    for element in soup(['script', 'style', 'nav', 'footer', 'iframe', 'noscript']):
-        element.decompose()
-
-    # Remove common ad/tracking classes
-    ad_patterns = [
-        'advertisement', 'ads', 'ad-container', 'sponsored',
-        'tracking', 'analytics', 'cookie-banner', 'popup'
-    ]
-    for pattern in ad_patterns:
-        for element in soup.find_all(class_=re.compile(pattern, re.I)):
-            element.decompose()
-
-    # Extract text
-    text = soup.get_text(separator='\n', strip=True)
-
-    # Clean whitespace
-    text = normalize_whitespace(text)
-
-    return text
+    _, text = (backend or get_parser_backend()).extract(html, '', noise_filter=noise_filter)
+    return normalize_whitespace(text)
 
 
 def normalize_whitespace(text: str) -> str:
@@ -107,27 +124,7 @@ def extract_title(html: str, url: str) -> str:
     Returns:
         Page title
     """
-    soup = BeautifulSoup(html, 'lxml')
-
-    # Try <title>
-    if soup.title and soup.title.string:
-        return soup.title.string.strip()
-
-    # Try <h1>
-    h1 = soup.find('h1')
-    if h1:
-        return h1.get_text(strip=True)
-
-    # Try Open Graph title
-    og_title = soup.find('meta', property='og:title')
-    if og_title and og_title.get('content'):
-        return og_title['content'].strip()
-
-    # Fallback: URL basename
-    from urllib.parse import urlparse
-    path = urlparse(url).path
-    basename = path.rstrip('/').split('/')[-1]
-    return basename.replace('-', ' ').replace('_', ' ').title() if basename else 'Untitled'
+    return BeautifulSoupBackend.title(BeautifulSoup(html, 'lxml'), url)
 
 
 def create_metadata_header(
@@ -170,22 +167,35 @@ def convert_html_to_document(
     html: str,
     url: str,
     output_path: Path,
-    include_metadata: bool = True
+    include_metadata: bool = True,
+    main_content_only: bool = False,
+    noise_filter: Optional[NoiseFilter] = None,
+    backend: Optional[ParserBackend] = None
 ) -> Path:
     """
     Convert HTML to a clean text document suitable for Gemini indexing.
 
+    The page is parsed exactly once; title extraction, main-content
+    selection, noise removal and text extraction all run over that tree
+    (parsing dominates conversion CPU time).
+
     Workflow:
-    1. Extract title
-    2. Clean HTML → text
-    3. Add metadata header (if enabled)
-    4. Save to file
+    1. Parse HTML (parser backend)
+    2. Extract title
+    3. Select main content area (if enabled)
+    4. Clean → text
+    5. Add metadata header (if enabled)
+    6. Save to file
 
     Args:
         html: Raw HTML string
         url: Source URL
         output_path: Where to save the document
         include_metadata: Whether to add metadata header
+        main_content_only: Only keep the main content area
+            (<main>, <article>, content classes - see extract_main_content)
+        noise_filter: Noise rules (None = defaults)
+        backend: Parser backend (None = BeautifulSoup)
 
     Returns:
         Path to created document
@@ -193,46 +203,478 @@ def convert_html_to_document(
     Side effects:
         Creates file at output_path
     """
-    # Extract title
-    title = extract_title(html, url)
+    _, document = _render_html_document(html, url, include_metadata, main_content_only, noise_filter, backend)
+    save_document(output_path, document)
+    return output_path
+
+
+def _render_html_document(
+    html: str,
+    url: str,
+    include_metadata: bool = True,
+    main_content_only: bool = False,
+    noise_filter: Optional[NoiseFilter] = None,
+    backend: Optional[ParserBackend] = None
+) -> Tuple[str, str]:
+    """(title, document text) of an HTML page (see convert_html_to_document)."""
+    # Parse once: title, main content, noise removal, text
+    title, text = (backend or get_parser_backend()).extract(
+        html, url, main_content_only, noise_filter
+    )
 
-    # Clean HTML
-    clean_text = clean_html_text(html)
+    # Clean whitespace
+    clean_text = normalize_whitespace(text)
 
     # Build document
     if include_metadata:
-        header = create_metadata_header(url, title)
-        document = header + clean_text
-    else:
-        document = clean_text
+        return title, create_metadata_header(url, title) + clean_text
+    return title, clean_text
+
+
+def clean_markdown_text(text: str) -> str:
+    """
+    Light cleanup for markdown/plain text (no parsing).
+
+    Unlike normalize_whitespace, indentation and inner spacing are kept -
+    they carry structure in markdown (code blocks, nested lists, tables).
+
+    - Normalize line endings
+    - Strip trailing whitespace per line
+    - Collapse multiple blank lines (max 1)
 
-    # Save to file
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(document, encoding='utf-8')
+    Args:
+        text: Markdown or plain text
+
+    Returns:
+        Cleaned text
+    """
+    lines = [line.rstrip() for line in text.replace('\r\n', '\n').replace('\r', '\n').split('\n')]
+    text = '\n'.join(lines)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip('\n')
+
+
+def extract_markdown_title(text: str, url: str) -> str:
+    """
+    Page title of a markdown/text document.
+
+    Priority:
+    1. First markdown heading (# Title)
+    2. URL basename as fallback
+
+    Args:
+        text: Markdown or plain text
+        url: Source URL (for fallback)
+
+    Returns:
+        Page title
+    """
+    match = re.search(r'^#{1,6}[ \t]+(.+?)[ \t#]*$', text, re.M)
+    if match:
+        return match.group(1).strip()
+    return title_from_url(url)
 
+
+def convert_text_to_document(
+    text: str,
+    url: str,
+    output_path: Path,
+    title: Optional[str] = None,
+    include_metadata: bool = True
+) -> Path:
+    """
+    Convert scraped markdown/plain text to a document (no HTML parsing).
+
+    Scrapers that already extract page content (website-content-crawler's
+    markdown, AI scrapers' text) need no noise removal - parsing their
+    output as HTML only costs time and flattens markdown structure.
+
+    Args:
+        text: Markdown or plain text
+        url: Source URL
+        output_path: Where to save the document
+        title: Page title recorded by the scraper (None = first heading / URL)
+        include_metadata: Whether to add metadata header
+
+    Returns:
+        Path to created document
+
+    Side effects:
+        Creates file at output_path
+    """
+    _, document = _render_text_document(text, url, title, include_metadata)
+    save_document(output_path, document)
     return output_path
 
 
+def _render_text_document(
+    text: str,
+    url: str,
+    title: Optional[str] = None,
+    include_metadata: bool = True
+) -> Tuple[str, str]:
+    """(title, document text) of a markdown/text page (see convert_text_to_document)."""
+    clean_text = clean_markdown_text(text)
+    title = title or extract_markdown_title(clean_text, url)
+
+    if include_metadata:
+        return title, create_metadata_header(url, title) + clean_text
+    return title, clean_text
+
+
+def available_cpus() -> int:
+    """
+    CPU cores this process may use.
+
+    Honours CPU affinity and the cgroup v2 CPU quota (containers such as
+    Apify actors see every host core but are only allotted a share).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        quota, period = Path('/sys/fs/cgroup/cpu.max').read_text().split()
+        if quota != 'max':
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
+
+# Converter job for one page: (url, content, output_path, content_type, title)
+Page = Tuple[str, str, Path, str, Optional[str]]
+
+# Converter result: (document record, MinHash signature or None)
+Converted = Tuple[DocumentRecord, Optional[Tuple[int, ...]]]
+
+
+def _field_resolver(adapter: Optional[OutputAdapter], html_field: str) -> FieldResolver:
+    """Field resolver for one dataset (None = original html-first field order)."""
+    return (adapter or DEFAULT_OUTPUT_ADAPTER).resolver(html_field)
+
+
+def _resolve_item(
+    index: int,
+    item: Dict,
+    output_dir: Path,
+    url_field: str,
+    resolver: FieldResolver,
+    manifest: Optional[ManifestTracker],
+    duplicates: Optional[ExactDuplicateFilter] = None
+) -> Optional[Page]:
+    """
+    Pick a dataset item's URL, content and output path (cheap, no parsing).
+
+    Returns:
+        (url, content, output_path, content_type, title), or None if the
+        item has no content, duplicates an earlier item or is unchanged
+        since the previous run
+    """
+    url = item.get(url_field, f'unknown-{index}')
+
+    # Different scrapers use different fields (see output_adapters.py)
+    content = resolver.read(item)
+
+    if content is None:
+        print(f"⚠️  Skipping {url} - no content in any field (tried: {resolver.describe()})")
+        return None
+
+    content, content_type, title = content
+
+    # Same page under another URL spelling (or byte-identical): never parsed.
+    # Checked before the manifest so duplicates don't become manifest entries.
+    if duplicates is not None:
+        first = duplicates.check(url, content, content_type, item)
+        if first is not None:
+            print(f"🔁 Duplicate: {url} (of {first}) - skipped")
+            return None
+
+    # Incremental mode: unchanged pages are already indexed
+    if manifest is not None and not manifest.check(url, content):
+        return None
+
+    # Generate filename from index
+    return url, content, output_dir / f"doc_{index:04d}.txt", content_type, title
+
+
+# Token counter of a conversion pool worker (set by _init_conversion_worker)
+_worker_token_counter: Optional[TokenCounter] = None
+
+
+def _convert_page(
+    content: str,
+    url: str,
+    output_path: Path,
+    content_type: str = 'html',
+    title: Optional[str] = None,
+    noise_filter: Optional[NoiseFilter] = None,
+    backend: Optional[ParserBackend] = None,
+    hasher: Optional[MinHasher] = None,
+    token_counter: Optional[TokenCounter] = None,
+    in_memory: bool = False
+) -> Converted:
+    """
+    Convert one page (module-level so process pool workers can run it).
+
+    The document is measured (size, tokens, hash) from the text being
+    written, and with a hasher its MinHash signature is computed here too,
+    so the parent process never reads the file back. In memory, the
+    encoded text travels on the record and no file is written.
+    """
+    if content_type != 'html':
+        title, document = _render_text_document(content, url, title)
+    else:
+        title, document = _render_html_document(content, url, noise_filter=noise_filter, backend=backend)
+    save_document(output_path, document, in_memory)
+
+    if token_counter is None:
+        token_counter = _worker_token_counter
+    tokens = token_counter.count(document) if token_counter is not None else estimate_tokens(document)
+    record = DocumentRecord.from_text(output_path, url, title, document, tokens, in_memory)
+
+    signature = None
+    if hasher is not None:
+        signature = hasher.signature(split_header(document)[1])
+    return record, signature
+
+
+def _finish_document(
+    url: str,
+    converted: Converted,
+    manifest: Optional[ManifestTracker],
+    near_duplicates: Optional[NearDuplicateIndex] = None
+) -> Optional[DocumentRecord]:
+    """
+    Record a converted document (runs in the parent process).
+
+    Returns:
+        Document record, or None if the page was dropped as a near
+        duplicate (its file is deleted)
+    """
+    record, signature = converted
+
+    if near_duplicates is not None:
+        canonical = near_duplicates.add(url, signature)
+        if canonical is not None:
+            record.path.unlink(missing_ok=True)
+            print(f"♊ Near duplicate: {url} (of {canonical}) - skipped")
+            return None
+
+    if manifest is not None:
+        manifest.record_document(url, record.name)
+
+    print(f"✅ Converted: {url} → {record.name}")
+    return record
+
+
+def _boilerplate_released(
+    released: List[Released],
+    near_duplicates: Optional[NearDuplicateIndex],
+    token_counter: Optional[TokenCounter]
+) -> List[Tuple[str, Converted]]:
+    """
+    Documents released by the boilerplate filter, ready for _finish_document.
+
+    Near-duplicate signatures are computed here, over the stripped text
+    (shared boilerplate would make unrelated short pages look alike).
+    Records of rewritten documents are re-measured; documents left empty
+    are deleted.
+    """
+    ready = []
+    for url, record, header, body in released:
+        if not body.strip():
+            record.path.unlink(missing_ok=True)
+            print(f"🧹 Boilerplate only: {url} - skipped")
+            continue
+
+        document = header + body
+        if len(document) != record.chars:
+            tokens = token_counter.count(document) if token_counter is not None else estimate_tokens(document)
+            record = DocumentRecord.from_text(record.path, url, record.title, document, tokens, record.in_memory)
+
+        signature = near_duplicates.hasher.signature(body) if near_duplicates is not None else None
+        ready.append((url, (record, signature)))
+    return ready
+
+
+def _strip_boilerplate(
+    url: str,
+    converted: Converted,
+    boilerplate: Optional[BoilerplateFilter],
+    near_duplicates: Optional[NearDuplicateIndex],
+    token_counter: Optional[TokenCounter] = None
+) -> List[Tuple[str, Converted]]:
+    """Pass a converted page through the boilerplate filter (if any)."""
+    if boilerplate is None:
+        return [(url, converted)]
+    return _boilerplate_released(boilerplate.add(url, converted[0]), near_duplicates, token_counter)
+
+
+def _flush_boilerplate(
+    boilerplate: Optional[BoilerplateFilter],
+    near_duplicates: Optional[NearDuplicateIndex],
+    token_counter: Optional[TokenCounter] = None
+) -> List[Tuple[str, Converted]]:
+    """Pages still held back by the boilerplate filter (if any)."""
+    if boilerplate is None:
+        return []
+    return _boilerplate_released(boilerplate.flush(), near_duplicates, token_counter)
+
+
+def _worker_hasher(
+    near_duplicates: Optional[NearDuplicateIndex],
+    boilerplate: Optional[BoilerplateFilter]
+) -> Optional[MinHasher]:
+    """Hasher for conversion workers (None when signatures come after boilerplate removal)."""
+    if near_duplicates is None or boilerplate is not None:
+        return None
+    return near_duplicates.hasher
+
+
+def _init_conversion_worker(token_counter: Optional[TokenCounter]):
+    """Process pool initializer: install the worker's token counter."""
+    global _worker_token_counter
+    _worker_token_counter = token_counter
+
+
+def _conversion_executor(workers: int, token_counter: Optional[TokenCounter] = None) -> Optional[ProcessPoolExecutor]:
+    """
+    Process pool for `workers` > 1, None (run in the calling process/thread) otherwise.
+
+    Workers are spawned rather than forked: the actor's event loop and
+    client threads must not be duplicated into the children. Each worker
+    gets its own copy of token_counter once, at startup - tasks then leave
+    the counter out (see _convert_page), so its memo cache lasts as long as
+    the worker instead of being pickled afresh with every task.
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    if workers == 1:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_conversion_worker, initargs=(token_counter,)
+    )
+
+
+def convert_dataset_item(
+    index: int,
+    item: Dict,
+    output_dir: Path,
+    url_field: str = 'url',
+    html_field: str = 'html',
+    manifest: Optional[ManifestTracker] = None,
+    noise_filter: Optional[NoiseFilter] = None,
+    backend: Optional[ParserBackend] = None,
+    adapter: Optional[OutputAdapter] = None,
+    resolver: Optional[FieldResolver] = None,
+    near_duplicates: Optional[NearDuplicateIndex] = None,
+    duplicates: Optional[ExactDuplicateFilter] = None,
+    token_counter: Optional[TokenCounter] = None,
+    in_memory: bool = False
+) -> Optional[DocumentRecord]:
+    """
+    Convert a single Apify dataset item to a document.
+
+    Shared by the list-based and streaming dataset converters so both
+    produce identical output (same field fallbacks, same naming).
+
+    Args:
+        index: Position of the item in the dataset (used for the filename)
+        item: Dataset item dict
+        output_dir: Directory to save the document
+        url_field: Field name containing URL
+        html_field: Field name containing HTML
+        manifest: Incremental re-indexing tracker (None = convert everything)
+        noise_filter: Noise rules (None = defaults)
+        backend: Parser backend (None = BeautifulSoup)
+        adapter: Scraper output adapter (None = html-first field order)
+        resolver: Field resolver shared across a dataset's items
+            (None = a fresh one from adapter)
+        near_duplicates: Near-duplicate index shared across a dataset's
+            items (None = keep every page)
+        duplicates: Exact duplicate filter shared across a dataset's
+            items (None = keep every page)
+        token_counter: Counts the document's tokens (None = estimate_tokens)
+        in_memory: Keep the document on its record instead of writing it
+
+    Returns:
+        Record of the created document, or None if the item has no
+        content, is unchanged since the previous run or is a (near) duplicate
+    """
+    if resolver is None:
+        resolver = _field_resolver(adapter, html_field)
+
+    page = _resolve_item(index, item, output_dir, url_field, resolver, manifest, duplicates)
+    if page is None:
+        return None
+
+    url, content, output_path, content_type, title = page
+    hasher = near_duplicates.hasher if near_duplicates is not None else None
+    converted = _convert_page(
+        content, url, output_path, content_type, title, noise_filter, backend, hasher, token_counter, in_memory
+    )
+    return _finish_document(url, converted, manifest, near_duplicates)
+
+
 def convert_dataset_to_documents(
-    dataset_items: List[Dict],
+    dataset_items: Iterable[Dict],
     output_dir: Path,
     url_field: str = 'url',
-    html_field: str = 'html'
-) -> List[Path]:
+    html_field: str = 'html',
+    manifest: Optional[ManifestTracker] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    noise_filter: Optional[NoiseFilter] = None,
+    backend: Optional[ParserBackend] = None,
+    adapter: Optional[OutputAdapter] = None,
+    near_duplicates: Optional[NearDuplicateIndex] = None,
+    boilerplate: Optional[BoilerplateFilter] = None,
+    duplicates: Optional[ExactDuplicateFilter] = None,
+    token_counter: Optional[TokenCounter] = None,
+    in_memory: bool = False
+) -> List[DocumentRecord]:
     """
     Convert Apify dataset items to documents.
 
     Apify scrapers return datasets (list of dicts) with HTML/text content.
     This function converts each item to a clean text document.
 
+    With workers > 1, pages are farmed out to a process pool in chunks
+    (parsing is CPU-bound, so threads wouldn't help). Filenames come from
+    the dataset index and results are collected in submission order, so
+    output is identical to sequential conversion.
+
     Args:
-        dataset_items: List of items from Apify dataset
+        dataset_items: Items from Apify dataset (list or any iterable)
         output_dir: Directory to save documents
         url_field: Field name containing URL
         html_field: Field name containing HTML
+        manifest: Incremental re-indexing tracker - only new or changed
+            pages are converted (None = convert everything)
+        workers: Conversion processes (default: available CPUs, 1 = in-process)
+        chunk_size: Pages per task sent to a worker (default: ~4 chunks per worker)
+        noise_filter: Noise rules (None = defaults)
+        backend: Parser backend (None = BeautifulSoup)
+        adapter: Scraper output adapter - which fields hold content and
+            whether it is html, markdown or text (None = html first)
+        near_duplicates: Near-duplicate index - pages too similar to an
+            earlier page are dropped (None = keep every page)
+        boilerplate: Cross-page boilerplate filter - lines repeated on
+            most pages are stripped (None = keep every line)
+        duplicates: Exact duplicate filter - pages whose canonical URL or
+            content was already seen are skipped before parsing
+            (None = keep every page)
+        token_counter: Counts each document's tokens as it is written
+            (None = estimate_tokens)
+        in_memory: Keep documents on their records (encoded text) instead
+            of writing files - see gemini_uploader for streaming uploads
 
     Returns:
-        List of paths to created documents
+        Records of created documents (dataset order)
 
     Example dataset item:
         {
@@ -243,41 +685,221 @@ def convert_dataset_to_documents(
         }
     """
     output_dir.mkdir(parents=True, exist_ok=True)
-    created_docs = []
 
-    for i, item in enumerate(dataset_items):
-        url = item.get(url_field, f'unknown-{i}')
-
-        # Try multiple field names (different scrapers use different fields)
-        html = (
-            item.get(html_field, '') or           # Default field
-            item.get('html', '') or                # Standard HTML field
-            item.get('text', '') or                # Text content field
-            item.get('markdown', '') or            # Markdown field
-            item.get('content', '') or             # Generic content field
-            item.get('crawl', {}).get('html', '')  # Nested HTML field
+    if workers is None:
+        workers = available_cpus()
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+
+    resolver = _field_resolver(adapter, html_field)
+    pages = [
+        page for page in (
+            _resolve_item(i, item, output_dir, url_field, resolver, manifest, duplicates)
+            for i, item in enumerate(dataset_items)
+        )
+        if page is not None
+    ]
+    urls, contents, output_paths, content_types, titles = zip(*pages) if pages else ((),) * 5
+
+    hasher = _worker_hasher(near_duplicates, boilerplate)
+    executor = _conversion_executor(min(workers, max(len(pages), 1)), token_counter)
+    convert_page = partial(
+        _convert_page, noise_filter=noise_filter, backend=backend, hasher=hasher,
+        token_counter=token_counter if executor is None else None, in_memory=in_memory
+    )
+    if executor is None:
+        converted_pages = map(convert_page, contents, urls, output_paths, content_types, titles)
+    else:
+        if chunk_size is None:
+            chunk_size = max(1, len(pages) // (workers * 4))
+        converted_pages = executor.map(
+            convert_page, contents, urls, output_paths, content_types, titles,
+            chunksize=chunk_size
         )
 
-        if not html:
-            print(f"⚠️  Skipping {url} - no content in any field (tried: {html_field}, html, text, markdown, content, crawl.html)")
-            continue
+    def finish(ready):
+        for url, converted in ready:
+            record = _finish_document(url, converted, manifest, near_duplicates)
+            if record is not None:
+                created_docs.append(record)
 
-        # Generate filename from index
-        filename = f"doc_{i:04d}.txt"
-        output_path = output_dir / filename
+    created_docs = []
+    try:
+        for url, converted in zip(urls, converted_pages):
+            finish(_strip_boilerplate(url, converted, boilerplate, near_duplicates, token_counter))
+        finish(_flush_boilerplate(boilerplate, near_duplicates, token_counter))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    where = 'in memory' if in_memory else f"in {output_dir}"
+    print(f"\n📄 Created {len(created_docs)} documents {where}")
+    if duplicates is not None:
+        print(f"   Duplicates: {duplicates.summary()}")
+    if manifest is not None:
+        print(f"   Incremental: {manifest.summary()}")
+    if boilerplate is not None:
+        print(f"   Boilerplate: {boilerplate.summary()}")
+    if near_duplicates is not None:
+        print(f"   Near duplicates: {near_duplicates.summary()}")
+    return created_docs
 
-        # Convert
-        doc_path = convert_html_to_document(
-            html=html,
-            url=url,
-            output_path=output_path,
-            include_metadata=True
-        )
 
-        created_docs.append(doc_path)
-        print(f"✅ Converted: {url} → {filename}")
+async def iterate_converted_documents(
+    dataset_items: AsyncIterable[Dict],
+    output_dir: Path,
+    url_field: str = 'url',
+    html_field: str = 'html',
+    manifest: Optional[ManifestTracker] = None,
+    workers: int = 1,
+    noise_filter: Optional[NoiseFilter] = None,
+    backend: Optional[ParserBackend] = None,
+    adapter: Optional[OutputAdapter] = None,
+    near_duplicates: Optional[NearDuplicateIndex] = None,
+    boilerplate: Optional[BoilerplateFilter] = None,
+    duplicates: Optional[ExactDuplicateFilter] = None,
+    token_counter: Optional[TokenCounter] = None,
+    in_memory: bool = False
+) -> AsyncIterator[DocumentRecord]:
+    """
+    Convert a stream of dataset items, yielding documents in dataset order.
+
+    Items are submitted to the converter as they arrive; up to 2 × workers
+    conversions run ahead of the consumer. With workers > 1 they run in a
+    process pool, otherwise in a worker thread - either way parsing never
+    stalls the event loop.
+
+    Args:
+        dataset_items: Async iterator of dataset items
+        output_dir: Directory to save documents
+        url_field: Field name containing URL
+        html_field: Field name containing HTML
+        manifest: Incremental re-indexing tracker (None = convert everything)
+        workers: Conversion processes (1 = a single worker thread)
+        noise_filter: Noise rules (None = defaults)
+        backend: Parser backend (None = BeautifulSoup)
+        adapter: Scraper output adapter (None = html-first field order)
+        near_duplicates: Near-duplicate index (None = keep every page)
+        boilerplate: Cross-page boilerplate filter (None = keep every line)
+        duplicates: Exact duplicate filter (None = keep every page)
+        token_counter: Counts each document's tokens (None = estimate_tokens)
+        in_memory: Keep documents on their records instead of writing files
+
+    Yields:
+        Records of created documents (dataset order)
+    """
+    loop = asyncio.get_running_loop()
+    executor = _conversion_executor(workers, token_counter)
+    # Pool workers already hold the counter (see _conversion_executor)
+    task_counter = token_counter if executor is None else None
+    in_flight: asyncio.Queue = asyncio.Queue(maxsize=2 * workers)
+    resolver = _field_resolver(adapter, html_field)
+    hasher = _worker_hasher(near_duplicates, boilerplate)
+
+    async def submit():
+        try:
+            index = 0
+            async for item in dataset_items:
+                page = _resolve_item(index, item, output_dir, url_field, resolver, manifest, duplicates)
+                index += 1
+                if page is not None:
+                    url, content, output_path, content_type, title = page
+                    future = loop.run_in_executor(
+                        executor, _convert_page, content, url, output_path,
+                        content_type, title, noise_filter, backend, hasher, task_counter, in_memory
+                    )
+                    await in_flight.put((url, future))
+            await in_flight.put(None)
+        except Exception as e:
+            await in_flight.put(e)
+
+    submitter = asyncio.create_task(submit())
+    try:
+        while True:
+            entry = await in_flight.get()
+            if entry is None:
+                break
+            if isinstance(entry, Exception):
+                raise entry
+
+            url, future = entry
+            for url, converted in _strip_boilerplate(url, await future, boilerplate, near_duplicates, token_counter):
+                record = _finish_document(url, converted, manifest, near_duplicates)
+                if record is not None:
+                    yield record
+
+        for url, converted in _flush_boilerplate(boilerplate, near_duplicates, token_counter):
+            record = _finish_document(url, converted, manifest, near_duplicates)
+            if record is not None:
+                yield record
+    finally:
+        submitter.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def convert_dataset_stream_to_documents(
+    dataset_items: AsyncIterable[Dict],
+    output_dir: Path,
+    url_field: str = 'url',
+    html_field: str = 'html',
+    manifest: Optional[ManifestTracker] = None,
+    workers: int = 1,
+    noise_filter: Optional[NoiseFilter] = None,
+    backend: Optional[ParserBackend] = None,
+    adapter: Optional[OutputAdapter] = None,
+    near_duplicates: Optional[NearDuplicateIndex] = None,
+    boilerplate: Optional[BoilerplateFilter] = None,
+    duplicates: Optional[ExactDuplicateFilter] = None,
+    token_counter: Optional[TokenCounter] = None,
+    in_memory: bool = False
+) -> List[DocumentRecord]:
+    """
+    Convert a streamed Apify dataset to documents.
 
-    print(f"\n📄 Created {len(created_docs)} documents in {output_dir}")
+    Async counterpart of convert_dataset_to_documents for use with
+    dataset_reader.iterate_dataset_items(). Each item is converted as soon
+    as it arrives and then dropped, so only one dataset page is in memory.
+    Conversion runs in a worker thread (or process pool, workers > 1) so
+    parsing never stalls the event loop.
+
+    Args:
+        dataset_items: Async iterator of dataset items
+        output_dir: Directory to save documents
+        url_field: Field name containing URL
+        html_field: Field name containing HTML
+        manifest: Incremental re-indexing tracker (None = convert everything)
+        workers: Conversion processes (1 = a single worker thread)
+        noise_filter: Noise rules (None = defaults)
+        backend: Parser backend (None = BeautifulSoup)
+        adapter: Scraper output adapter (None = html-first field order)
+        near_duplicates: Near-duplicate index (None = keep every page)
+        boilerplate: Cross-page boilerplate filter (None = keep every line)
+        duplicates: Exact duplicate filter (None = keep every page)
+        token_counter: Counts each document's tokens (None = estimate_tokens)
+        in_memory: Keep documents on their records instead of writing files
+
+    Returns:
+        Records of created documents (dataset order)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    created_docs = [
+        record async for record in iterate_converted_documents(
+            dataset_items, output_dir, url_field, html_field, manifest, workers,
+            noise_filter, backend, adapter, near_duplicates, boilerplate, duplicates, token_counter, in_memory
+        )
+    ]
+
+    where = 'in memory' if in_memory else f"in {output_dir}"
+    print(f"\n📄 Created {len(created_docs)} documents {where}")
+    if duplicates is not None:
+        print(f"   Duplicates: {duplicates.summary()}")
+    if manifest is not None:
+        print(f"   Incremental: {manifest.summary()}")
+    if boilerplate is not None:
+        print(f"   Boilerplate: {boilerplate.summary()}")
+    if near_duplicates is not None:
+        print(f"   Near duplicates: {near_duplicates.summary()}")
     return created_docs
 
 
@@ -285,6 +907,9 @@ def estimate_tokens(text: str) -> int:
     """
     Estimate token count for text (rough approximation).
 
+    Fast heuristic for chunking decisions; cost estimates use a
+    TokenCounter (see token_counter.py).
+
     Rule of thumb:
     - English: ~4 characters per token
     - Technical docs: ~5 characters per token (more jargon)
@@ -299,7 +924,7 @@ def estimate_tokens(text: str) -> int:
     return len(text) // 5
 
 
-def calculate_indexing_cost(documents: List[Path]) -> float:
+def calculate_indexing_cost(documents: List[Document], counter: Optional[TokenCounter] = None) -> float:
     """
     Calculate estimated Gemini indexing cost.
 
@@ -307,24 +932,28 @@ def calculate_indexing_cost(documents: List[Path]) -> float:
     - Indexing: $0.15 per 1M tokens (one-time)
 
     Args:
-        documents: List of document paths
+        documents: Document records (token counts taken as recorded at
+            conversion) or paths (read and counted)
+        counter: Token counter for paths (None = DEFAULT_TOKEN_COUNTER).
+            Pass the uploader's counter to reuse its memoized counts.
 
     Returns:
         Estimated cost in USD
     """
-    total_tokens = 0
+    if counter is None:
+        counter = get_token_counter()
 
-    for doc_path in documents:
-        text = doc_path.read_text(encoding='utf-8')
-        tokens = estimate_tokens(text)
-        total_tokens += tokens
+    recorded = [document_tokens(doc) for doc in documents]
+    unrecorded = [document_path(doc) for doc, tokens in zip(documents, recorded) if tokens is None]
+    total_tokens = sum(tokens for tokens in recorded if tokens is not None)
+    total_tokens += sum(counter.count_documents(unrecorded))
 
     # Calculate cost
     cost_per_million = 0.15
     cost = (total_tokens / 1_000_000) * cost_per_million
 
     print(f"\n💰 Indexing cost estimate:")
-    print(f"   Total tokens: {total_tokens:,}")
+    print(f"   Total tokens: {total_tokens:,} ({counter.name})")
     print(f"   Cost: ${cost:.4f} (${cost_per_million}/1M tokens)")
 
     return cost
@@ -351,25 +980,10 @@ def extract_main_content(html: str) -> str:
     """
     soup = BeautifulSoup(html, 'lxml')
 
-    # Try semantic tags
-    main = soup.find('main')
-    if main:
+    main = BeautifulSoupBackend.main_content(soup)
+    if main is not None:
         return str(main)
 
-    article = soup.find('article')
-    if article:
-        return str(article)
-
-    # Try common content class names
-    content_patterns = [
-        'content', 'main-content', 'article-content',
-        'post-content', 'entry-content', 'documentation'
-    ]
-    for pattern in content_patterns:
-        content = soup.find(class_=re.compile(pattern, re.I))
-        if content:
-            return str(content)
-
     # Fallback: body
     body = soup.find('body')
     return str(body) if body else html
@@ -377,14 +991,16 @@ def extract_main_content(html: str) -> str:
 
 def split_long_document(
     text: str,
-    max_tokens: int = 10000,
-    overlap: int = 500
+    max_tokens: int = DEFAULT_CHUNK_TOKENS,
+    overlap: int = DEFAULT_OVERLAP_TOKENS
 ) -> List[str]:
     """
     Split a long document into chunks (if needed for very large docs).
 
     Gemini File Search handles chunking automatically, but for very large
-    documents (>50K tokens), pre-splitting can improve quality.
+    documents (>50K tokens), pre-splitting can improve quality. Chunks break
+    at headings, then paragraphs (see chunker.py); conversion splits
+    oversized documents itself with DocumentSplitter.
 
     Args:
         text: Input text
@@ -400,40 +1016,6 @@ def split_long_document(
     if estimated_tokens <= max_tokens:
         return [text]
 
-    # Split on paragraphs (preserves structure)
-    paragraphs = text.split('\n\n')
-
-    chunks = []
-    current_chunk = []
-    current_tokens = 0
-
-    for para in paragraphs:
-        para_tokens = estimate_tokens(para)
-
-        if current_tokens + para_tokens > max_tokens and current_chunk:
-            # Save current chunk
-            chunks.append('\n\n'.join(current_chunk))
-
-            # Start new chunk with overlap (last few paragraphs)
-            overlap_paras = []
-            overlap_tokens = 0
-            for prev_para in reversed(current_chunk):
-                prev_tokens = estimate_tokens(prev_para)
-                if overlap_tokens + prev_tokens <= overlap:
-                    overlap_paras.insert(0, prev_para)
-                    overlap_tokens += prev_tokens
-                else:
-                    break
-
-            current_chunk = overlap_paras
-            current_tokens = overlap_tokens
-
-        current_chunk.append(para)
-        current_tokens += para_tokens
-
-    # Add final chunk
-    if current_chunk:
-        chunks.append('\n\n'.join(current_chunk))
-
+    chunks = list(iter_chunks(text, max_tokens, overlap))
     print(f"📚 Split document into {len(chunks)} chunks ({estimated_tokens:,} tokens)")
     return chunks
@@ -0,0 +1,208 @@
+"""
+Document Packing for Gemini Knowledge Scraper
+
+Every document costs an upload round trip plus an import operation, and
+most docs pages are only a few KB. Packing bundles many small page
+documents into fewer, larger upload documents, cutting Phase 4 from
+thousands of API operations to dozens.
+
+Each page keeps its metadata header (Source/Title) inside the pack, so
+retrieved chunks still cite the original URL.
+
+Key functions:
+- Best-fit bin packing by size (and optionally tokens): each page goes to
+  the fullest open pack it fits in
+- Streaming: a bounded number of packs stay open; the fullest is closed
+  when another one is needed
+- Offline: best-fit decreasing over a complete list (fewest packs)
+- Pages larger than the target are passed through unpacked
+"""
+
+from typing import Dict, Iterable, List, Optional
+from pathlib import Path
+from .document_record import DocumentRecord, read_document, save_document
+
+# Pack size target (bytes) - well under Gemini's per-file limit, small enough
+# that a failed import only re-uploads a little
+DEFAULT_PACK_BYTES = 512 * 1024
+
+# Packs open at once while streaming (more = fuller packs, later uploads)
+DEFAULT_OPEN_PACKS = 8
+
+# Packs this close to the target (fraction) are closed right away
+DEFAULT_CLOSE_SLACK = 0.02
+
+# Between pages in a pack (each page starts with its own metadata header)
+PAGE_SEPARATOR = '\n\n'
+
+
+class _Pack:
+    """An open pack: page records and totals."""
+
+    __slots__ = ('records', 'size', 'tokens')
+
+    def __init__(self):
+        self.records: List[DocumentRecord] = []
+        self.size = 0
+        self.tokens = 0
+
+
+class DocumentPacker:
+    """
+    Bundles small page documents into larger upload documents.
+
+    Example:
+        >>> packer = DocumentPacker(output_dir, max_bytes=256 * 1024)
+        >>> for record in converted:
+        ...     for document in packer.add(record):
+        ...         upload(document)
+        >>> for document in packer.flush():
+        ...     upload(document)
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        max_bytes: int = DEFAULT_PACK_BYTES,
+        max_tokens: Optional[int] = None,
+        open_packs: Optional[int] = DEFAULT_OPEN_PACKS
+    ):
+        """
+        Args:
+            output_dir: Directory for packed documents
+            max_bytes: Pack size target in bytes
+            max_tokens: Pack token target (None = size only)
+            open_packs: Packs open at once (None = unlimited, for offline packing)
+
+        Raises:
+            ValueError: If a target or open_packs is < 1
+        """
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be >= 1, got {max_bytes}")
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError(f"max_tokens must be >= 1, got {max_tokens}")
+        if open_packs is not None and open_packs < 1:
+            raise ValueError(f"open_packs must be >= 1, got {open_packs}")
+
+        self.output_dir = output_dir
+        self.max_bytes = max_bytes
+        self.max_tokens = max_tokens
+        self.open_packs = open_packs
+
+        self._open: List[_Pack] = []
+        self._written = 0
+        # Pack filename -> page URLs (run output)
+        self.packs: Dict[str, List[str]] = {}
+        self.pages = 0
+        self.unpacked = 0
+
+    def _fits(self, pack: _Pack, record: DocumentRecord) -> bool:
+        size = pack.size + len(PAGE_SEPARATOR) + record.size
+        if size > self.max_bytes:
+            return False
+        return self.max_tokens is None or pack.tokens + record.tokens <= self.max_tokens
+
+    def _full(self, pack: _Pack) -> bool:
+        return pack.size >= self.max_bytes * (1 - DEFAULT_CLOSE_SLACK)
+
+    def _close(self, pack: _Pack) -> DocumentRecord:
+        """Write a pack (single-page packs are left as they are; in-memory pages make in-memory packs)."""
+        self._open.remove(pack)
+        if len(pack.records) == 1:
+            return pack.records[0]
+
+        first = pack.records[0]
+        text = PAGE_SEPARATOR.join(read_document(record) for record in pack.records)
+        path = self.output_dir / f"pack_{self._written:04d}.txt"
+        self._written += 1
+        save_document(path, text, first.in_memory)
+        for record in pack.records:
+            record.path.unlink(missing_ok=True)
+
+        self.packs[path.name] = [record.url for record in pack.records]
+        return DocumentRecord.from_text(
+            path, first.url, f"{first.title} (+{len(pack.records) - 1} pages)", text, pack.tokens, first.in_memory
+        )
+
+    def add(self, record: DocumentRecord) -> List[DocumentRecord]:
+        """
+        Place a page document in a pack.
+
+        Args:
+            record: Converted page document
+
+        Returns:
+            Documents ready for upload: closed packs, or the page itself if
+            it is larger than the target
+        """
+        self.pages += 1
+        too_big = record.size > self.max_bytes or (self.max_tokens is not None and record.tokens > self.max_tokens)
+        if too_big:
+            self.unpacked += 1
+            return [record]
+
+        # Best fit: the fullest open pack with room
+        candidates = [pack for pack in self._open if self._fits(pack, record)]
+        ready = []
+        if candidates:
+            pack = max(candidates, key=lambda pack: pack.size)
+        else:
+            if self.open_packs is not None and len(self._open) >= self.open_packs:
+                ready.append(self._close(max(self._open, key=lambda pack: pack.size)))
+            pack = _Pack()
+            self._open.append(pack)
+
+        pack.size += (len(PAGE_SEPARATOR) if pack.records else 0) + record.size
+        pack.tokens += record.tokens
+        pack.records.append(record)
+
+        if self._full(pack):
+            ready.append(self._close(pack))
+        return ready
+
+    def flush(self) -> List[DocumentRecord]:
+        """
+        Close all open packs.
+
+        Returns:
+            Remaining documents ready for upload
+        """
+        return [self._close(pack) for pack in list(self._open)]
+
+    def summary(self) -> Dict:
+        """Counts for logs and run output."""
+        packed = sum(len(urls) for urls in self.packs.values())
+        return {
+            'pages': self.pages,
+            'packs': len(self.packs),
+            'pages_packed': packed,
+            'documents': self.pages - packed + len(self.packs)
+        }
+
+
+def pack_documents(
+    records: Iterable[DocumentRecord],
+    output_dir: Path,
+    max_bytes: int = DEFAULT_PACK_BYTES,
+    max_tokens: Optional[int] = None
+) -> List[DocumentRecord]:
+    """
+    Pack a complete list of page documents (best-fit decreasing).
+
+    Args:
+        records: Converted page documents
+        output_dir: Directory for packed documents
+        max_bytes: Pack size target in bytes
+        max_tokens: Pack token target (None = size only)
+
+    Returns:
+        Documents to upload (packs and oversized pages)
+    """
+    packer = DocumentPacker(output_dir, max_bytes, max_tokens, open_packs=None)
+    documents = []
+    for record in sorted(records, key=lambda record: record.size, reverse=True):
+        documents += packer.add(record)
+    documents += packer.flush()
+
+    print(f"📦 Packed: {packer.summary()}")
+    return documents
@@ -0,0 +1,159 @@
+"""
+Per-Document Records for Gemini Knowledge Scraper
+
+The converter already holds each document's text when it writes it, so it
+measures it there: byte size, character count, token estimate and content
+hash travel with the document through cost estimation, upload and run
+output, instead of every later stage re-reading or stat()ing the file.
+
+In zero-disk mode the record also carries the encoded document itself and
+no file is written: the uploader streams the bytes straight to Gemini.
+
+Key functions:
+- DocumentRecord: compact (__slots__) record of one converted document
+- Record built from in-memory document text (no disk access)
+- In-memory documents (encoded bytes on the record, no file)
+- Path/size helpers for stages that accept plain paths too
+- Metadata header / body split of document text
+"""
+
+from typing import Dict, Optional, Tuple, Union
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+import os
+from .manifest import content_hash
+
+
+@dataclass(slots=True)
+class DocumentRecord:
+    """
+    One converted document.
+
+    Example:
+        >>> record = DocumentRecord.from_text(path, url, title, document, tokens=812)
+        >>> record.size, record.name
+        (4096, 'doc_0003.txt')
+    """
+
+    path: Path
+    url: str
+    title: str
+    size: int
+    chars: int
+    tokens: int
+    content_hash: str
+    # UTF-8 document text for in-memory documents (None = read from path)
+    data: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_text(
+        cls,
+        path: Path,
+        url: str,
+        title: str,
+        document: str,
+        tokens: int,
+        in_memory: bool = False
+    ) -> 'DocumentRecord':
+        """
+        Record for a document written from `document` (sizes measured in memory).
+
+        Args:
+            path: Document file (in memory: only its name is used)
+            url: Source page URL
+            title: Page title
+            document: Full document text as written (header included)
+            tokens: Token estimate of the document
+            in_memory: Keep the encoded text on the record (no file needed)
+
+        Returns:
+            DocumentRecord
+        """
+        data = document.encode('utf-8')
+        return cls(
+            path=path,
+            url=url,
+            title=title,
+            size=len(data),
+            chars=len(document),
+            tokens=tokens,
+            content_hash=content_hash(document),
+            data=data if in_memory else None
+        )
+
+    @property
+    def in_memory(self) -> bool:
+        """True if the document text is held on the record."""
+        return self.data is not None
+
+    @property
+    def name(self) -> str:
+        """Document filename (upload display name)."""
+        return self.path.name
+
+    def __fspath__(self) -> str:
+        return os.fspath(self.path)
+
+    def without_data(self) -> 'DocumentRecord':
+        """Copy without the in-memory text (for bookkeeping that outlives the upload)."""
+        return self if self.data is None else replace(self, data=None)
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form (run output)."""
+        return {
+            'name': self.name,
+            'url': self.url,
+            'title': self.title,
+            'size': self.size,
+            'chars': self.chars,
+            'tokens': self.tokens,
+            'content_hash': self.content_hash
+        }
+
+
+def split_header(document: str) -> Tuple[str, str]:
+    """(metadata header, body) of a converted document (header '' if none)."""
+    if document.startswith('---\n'):
+        header, sep, body = document.partition('---\n\n')
+        if sep:
+            return header + sep, body
+    return '', document
+
+
+# A stage's document input: a record from the converter, or a bare path
+Document = Union[DocumentRecord, Path]
+
+
+def document_path(document: Document) -> Path:
+    """File path of a record or path."""
+    return document.path if isinstance(document, DocumentRecord) else document
+
+
+def document_size(document: Document) -> int:
+    """Byte size of a document (stat() only for bare paths)."""
+    return document.size if isinstance(document, DocumentRecord) else document.stat().st_size
+
+
+def document_tokens(document: Document) -> Optional[int]:
+    """Token estimate recorded at conversion (None for bare paths)."""
+    return document.tokens if isinstance(document, DocumentRecord) else None
+
+
+def document_data(document: Document) -> Optional[bytes]:
+    """Encoded text of an in-memory document (None if it lives on disk)."""
+    return document.data if isinstance(document, DocumentRecord) else None
+
+
+def read_document(document: Document) -> str:
+    """Text of a document, from memory or its file."""
+    data = document_data(document)
+    if data is not None:
+        return data.decode('utf-8')
+    return document_path(document).read_text(encoding='utf-8')
+
+
+def save_document(path: Path, document: str, in_memory: bool = False):
+    """Write document text to its file (nothing to do for in-memory documents)."""
+    if not in_memory:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(document, encoding='utf-8')
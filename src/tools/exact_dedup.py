@@ -0,0 +1,208 @@
+"""
+Exact Duplicate Removal for Gemini Knowledge Scraper
+
+Scrapers often return the same page several times: with tracking
+parameters (?utm_source=...), with and without a trailing slash, with
+#anchors, or under an alias that declares <link rel="canonical">. Each
+copy used to be parsed, written and uploaded. This module drops them
+before conversion, from the URL and raw content alone (no parsing).
+
+Key functions:
+- URL normalization (scheme/host case, default ports, fragments,
+  tracking parameters, query order, trailing slashes, index pages)
+- Canonical URL from <link rel="canonical"> (regex over the page head)
+  or the scraper's metadata.canonicalUrl
+- Content hash set for byte-identical pages under unrelated URLs
+- Dropped URLs reported with the page they duplicate
+"""
+
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+import re
+from .manifest import content_hash
+from .output_adapters import get_field
+
+# Query parameters that never change page content (generic names like
+# ref/source are left alone: docs sites use ?ref=main, ?source=v2 to pick
+# a branch or version)
+TRACKING_PARAMS = frozenset({
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'ref_src', 'spm'
+})
+TRACKING_PREFIXES = ('utm_',)
+
+# Path basenames served identically to their directory
+INDEX_PAGES = frozenset({'index.html', 'index.htm', 'index.php', 'default.aspx'})
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# <link rel="canonical"> is in <head>; don't scan whole pages for it
+CANONICAL_SCAN_BYTES = 65536
+
+_LINK_TAG = re.compile(r'<link\b[^>]*>', re.I)
+_REL_CANONICAL = re.compile(r'''\brel\s*=\s*["']?[^"'>]*\bcanonical\b''', re.I)
+_HREF = re.compile(r'''\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''', re.I)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings compare equal.
+
+    - Lowercase scheme and host, drop default ports
+    - Drop the #fragment
+    - Drop tracking parameters (utm_*, gclid, fbclid, ...), sort the rest
+    - Drop index.html-style basenames and trailing slashes (except root)
+
+    Args:
+        url: Page URL
+
+    Returns:
+        Normalized URL (unparseable input is returned stripped)
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{port}'
+
+    path = parts.path or '/'
+    segments = path.split('/')
+    if segments[-1].lower() in INDEX_PAGES:
+        segments[-1] = ''
+    path = '/'.join(segments)
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ))
+
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def find_canonical_link(html: str, url: str) -> Optional[str]:
+    """
+    href of the page's <link rel="canonical">, resolved against its URL.
+
+    Scans only the first CANONICAL_SCAN_BYTES characters (the <head>).
+
+    Args:
+        html: Raw HTML
+        url: Page URL (base for relative links)
+
+    Returns:
+        Absolute canonical URL, or None
+    """
+    head = html[:CANONICAL_SCAN_BYTES]
+    for tag in _LINK_TAG.findall(head):
+        if not _REL_CANONICAL.search(tag):
+            continue
+        href = _HREF.search(tag)
+        if href:
+            value = next(group for group in href.groups() if group is not None).strip()
+            if value:
+                return urljoin(url, value)
+    return None
+
+
+def canonical_url(url: str, content: str = '', content_type: str = 'html', item: Optional[Dict] = None) -> str:
+    """
+    Normalized canonical URL of a scraped page.
+
+    Declared canonicals (scraper metadata.canonicalUrl, then
+    <link rel="canonical">) are honoured only on the same host, and not
+    when they point a deeper page at the site root (a common CMS
+    misconfiguration that would merge the whole site into one page).
+
+    Args:
+        url: Page URL
+        content: Raw page content
+        content_type: 'html', 'markdown' or 'text'
+        item: Dataset item (for metadata.canonicalUrl)
+
+    Returns:
+        Normalized URL
+    """
+    own = normalize_url(url)
+
+    declared = get_field(item, 'metadata.canonicalUrl') if item else None
+    if not (declared and isinstance(declared, str)) and content_type == 'html':
+        declared = find_canonical_link(content, url)
+    if not declared:
+        return own
+
+    canonical = normalize_url(urljoin(url, declared))
+    own_parts, canonical_parts = urlsplit(own), urlsplit(canonical)
+    if canonical_parts.netloc != own_parts.netloc:
+        return own
+    if canonical_parts.path == '/' and own_parts.path != '/':
+        return own
+    return canonical
+
+
+class ExactDuplicateFilter:
+    """
+    Drops pages already seen in this run, by canonical URL or content hash.
+
+    Example:
+        >>> duplicates = ExactDuplicateFilter()
+        >>> duplicates.check('https://a.com/docs/', html)
+        None
+        >>> duplicates.check('https://a.com/docs?utm_source=x#intro', html)
+        'https://a.com/docs/'
+    """
+
+    def __init__(self):
+        self._urls: Dict[str, str] = {}
+        self._hashes: Dict[str, str] = {}
+        self.duplicates: List[Dict] = []
+
+    def check(
+        self,
+        url: str,
+        content: str,
+        content_type: str = 'html',
+        item: Optional[Dict] = None
+    ) -> Optional[str]:
+        """
+        Check a page before conversion, remembering it if new.
+
+        Args:
+            url: Page URL
+            content: Raw page content
+            content_type: 'html', 'markdown' or 'text'
+            item: Dataset item (for scraper canonical metadata)
+
+        Returns:
+            URL of the earlier page this one duplicates, or None if new
+        """
+        canonical = canonical_url(url, content, content_type, item)
+        first = self._urls.get(canonical)
+        if first is not None:
+            self.duplicates.append({'url': url, 'duplicate_of': first, 'reason': 'url'})
+            return first
+
+        digest = content_hash(content)
+        first = self._hashes.get(digest)
+        if first is not None:
+            self.duplicates.append({'url': url, 'duplicate_of': first, 'reason': 'content'})
+            return first
+
+        self._urls[canonical] = url
+        self._hashes[digest] = url
+        return None
+
+    def summary(self) -> Dict:
+        """Counts for logs and run output."""
+        reasons = [duplicate['reason'] for duplicate in self.duplicates]
+        return {
+            'unique': len(self._urls),
+            'same_url': reasons.count('url'),
+            'same_content': reasons.count('content')
+        }
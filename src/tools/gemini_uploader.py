@@ -6,8 +6,15 @@ NOT basic File API (which deletes after 48 hours)
 
 Key functions:
 - Create File Search Store (persistent container)
-- Upload documents to store
+- Upload documents to store (from files, or streamed from memory for
+  in-memory document records - no disk reads)
 - Wait for import completion
+- Rate limiting + retries for transient API errors (failed imports are
+  re-queued, slow ones polled again, then dead-lettered instead of
+  aborting the run)
+- Incremental re-indexing: reuse the previous run's store, delete
+  documents of removed/changed pages (see manifest.py)
+- Upsert: find an existing store by display name and list its documents
 - Return store name for global access
 
 Documentation:
@@ -17,18 +24,53 @@ Documentation:
 - Queries: Standard Gemini model pricing (~$0.002/query typical, subject to Google's rates)
 """
 
-from typing import List, Dict, Optional
+from typing import AsyncIterable, AsyncIterator, Callable, List, Dict, Optional, Union
 from pathlib import Path
 from datetime import datetime
 import asyncio
+import io
+import time
+import weakref
 from google import genai
 from google.genai import types
+from google.genai import errors
+from .import_poller import ImportPoller
+from .token_counter import TokenCounter
+from .document_record import Document, DocumentRecord, document_data, document_path, document_size
+from .manifest import ManifestTracker, manifest_from_documents
+from .rate_limit import (
+    TokenBucket,
+    RetryPolicy,
+    call_with_retry,
+    is_retryable,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_MAX_RETRIES
+)
+
+# Uploads in flight at once (imports are awaited by the shared ImportPoller)
+DEFAULT_UPLOAD_CONCURRENCY = 8
+
+# Upload+import attempts per document before it is dead-lettered
+DEFAULT_DOCUMENT_ATTEMPTS = 3
+
+# MIME type of converted documents (sent explicitly for in-memory uploads,
+# which have no file extension to guess from)
+DOCUMENT_MIME_TYPE = 'text/plain'
+
+# Page size for store/document listings (API maximum: 20)
+DEFAULT_LIST_PAGE_SIZE = 20
+
+# Store listings per client (an API key can own many stores; listing
+# them all is paginated, so do it once per run)
+_store_cache: 'weakref.WeakKeyDictionary[genai.Client, List[Dict]]' = weakref.WeakKeyDictionary()
 
 
 async def create_file_search_store(
     client: genai.Client,
     store_name: str,
-    display_name: Optional[str] = None
+    display_name: Optional[str] = None,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None
 ) -> str:
     """
     Create a File Search Store (persistent knowledge base container).
@@ -40,6 +82,8 @@ async def create_file_search_store(
         client: Initialized Gemini client
         store_name: Internal store name (for your reference)
         display_name: Human-readable name (shown in AI Studio)
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for transient errors
 
     Returns:
         Store resource name (format: "fileSearchStores/<id>")
@@ -53,11 +97,17 @@ async def create_file_search_store(
     if display_name is None:
         display_name = store_name
 
-    # Create File Search Store
-    file_search_store = client.file_search_stores.create(
-        config={'display_name': display_name}
+    # Create File Search Store (async surface - doesn't block the event loop)
+    file_search_store = await call_with_retry(
+        client.aio.file_search_stores.create,
+        config={'display_name': display_name},
+        limiter=limiter,
+        policy=policy
     )
 
+    if client in _store_cache:
+        _store_cache[client].append(_store_metadata(file_search_store))
+
     print(f"✅ Created File Search Store: {file_search_store.name}")
     print(f"   Display name: {display_name}")
     print(f"   Persistence: Indefinite (until manually deleted)")
@@ -65,11 +115,476 @@ async def create_file_search_store(
     return file_search_store.name
 
 
+async def get_file_search_store(
+    client: genai.Client,
+    store_name: str,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None
+) -> Optional[str]:
+    """
+    Check that a File Search Store still exists.
+
+    Args:
+        client: Initialized Gemini client
+        store_name: Store resource name (e.g., "fileSearchStores/abc123")
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for transient errors
+
+    Returns:
+        Store resource name, or None if it was deleted (or belongs to
+        another API key)
+    """
+    try:
+        file_search_store = await call_with_retry(
+            client.aio.file_search_stores.get,
+            name=store_name,
+            limiter=limiter,
+            policy=policy
+        )
+    except errors.ClientError as e:
+        if e.code in (403, 404):
+            return None
+        raise
+
+    return file_search_store.name
+
+
+async def list_file_search_stores(
+    client: genai.Client,
+    refresh: bool = False,
+    page_size: int = DEFAULT_LIST_PAGE_SIZE,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None
+) -> List[Dict]:
+    """
+    List all File Search Stores for this API key (cached per client).
+
+    The first call pages through every store; later calls return the
+    cached list (kept up to date by create/delete_file_search_store).
+
+    Args:
+        client: Initialized Gemini client
+        refresh: Ignore the cache and list again
+        page_size: Stores per list request
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for transient errors
+
+    Returns:
+        List of store metadata dicts (name, display_name, created_time)
+    """
+    if not refresh and client in _store_cache:
+        return _store_cache[client]
+
+    pager = await call_with_retry(
+        client.aio.file_search_stores.list,
+        config={'page_size': page_size},
+        limiter=limiter,
+        policy=policy
+    )
+    store_list = [_store_metadata(store) async for store in pager]
+
+    _store_cache[client] = store_list
+    return store_list
+
+
+async def find_file_search_store(
+    client: genai.Client,
+    display_name: str,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None
+) -> Optional[str]:
+    """
+    Find a File Search Store by display name (e.g. the corpus_name of a previous run).
+
+    Args:
+        client: Initialized Gemini client
+        display_name: Store display name
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for transient errors
+
+    Returns:
+        Store resource name (most recently created match), or None
+    """
+    stores = await list_file_search_stores(client, limiter=limiter, policy=policy)
+    matches = [s for s in stores if s['display_name'] == display_name]
+    if not matches:
+        return None
+
+    # Several runs may have created stores with the same name
+    newest = max(matches, key=lambda s: s['created_time'].timestamp() if s['created_time'] else 0)
+    return newest['name']
+
+
+async def list_store_documents(
+    client: genai.Client,
+    store_name: str,
+    page_size: int = DEFAULT_LIST_PAGE_SIZE,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None
+) -> List:
+    """
+    List every document in a File Search Store.
+
+    Args:
+        client: Initialized Gemini client
+        store_name: Store resource name
+        page_size: Documents per list request
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for transient errors
+
+    Returns:
+        List of genai Document objects (name, display_name, state, custom_metadata, ...)
+    """
+    pager = await call_with_retry(
+        client.aio.file_search_stores.documents.list,
+        parent=store_name,
+        config={'page_size': page_size},
+        limiter=limiter,
+        policy=policy
+    )
+    documents = [document async for document in pager]
+
+    print(f"📚 {store_name} holds {len(documents)} documents")
+    return documents
+
+
+async def load_store_manifest(
+    client: genai.Client,
+    corpus_name: str,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None
+) -> Optional[Dict]:
+    """
+    Find a corpus's existing store and describe what is already indexed in it.
+
+    Used by update-existing-store mode: the result feeds a ManifestTracker,
+    so only new or changed pages are uploaded into the existing store.
+
+    Args:
+        client: Initialized Gemini client
+        corpus_name: Knowledge base name (store display name)
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for transient errors
+
+    Returns:
+        Manifest dict (see manifest.manifest_from_documents), or None if
+        no store with that display name exists
+    """
+    store_name = await find_file_search_store(client, corpus_name, limiter, policy)
+    if store_name is None:
+        return None
+
+    documents = await list_store_documents(client, store_name, limiter=limiter, policy=policy)
+    return manifest_from_documents(corpus_name, store_name, documents)
+
+
+def _store_metadata(store) -> Dict:
+    """Store listing entry for a genai FileSearchStore."""
+    return {
+        'name': store.name,
+        'display_name': store.display_name,
+        'created_time': store.create_time
+    }
+
+
+async def delete_documents(
+    client: genai.Client,
+    document_names: List[str],
+    concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None
+) -> List[str]:
+    """
+    Delete documents (and their indexed chunks) from a File Search Store.
+
+    Documents that are already gone count as deleted. Other failures are
+    reported but don't abort the run - the document is left behind.
+
+    Args:
+        client: Initialized Gemini client
+        document_names: Document resource names
+            (format: "fileSearchStores/<id>/documents/<id>")
+        concurrency: Maximum deletions in flight at once
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for transient errors
+
+    Returns:
+        Names of deleted documents
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    deleted = []
+
+    async def delete(document_name: str):
+        async with semaphore:
+            try:
+                await call_with_retry(
+                    client.aio.file_search_stores.documents.delete,
+                    name=document_name,
+                    config={'force': True},  # Also delete the document's chunks
+                    limiter=limiter,
+                    policy=policy
+                )
+            except errors.ClientError as e:
+                if e.code != 404:
+                    print(f"   ⚠️  Could not delete {document_name}: {e}")
+                    return
+            deleted.append(document_name)
+
+    await asyncio.gather(*(delete(name) for name in document_names))
+
+    if document_names:
+        print(f"🗑️  Deleted {len(deleted)}/{len(document_names)} stale documents")
+    return deleted
+
+
+async def upload_document(
+    client: genai.Client,
+    store_name: str,
+    doc_path: Path,
+    poller: ImportPoller,
+    size: Optional[int] = None,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None,
+    metadata: Optional[Dict[str, str]] = None,
+    data: Optional[bytes] = None
+) -> Dict:
+    """
+    Upload a single document to a File Search Store and wait for its import.
+
+    Args:
+        client: Initialized Gemini client
+        store_name: File Search Store name (from create_file_search_store)
+        doc_path: Document file path
+        poller: Shared import poller (waits for the import operation)
+        size: File size in bytes (stat()'d if not given)
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for transient upload errors
+        metadata: Extra custom metadata (see submit_document)
+        data: Document bytes to upload instead of reading doc_path
+
+    Returns:
+        Uploaded file metadata dict
+
+    Raises:
+        TimeoutError: If import takes longer than the poller's max_wait
+        RuntimeError: If import fails
+    """
+    operation = await submit_document(client, store_name, doc_path, size, limiter, policy, metadata, data)
+    return await wait_for_import(poller, operation, doc_path, size)
+
+
+async def submit_document(
+    client: genai.Client,
+    store_name: str,
+    doc_path: Path,
+    size: Optional[int] = None,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None,
+    metadata: Optional[Dict[str, str]] = None,
+    data: Optional[bytes] = None
+):
+    """
+    Upload a document to a File Search Store without waiting for the import.
+
+    With `data`, the document is streamed from memory as a file-like
+    object (explicit text/plain MIME type) and doc_path only names it.
+
+    Args:
+        client: Initialized Gemini client
+        store_name: File Search Store name
+        doc_path: Document file path
+        size: File size in bytes (stat()'d if not given)
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for transient upload errors
+        metadata: Extra custom metadata (e.g. source_url/content_hash, so
+            later runs can match store documents to pages)
+        data: Document bytes to upload instead of reading doc_path
+
+    Returns:
+        Import operation (pass to wait_for_import)
+    """
+    if size is None:
+        size = len(data) if data is not None else doc_path.stat().st_size
+
+    config = {
+        'display_name': doc_path.name,
+        'custom_metadata': [
+            {'key': 'source_path', 'string_value': str(doc_path)},
+            {'key': 'upload_date', 'string_value': datetime.now().isoformat()},
+            {'key': 'file_size', 'string_value': str(size)}
+        ] + [
+            {'key': key, 'string_value': value}
+            for key, value in (metadata or {}).items()
+        ]
+    }
+
+    # Upload to File Search Store (NOT basic files.upload!)
+    upload = client.aio.file_search_stores.upload_to_file_search_store
+    if data is None:
+        return await call_with_retry(
+            upload, limiter=limiter, policy=policy,
+            file=str(doc_path), file_search_store_name=store_name, config=config
+        )
+
+    async def upload_from_memory(**kwargs):
+        # A fresh stream per attempt: a retried upload starts at byte 0
+        return await upload(file=io.BytesIO(data), **kwargs)
+
+    return await call_with_retry(
+        upload_from_memory, limiter=limiter, policy=policy,
+        file_search_store_name=store_name, config={**config, 'mime_type': DOCUMENT_MIME_TYPE}
+    )
+
+
+async def wait_for_import(
+    poller: ImportPoller,
+    operation,
+    doc_path: Path,
+    size: Optional[int] = None
+) -> Dict:
+    """
+    Wait for a submitted document's import operation to complete.
+
+    Args:
+        poller: Shared import poller
+        operation: Operation returned by submit_document
+        doc_path: Document file path
+        size: File size in bytes (stat()'d if not given)
+
+    Returns:
+        Uploaded file metadata dict
+
+    Raises:
+        TimeoutError: If import takes longer than the poller's max_wait
+        RuntimeError: If import fails
+    """
+    if size is None:
+        size = doc_path.stat().st_size
+
+    try:
+        operation = await poller.wait(operation, size=size)
+    except TimeoutError:
+        raise TimeoutError(f"Import timeout for {doc_path.name} after {poller.max_wait}s")
+
+    if operation.error:
+        raise RuntimeError(f"Import failed for {doc_path.name}: {operation.error}")
+    return _import_result(operation, doc_path, size)
+
+
+def _import_result(operation, doc_path: Path, size: int) -> Dict:
+    """Uploaded file metadata dict for a successfully finished import operation."""
+    response = getattr(operation, 'response', None)
+    return {
+        'name': doc_path.name,
+        'path': str(doc_path),
+        'size': size,
+        'document_name': getattr(response, 'document_name', None),
+        'imported_at': datetime.now().isoformat()
+    }
+
+
+def _with_record(uploaded: Optional[Dict], document: Document) -> Optional[Dict]:
+    """Add a converter record's page fields to uploaded file metadata."""
+    if uploaded is not None and isinstance(document, DocumentRecord):
+        uploaded.update(url=document.url, title=document.title, tokens=document.tokens)
+    return uploaded
+
+
+async def _upload_with_requeue(
+    client: genai.Client,
+    store_name: str,
+    doc_path: Path,
+    size: int,
+    semaphore: asyncio.Semaphore,
+    poller: ImportPoller,
+    limiter: Optional[TokenBucket],
+    policy: RetryPolicy,
+    max_attempts: int,
+    dead_letters: List[Dict],
+    holding_slot: bool = False,
+    metadata: Optional[Dict[str, str]] = None,
+    data: Optional[bytes] = None
+) -> Optional[Dict]:
+    """
+    Upload one document, re-queueing it on failure (shared by list and stream uploads).
+
+    Args:
+        semaphore: Upload slots (bounds submissions in flight)
+        holding_slot: Caller already acquired a slot for the first attempt
+        metadata: Extra custom metadata for the document
+        data: Document bytes (in-memory documents; None = read doc_path)
+        (other args as in upload_documents_to_store)
+
+    Returns:
+        Uploaded file metadata dict, or None if the document was dead-lettered
+    """
+    # Submitted import still pending: polled again rather than uploaded again,
+    # since it may yet finish (a second upload would duplicate the document)
+    operation = None
+    waiting_since = 0.0
+    attempt = 1
+
+    while True:
+        try:
+            if operation is None:
+                if holding_slot:
+                    holding_slot = False
+                    try:
+                        operation = await submit_document(client, store_name, doc_path, size, limiter, policy, metadata, data)
+                    finally:
+                        semaphore.release()
+                else:
+                    async with semaphore:
+                        operation = await submit_document(client, store_name, doc_path, size, limiter, policy, metadata, data)
+                waiting_since = time.monotonic()
+
+            finished = await poller.wait(operation, size=size)
+            if not finished.error:
+                return _import_result(finished, doc_path, size)
+
+            # The import itself failed: only now is the document uploaded again
+            operation = None
+            error = RuntimeError(f"Import failed for {doc_path.name}: {finished.error}")
+            retry, retryable = 're-queued', True
+        except Exception as e:
+            # Poll timeouts and transient API errors are worth another attempt;
+            # anything else (bad request, missing file) isn't
+            error = e
+            retry = 're-queued' if operation is None else 'polling again'
+            retryable = isinstance(e, TimeoutError) or is_retryable(e)
+            if operation is not None and retryable and time.monotonic() - waiting_since < poller.max_wait:
+                # Polls rejected (429/5xx) before max_wait: the import is still
+                # running, keep waiting for it without spending an attempt
+                continue
+
+        if not retryable or attempt == max_attempts:
+            dead_letters.append({
+                'name': doc_path.name,
+                'path': str(doc_path),
+                'attempts': attempt,
+                'error': str(error)
+            })
+            print(f"   ❌ Dead-lettered {doc_path.name} after {attempt} attempt(s): {error}")
+            return None
+
+        # Re-acquiring the semaphore puts the document at the back of the queue
+        print(f"   ⚠️  {doc_path.name} failed (attempt {attempt}/{max_attempts}), {retry}: {error}")
+        attempt += 1
+        waiting_since = time.monotonic()
+
+
 async def upload_documents_to_store(
     client: genai.Client,
     store_name: str,
-    document_paths: List[Path],
-    max_wait: int = 300
+    document_paths: List[Document],
+    max_wait: int = 300,
+    concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    poller: Optional[ImportPoller] = None,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None,
+    max_attempts: int = DEFAULT_DOCUMENT_ATTEMPTS,
+    dead_letters: Optional[List[Dict]] = None,
+    document_metadata: Optional[Callable[[Path], Optional[Dict[str, str]]]] = None
 ) -> List[Dict]:
     """
     Upload documents to a File Search Store.
@@ -77,94 +592,264 @@ async def upload_documents_to_store(
     CRITICAL: Uses upload_to_file_search_store (persistent)
     NOT files.upload (which deletes after 48h)
 
+    All API calls go through the async client surface (client.aio), so
+    waiting on uploads and imports never blocks the actor's event loop.
+
     Workflow:
-    1. Upload each document to the store
-    2. Wait for import operations to complete
-    3. Return metadata for uploaded files
+    1. Schedule documents largest-first (longest imports start earliest,
+       which minimizes total wall-clock time)
+    2. Submit up to `concurrency` uploads at once (rate-limited, transient
+       API errors retried with jittered backoff)
+    3. Hand each import operation to a shared ImportPoller - the upload
+       slot is freed immediately, so waiting on imports never throttles
+       submission throughput
+    4. Failed documents (import error, timeout, exhausted retries) go to
+       the back of the queue; after max_attempts they are dead-lettered
+    5. Return metadata for uploaded files (in document_paths order)
 
     Args:
         client: Initialized Gemini client
         store_name: File Search Store name (from create_file_search_store)
-        document_paths: List of document file paths
+        document_paths: Document records from the converter (sizes taken
+            from the record; in-memory records are streamed from memory) or
+            file paths (stat()'d)
         max_wait: Maximum seconds to wait per file (default: 300s)
+        concurrency: Maximum uploads in flight at once
+        poller: Import poller to use (default: a new ImportPoller with max_wait)
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for individual API calls
+        max_attempts: Upload+import attempts per document
+        dead_letters: List that receives one dict per document that could
+            not be uploaded ({name, path, attempts, error})
+        document_metadata: Returns extra custom metadata for a document
+            (e.g. ManifestTracker.document_metadata)
 
     Returns:
-        List of uploaded file metadata dicts
+        List of uploaded file metadata dicts (document_paths order,
+        dead-lettered documents omitted; url/title/tokens added for records)
 
     Raises:
-        TimeoutError: If import takes longer than max_wait
-        RuntimeError: If import fails
+        ValueError: If concurrency or max_attempts < 1
     """
-    uploaded_files = []
-
-    print(f"\n📤 Uploading {len(document_paths)} documents to {store_name}...")
-
-    for i, doc_path in enumerate(document_paths, 1):
-        print(f"   [{i}/{len(document_paths)}] Uploading {doc_path.name}...")
-
-        # Upload to File Search Store (NOT basic files.upload!)
-        operation = client.file_search_stores.upload_to_file_search_store(
-            file=str(doc_path),
-            file_search_store_name=store_name,
-            config={
-                'display_name': doc_path.name,
-                'custom_metadata': [
-                    {'key': 'source_path', 'string_value': str(doc_path)},
-                    {'key': 'upload_date', 'string_value': datetime.now().isoformat()},
-                    {'key': 'file_size', 'string_value': str(doc_path.stat().st_size)}
-                ]
-            }
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+    if max_attempts < 1:
+        raise ValueError(f"max_attempts must be >= 1, got {max_attempts}")
+
+    if policy is None:
+        policy = RetryPolicy()
+    if dead_letters is None:
+        dead_letters = []
+
+    owns_poller = poller is None
+    if owns_poller:
+        poller = ImportPoller(
+            client,
+            max_wait=max_wait,
+            limiter=limiter,
+            max_poll_errors=policy.max_attempts
         )
 
-        # Wait for import to complete
-        waited = 0
-        while not operation.done and waited < max_wait:
-            await asyncio.sleep(2)
-            operation = client.operations.get(operation)
-            waited += 2
-
-            if waited % 10 == 0:  # Progress update every 10s
-                print(f"      Importing... ({waited}s elapsed)")
+    total = len(document_paths)
+    sizes = [document_size(document) for document in document_paths]
+    uploaded_files: List[Optional[Dict]] = [None] * total
+    semaphore = asyncio.Semaphore(concurrency)
+    completed = 0
+
+    print(f"\n📤 Uploading {total} documents to {store_name} (concurrency: {concurrency})...")
+
+    async def upload_slot(index: int):
+        nonlocal completed
+        doc_path = document_path(document_paths[index])
+
+        uploaded_files[index] = _with_record(await _upload_with_requeue(
+            client, store_name, doc_path, sizes[index], semaphore, poller,
+            limiter, policy, max_attempts, dead_letters,
+            metadata=document_metadata(doc_path) if document_metadata else None,
+            data=document_data(document_paths[index])
+        ), document_paths[index])
+
+        if uploaded_files[index] is not None:
+            completed += 1
+            print(f"   [{completed}/{total}] ✅ Imported {doc_path.name}")
+
+    # Largest-first (LPT) scheduling: tasks are created in descending size
+    # order and the semaphore admits waiters FIFO, so big files start first
+    schedule = sorted(range(total), key=lambda i: sizes[i], reverse=True)
+    tasks = [asyncio.create_task(upload_slot(i)) for i in schedule]
+
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        if owns_poller:
+            await poller.close()
+
+    uploaded = [f for f in uploaded_files if f is not None]
+
+    print(f"\n✅ {len(uploaded)}/{total} documents uploaded and imported")
+    if dead_letters:
+        print(f"   ⚠️  {len(dead_letters)} documents dead-lettered")
+    print(f"   Import polling: {poller.polls} status checks in {poller.cycles} cycles")
+    return uploaded
+
+
+async def upload_document_stream(
+    client: genai.Client,
+    store_name: str,
+    documents: AsyncIterable[Document],
+    max_wait: int = 300,
+    concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    poller: Optional[ImportPoller] = None,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None,
+    max_attempts: int = DEFAULT_DOCUMENT_ATTEMPTS,
+    dead_letters: Optional[List[Dict]] = None,
+    document_metadata: Optional[Callable[[Path], Optional[Dict[str, str]]]] = None
+) -> List[Dict]:
+    """
+    Upload documents to a File Search Store as they are produced.
 
-        if not operation.done:
-            raise TimeoutError(f"Import timeout for {doc_path.name} after {max_wait}s")
+    Streaming counterpart of upload_documents_to_store for pipelines where
+    conversion is still running. A document is only pulled from `documents`
+    once an upload slot is free, so a slow upload stage applies backpressure
+    to the producer instead of buffering converted documents.
 
-        if operation.error:
-            raise RuntimeError(f"Import failed for {doc_path.name}: {operation.error}")
+    Same retry/dead-letter behaviour as upload_documents_to_store. Documents
+    are uploaded in arrival order (sizes aren't known up front, so there is
+    no largest-first scheduling).
 
-        # Extract file metadata from operation result
-        file_metadata = {
-            'name': doc_path.name,
-            'path': str(doc_path),
-            'size': doc_path.stat().st_size,
-            'imported_at': datetime.now().isoformat()
-        }
+    Args:
+        documents: Async iterator of document records or file paths
+        (other args as in upload_documents_to_store)
 
-        uploaded_files.append(file_metadata)
-        print(f"      ✅ Imported successfully")
+    Returns:
+        List of uploaded file metadata dicts (arrival order,
+        dead-lettered documents omitted)
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+    if max_attempts < 1:
+        raise ValueError(f"max_attempts must be >= 1, got {max_attempts}")
+
+    if policy is None:
+        policy = RetryPolicy()
+    if dead_letters is None:
+        dead_letters = []
+
+    owns_poller = poller is None
+    if owns_poller:
+        poller = ImportPoller(
+            client,
+            max_wait=max_wait,
+            limiter=limiter,
+            max_poll_errors=policy.max_attempts
+        )
 
-    print(f"\n✅ All {len(uploaded_files)} documents uploaded and imported")
-    return uploaded_files
+    documents = aiter(documents)
+    uploaded_files: List[Optional[Dict]] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = []
+    completed = 0
+
+    print(f"\n📤 Streaming documents to {store_name} (concurrency: {concurrency})...")
+
+    async def upload_slot(index: int, document: Document):
+        nonlocal completed
+        doc_path = document_path(document)
+        uploaded_files[index] = _with_record(await _upload_with_requeue(
+            client, store_name, doc_path, document_size(document), semaphore, poller,
+            limiter, policy, max_attempts, dead_letters, holding_slot=True,
+            metadata=document_metadata(doc_path) if document_metadata else None,
+            data=document_data(document)
+        ), document)
+
+        if uploaded_files[index] is not None:
+            completed += 1
+            print(f"   [{completed}] ✅ Imported {doc_path.name}")
+
+    try:
+        while True:
+            # Take a slot BEFORE pulling the next document (backpressure)
+            await semaphore.acquire()
+            try:
+                document = await anext(documents)
+            except StopAsyncIteration:
+                semaphore.release()
+                break
+            except BaseException:
+                semaphore.release()
+                raise
+
+            uploaded_files.append(None)
+            tasks.append(asyncio.create_task(upload_slot(len(uploaded_files) - 1, document)))
+
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        if owns_poller:
+            await poller.close()
+
+    uploaded = [f for f in uploaded_files if f is not None]
+
+    print(f"\n✅ {len(uploaded)}/{len(uploaded_files)} documents uploaded and imported")
+    if dead_letters:
+        print(f"   ⚠️  {len(dead_letters)} documents dead-lettered")
+    print(f"   Import polling: {poller.polls} status checks in {poller.cycles} cycles")
+    return uploaded
 
 
 async def upload_to_gemini(
     gemini_api_key: str,
-    document_paths: List[Path],
-    corpus_name: str
+    document_paths: Union[List[Document], AsyncIterable[Document]],
+    corpus_name: str,
+    upload_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    rate_limit: float = DEFAULT_RATE_LIMIT,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    max_attempts: int = DEFAULT_DOCUMENT_ATTEMPTS,
+    client: Optional[genai.Client] = None,
+    manifest: Optional[ManifestTracker] = None,
+    token_counter: Optional[TokenCounter] = None
 ) -> Dict:
     """
     Main function: Upload documents to Gemini File Search.
 
     High-level workflow:
     1. Initialize Gemini client
-    2. Create File Search Store (persistent container)
+    2. Create File Search Store (persistent container), or reuse the
+       manifest's store on incremental re-runs
     3. Upload all documents to the store
-    4. Return corpus metadata (includes store name for queries)
+    4. Incremental: delete old versions of changed pages and documents
+       of removed pages (after the upload, so the store is never missing
+       content mid-run)
+    5. Return corpus metadata (includes store name for queries)
+
+    document_paths may be a list (uploaded largest-first) or an async
+    iterator of paths still being produced by conversion (uploaded as they
+    arrive, see upload_document_stream). For a stream, the store is created
+    once the first document is ready.
 
     Args:
         gemini_api_key: Google Gemini API key
-        document_paths: List of document file paths
+        document_paths: List or async iterator of document records
+            (from the converter) or file paths
         corpus_name: Name for the knowledge base
+        upload_concurrency: Maximum documents uploading at once
+        rate_limit: Gemini API requests per second (0 = unlimited)
+        max_retries: Attempts per API call for transient errors (429/5xx)
+        max_attempts: Upload+import attempts per document before dead-lettering
+        client: Gemini client to use (default: created from gemini_api_key)
+        manifest: Incremental re-indexing tracker, already filled in by
+            conversion. Uploaded document names are recorded on it.
+        token_counter: Counts tokens of indexed documents given as paths,
+            for the cost estimate (None = file size / 5). Records carry
+            their token count already.
 
     Returns:
         Corpus metadata dict with:
@@ -174,6 +859,9 @@ async def upload_to_gemini(
         - storage_persistence: "Indefinite (until manually deleted)"
         - created_at: ISO timestamp
         - cost_estimate: Estimated indexing cost
+        - failed_documents: Dead-lettered documents ({name, path, attempts, error})
+        - incremental: Page counts (new/changed/unchanged/removed) and
+          deleted document count, if a manifest was given
 
     Example:
         >>> docs = [Path("doc1.txt"), Path("doc2.txt")]
@@ -196,30 +884,83 @@ async def upload_to_gemini(
         ... )
     """
     # Initialize Gemini client
-    client = genai.Client(api_key=gemini_api_key)
+    if client is None:
+        client = genai.Client(api_key=gemini_api_key)
+
+    # One limiter/policy shared by store creation, uploads and polling
+    limiter = TokenBucket(rate_limit) if rate_limit > 0 else None
+    policy = RetryPolicy(max_attempts=max_retries)
+
+    streaming = not isinstance(document_paths, list)
+    store_name = manifest.store_name if manifest is not None else None
 
     print(f"🧠 Gemini File Search Upload")
     print(f"   Corpus: {corpus_name}")
-    print(f"   Documents: {len(document_paths)}")
-
-    # Create File Search Store
-    store_name = await create_file_search_store(
-        client=client,
-        store_name=corpus_name,
-        display_name=corpus_name
-    )
+    print(f"   Documents: {'streaming' if streaming else len(document_paths)}")
+
+    if streaming:
+        # Don't create (and leave behind) a store until there's something to upload
+        document_paths = aiter(document_paths)
+        first_document = await anext(document_paths, None)
+        if first_document is not None:
+            document_paths = _prepend(first_document, document_paths)
+        elif store_name is None:
+            raise RuntimeError("No valid documents created from scraped data")
+        else:
+            # Incremental re-run with nothing new or changed
+            streaming = False
+            document_paths = []
+
+    # Create File Search Store (incremental re-runs reuse the existing one)
+    if store_name is None:
+        store_name = await create_file_search_store(
+            client=client,
+            store_name=corpus_name,
+            display_name=corpus_name,
+            limiter=limiter,
+            policy=policy
+        )
+    else:
+        print(f"♻️  Updating existing File Search Store: {store_name}")
 
     # Upload documents
-    uploaded_files = await upload_documents_to_store(
-        client=client,
-        store_name=store_name,
-        document_paths=document_paths
+    dead_letters = []
+    upload = upload_document_stream if streaming else upload_documents_to_store
+    uploaded_files = await upload(
+        client,
+        store_name,
+        document_paths,
+        concurrency=upload_concurrency,
+        limiter=limiter,
+        policy=policy,
+        max_attempts=max_attempts,
+        dead_letters=dead_letters,
+        document_metadata=manifest.document_metadata if manifest is not None else None
     )
 
-    # Calculate cost estimate
-    total_size = sum(doc.stat().st_size for doc in document_paths)
-    # Rough estimate: ~5 characters per token, $0.15 per 1M tokens
-    estimated_tokens = total_size // 5
+    if not uploaded_files and dead_letters:
+        raise RuntimeError(
+            f"All {len(dead_letters)} documents failed to upload: {dead_letters[0]['error']}"
+        )
+
+    if manifest is not None:
+        manifest.record_uploads(uploaded_files)
+        deleted = await delete_documents(
+            client, manifest.stale_documents(), upload_concurrency, limiter, policy
+        )
+
+    # Calculate cost estimate (indexed documents only), $0.15 per 1M tokens
+    total_size = sum(f['size'] for f in uploaded_files)
+    recorded = [f for f in uploaded_files if 'tokens' in f]
+    unrecorded = [f for f in uploaded_files if 'tokens' not in f]
+    estimated_tokens = sum(f['tokens'] for f in recorded)
+    if token_counter is not None:
+        # Reads every unrecorded document - off the event loop
+        counts = await asyncio.to_thread(token_counter.count_documents, [Path(f['path']) for f in unrecorded])
+        estimated_tokens += sum(counts)
+    else:
+        # Rough estimate: ~5 characters per token
+        estimated_tokens += sum(f['size'] for f in unrecorded) // 5
     cost_estimate = (estimated_tokens / 1_000_000) * 0.15
 
     # Build corpus metadata
@@ -234,13 +975,18 @@ async def upload_to_gemini(
         'total_size_bytes': total_size,
         'estimated_tokens': estimated_tokens,
         'cost_estimate_usd': round(cost_estimate, 4),
-        'uploaded_files': uploaded_files[:10]  # First 10 for reference
+        'uploaded_files': uploaded_files[:10],  # First 10 for reference
+        'failed_documents': dead_letters
     }
+    if manifest is not None:
+        corpus_metadata['incremental'] = {**manifest.summary(), 'deleted_documents': len(deleted)}
 
     print(f"\n🎉 Knowledge base created successfully!")
     print(f"\n📊 Summary:")
     print(f"   Store name: {store_name}")
     print(f"   Files indexed: {len(uploaded_files)}")
+    if dead_letters:
+        print(f"   Failed documents: {len(dead_letters)} (see failed_documents)")
     print(f"   Total size: {total_size / 1024 / 1024:.2f} MB")
     print(f"   Estimated tokens: {estimated_tokens:,}")
     print(f"   Indexing cost: ${cost_estimate:.4f}")
@@ -252,6 +998,13 @@ async def upload_to_gemini(
     return corpus_metadata
 
 
+async def _prepend(first: Path, rest: AsyncIterator[Path]) -> AsyncIterator[Path]:
+    """Re-attach a peeked item to the front of an async iterator."""
+    yield first
+    async for item in rest:
+        yield item
+
+
 def generate_query_guide(
     corpus_metadata: Dict,
     output_path: Path
@@ -457,32 +1210,12 @@ Your knowledge base is **permanent** until you delete it:
 
 # ========== HELPER FUNCTIONS ==========
 
-def list_file_search_stores(client: genai.Client) -> List[Dict]:
-    """
-    List all File Search Stores for this API key.
-
-    Useful for debugging and verifying stores were created.
-
-    Args:
-        client: Initialized Gemini client
-
-    Returns:
-        List of store metadata dicts
-    """
-    stores = client.file_search_stores.list()
-    store_list = []
-
-    for store in stores:
-        store_list.append({
-            'name': store.name,
-            'display_name': store.display_name,
-            'created_time': store.create_time
-        })
-
-    return store_list
-
-
-def delete_file_search_store(client: genai.Client, store_name: str):
+async def delete_file_search_store(
+    client: genai.Client,
+    store_name: str,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None
+):
     """
     Delete a File Search Store (removes all indexed data).
 
@@ -491,6 +1224,17 @@ def delete_file_search_store(client: genai.Client, store_name: str):
     Args:
         client: Initialized Gemini client
         store_name: Store resource name (e.g., "fileSearchStores/abc123")
+        limiter: Shared rate limiter (None = unlimited)
+        policy: Retry policy for transient errors
     """
-    client.file_search_stores.delete(name=store_name)
+    await call_with_retry(
+        client.aio.file_search_stores.delete,
+        name=store_name,
+        limiter=limiter,
+        policy=policy
+    )
+
+    if client in _store_cache:
+        _store_cache[client] = [s for s in _store_cache[client] if s['name'] != store_name]
+
     print(f"🗑️  Deleted File Search Store: {store_name}")
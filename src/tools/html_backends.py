@@ -0,0 +1,327 @@
+"""
+HTML Parser Backends for Gemini Knowledge Scraper
+
+Pluggable parsers for the converter's per-page work: title extraction,
+main-content selection, noise removal and text extraction. Every backend
+parses a page exactly once and returns (title, text); whitespace
+normalization stays in document_converter.
+
+Backends:
+- beautifulsoup: BeautifulSoup over lxml (original behaviour, default)
+- lxml: raw lxml.html - drops and iterates elements directly, without
+  building a BeautifulSoup object layer (several times faster)
+
+Both backends produce the same output for the same page (see
+tests/test_html_backends.py).
+"""
+
+from typing import Dict, Iterator, Optional, Tuple
+from abc import ABC, abstractmethod
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, Tag
+import lxml.etree
+import lxml.html
+import re
+from .noise_filter import NoiseFilter, DEFAULT_NOISE_FILTER
+
+# Class fragments marking a page's main content area (priority order)
+CONTENT_CLASS_PATTERNS = [
+    re.compile(pattern, re.I) for pattern in (
+        'content', 'main-content', 'article-content',
+        'post-content', 'entry-content', 'documentation'
+    )
+]
+
+# Elements whose text is never page text (BeautifulSoup's get_text skips them too)
+NON_TEXT_TAGS = frozenset({'script', 'style', 'template'})
+
+
+def title_from_url(url: str) -> str:
+    """Title fallback: URL basename ("getting-started" → "Getting Started")."""
+    path = urlparse(url).path
+    basename = path.rstrip('/').split('/')[-1]
+    return basename.replace('-', ' ').replace('_', ' ').title() if basename else 'Untitled'
+
+
+class ParserBackend(ABC):
+    """Base class: parse a page once, return its title and clean (unnormalized) text."""
+
+    name = ''
+
+    @abstractmethod
+    def extract(
+        self,
+        html: str,
+        url: str,
+        main_content_only: bool = False,
+        noise_filter: Optional[NoiseFilter] = None
+    ) -> Tuple[str, str]:
+        """
+        Extract title and text from a page.
+
+        Workflow (over a single parse):
+        1. Extract title (before noise removal)
+        2. Select main content area (if enabled)
+        3. Remove noise elements
+        4. Extract text (one line per text node)
+
+        Args:
+            html: Raw HTML string
+            url: Source URL (title fallback)
+            main_content_only: Only keep the main content area
+            noise_filter: Noise rules (None = defaults)
+
+        Returns:
+            (title, text)
+        """
+
+
+# ========== BEAUTIFULSOUP ==========
+
+class BeautifulSoupBackend(ParserBackend):
+    """BeautifulSoup over the lxml parser (original converter behaviour)."""
+
+    name = 'beautifulsoup'
+
+    def extract(self, html, url, main_content_only=False, noise_filter=None):
+        soup = BeautifulSoup(html, 'lxml')
+
+        # Title first - <h1> may sit in a stripped area
+        title = self.title(soup, url)
+
+        root = soup
+        if main_content_only:
+            main = self.main_content(soup)
+            if main is not None:
+                root = main
+
+        (noise_filter or DEFAULT_NOISE_FILTER).strip(root)
+        return title, root.get_text(separator='\n', strip=True)
+
+    @staticmethod
+    def title(soup: BeautifulSoup, url: str) -> str:
+        """
+        Page title.
+
+        Priority:
+        1. <title> tag
+        2. <h1> tag
+        3. <meta property="og:title">
+        4. URL basename as fallback
+        """
+        # Try <title>
+        if soup.title and soup.title.string:
+            return soup.title.string.strip()
+
+        # Try <h1>
+        h1 = soup.find('h1')
+        if h1:
+            return h1.get_text(strip=True)
+
+        # Try Open Graph title
+        og_title = soup.find('meta', property='og:title')
+        if og_title and og_title.get('content'):
+            return og_title['content'].strip()
+
+        # Fallback: URL basename
+        return title_from_url(url)
+
+    @staticmethod
+    def main_content(soup: BeautifulSoup) -> Optional[Tag]:
+        """
+        Main content element: <main>, <article>, or the first element with
+        a content class. None if the page has none.
+        """
+        # Try semantic tags
+        main = soup.find('main')
+        if main:
+            return main
+
+        article = soup.find('article')
+        if article:
+            return article
+
+        # Try common content class names
+        for pattern in CONTENT_CLASS_PATTERNS:
+            content = soup.find(class_=pattern)
+            if content:
+                return content
+
+        return None
+
+
+# ========== LXML ==========
+
+# huge_tree lifts libxml2's default nesting limit (256), which silently drops
+# the content of deeply nested pages
+_LXML_PARSER = lxml.html.HTMLParser(huge_tree=True)
+
+
+def _parse_lxml(html: str):
+    """Parse a page with lxml.html (None for empty documents)."""
+    try:
+        return lxml.html.document_fromstring(html, parser=_LXML_PARSER)
+    except ValueError:
+        # Unicode strings with an XML encoding declaration are rejected
+        return lxml.html.document_fromstring(html.encode('utf-8'), parser=_LXML_PARSER)
+    except lxml.etree.ParserError:
+        return None
+
+
+def _is_element(node) -> bool:
+    """True for elements (comments and processing instructions have callable tags)."""
+    return isinstance(node.tag, str)
+
+
+def _text_nodes(root) -> Iterator[str]:
+    """
+    Text nodes in document order, skipping script/style/template contents
+    and comments (same strings BeautifulSoup's get_text sees).
+
+    Iterative, so deeply nested (malformed) pages can't hit the recursion limit.
+    """
+    if root.tag in NON_TEXT_TAGS:
+        return
+    if root.text:
+        yield root.text
+
+    # (children iterator, tail of the element owning them)
+    stack = [(iter(root), None)]
+    while stack:
+        children, tail = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            if tail:
+                yield tail
+            continue
+
+        if _is_element(child) and child.tag not in NON_TEXT_TAGS:
+            if child.text:
+                yield child.text
+            stack.append((iter(child), child.tail))
+        elif child.tail:
+            yield child.tail
+
+
+def _class_attr(element) -> str:
+    """Class attribute normalized like BeautifulSoup's multi-valued class."""
+    return ' '.join(element.get('class', '').split())
+
+
+class LxmlBackend(ParserBackend):
+    """Raw lxml.html backend: no BeautifulSoup object layer."""
+
+    name = 'lxml'
+
+    def extract(self, html, url, main_content_only=False, noise_filter=None):
+        root = _parse_lxml(html)
+        if root is None:
+            return title_from_url(url), ''
+
+        title = self.title(root, url)
+
+        if main_content_only:
+            main = self.main_content(root)
+            if main is not None:
+                root = main
+
+        self.strip_noise(root, noise_filter or DEFAULT_NOISE_FILTER)
+
+        lines = (text.strip() for text in _text_nodes(root))
+        return title, '\n'.join(line for line in lines if line)
+
+    @staticmethod
+    def title(root, url: str) -> str:
+        """Page title (same priority as BeautifulSoupBackend.title)."""
+        title = root.find('.//title')
+        if title is not None and title.text and len(title) == 0:
+            return title.text.strip()
+
+        h1 = root.find('.//h1')
+        if h1 is not None:
+            return ''.join(text.strip() for text in _text_nodes(h1))
+
+        for meta in root.iter('meta'):
+            if meta.get('property') == 'og:title' and meta.get('content'):
+                return meta.get('content').strip()
+
+        return title_from_url(url)
+
+    @staticmethod
+    def main_content(root):
+        """Main content element (same rules as BeautifulSoupBackend.main_content)."""
+        for tag in ('main', 'article'):
+            element = root.find(f'.//{tag}')
+            if element is not None:
+                return element
+
+        # One pass: first element matching each content pattern
+        first_match: Dict[int, object] = {}
+        for element in root.iter():
+            if not _is_element(element) or 'class' not in element.attrib:
+                continue
+            classes = _class_attr(element)
+            for i, pattern in enumerate(CONTENT_CLASS_PATTERNS):
+                if i not in first_match and pattern.search(classes):
+                    first_match[i] = element
+            if 0 in first_match:
+                break  # Highest priority pattern found
+
+        if first_match:
+            return first_match[min(first_match)]
+        return None
+
+    @staticmethod
+    def strip_noise(root, noise_filter: NoiseFilter) -> int:
+        """
+        Remove noise elements in one walk (NoiseFilter rules, lxml tree).
+
+        drop_tree() keeps the element's tail text, like decompose() in
+        BeautifulSoup keeps following text nodes.
+
+        Returns:
+            Number of elements removed (top-most only)
+        """
+        doomed = []
+        stack = [root]
+        while stack:
+            for child in stack.pop():
+                if not _is_element(child):
+                    continue
+                if noise_filter.is_noise(child.tag, child.attrib):
+                    doomed.append(child)
+                else:
+                    stack.append(child)
+
+        for element in doomed:
+            element.drop_tree()
+        return len(doomed)
+
+
+# ========== REGISTRY ==========
+
+PARSER_BACKENDS: Dict[str, ParserBackend] = {
+    backend.name: backend for backend in (BeautifulSoupBackend(), LxmlBackend())
+}
+
+DEFAULT_PARSER_BACKEND = 'beautifulsoup'
+
+
+def get_parser_backend(name: Optional[str] = None) -> ParserBackend:
+    """
+    Look up a parser backend by name.
+
+    Args:
+        name: Backend name (None = DEFAULT_PARSER_BACKEND)
+
+    Returns:
+        ParserBackend instance
+
+    Raises:
+        ValueError: If no backend has that name
+    """
+    name = name or DEFAULT_PARSER_BACKEND
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}' (available: {', '.join(PARSER_BACKENDS)})")
+    return PARSER_BACKENDS[name]
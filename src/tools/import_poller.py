@@ -0,0 +1,227 @@
+"""
+Import Operation Poller for Gemini Knowledge Scraper
+
+Tracks every outstanding File Search import operation and polls them
+from a single background loop, instead of one sleep/get loop per upload.
+
+Key features:
+- One poll cycle for all due operations (batched operations.get calls)
+- Adaptive backoff: small files start with fast polls, long-running
+  imports back off towards max_interval
+- Each tracked operation resolves an asyncio.Future when it completes
+- Per-operation timeout (max_wait)
+- Rate-limited polls; transient poll errors are retried on the next cycle
+"""
+
+from typing import Dict, Optional
+import asyncio
+import time
+from google import genai
+from .rate_limit import TokenBucket, DEFAULT_MAX_RETRIES, is_retryable, is_rate_limited
+
+# Poll interval bounds (seconds)
+DEFAULT_MIN_INTERVAL = 0.5
+DEFAULT_MAX_INTERVAL = 10.0
+
+# Interval multiplier after each poll that finds the import still running
+DEFAULT_BACKOFF = 1.5
+
+# Files up to this size start at min_interval; larger files start
+# proportionally slower (imports take longer for bigger documents)
+SMALL_FILE_BYTES = 64 * 1024
+
+
+class _TrackedOperation:
+    __slots__ = ('operation', 'future', 'interval', 'next_poll', 'deadline', 'errors')
+
+    def __init__(self, operation, future, interval, next_poll, deadline):
+        self.operation = operation
+        self.future = future
+        self.interval = interval
+        self.next_poll = next_poll
+        self.deadline = deadline
+        self.errors = 0  # Consecutive failed polls
+
+
+class ImportPoller:
+    """
+    Batch poller for File Search import operations.
+
+    Usage:
+        >>> poller = ImportPoller(client, max_wait=300)
+        >>> operation = await client.aio.file_search_stores.upload_to_file_search_store(...)
+        >>> operation = await poller.wait(operation, size=doc_size)
+        >>> await poller.close()
+
+    Operations that come due within `coalesce` seconds of each other are
+    polled in the same cycle, so N outstanding imports cost one loop wakeup
+    per cycle rather than N independent timers.
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        max_wait: float = 300,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = DEFAULT_BACKOFF,
+        coalesce: Optional[float] = None,
+        limiter: Optional[TokenBucket] = None,
+        max_poll_errors: int = DEFAULT_MAX_RETRIES
+    ):
+        """
+        Args:
+            client: Initialized Gemini client
+            max_wait: Maximum seconds to wait per operation
+            min_interval: Fastest poll interval (small files)
+            max_interval: Slowest poll interval (long imports)
+            backoff: Interval multiplier per unfinished poll
+            coalesce: Poll operations due within this window together
+                (default: min_interval)
+            limiter: Shared rate limiter for operations.get calls
+            max_poll_errors: Consecutive transient poll errors tolerated
+                per operation before its future fails
+        """
+        self.client = client
+        self.max_wait = max_wait
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.coalesce = min_interval if coalesce is None else coalesce
+        self.limiter = limiter
+        self.max_poll_errors = max_poll_errors
+
+        self.polls = 0    # operations.get calls made
+        self.cycles = 0   # loop wakeups that polled something
+
+        self._tracked: Dict[str, _TrackedOperation] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def initial_interval(self, size: int) -> float:
+        """First poll delay for a document of `size` bytes."""
+        scale = max(1.0, size / SMALL_FILE_BYTES)
+        return min(self.max_interval, self.min_interval * scale)
+
+    def track(self, operation, size: int = 0) -> asyncio.Future:
+        """
+        Start tracking an import operation.
+
+        Args:
+            operation: Operation returned by upload_to_file_search_store
+            size: Document size in bytes (sets the initial poll interval)
+
+        Returns:
+            Future resolving to the finished operation. Raises TimeoutError
+            if it doesn't finish within max_wait.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        if operation.done:
+            future.set_result(operation)
+            return future
+
+        now = time.monotonic()
+        interval = self.initial_interval(size)
+        self._tracked[operation.name] = _TrackedOperation(
+            operation=operation,
+            future=future,
+            interval=interval,
+            next_poll=now + interval,
+            deadline=now + self.max_wait
+        )
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+
+        return future
+
+    async def wait(self, operation, size: int = 0):
+        """Track an operation and wait for it to finish."""
+        return await self.track(operation, size)
+
+    @property
+    def pending(self) -> int:
+        """Number of operations still being polled."""
+        return len(self._tracked)
+
+    async def close(self):
+        """Stop polling; outstanding waiters are cancelled."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for entry in self._tracked.values():
+            entry.future.cancel()
+        self._tracked.clear()
+
+    async def _run(self):
+        while self._tracked:
+            # Sleep until the earliest operation is due (or a new one arrives)
+            next_due = min(entry.next_poll for entry in self._tracked.values())
+            delay = next_due - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    continue  # New operation - recompute earliest due time
+                except asyncio.TimeoutError:
+                    pass
+
+            now = time.monotonic()
+            due = [
+                entry for entry in self._tracked.values()
+                if entry.next_poll <= now + self.coalesce
+            ]
+            if due:
+                self.cycles += 1
+                await self._poll(due)
+
+    async def _get(self, operation):
+        if self.limiter is not None:
+            await self.limiter.acquire()
+        return await self.client.aio.operations.get(operation)
+
+    async def _poll(self, due):
+        self.polls += len(due)
+        results = await asyncio.gather(
+            *(self._get(entry.operation) for entry in due),
+            return_exceptions=True
+        )
+
+        now = time.monotonic()
+        for entry, result in zip(due, results):
+            if entry.future.done():  # Waiter gave up (cancelled)
+                self._tracked.pop(entry.operation.name, None)
+                continue
+
+            if isinstance(result, BaseException):
+                entry.errors += 1
+                if not is_retryable(result) or entry.errors >= self.max_poll_errors:
+                    self._tracked.pop(entry.operation.name, None)
+                    entry.future.set_exception(result)
+                    continue
+                if self.limiter is not None and is_rate_limited(result):
+                    self.limiter.drain(entry.interval)
+                # Transient - try again next cycle, backing off as usual
+                entry.interval = min(self.max_interval, entry.interval * self.backoff)
+                entry.next_poll = min(now + entry.interval, entry.deadline)
+            elif result.done:
+                self._tracked.pop(entry.operation.name, None)
+                entry.future.set_result(result)
+            elif now >= entry.deadline:
+                self._tracked.pop(entry.operation.name, None)
+                entry.future.set_exception(TimeoutError(
+                    f"Import timeout for {entry.operation.name} after {self.max_wait}s"
+                ))
+            else:
+                entry.operation = result
+                entry.errors = 0
+                entry.interval = min(self.max_interval, entry.interval * self.backoff)
+                entry.next_poll = min(now + entry.interval, entry.deadline)
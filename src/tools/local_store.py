@@ -0,0 +1,205 @@
+"""
+Local File Search Store for Gemini Knowledge Scraper
+
+In-process stand-in for the part of genai.Client the uploader talks to
+(client.aio.file_search_stores and client.aio.operations), so the full
+upload path - store creation, uploads, import polling, incremental
+deletes - runs offline, without an API key or network access.
+
+Key functions:
+- File Search Stores: create, get, list
+- Uploads from a path or a file-like object (in-memory documents);
+  imports complete immediately
+- Documents: list with custom metadata (load_store_manifest works on
+  them), delete
+- Optional directory: uploaded documents are written there for inspection
+- Request counters for profiling (uploads, bytes, operation polls)
+
+Usage:
+    >>> client = LocalFileSearchClient()
+    >>> corpus = await upload_to_gemini('', documents, 'my-docs', client=client)
+    >>> client.summary()
+    {'stores': 1, 'documents': 120, 'bytes_uploaded': ..., 'requests': {'upload': 120, ...}}
+"""
+
+from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+import io
+import itertools
+from google.genai import errors
+
+
+def _not_found(resource: str) -> errors.ClientError:
+    """404 ClientError, as the API raises for missing stores and documents."""
+    return errors.ClientError(404, {'error': {'code': 404, 'message': f'{resource} not found', 'status': 'NOT_FOUND'}})
+
+
+class LocalOperation:
+    """Stand-in for an UploadToFileSearchStoreOperation."""
+
+    def __init__(self, name: str, document_name: Optional[str] = None, error: Optional[str] = None):
+        self.name = name
+        self.done = True
+        self.error = error
+        self.response = SimpleNamespace(document_name=document_name) if error is None else None
+
+
+class _LocalPager:
+    """AsyncPager stand-in over a snapshot of items."""
+
+    def __init__(self, items: List):
+        self.items = items
+
+    async def __aiter__(self):
+        for item in self.items:
+            yield item
+
+
+class _LocalDocuments:
+    def __init__(self, client: 'LocalFileSearchClient'):
+        self._client = client
+
+    async def list(self, parent: str, config=None):
+        await self._client.request('documents.list')
+        if parent not in self._client.stores:
+            raise _not_found(parent)
+        return _LocalPager(list(self._client.documents[parent].values()))
+
+    async def delete(self, name: str, config=None):
+        await self._client.request('documents.delete')
+        store_name = name.rsplit('/documents/', 1)[0]
+        if self._client.documents.get(store_name, {}).pop(name, None) is None:
+            raise _not_found(name)
+
+
+class _LocalFileSearchStores:
+    def __init__(self, client: 'LocalFileSearchClient'):
+        self._client = client
+        self.documents = _LocalDocuments(client)
+
+    async def create(self, config=None):
+        await self._client.request('stores.create')
+        return self._client.create_store((config or {}).get('display_name'))
+
+    async def get(self, name: str, config=None):
+        await self._client.request('stores.get')
+        if name not in self._client.stores:
+            raise _not_found(name)
+        return self._client.stores[name]
+
+    async def list(self, config=None):
+        await self._client.request('stores.list')
+        return _LocalPager(list(self._client.stores.values()))
+
+    async def upload_to_file_search_store(self, file, file_search_store_name: str, config=None):
+        await self._client.request('upload')
+        if file_search_store_name not in self._client.stores:
+            raise _not_found(file_search_store_name)
+        data = file.read() if isinstance(file, io.IOBase) else Path(file).read_bytes()
+        return await self._client.import_document(file_search_store_name, data, config or {})
+
+
+class _LocalOperations:
+    def __init__(self, client: 'LocalFileSearchClient'):
+        self._client = client
+
+    async def get(self, operation):
+        await self._client.request('operations.get')
+        return await self._client.poll_operation(operation)
+
+
+class LocalFileSearchClient:
+    """
+    genai.Client stand-in holding File Search Stores in memory.
+
+    Pass it as upload_to_gemini(client=...). Subclasses can override
+    request / import_document / poll_operation to model API latency,
+    rate limiting or failed imports (see the simulator package).
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        """
+        Args:
+            directory: Write uploaded documents to <directory>/<store id>/
+                (None = keep only their metadata)
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.stores: Dict[str, SimpleNamespace] = {}
+        self.documents: Dict[str, Dict[str, SimpleNamespace]] = {}
+        self.requests: Dict[str, int] = dict.fromkeys(
+            ('stores.create', 'stores.get', 'stores.list', 'upload', 'operations.get',
+             'documents.list', 'documents.delete'),
+            0
+        )
+        self.bytes_uploaded = 0
+        self._ids = itertools.count(1)
+        self.aio = SimpleNamespace(
+            file_search_stores=_LocalFileSearchStores(self),
+            operations=_LocalOperations(self)
+        )
+
+    async def request(self, method: str):
+        """Count an API call (subclasses add latency and errors here)."""
+        self.requests[method] += 1
+
+    def create_store(self, display_name: Optional[str] = None) -> SimpleNamespace:
+        """Create an empty store (what file_search_stores.create returns)."""
+        name = f'fileSearchStores/local-{next(self._ids)}'
+        store = SimpleNamespace(
+            name=name,
+            display_name=display_name,
+            create_time=datetime.now(timezone.utc)
+        )
+        self.stores[name] = store
+        self.documents[name] = {}
+        return store
+
+    async def import_document(self, store_name: str, data: bytes, config: Dict) -> LocalOperation:
+        """
+        Add an uploaded document to a store.
+
+        Args:
+            store_name: Store resource name
+            data: Document bytes
+            config: Upload config (display_name, custom_metadata, mime_type)
+
+        Returns:
+            Finished import operation
+        """
+        document_id = next(self._ids)
+        name = f'{store_name}/documents/local-{document_id}'
+        self.documents[store_name][name] = SimpleNamespace(
+            name=name,
+            display_name=config.get('display_name'),
+            custom_metadata=[
+                SimpleNamespace(key=entry['key'], string_value=entry['string_value'])
+                for entry in config.get('custom_metadata', [])
+            ],
+            size_bytes=len(data),
+            mime_type=config.get('mime_type'),
+            state='STATE_ACTIVE',
+            create_time=datetime.now(timezone.utc)
+        )
+        self.bytes_uploaded += len(data)
+
+        if self.directory is not None:
+            store_dir = self.directory / store_name.rsplit('/', 1)[-1]
+            store_dir.mkdir(parents=True, exist_ok=True)
+            (store_dir / f'{document_id:06d}_{config.get("display_name", "document")}').write_bytes(data)
+
+        return LocalOperation(f'{store_name}/operations/local-{document_id}', document_name=name)
+
+    async def poll_operation(self, operation: LocalOperation) -> LocalOperation:
+        """Current state of an import operation (local imports finish at once)."""
+        return operation
+
+    def summary(self) -> Dict:
+        """Store contents and request counts."""
+        return {
+            'stores': len(self.stores),
+            'documents': sum(len(documents) for documents in self.documents.values()),
+            'bytes_uploaded': self.bytes_uploaded,
+            'requests': dict(self.requests)
+        }
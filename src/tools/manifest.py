@@ -0,0 +1,242 @@
+"""
+Incremental Re-indexing Manifest for Gemini Knowledge Scraper
+
+Persists a per-URL content-hash manifest in a named Apify Key-Value Store
+(one record per corpus_name), so re-runs only convert and upload pages
+that are new or changed, and delete the documents of removed pages.
+
+Uploaded documents also carry source_url/content_hash custom metadata, so
+a manifest can be rebuilt from an existing store's document listing
+(update-existing-store mode, no Key-Value Store record needed).
+
+Manifest format:
+    {
+        "corpus_name": "python-docs",
+        "file_search_store_name": "fileSearchStores/abc123",
+        "updated_at": "2025-01-01T00:00:00",
+        "pages": {
+            "<url>": {
+                "content_hash": "<sha256 of scraped content>",
+                "document_name": "fileSearchStores/abc123/documents/xyz"
+            }
+        }
+    }
+"""
+
+from typing import Dict, Iterable, List, Optional
+from pathlib import Path
+from datetime import datetime
+import hashlib
+import re
+
+# Named Key-Value Store (persists across runs, unlike the run's default store)
+MANIFEST_STORE_NAME = 'gemini-file-search-manifests'
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 hex digest of scraped page content."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def store_key(prefix: str, corpus_name: str, reserve: int = 0) -> str:
+    """
+    Key-Value Store record key for a corpus.
+
+    Record keys may only contain a-zA-Z0-9!-_.'() (max 256 chars).
+
+    Args:
+        prefix: Record type (manifest, archive, ...)
+        corpus_name: Knowledge base name
+        reserve: Characters left free for suffixes appended by the caller
+
+    Returns:
+        Record key
+    """
+    safe_name = re.sub(r"[^a-zA-Z0-9!\-_.'()]", '-', corpus_name)
+    return f"{prefix}-{safe_name}"[:256 - reserve]
+
+
+def manifest_key(corpus_name: str) -> str:
+    """Key-Value Store record key of a corpus's manifest."""
+    return store_key('manifest', corpus_name)
+
+
+async def load_manifest(kv_store, corpus_name: str) -> Optional[Dict]:
+    """
+    Load the previous run's manifest for a corpus.
+
+    Args:
+        kv_store: Apify Key-Value Store (Actor.open_key_value_store(name=MANIFEST_STORE_NAME))
+        corpus_name: Knowledge base name
+
+    Returns:
+        Manifest dict, or None on first run
+    """
+    return await kv_store.get_value(manifest_key(corpus_name))
+
+
+async def save_manifest(kv_store, manifest: Dict):
+    """Persist a manifest (from ManifestTracker.to_manifest) for the next run."""
+    await kv_store.set_value(manifest_key(manifest['corpus_name']), manifest)
+
+
+def manifest_from_documents(corpus_name: str, store_name: str, documents: Iterable) -> Dict:
+    """
+    Rebuild a manifest from the documents already in a File Search Store.
+
+    Documents are matched to pages by their source_url/content_hash custom
+    metadata. Documents without it (uploaded by older versions), failed
+    imports and repeat uploads of a URL are recorded under a placeholder
+    key no crawl URL matches, so they are deleted as removed pages once
+    the run's uploads finish.
+
+    Args:
+        corpus_name: Knowledge base name
+        store_name: Store resource name
+        documents: genai Document objects (gemini_uploader.list_store_documents)
+
+    Returns:
+        Manifest dict (same format as the Key-Value Store record)
+    """
+    pages = {}
+    for document in documents:
+        metadata = {m.key: m.string_value for m in document.custom_metadata or []}
+        url = metadata.get('source_url')
+        digest = metadata.get('content_hash')
+        failed = str(document.state).endswith('STATE_FAILED')
+
+        if url and digest and not failed and url not in pages:
+            pages[url] = {'content_hash': digest, 'document_name': document.name}
+        else:
+            pages[f'document:{document.name}'] = {'content_hash': '', 'document_name': document.name}
+
+    return {
+        'corpus_name': corpus_name,
+        'file_search_store_name': store_name,
+        'updated_at': datetime.now().isoformat(),
+        'pages': pages
+    }
+
+
+class ManifestTracker:
+    """
+    Tracks which pages of the current crawl need (re-)indexing.
+
+    Usage:
+        1. Conversion calls check(url, content) per page and skips pages
+           that return False (unchanged since the previous run)
+        2. Conversion calls record_document(url, filename) for each
+           document it writes
+        3. Upload calls record_uploads(uploaded_files) and deletes
+           stale_documents() (old versions + removed pages)
+        4. to_manifest() builds the manifest to save for the next run
+    """
+
+    def __init__(self, corpus_name: str, previous: Optional[Dict] = None):
+        """
+        Args:
+            corpus_name: Knowledge base name
+            previous: Manifest from the previous run (None = index everything)
+        """
+        self.corpus_name = corpus_name
+        self.store_name = previous.get('file_search_store_name') if previous else None
+        self.previous_pages: Dict[str, Dict] = previous.get('pages', {}) if previous else {}
+        self.pages: Dict[str, Dict] = {}
+        self.files: Dict[str, str] = {}  # Document filename → URL
+        self.counts = {'new': 0, 'changed': 0, 'unchanged': 0, 'duplicate': 0}
+
+    def check(self, url: str, content: str) -> bool:
+        """
+        Record a scraped page and decide whether it needs indexing.
+
+        Args:
+            url: Page URL
+            content: Raw scraped content (HTML/markdown/text)
+
+        Returns:
+            True if the page is new or changed, False if it can be skipped
+            (unchanged, or a repeat of a URL already seen in this crawl)
+        """
+        if url in self.pages:
+            self.counts['duplicate'] += 1
+            return False
+
+        digest = content_hash(content)
+        previous = self.previous_pages.get(url)
+
+        if previous and previous['content_hash'] == digest and previous.get('document_name'):
+            self.pages[url] = dict(previous)
+            self.counts['unchanged'] += 1
+            return False
+
+        self.pages[url] = {'content_hash': digest, 'document_name': None}
+        self.counts['changed' if previous else 'new'] += 1
+        return True
+
+    def record_document(self, url: str, filename: str):
+        """Associate a converted document file with its page."""
+        self.files[filename] = url
+
+    def document_metadata(self, doc_path: Path) -> Optional[Dict[str, str]]:
+        """Custom metadata identifying a document's page (for the uploader)."""
+        url = self.files.get(doc_path.name)
+        if url is None:
+            return None
+        return {'source_url': url, 'content_hash': self.pages[url]['content_hash']}
+
+    def record_uploads(self, uploaded_files: List[Dict]):
+        """Store Gemini document names for uploaded files (uploader metadata dicts)."""
+        for file_metadata in uploaded_files:
+            url = self.files.get(file_metadata['name'])
+            if url is not None and file_metadata.get('document_name'):
+                self.pages[url]['document_name'] = file_metadata['document_name']
+
+    def removed_urls(self) -> List[str]:
+        """URLs indexed by the previous run but missing from this crawl."""
+        return [url for url in self.previous_pages if url not in self.pages]
+
+    def stale_documents(self) -> List[str]:
+        """
+        Gemini documents to delete after upload.
+
+        - Documents of removed pages
+        - Old versions of changed pages, once the new version is uploaded
+          (if re-upload failed, the old version is kept)
+        """
+        stale = []
+        for url, previous in self.previous_pages.items():
+            old_name = previous.get('document_name')
+            if not old_name:
+                continue
+
+            current = self.pages.get(url)
+            if current is None:
+                stale.append(old_name)
+            elif current['document_name'] and current['document_name'] != old_name:
+                stale.append(old_name)
+        return stale
+
+    def to_manifest(self, store_name: str) -> Dict:
+        """
+        Build the manifest to persist for the next run.
+
+        Pages whose upload failed are recorded with their previous entry
+        (if any) so the next run retries them.
+        """
+        pages = {}
+        for url, entry in self.pages.items():
+            if entry['document_name']:
+                pages[url] = entry
+            elif url in self.previous_pages:
+                pages[url] = self.previous_pages[url]
+
+        return {
+            'corpus_name': self.corpus_name,
+            'file_search_store_name': store_name,
+            'updated_at': datetime.now().isoformat(),
+            'pages': pages
+        }
+
+    def summary(self) -> Dict:
+        """Page counts for run output."""
+        return {**self.counts, 'removed': len(self.removed_urls())}
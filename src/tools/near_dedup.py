@@ -0,0 +1,243 @@
+"""
+Near-Duplicate Page Detection for Gemini Knowledge Scraper
+
+Docs sites serve many near-identical pages (versioned copies, print views,
+query-parameter variants). Indexing each one costs tokens and import time
+and adds duplicate chunks to search results. This module drops them
+before upload.
+
+Key functions:
+- Word shingling of the cleaned document text
+- MinHash signatures via one-permutation hashing (one hash per shingle
+  instead of one per shingle per permutation - pure Python stays fast)
+- LSH banding: each page is compared only with pages sharing a band,
+  so detection scales sub-quadratically to tens of thousands of pages
+- One canonical document per cluster (the first one seen), dropped URLs
+  reported with the page they duplicate
+
+Signatures are computed next to conversion (in the process pool workers);
+only the LSH lookup runs in the parent process.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import hashlib
+
+# Estimated Jaccard similarity of word shingles above which a page is a duplicate
+DEFAULT_SIMILARITY_THRESHOLD = 0.9
+
+# Signature length (hash bins)
+DEFAULT_NUM_PERM = 128
+
+# Words per shingle
+DEFAULT_SHINGLE_SIZE = 5
+
+# Probability that a pair right at the threshold shares an LSH band
+DEFAULT_LSH_RECALL = 0.95
+
+_MASK64 = (1 << 64) - 1
+
+# Offset added per step when an empty bin borrows a neighbour's value
+# (rotation densification - keeps borrowed values distinct from real ones)
+_DENSIFY_OFFSET = 1 << 61
+
+
+def _hash64(shingle: str) -> int:
+    """Stable 64-bit shingle hash (same value in every process and run)."""
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class MinHasher:
+    """
+    MinHash signatures of document text (picklable - runs in pool workers).
+
+    One-permutation hashing: every shingle is hashed once; the hash picks a
+    bin and the rest of it competes for that bin's minimum. Empty bins
+    (short documents) borrow from the next non-empty bin.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE):
+        """
+        Args:
+            num_perm: Signature length
+            shingle_size: Words per shingle
+
+        Raises:
+            ValueError: If either value is < 1
+        """
+        if num_perm < 1 or shingle_size < 1:
+            raise ValueError(f"num_perm and shingle_size must be >= 1, got {num_perm}, {shingle_size}")
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """
+        MinHash signature of a text.
+
+        Args:
+            text: Cleaned document text
+
+        Returns:
+            Tuple of num_perm ints, or None for texts without words
+        """
+        words = text.lower().split()
+        if not words:
+            return None
+
+        num_perm = self.num_perm
+        size = self.shingle_size
+        empty = _MASK64 + 1
+        bins = [empty] * num_perm
+        for i in range(max(1, len(words) - size + 1)):
+            h = _hash64(' '.join(words[i:i + size]))
+            slot = h % num_perm
+            value = h // num_perm
+            if value < bins[slot]:
+                bins[slot] = value
+
+        return tuple(self._densify(bins, empty))
+
+    @staticmethod
+    def _densify(bins: List[int], empty: int) -> List[int]:
+        """Fill empty bins from the next non-empty bin to the right (circular)."""
+        if empty not in bins:
+            return bins
+
+        num_perm = len(bins)
+        filled = list(bins)
+        for i in range(num_perm):
+            if bins[i] != empty:
+                continue
+            for distance in range(1, num_perm):
+                neighbour = bins[(i + distance) % num_perm]
+                if neighbour != empty:
+                    filled[i] = neighbour + distance * _DENSIFY_OFFSET
+                    break
+        return filled
+
+
+def estimate_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity: fraction of equal signature positions."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def lsh_params(threshold: float, num_perm: int, recall: float = DEFAULT_LSH_RECALL) -> Tuple[int, int]:
+    """
+    LSH bands and rows (bands × rows <= num_perm) for a similarity threshold.
+
+    A pair with similarity s shares at least one band with probability
+    1 - (1 - s^rows)^bands. Picks the split that reaches `recall` at the
+    threshold with the fewest candidates below it (each candidate costs a
+    signature comparison; a missed pair costs an indexed duplicate).
+
+    Args:
+        threshold: Similarity threshold (0-1]
+        num_perm: Signature length
+        recall: Minimum candidate probability at the threshold
+
+    Returns:
+        (bands, rows)
+    """
+    steps = 100
+    width = threshold / steps
+    best = None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            def candidate(s):
+                return 1 - (1 - s ** rows) ** bands
+
+            at_threshold = candidate(threshold)
+            # False positive area: integral of candidate(s) over [0, threshold)
+            false_positives = sum(candidate((i + 0.5) * width) for i in range(steps)) * width
+            key = (at_threshold < recall, -at_threshold if at_threshold < recall else false_positives)
+            if best is None or key < best[0]:
+                best = (key, bands, rows)
+    return best[1], best[2]
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of canonical documents; flags pages too similar to one.
+
+    Example:
+        >>> index = NearDuplicateIndex(threshold=0.9)
+        >>> index.add('https://a', index.hasher.signature(text_a))
+        None
+        >>> index.add('https://a?print=1', index.hasher.signature(text_a))
+        'https://a'
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE
+    ):
+        """
+        Args:
+            threshold: Similarity (0-1] at or above which pages are duplicates
+            num_perm: Signature length (more = more accurate, slower)
+            shingle_size: Words per shingle
+
+        Raises:
+            ValueError: If threshold is not in (0, 1]
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self._buckets: List[Dict[Tuple[int, ...], List[str]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        self.duplicates: List[Dict] = []
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def add(self, url: str, signature: Optional[Tuple[int, ...]]) -> Optional[str]:
+        """
+        Check a page against the canonical documents, indexing it if new.
+
+        Args:
+            url: Page URL
+            signature: MinHash signature from self.hasher (None = never a
+                duplicate, e.g. empty documents)
+
+        Returns:
+            URL of the canonical page this one duplicates, or None if the
+            page is kept (it becomes canonical for later pages)
+        """
+        if signature is None:
+            return None
+
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best_url, best_similarity = None, 0.0
+        for candidate in candidates:
+            similarity = estimate_similarity(signature, self._signatures[candidate])
+            if similarity > best_similarity:
+                best_url, best_similarity = candidate, similarity
+
+        if best_url is not None and best_similarity >= self.threshold:
+            self.duplicates.append({
+                'url': url,
+                'duplicate_of': best_url,
+                'similarity': round(best_similarity, 3)
+            })
+            return best_url
+
+        self._signatures[url] = signature
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(url)
+        return None
+
+    def summary(self) -> Dict:
+        """Counts for logs and run output."""
+        return {
+            'canonical': len(self._signatures),
+            'dropped': len(self.duplicates),
+            'threshold': self.threshold
+        }
@@ -0,0 +1,211 @@
+"""
+Noise Removal Engine for Gemini Knowledge Scraper
+
+Decides which elements of a parsed page are noise (scripts, navigation,
+ads, cookie banners, ...) in a single tree walk, using one precompiled
+matcher instead of one find_all sweep per rule.
+
+Rules cover:
+- Tag names (script, style, nav, ...)
+- Class patterns (regex, case-insensitive, searched in the class attribute)
+- Id patterns (regex, case-insensitive, matching whole '-'/'_'-separated
+  parts of the id: 'ads' drops id="sidebar-ads" but not id="downloads")
+- ARIA roles (exact match on any role token)
+
+Rule sets are configurable from actor input (see NoiseFilter.from_config).
+"""
+
+from typing import Dict, Iterable, List, Optional
+from bs4 import Tag
+import re
+
+# Elements that never carry page content
+DEFAULT_NOISE_TAGS = ('script', 'style', 'nav', 'footer', 'iframe', 'noscript')
+
+# Common ad/tracking class and id fragments
+DEFAULT_NOISE_PATTERNS = (
+    'advertisement', 'ads', 'ad-container', 'sponsored',
+    'tracking', 'analytics', 'cookie-banner', 'popup'
+)
+
+# Landmark roles equivalent to <nav> and <footer>
+DEFAULT_NOISE_ROLES = ('navigation', 'contentinfo')
+
+
+def _combine(patterns: Iterable[str], whole_tokens: bool = False) -> Optional['re.Pattern']:
+    """
+    One case-insensitive alternation for a list of regex fragments (None if empty).
+
+    With whole_tokens, a match must start and end at the string's ends or
+    at a '-'/'_' separator.
+    """
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    alternation = '|'.join(f'(?:{pattern})' for pattern in patterns)
+    if whole_tokens:
+        alternation = rf'(?:^|(?<=[-_]))(?:{alternation})(?=$|[-_])'
+    return re.compile(alternation, re.I)
+
+
+class NoiseFilter:
+    """
+    Precompiled noise rules, applied to a parsed tree in one walk.
+
+    Example:
+        >>> noise_filter = NoiseFilter(class_patterns=['promo'])
+        >>> noise_filter.strip(soup)
+        3
+    """
+
+    def __init__(
+        self,
+        tags: Iterable[str] = DEFAULT_NOISE_TAGS,
+        class_patterns: Iterable[str] = DEFAULT_NOISE_PATTERNS,
+        id_patterns: Iterable[str] = DEFAULT_NOISE_PATTERNS,
+        roles: Iterable[str] = DEFAULT_NOISE_ROLES
+    ):
+        """
+        Args:
+            tags: Tag names to drop
+            class_patterns: Regex fragments searched in the class attribute
+            id_patterns: Regex fragments matching whole '-'/'_'-separated
+                parts of the id attribute (ids are often single words like
+                "downloads" or "threads", so substrings would over-match)
+            roles: ARIA roles to drop
+
+        Raises:
+            re.error: If a pattern is not a valid regex
+        """
+        self.tags = frozenset(tag.lower() for tag in tags)
+        self.class_patterns = list(class_patterns)
+        self.id_patterns = list(id_patterns)
+        self.roles = frozenset(role.lower() for role in roles)
+        self._class_re = _combine(self.class_patterns)
+        self._id_re = _combine(self.id_patterns, whole_tokens=True)
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> 'NoiseFilter':
+        """
+        Build a filter from actor input.
+
+        Config format (every key optional):
+            {
+                "tags": ["aside"],
+                "class_patterns": ["promo", "newsletter"],
+                "id_patterns": ["comments"],
+                "roles": ["complementary"],
+                "replace_defaults": false
+            }
+
+        Rules extend the defaults unless replace_defaults is true.
+
+        Args:
+            config: Noise rule config (None = defaults)
+
+        Returns:
+            NoiseFilter
+
+        Raises:
+            ValueError: If the config has unknown keys or invalid patterns
+        """
+        config = dict(config or {})
+        replace = config.pop('replace_defaults', False)
+
+        unknown = set(config) - {'tags', 'class_patterns', 'id_patterns', 'roles'}
+        if unknown:
+            raise ValueError(f"Unknown noise rule keys: {sorted(unknown)}")
+
+        def rules(key: str, defaults: Iterable[str]) -> List[str]:
+            extra = list(config.get(key, []))
+            return extra if replace else list(defaults) + extra
+
+        try:
+            return cls(
+                tags=rules('tags', DEFAULT_NOISE_TAGS),
+                class_patterns=rules('class_patterns', DEFAULT_NOISE_PATTERNS),
+                id_patterns=rules('id_patterns', DEFAULT_NOISE_PATTERNS),
+                roles=rules('roles', DEFAULT_NOISE_ROLES)
+            )
+        except re.error as e:
+            raise ValueError(f"Invalid noise rule pattern: {e}")
+
+    def is_noise(self, name: str, attrs: Dict) -> bool:
+        """
+        Check one element against every rule.
+
+        Args:
+            name: Tag name
+            attrs: Attribute dict (class may be a list of tokens or a string)
+
+        Returns:
+            True if the element should be dropped
+        """
+        if name in self.tags:
+            return True
+        if not attrs:
+            return False
+
+        if self._class_re is not None:
+            classes = attrs.get('class')
+            if classes:
+                if not isinstance(classes, str):
+                    classes = ' '.join(classes)
+                if self._class_re.search(classes):
+                    return True
+
+        if self._id_re is not None:
+            element_id = attrs.get('id')
+            if element_id and self._id_re.search(element_id):
+                return True
+
+        if self.roles:
+            role = attrs.get('role')
+            if role and not self.roles.isdisjoint(role.lower().split()):
+                return True
+
+        return False
+
+    def find_noise(self, root: Tag) -> List[Tag]:
+        """
+        Walk the tree once and collect the top-most noise elements.
+
+        Subtrees of matched elements are not visited - they go away with
+        their ancestor.
+
+        Args:
+            root: BeautifulSoup document or element
+
+        Returns:
+            Elements to drop (document order not guaranteed)
+        """
+        doomed = []
+        stack = [root]
+        while stack:
+            for child in stack.pop().contents:
+                if not isinstance(child, Tag):
+                    continue
+                if self.is_noise(child.name, child.attrs):
+                    doomed.append(child)
+                else:
+                    stack.append(child)
+        return doomed
+
+    def strip(self, root: Tag) -> int:
+        """
+        Remove noise elements from a parsed tree in place.
+
+        Args:
+            root: BeautifulSoup document or element
+
+        Returns:
+            Number of elements removed (top-most only)
+        """
+        doomed = self.find_noise(root)
+        for element in doomed:
+            element.decompose()
+        return len(doomed)
+
+
+# Shared default instance (rules compiled once per process)
+DEFAULT_NOISE_FILTER = NoiseFilter()
@@ -0,0 +1,167 @@
+"""
+Scraper Output Adapters for Gemini Knowledge Scraper
+
+Scrapers in the library return different dataset shapes: the Website
+Content Crawler saves `markdown` and `text`, Cheerio/BeautifulSoup scrapers
+return `html`, AI scrapers return text or markdown. An adapter knows, for
+one output_format, which item fields hold the page content and what kind
+of content each one is.
+
+Key functions:
+- Adapter registry keyed by scraper_library output_format
+- Per-dataset field resolution (the field that worked is tried first)
+- Content type per field: html goes through the HTML parser backends,
+  markdown/text take a lightweight passthrough (no parsing)
+- Page titles from scraper metadata (metadata.title, title)
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+from .scraper_library import get_scraper_library
+
+CONTENT_TYPES = ('html', 'markdown', 'text')
+
+# Item fields holding a page title (website-content-crawler: metadata.title)
+DEFAULT_TITLE_FIELDS = ('metadata.title', 'title')
+
+
+def get_field(item: Dict, path: str):
+    """Value of a dotted field path ('crawl.html'), None if missing."""
+    value = item
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class FieldResolver:
+    """
+    Reads content from one dataset's items.
+
+    The first field that yields content is remembered and tried first for
+    every following item, so a dataset's items are normally read with a
+    single lookup. Items missing that field fall back to the full list.
+    """
+
+    def __init__(self, fields: Sequence[Tuple[str, str]], title_fields: Sequence[str]):
+        """
+        Args:
+            fields: (field path, content type) candidates in priority order
+            title_fields: Field paths holding a page title
+        """
+        self.fields = list(fields)
+        self.title_fields = list(title_fields)
+        self.field: Optional[Tuple[str, str]] = None
+
+    def read(self, item: Dict) -> Optional[Tuple[str, str, Optional[str]]]:
+        """
+        Pick an item's content.
+
+        Args:
+            item: Dataset item dict
+
+        Returns:
+            (content, content_type, title) - title is None if the item has
+            none - or None if no field has content
+        """
+        candidates = self.fields if self.field is None else [self.field] + self.fields
+        for field in candidates:
+            content = get_field(item, field[0])
+            if content and isinstance(content, str):
+                self.field = field
+                return content, field[1], self.title(item)
+        return None
+
+    def title(self, item: Dict) -> Optional[str]:
+        """Title the scraper recorded for an item (None if it has none)."""
+        for path in self.title_fields:
+            title = get_field(item, path)
+            if title and isinstance(title, str):
+                return title.strip()
+        return None
+
+    def describe(self) -> str:
+        """Field names tried, for skip messages."""
+        return ', '.join(path for path, _ in self.fields)
+
+
+class OutputAdapter:
+    """How to read the datasets of scrapers with one output_format."""
+
+    def __init__(
+        self,
+        output_format: str,
+        fields: Sequence[Tuple[str, str]],
+        title_fields: Sequence[str] = DEFAULT_TITLE_FIELDS
+    ):
+        """
+        Args:
+            output_format: scraper_library output_format this adapter reads
+            fields: (field path, content type) candidates in priority order
+            title_fields: Field paths holding a page title (html pages use
+                their own <title> instead)
+        """
+        for path, content_type in fields:
+            if content_type not in CONTENT_TYPES:
+                raise ValueError(f"Unknown content type '{content_type}' for field '{path}'")
+        self.output_format = output_format
+        self.fields = list(fields)
+        self.title_fields = list(title_fields)
+
+    def resolver(self, html_field: str = 'html') -> FieldResolver:
+        """
+        Fresh field resolver for one dataset.
+
+        Args:
+            html_field: Caller's HTML field name (converter html_field
+                argument), tried just before the standard html field
+
+        Returns:
+            FieldResolver
+        """
+        fields: List[Tuple[str, str]] = list(self.fields)
+        if (html_field, 'html') not in fields:
+            fields.insert(fields.index(('html', 'html')), (html_field, 'html'))
+        return FieldResolver(fields, self.title_fields)
+
+
+# ========== REGISTRY ==========
+
+# Fallback fields shared by every adapter, after its preferred ones
+_COMMON_FIELDS = [
+    ('html', 'html'),
+    ('text', 'text'),
+    ('markdown', 'markdown'),
+    ('content', 'html'),
+    ('crawl.html', 'html')
+]
+
+
+def _fields(*preferred: Tuple[str, str]) -> List[Tuple[str, str]]:
+    return list(preferred) + [field for field in _COMMON_FIELDS if field not in preferred]
+
+
+OUTPUT_ADAPTERS: Dict[str, OutputAdapter] = {
+    'html': OutputAdapter('html', _fields(('html', 'html'))),
+    'markdown': OutputAdapter('markdown', _fields(('markdown', 'markdown'), ('text', 'text'))),
+    'text': OutputAdapter('text', _fields(('text', 'text'), ('markdown', 'markdown')))
+}
+
+# Unknown scrapers: original field order, html first
+DEFAULT_OUTPUT_ADAPTER = OUTPUT_ADAPTERS['html']
+
+
+def get_output_adapter(scraper_id: Optional[str] = None) -> OutputAdapter:
+    """
+    Adapter for a scraper's dataset, by its scraper_library output_format.
+
+    Args:
+        scraper_id: Apify actor id (e.g. 'apify/website-content-crawler')
+
+    Returns:
+        OutputAdapter (DEFAULT_OUTPUT_ADAPTER for scrapers not in the library)
+    """
+    for scraper in get_scraper_library():
+        if scraper['id'] == scraper_id:
+            return OUTPUT_ADAPTERS.get(scraper.get('output_format'), DEFAULT_OUTPUT_ADAPTER)
+    return DEFAULT_OUTPUT_ADAPTER
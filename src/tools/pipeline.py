@@ -0,0 +1,188 @@
+"""
+Streaming Pipeline for Gemini Knowledge Scraper
+
+Wires scrape → convert → upload together as concurrent producer/consumer
+stages connected by bounded asyncio queues:
+
+    dataset items ──▶ [items queue] ──▶ convert ──▶ [documents queue] ──▶ upload
+
+- Pages are converted as soon as they arrive from the dataset (optionally
+  across a process pool, output order unchanged)
+- Documents are uploaded as soon as they are converted (or, with a
+  packer, as soon as their pack is full); oversized documents are split
+  into parts first when a splitter is given
+- In memory, documents travel as encoded bytes on their records and are
+  streamed to Gemini without touching the disk
+- Bounded queues give backpressure: a slow upload stage stalls conversion,
+  which stalls dataset reads, instead of buffering the whole crawl
+
+End-to-end latency approaches max(phase) instead of sum(phases).
+"""
+
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Optional
+from pathlib import Path
+import asyncio
+import time
+from .document_converter import iterate_converted_documents
+from .manifest import ManifestTracker
+from .noise_filter import NoiseFilter
+from .html_backends import ParserBackend
+from .output_adapters import OutputAdapter
+from .near_dedup import NearDuplicateIndex
+from .boilerplate import BoilerplateFilter
+from .exact_dedup import ExactDuplicateFilter
+from .token_counter import TokenCounter
+from .document_record import DocumentRecord
+from .document_packer import DocumentPacker
+from .chunker import DocumentSplitter
+
+# Max items waiting between two stages
+DEFAULT_QUEUE_SIZE = 32
+
+# Marks the end of a stage's output
+_DONE = object()
+
+
+async def _drain(queue: asyncio.Queue) -> AsyncIterator[Any]:
+    """Yield queue entries until the end-of-stream marker."""
+    while True:
+        entry = await queue.get()
+        if entry is _DONE:
+            return
+        yield entry
+
+
+async def run_document_pipeline(
+    dataset_items: AsyncIterable[Dict],
+    output_dir: Path,
+    upload: Callable[[AsyncIterator[DocumentRecord]], Awaitable[Any]],
+    url_field: str = 'url',
+    html_field: str = 'html',
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    manifest: Optional[ManifestTracker] = None,
+    workers: int = 1,
+    noise_filter: Optional[NoiseFilter] = None,
+    backend: Optional[ParserBackend] = None,
+    adapter: Optional[OutputAdapter] = None,
+    near_duplicates: Optional[NearDuplicateIndex] = None,
+    boilerplate: Optional[BoilerplateFilter] = None,
+    duplicates: Optional[ExactDuplicateFilter] = None,
+    token_counter: Optional[TokenCounter] = None,
+    packer: Optional[DocumentPacker] = None,
+    splitter: Optional[DocumentSplitter] = None,
+    in_memory: bool = False
+) -> Dict:
+    """
+    Run scrape → convert → upload as a streaming pipeline.
+
+    Args:
+        dataset_items: Async iterator of scraped dataset items
+            (e.g. dataset_reader.iterate_run_dataset_items)
+        output_dir: Directory to save documents
+        upload: Coroutine function consuming an async iterator of document
+            records (e.g. a partial of gemini_uploader.upload_to_gemini)
+        url_field: Field name containing URL
+        html_field: Field name containing HTML
+        queue_size: Capacity of each inter-stage queue
+        manifest: Incremental re-indexing tracker - unchanged pages are
+            not converted or uploaded (None = convert everything)
+        workers: Conversion processes (1 = a single worker thread)
+        noise_filter: Noise rules for HTML cleaning (None = defaults)
+        backend: HTML parser backend (None = BeautifulSoup)
+        adapter: Scraper output adapter (None = html-first field order)
+        near_duplicates: Near-duplicate index - pages too similar to an
+            earlier page are not uploaded (None = keep every page)
+        boilerplate: Cross-page boilerplate filter - lines repeated on
+            most pages are stripped before upload (None = keep every line)
+        duplicates: Exact duplicate filter - pages whose canonical URL or
+            content was already seen are not parsed or uploaded
+            (None = keep every page)
+        token_counter: Counts each document's tokens as it is written
+            (None = estimate_tokens)
+        packer: Bundles small page documents into larger upload
+            documents (None = one upload per page)
+        splitter: Splits documents above a token threshold into parts
+            before packing (None = upload documents whole)
+        in_memory: Keep documents in memory and upload them from there
+            instead of writing files to output_dir
+
+    Returns:
+        Dict with:
+        - items: Number of dataset items read
+        - documents: Records of created page documents (dataset order,
+          after splitting, before packing; without their in-memory text,
+          which is released once uploaded)
+        - upload_result: Return value of `upload`
+        - timings: Seconds from start until each stage finished, plus total
+
+    Raises:
+        The first exception raised by any stage (other stages are cancelled)
+    """
+    if queue_size < 1:
+        raise ValueError(f"queue_size must be >= 1, got {queue_size}")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    item_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    document_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    documents = []
+    timings = {}
+    item_count = 0
+    start = time.monotonic()
+
+    async def read_stage():
+        nonlocal item_count
+        async for item in dataset_items:
+            await item_queue.put(item)
+            item_count += 1
+
+        timings['read_seconds'] = time.monotonic() - start
+        await item_queue.put(_DONE)
+
+    async def convert_stage():
+        # CPU-bound parsing runs off the event loop
+        async for record in iterate_converted_documents(
+            _drain(item_queue), output_dir, url_field, html_field, manifest, workers,
+            noise_filter, backend, adapter, near_duplicates, boilerplate, duplicates, token_counter, in_memory
+        ):
+            for part in splitter.split(record) if splitter is not None else [record]:
+                documents.append(part.without_data())
+                for ready in packer.add(part) if packer is not None else [part]:
+                    await document_queue.put(ready)
+
+        if packer is not None:
+            for ready in packer.flush():
+                await document_queue.put(ready)
+
+        timings['convert_seconds'] = time.monotonic() - start
+        await document_queue.put(_DONE)
+
+    async def upload_stage():
+        result = await upload(_drain(document_queue))
+        timings['upload_seconds'] = time.monotonic() - start
+        return result
+
+    tasks = [
+        asyncio.create_task(read_stage()),
+        asyncio.create_task(convert_stage()),
+        asyncio.create_task(upload_stage())
+    ]
+
+    try:
+        _, _, upload_result = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+    timings['total_seconds'] = time.monotonic() - start
+
+    print(f"\n⏱️  Pipeline finished in {timings['total_seconds']:.1f}s")
+    print(f"   Stage finished at: read {timings['read_seconds']:.1f}s | convert {timings['convert_seconds']:.1f}s | upload {timings['upload_seconds']:.1f}s")
+
+    return {
+        'items': item_count,
+        'documents': documents,
+        'upload_result': upload_result,
+        'timings': timings
+    }
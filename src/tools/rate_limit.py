@@ -0,0 +1,182 @@
+"""
+Rate Limiting and Retry Module for Gemini Knowledge Scraper
+
+Client-side protection for Gemini File Search API calls, so one transient
+429/5xx doesn't abort a run after the scrape has already been paid for.
+
+Key components:
+- TokenBucket: async token-bucket rate limiter (shared by all callers)
+- RetryPolicy: jittered exponential backoff settings
+- call_with_retry: run an API call under the limiter with retries
+- is_retryable: classify errors as transient (retry) or permanent
+"""
+
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import random
+import time
+import httpx
+from google.genai import errors
+
+# Requests per second across all Gemini File Search calls
+DEFAULT_RATE_LIMIT = 10.0
+
+# Attempts per API call (1 = no retries)
+DEFAULT_MAX_RETRIES = 5
+
+# HTTP status codes worth retrying (timeouts, rate limits, server errors)
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `burst`. Callers
+    are served in FIFO order. A 429 response can drain the bucket so every
+    caller backs off together instead of hammering the API.
+
+    Example:
+        >>> limiter = TokenBucket(rate=10)
+        >>> await limiter.acquire()
+        >>> await client.aio.file_search_stores.create(...)
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second (requests/sec)
+            burst: Bucket capacity (default: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0, got {rate}")
+
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until `tokens` are available, then take them."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+    def drain(self, seconds: float):
+        """Empty the bucket so no tokens are available for `seconds`."""
+        self._refill()
+        self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff settings.
+
+    Delay before retry n (1-based) is uniform in [0, min(max_delay, base_delay * 2^(n-1))]
+    ("full jitter"), which spreads retries from concurrent uploads apart.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0
+    ):
+        """
+        Args:
+            max_attempts: Total attempts per call (including the first)
+            base_delay: Backoff ceiling for the first retry (seconds)
+            max_delay: Maximum backoff ceiling (seconds)
+        """
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be >= 1, got {max_attempts}")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retrying after failed attempt number `attempt`."""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Check whether an API error is transient.
+
+    Retryable:
+    - Gemini API errors with 408/429/5xx status
+    - Network-level failures (connection resets, read timeouts)
+
+    Args:
+        error: Exception raised by a Gemini SDK call
+
+    Returns:
+        True if the call should be retried
+    """
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+
+    return isinstance(error, (httpx.TransportError, ConnectionError, asyncio.TimeoutError))
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Check whether an error is a 429 (quota/rate limit exceeded)."""
+    return isinstance(error, errors.APIError) and error.code == 429
+
+
+async def call_with_retry(
+    fn: Callable[..., Awaitable[Any]],
+    *args,
+    limiter: Optional[TokenBucket] = None,
+    policy: Optional[RetryPolicy] = None,
+    **kwargs
+) -> Any:
+    """
+    Call an async API function under the rate limiter, retrying transient errors.
+
+    Args:
+        fn: Async SDK method (e.g. client.aio.file_search_stores.create)
+        *args, **kwargs: Passed through to fn
+        limiter: Shared token bucket (None = unlimited)
+        policy: Retry policy (default: RetryPolicy())
+
+    Returns:
+        Result of fn
+
+    Raises:
+        The last error, if it is not retryable or attempts are exhausted
+    """
+    if policy is None:
+        policy = RetryPolicy()
+
+    attempt = 1
+    while True:
+        if limiter is not None:
+            await limiter.acquire()
+
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            if not is_retryable(e) or attempt >= policy.max_attempts:
+                raise
+
+            delay = policy.delay(attempt)
+            if limiter is not None and is_rate_limited(e):
+                # Quota hit - pause every caller, not just this one
+                limiter.drain(delay)
+
+            print(f"      ⚠️  Transient error ({e}), retry {attempt}/{policy.max_attempts - 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
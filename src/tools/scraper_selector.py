@@ -14,7 +14,7 @@ Banned categories (Section 2.3):
 """
 
 from typing import List, Dict, Optional, Tuple
-from apify_client import ApifyClient
+from apify_client import ApifyClientAsync
 import re
 from .scraper_library import (
     get_scraper_library,
@@ -243,7 +243,7 @@ def classify_target(url: str) -> str:
 
 
 async def find_and_select_scrapers(
-    apify_client: ApifyClient,
+    apify_client: ApifyClientAsync,
     target: str,
     budget_mode: str = 'optimal',
     top_n: int = 3
@@ -259,7 +259,8 @@ async def find_and_select_scrapers(
     5. Return top N with fallbacks
 
     Args:
-        apify_client: Initialized Apify client
+        apify_client: Async Apify client (unused: scrapers come from the
+            static production library, so selection makes no API calls)
         target: Target URL or domain
         budget_mode: 'minimal', 'optimal', or 'premium'
         top_n: Number of scrapers to return
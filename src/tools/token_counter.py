@@ -0,0 +1,286 @@
+"""
+Token Counting for Gemini Knowledge Scraper
+
+Indexing is billed per token, and `len(text) // 5` can be off by 30% or
+more on code-heavy or non-English pages. This module counts tokens
+locally (no API calls) behind one interface, so the cost estimate and the
+uploader's summary use the same numbers.
+
+Counters:
+- heuristic: len(text) // 5 - the original estimate, fastest (default)
+- sentencepiece: exact counts from a SentencePiece .model file (optional
+  `sentencepiece` package; falls back to the default when unavailable)
+- subword: regex pre-tokenizer with per-piece subword estimates (words
+  split at case changes, digits one token each, CJK one per character,
+  punctuation runs, indentation). Pure Python, no model. Its per-piece
+  costs are not calibrated against a real tokenizer, so it is a
+  different estimate, not a more accurate one - use sentencepiece when
+  the numbers matter
+
+Key functions:
+- Batched API over many texts/documents (count_many, count_documents)
+- Memoization by content hash (LRU, shared across the run's cost reports)
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+import math
+import re
+from .manifest import content_hash
+
+# Characters per token of the heuristic counter (technical English)
+DEFAULT_CHARS_PER_TOKEN = 5
+
+# Memoized counts (one entry per distinct text)
+DEFAULT_CACHE_SIZE = 65536
+
+# Documents read per count_many() call in count_documents()
+DEFAULT_BATCH_SIZE = 64
+
+DEFAULT_TOKEN_COUNTER = 'heuristic'
+
+
+class TokenCounter(ABC):
+    """
+    Base class: count tokens of many texts at once, memoized by content hash.
+
+    Subclasses implement _count_batch().
+    """
+
+    name = ''
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            cache_size: Memoized counts kept (0 = no memoization)
+        """
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[str, int]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _count_batch(self, texts: Sequence[str]) -> List[int]:
+        """Token counts of texts (no memoization)."""
+
+    def count(self, text: str) -> int:
+        """Token count of one text."""
+        return self.count_many([text])[0]
+
+    def measure(self, text: str) -> int:
+        """Token count of a text fragment, not memoized (for pieces that won't repeat)."""
+        self.misses += 1
+        return self._count_batch([text])[0]
+
+    def count_many(self, texts: Iterable[str]) -> List[int]:
+        """
+        Token counts of many texts.
+
+        Texts seen before (same content hash) are not counted again;
+        the rest go to the counter in a single batch.
+
+        Args:
+            texts: Texts to count
+
+        Returns:
+            Token counts, in input order
+        """
+        texts = list(texts)
+        if not self.cache_size:
+            self.misses += len(texts)
+            return self._count_batch(texts)
+
+        keys = [content_hash(text) for text in texts]
+        counts: Dict[str, int] = {}
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in counts or key in missing:
+                continue
+            cached = self._cache.get(key)
+            if cached is None:
+                missing[key] = text
+            else:
+                self._cache.move_to_end(key)
+                counts[key] = cached
+
+        if missing:
+            for key, count in zip(missing, self._count_batch(list(missing.values()))):
+                counts[key] = count
+                self._cache[key] = count
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+        return [counts[key] for key in keys]
+
+    def count_documents(self, documents: Iterable[Path], batch_size: int = DEFAULT_BATCH_SIZE) -> List[int]:
+        """
+        Token counts of document files, read and counted in batches.
+
+        Args:
+            documents: Document paths
+            batch_size: Documents held in memory at once
+
+        Returns:
+            Token counts, in input order
+        """
+        counts = []
+        batch = []
+        for doc_path in documents:
+            batch.append(Path(doc_path).read_text(encoding='utf-8'))
+            if len(batch) == batch_size:
+                counts += self.count_many(batch)
+                batch = []
+        if batch:
+            counts += self.count_many(batch)
+        return counts
+
+    def summary(self) -> Dict:
+        """Counter name and memoization stats."""
+        return {'counter': self.name, 'counted': self.misses, 'cache_hits': self.hits}
+
+
+# ========== HEURISTIC ==========
+
+class HeuristicTokenCounter(TokenCounter):
+    """len(text) // 5 (original estimate). Not memoized - hashing costs more than counting."""
+
+    name = 'heuristic'
+
+    def __init__(self, chars_per_token: int = DEFAULT_CHARS_PER_TOKEN, cache_size: int = 0):
+        super().__init__(cache_size)
+        self.chars_per_token = chars_per_token
+
+    def _count_batch(self, texts: Sequence[str]) -> List[int]:
+        return [len(text) // self.chars_per_token for text in texts]
+
+
+# ========== SUBWORD ESTIMATE ==========
+
+# Scripts tokenized about one token per character (kana, CJK, hangul)
+_CJK = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff'
+
+# One alternative per kind of piece; the match's lastgroup picks the cost rule
+_PIECES = re.compile(rf'''
+    (?P<word>[A-Z]?[a-z]+|[A-Z]+(?![a-z]))      # ASCII words, camelCase split
+  | (?P<digits>[0-9]+)
+  | (?P<cjk>[{_CJK}])
+  | (?P<other>[^\W\d_a-zA-Z{_CJK}]+)            # letters of other scripts
+  | (?P<newlines>\n+)
+  | (?P<indent>(?<=\n)[ \t]+|[ \t]{{2,}})
+  | (?P<punct>([^\w\s])\8*|_+)
+''', re.X)
+
+# Letters per token, by piece kind (ASCII words merge into large vocab
+# entries; other scripts split into shorter pieces)
+_WORD_CHARS = 6
+_OTHER_SCRIPT_CHARS = 3
+# Repeated punctuation ("-----", "====") merges into few tokens
+_PUNCT_RUN_CHARS = 4
+
+
+class SubwordTokenCounter(TokenCounter):
+    """
+    Estimates SentencePiece/BPE counts without a model.
+
+    Text is split into pieces with one regex pass; each piece costs what a
+    subword tokenizer typically spends on it. Single spaces are free (they
+    merge into the next word, like SentencePiece's ▁ prefix). The costs
+    are rules of thumb, not fitted to any tokenizer's output.
+    """
+
+    name = 'subword'
+
+    def _count_one(self, text: str) -> int:
+        tokens = 0
+        for match in _PIECES.finditer(text):
+            kind = match.lastgroup
+            length = match.end() - match.start()
+            if kind == 'word':
+                tokens += math.ceil(length / _WORD_CHARS)
+            elif kind == 'digits':
+                tokens += length
+            elif kind == 'other':
+                tokens += math.ceil(length / _OTHER_SCRIPT_CHARS)
+            elif kind == 'punct':
+                tokens += 1 + (length - 1) // _PUNCT_RUN_CHARS
+            else:
+                # cjk character, newline run, indentation run
+                tokens += 1
+        return tokens
+
+    def _count_batch(self, texts: Sequence[str]) -> List[int]:
+        return [self._count_one(text) for text in texts]
+
+
+# ========== SENTENCEPIECE ==========
+
+class SentencePieceTokenCounter(TokenCounter):
+    """Exact counts from a SentencePiece model file (needs the `sentencepiece` package)."""
+
+    name = 'sentencepiece'
+
+    def __init__(self, model_path: Path, cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            model_path: SentencePiece .model file
+            cache_size: Memoized counts kept
+
+        Raises:
+            ImportError: If sentencepiece is not installed
+            FileNotFoundError: If the model file does not exist
+        """
+        import sentencepiece
+
+        super().__init__(cache_size)
+        model_path = Path(model_path)
+        if not model_path.is_file():
+            raise FileNotFoundError(f"SentencePiece model not found: {model_path}")
+        self._processor = sentencepiece.SentencePieceProcessor(model_file=str(model_path))
+
+    def _count_batch(self, texts: Sequence[str]) -> List[int]:
+        # encode() takes a list and tokenizes it in native code
+        return [len(ids) for ids in self._processor.encode(list(texts))]
+
+
+TOKEN_COUNTERS = {
+    counter.name: counter for counter in (HeuristicTokenCounter, SubwordTokenCounter, SentencePieceTokenCounter)
+}
+
+
+def get_token_counter(name: Optional[str] = None, model_path: Optional[Path] = None) -> TokenCounter:
+    """
+    Create a token counter.
+
+    A model path selects the SentencePiece counter; if it can't be loaded
+    (package missing, file missing) the default counter is used instead.
+
+    Args:
+        name: Counter name (None = sentencepiece with a model path,
+            DEFAULT_TOKEN_COUNTER otherwise)
+        model_path: SentencePiece .model file
+
+    Returns:
+        TokenCounter instance
+
+    Raises:
+        ValueError: If no counter has that name, or sentencepiece is
+            requested without a model path
+    """
+    name = name or ('sentencepiece' if model_path else DEFAULT_TOKEN_COUNTER)
+    if name not in TOKEN_COUNTERS:
+        raise ValueError(f"Unknown token counter '{name}' (available: {', '.join(TOKEN_COUNTERS)})")
+
+    if name == 'sentencepiece':
+        if not model_path:
+            raise ValueError("The sentencepiece token counter needs a model path")
+        try:
+            return SentencePieceTokenCounter(model_path)
+        except (ImportError, OSError) as e:
+            print(f"⚠️  SentencePiece unavailable ({e}) - using {DEFAULT_TOKEN_COUNTER} estimates")
+            return TOKEN_COUNTERS[DEFAULT_TOKEN_COUNTER]()
+
+    return TOKEN_COUNTERS[name]()
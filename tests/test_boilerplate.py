@@ -0,0 +1,146 @@
+"""
+Cross-Page Boilerplate Removal Tests
+
+Test coverage:
+- Lines above the page fraction are stripped, others kept
+- Held-back first pages, release order, small crawls
+- Lossy counting keeps memory bounded
+- Converter integration (files rewritten, header kept, near-dup signatures)
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.boilerplate import BoilerplateFilter
+from tools.near_dedup import NearDuplicateIndex
+from tools.document_converter import convert_dataset_to_documents, convert_dataset_stream_to_documents
+
+HEADER = 'Acme Docs Portal version 2'
+EDIT = 'Edit this page on GitHub'
+
+
+def write_doc(tmp_path, i, lines):
+    path = tmp_path / f'doc_{i:04d}.txt'
+    path.write_text(f'---\nSource: https://x/{i}\nTitle: Page {i}\n---\n\n' + '\n'.join(lines), encoding='utf-8')
+    return path
+
+
+def site_page(i, edit_link=True):
+    lines = [f'<div class="site-header">{HEADER}</div>', f'<h1>Topic {i}</h1>', f'<p>Unique content for topic number {i}.</p>']
+    if edit_link:
+        lines.append(f'<div>{EDIT}</div>')
+    return {'url': f'https://docs.example.com/{i}', 'html': '<html><body>' + ''.join(lines) + '</body></html>'}
+
+
+async def stream(items):
+    for item in items:
+        yield item
+
+
+def body_of(path: Path) -> str:
+    return path.read_text(encoding='utf-8').split('---\n\n', 1)[1]
+
+
+class TestDetection:
+    """Test which lines are boilerplate"""
+
+    def test_frequent_lines_stripped(self, tmp_path):
+        """Lines on more than the fraction of pages go, the rest stays"""
+        boilerplate = BoilerplateFilter(threshold=0.5, min_pages=4)
+        released = []
+        for i in range(8):
+            lines = [HEADER, f'Topic {i} body text', 'Shared by a few pages' if i >= 5 else f'Other line {i}']
+            released += boilerplate.add(f'u{i}', write_doc(tmp_path, i, lines))
+
+        assert [url for url, _, _, _ in released] == [f'u{i}' for i in range(8)]
+        for i, (_, path, header, body) in enumerate(released):
+            assert HEADER not in body
+            assert f'Topic {i} body text' in body
+            assert body == body_of(path)
+            assert path.read_text(encoding='utf-8') == header + body
+            assert header.startswith('---\nSource:')
+        assert 'Shared by a few pages' in released[7][3]
+
+    def test_case_and_spacing_ignored(self, tmp_path):
+        """Line keys are normalized"""
+        boilerplate = BoilerplateFilter(min_pages=2)
+        boilerplate.add('a', write_doc(tmp_path, 0, ['Edit  This Page', 'a']))
+        assert boilerplate.is_boilerplate('edit this page ')
+
+    def test_short_lines_kept(self, tmp_path):
+        """Single-word headings are never boilerplate"""
+        boilerplate = BoilerplateFilter(min_pages=2)
+        for i in range(4):
+            boilerplate.add(f'u{i}', write_doc(tmp_path, i, ['Parameters', f'p {i}']))
+        assert not boilerplate.is_boilerplate('Parameters')
+
+    def test_invalid_threshold(self):
+        """Threshold must be a fraction"""
+        with pytest.raises(ValueError):
+            BoilerplateFilter(threshold=1.5)
+
+
+class TestStreaming:
+    """Test held-back pages"""
+
+    def test_held_until_min_pages(self, tmp_path):
+        """Nothing is released before min_pages pages were counted"""
+        boilerplate = BoilerplateFilter(min_pages=3)
+        assert boilerplate.add('a', write_doc(tmp_path, 0, [HEADER, 'a'])) == []
+        assert boilerplate.add('b', write_doc(tmp_path, 1, [HEADER, 'b'])) == []
+        released = boilerplate.add('c', write_doc(tmp_path, 2, [HEADER, 'c']))
+        assert [body for _, _, _, body in released] == ['a', 'b', 'c']
+
+    def test_small_crawl_unchanged(self, tmp_path):
+        """Crawls smaller than min_pages are flushed untouched"""
+        boilerplate = BoilerplateFilter(min_pages=10)
+        for i in range(3):
+            boilerplate.add(f'u{i}', write_doc(tmp_path, i, [HEADER, f'body {i}']))
+        assert [body for _, _, _, body in boilerplate.flush()] == [f'{HEADER}\nbody {i}' for i in range(3)]
+
+    def test_memory_bounded(self, tmp_path):
+        """Unique lines are pruned at bucket ends; frequent ones survive"""
+        boilerplate = BoilerplateFilter(error=0.05, min_pages=1)
+        path = tmp_path / 'doc.txt'
+        for i in range(400):
+            path.write_text('\n'.join([HEADER] + [f'unique line {i} {j}' for j in range(50)]), encoding='utf-8')
+            boilerplate.add(f'u{i}', path)
+
+        # ~1/error pages of unique lines at most, not 400 × 50
+        assert boilerplate.tracked_lines() <= 20 * 50 + 1
+        assert boilerplate.is_boilerplate(HEADER)
+
+
+class TestConverterIntegration:
+    """Test stripping during conversion"""
+
+    def test_documents_rewritten(self, tmp_path):
+        """Converted documents lose site-wide lines, keep their own"""
+        items = [site_page(i) for i in range(12)]
+        boilerplate = BoilerplateFilter(min_pages=5)
+
+        docs = convert_dataset_to_documents(items, tmp_path, workers=1, boilerplate=boilerplate)
+
+        assert len(docs) == 12
+        assert body_of(docs[0].path) == 'Topic 0\nUnique content for topic number 0.'
+        assert 'Title:' in docs[0].path.read_text(encoding='utf-8')
+        assert boilerplate.summary()['lines_removed'] == 24
+
+    @pytest.mark.asyncio
+    async def test_streamed_with_near_duplicates(self, tmp_path):
+        """Signatures are taken after stripping: shared chrome doesn't make pages duplicates"""
+        items = [site_page(i) for i in range(12)] + [site_page(3, edit_link=False)]
+        index = NearDuplicateIndex(threshold=0.9)
+
+        docs = await convert_dataset_stream_to_documents(
+            stream(items), tmp_path, workers=2,
+            boilerplate=BoilerplateFilter(min_pages=5), near_duplicates=index
+        )
+
+        assert [d.name for d in docs] == [f'doc_{i:04d}.txt' for i in range(12)]
+        assert index.duplicates[0]['url'] == 'https://docs.example.com/3'
+        assert index.duplicates[0]['duplicate_of'] == 'https://docs.example.com/3'
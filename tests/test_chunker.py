@@ -0,0 +1,167 @@
+"""
+Document Chunking Tests
+
+Test coverage:
+- Chunks stay under the token limit; no text is lost
+- Breaks prefer headings, then paragraph boundaries
+- Overlap repeats the previous chunk's trailing lines
+- Lines longer than a chunk are cut
+- Document splitting (part files, headers, records)
+- Pipeline integration (parts reach the uploader)
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.chunker import DocumentSplitter, iter_chunk_tokens, iter_chunks
+from tools.document_converter import split_long_document
+from tools.document_record import DocumentRecord
+from tools.pipeline import run_document_pipeline
+from tools.token_counter import HeuristicTokenCounter
+
+count = HeuristicTokenCounter().measure
+
+
+def manual(sections=30, paragraphs=5, words=40):
+    """Markdown with `sections` headed sections of `paragraphs` paragraphs"""
+    parts = ['# Manual']
+    for i in range(sections):
+        parts.append(f'## Section {i}')
+        parts += [f'Paragraph {i}.{j} ' + 'word ' * words for j in range(paragraphs)]
+    return '\n\n'.join(parts)
+
+
+class TestChunking:
+    """Test chunk sizes and break points"""
+
+    def test_under_limit(self):
+        """Every chunk's token count stays within max_tokens"""
+        chunks = list(iter_chunk_tokens(manual(), max_tokens=1000, overlap=100, count=count))
+        assert len(chunks) > 1
+        assert all(tokens <= 1000 for _, tokens in chunks)
+
+    def test_no_text_lost(self):
+        """Without overlap the chunks add back up to the document"""
+        text = manual()
+        chunks = list(iter_chunks(text, max_tokens=1000, overlap=0))
+        assert ''.join(chunks).replace('\n', '') == text.replace('\n', '')
+
+    def test_no_paragraph_lost_with_overlap(self):
+        """Units left after a break at a late heading go into the next chunk"""
+        paragraphs = ['a' * 50, '# hhh', 'b' * 30, 'c' * 90]
+        chunks = list(iter_chunks('\n\n'.join(paragraphs), max_tokens=100, overlap=10, count=len))
+        assert all(paragraph in '\n\n'.join(chunks) for paragraph in paragraphs)
+
+        rng = random.Random(0)
+        paragraphs = [
+            (f'## Heading {i}' if rng.random() < 0.2 else f'Paragraph {i} ' + 'word ' * rng.randint(5, 400))
+            for i in range(400)
+        ]
+        joined = '\n\n'.join(iter_chunks('\n\n'.join(paragraphs), max_tokens=1000, overlap=100))
+        assert all(paragraph in joined for paragraph in paragraphs)
+
+    def test_breaks_at_headings(self):
+        """Chunks start at a section heading when one is in reach"""
+        chunks = list(iter_chunks(manual(), max_tokens=1000, overlap=0))
+        assert all(chunk.startswith('## Section') for chunk in chunks[1:])
+
+    def test_breaks_at_paragraphs(self):
+        """Without headings, chunks start at a paragraph"""
+        text = '\n\n'.join(f'Paragraph {i} ' + 'word ' * 40 for i in range(100))
+        chunks = list(iter_chunks(text, max_tokens=500, overlap=0))
+        assert all(chunk.startswith('Paragraph') for chunk in chunks)
+
+    def test_overlap(self):
+        """The next chunk starts with the previous chunk's last lines"""
+        chunks = list(iter_chunks(manual(), max_tokens=1000, overlap=100))
+        last_line = chunks[0].split('\n')[-1]
+        assert last_line in chunks[1].split('## Section')[0]
+        assert not chunks[1].startswith('## Section')
+
+    def test_long_line_cut(self):
+        """A single line longer than a chunk is cut into pieces"""
+        chunks = list(iter_chunk_tokens('x' * 50_000, max_tokens=1000, overlap=100, count=count))
+        assert len(chunks) >= 10
+        assert all(tokens <= 1000 for _, tokens in chunks)
+
+    def test_small_text_single_chunk(self):
+        """Text under the limit is one chunk; empty text is none"""
+        assert list(iter_chunks('hello\n\nworld', max_tokens=100, overlap=10)) == ['hello\n\nworld']
+        assert list(iter_chunks('', max_tokens=100, overlap=10)) == []
+
+    def test_invalid_overlap(self):
+        """Overlap must be less than half a chunk"""
+        with pytest.raises(ValueError):
+            list(iter_chunks('text', max_tokens=100, overlap=50))
+
+    def test_split_long_document(self):
+        """The converter helper keeps its signature and no-split fast path"""
+        assert split_long_document('short') == ['short']
+        assert len(split_long_document(manual(), max_tokens=1000, overlap=100)) > 1
+
+
+class TestDocumentSplitter:
+    """Test splitting converted documents into parts"""
+
+    def write_document(self, tmp_path, body):
+        header = '---\nSource: https://x/api\nTitle: API\n---\n\n'
+        text = header + body
+        path = tmp_path / 'doc_0000.txt'
+        path.write_text(text, encoding='utf-8')
+        return DocumentRecord.from_text(path, 'https://x/api', 'API', text, count(text))
+
+    def test_parts_keep_header(self, tmp_path):
+        """Each part file starts with the page's metadata header"""
+        record = self.write_document(tmp_path, manual())
+        parts = DocumentSplitter(threshold=2000, max_tokens=1000, overlap=100).split(record)
+
+        assert len(parts) > 1
+        assert not record.path.exists()
+        assert parts[0].name == 'doc_0000_part01.txt'
+        for part in parts:
+            text = part.path.read_text(encoding='utf-8')
+            assert text.startswith('---\nSource: https://x/api\n')
+            assert part.size == len(text.encode('utf-8'))
+            assert part.url == 'https://x/api'
+
+    def test_small_document_untouched(self, tmp_path):
+        """Documents under the threshold are returned as they are"""
+        record = self.write_document(tmp_path, 'short body')
+        splitter = DocumentSplitter(threshold=2000, max_tokens=1000, overlap=100)
+        assert splitter.split(record) == [record]
+        assert splitter.summary() == {'documents_split': 0, 'parts': 0}
+
+    def test_limits_clamped(self):
+        """A threshold below the part size shrinks parts and overlap"""
+        splitter = DocumentSplitter(threshold=300)
+        assert splitter.max_tokens == 300
+        assert splitter.overlap * 2 < 300
+
+
+class TestPipeline:
+    """Test splitting between conversion and upload"""
+
+    @pytest.mark.asyncio
+    async def test_uploader_receives_parts(self, tmp_path):
+        """A very long page reaches the uploader as several parts"""
+        html = '<title>API</title>' + ''.join(
+            f'<h2>Section {i}</h2>' + f'<p>{"word " * 200}</p>' * 5 for i in range(20)
+        )
+
+        async def items():
+            yield {'url': 'https://example.com/api', 'html': html}
+
+        async def upload(documents):
+            return [document async for document in documents]
+
+        splitter = DocumentSplitter(threshold=2000, max_tokens=1000, overlap=100)
+        result = await run_document_pipeline(items(), tmp_path, upload, splitter=splitter)
+
+        assert len(result['upload_result']) > 1
+        assert result['documents'] == result['upload_result']
+        assert splitter.summary()['documents_split'] == 1
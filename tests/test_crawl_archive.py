@@ -0,0 +1,193 @@
+"""
+Crawl Archive Tests
+
+Test coverage:
+- Archive → replay round trip (order, unicode, chunking)
+- Tee passes items through unchanged and closes the archive
+- A new archive replaces the previous one only once it is stored
+- Partial archives, missing archives, codec selection
+- Replay through the converter (no scraper)
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.crawl_archive import (
+    ArchiveCodec,
+    CrawlArchive,
+    GzipCodec,
+    archive_key,
+    get_archive_codec,
+    iterate_archived_items,
+    load_archive_index,
+    partial_archive_key
+)
+from tools.document_converter import convert_dataset_stream_to_documents
+
+
+class FakeKeyValueStore:
+    def __init__(self):
+        self.records = {}
+        self.content_types = {}
+
+    async def get_value(self, key):
+        return self.records.get(key)
+
+    async def set_value(self, key, value, content_type=None):
+        self.records[key] = value
+        self.content_types[key] = content_type
+
+    async def delete_value(self, key):
+        self.records.pop(key, None)
+
+
+def items(count, size=100):
+    return [
+        {'url': f'https://docs.example.com/{i}', 'html': f'<title>Päge {i}</title><p>{"x" * size}</p>'}
+        for i in range(count)
+    ]
+
+
+async def aiter_items(dataset):
+    for item in dataset:
+        yield item
+
+
+async def archive(store, dataset, **options):
+    writer = CrawlArchive(store, 'docs', **options)
+    passed = [item async for item in writer.tee(aiter_items(dataset))]
+    return writer, passed
+
+
+class TestRoundTrip:
+    """Test archiving and replaying items"""
+
+    @pytest.mark.asyncio
+    async def test_replay_matches_crawl(self):
+        """Replayed items equal the crawl, in order, across several chunks"""
+        store = FakeKeyValueStore()
+        dataset = items(50)
+        writer, passed = await archive(store, dataset, chunk_bytes=1000, metadata={'scraper_used': 'apify/crawler'})
+
+        assert passed == dataset
+        index = await load_archive_index(store, 'docs')
+        assert index['complete'] and index['items'] == 50
+        assert index['scraper_used'] == 'apify/crawler'
+        assert len(index['chunks']) == writer.summary()['chunks'] > 1
+        assert [item async for item in iterate_archived_items(store, index)] == dataset
+
+    @pytest.mark.asyncio
+    async def test_chunks_compressed(self):
+        """Chunks are stored gzip-compressed, much smaller than the JSONL"""
+        store = FakeKeyValueStore()
+        writer, _ = await archive(store, items(20, size=5000))
+
+        key = writer.chunks[0]
+        assert store.content_types[key] == 'application/gzip'
+        assert writer.compressed_bytes * 10 < writer.raw_bytes
+        assert GzipCodec().decompress(store.records[key]).count(b'\n') == 20
+
+    @pytest.mark.asyncio
+    async def test_new_archive_replaces_previous(self):
+        """The previous archive's chunks are deleted once the new index is stored"""
+        store = FakeKeyValueStore()
+        first, _ = await archive(store, items(5))
+        second, _ = await archive(store, items(3))
+
+        assert first.generation != second.generation
+        assert not any(key in store.records for key in first.chunks)
+        index = await load_archive_index(store, 'docs')
+        assert [item async for item in iterate_archived_items(store, index)] == items(3)
+
+    @pytest.mark.asyncio
+    async def test_partial_archive(self):
+        """A crawl that ended early is archived and marked partial"""
+        store = FakeKeyValueStore()
+        writer = CrawlArchive(store, 'docs')
+        await writer.add(items(1)[0])
+        await writer.close(complete=False)
+        await writer.close()
+
+        index = await load_archive_index(store, 'docs')
+        assert index['complete'] is False
+        assert index['items'] == 1
+
+    @pytest.mark.asyncio
+    async def test_partial_keeps_complete_archive(self):
+        """A crawl that ends early doesn't replace (or delete) the previous complete archive"""
+        store = FakeKeyValueStore()
+        complete, _ = await archive(store, items(5))
+        writer = CrawlArchive(store, 'docs')
+        await writer.add(items(1)[0])
+        await writer.close(complete=False)
+
+        index = await load_archive_index(store, 'docs')
+        assert index['generation'] == complete.generation
+        assert [item async for item in iterate_archived_items(store, index)] == items(5)
+        assert store.records[partial_archive_key('docs')]['chunks'] == writer.chunks
+
+        # The next complete crawl replaces both
+        latest, _ = await archive(store, items(2))
+        assert partial_archive_key('docs') not in store.records
+        assert not any(key in store.records for key in complete.chunks + writer.chunks)
+        assert (await load_archive_index(store, 'docs'))['generation'] == latest.generation
+
+    @pytest.mark.asyncio
+    async def test_missing_archive(self):
+        """No archive → None; a lost chunk fails loudly"""
+        store = FakeKeyValueStore()
+        assert await load_archive_index(store, 'docs') is None
+
+        writer, _ = await archive(store, items(3))
+        del store.records[writer.chunks[0]]
+        with pytest.raises(LookupError):
+            [item async for item in iterate_archived_items(store, await load_archive_index(store, 'docs'))]
+
+
+class TestCodecs:
+    """Test codec selection"""
+
+    def test_unknown_codec(self):
+        """Unknown codec names are rejected"""
+        with pytest.raises(ValueError):
+            get_archive_codec('lz4')
+
+    def test_zstd_falls_back(self):
+        """zstd works with the zstandard package and falls back to gzip without it"""
+        codec = get_archive_codec('zstd')
+        assert codec.name in ('zstd', 'gzip')
+        assert codec.decompress(codec.compress(b'abc' * 100)) == b'abc' * 100
+
+    def test_codec_must_implement_both_directions(self):
+        """A codec missing decompress() fails when created, not on replay"""
+        class CompressOnly(ArchiveCodec):
+            name = 'compress-only'
+
+            def compress(self, data):
+                return data
+
+        with pytest.raises(TypeError):
+            CompressOnly()
+
+    def test_key_length(self):
+        """Chunk keys stay within the 256-character record key limit"""
+        assert len(archive_key('x' * 500)) + 28 <= 256
+
+
+class TestReplay:
+    """Test rebuilding documents from an archive"""
+
+    @pytest.mark.asyncio
+    async def test_convert_from_archive(self, tmp_path):
+        """Archived items convert exactly like the live crawl did"""
+        store = FakeKeyValueStore()
+        await archive(store, items(4))
+        index = await load_archive_index(store, 'docs')
+
+        docs = await convert_dataset_stream_to_documents(iterate_archived_items(store, index), tmp_path)
+        assert [d.url for d in docs] == [item['url'] for item in items(4)]
+        assert docs[0].title == 'Päge 0'
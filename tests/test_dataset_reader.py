@@ -0,0 +1,177 @@
+"""
+Dataset Streaming Tests
+
+Test coverage:
+- Pagination (offset/limit per request, short final page, empty dataset)
+- Streaming conversion (same output as list-based conversion)
+- Following a still-running scraper's dataset
+- Saved dataset files (JSON, JSONL, gzip)
+"""
+
+import gzip
+import json
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.dataset_reader import iterate_dataset_items, iterate_run_dataset_items, read_dataset_file
+from tools.document_converter import (
+    convert_dataset_to_documents,
+    convert_dataset_stream_to_documents
+)
+
+
+class FakeDatasetClient:
+    """Mimics apify_client DatasetClientAsync.list_items() pagination"""
+
+    def __init__(self, items):
+        self.items = items
+        self.requests = []
+
+    async def list_items(self, offset=0, limit=None):
+        self.requests.append((offset, limit))
+        page = self.items[offset:offset + limit]
+        return SimpleNamespace(items=page, total=len(self.items))
+
+
+def make_items(n):
+    return [
+        {'url': f'https://example.com/page{i}', 'html': f'<html><title>Page {i}</title><body><p>Body {i}</p></body></html>'}
+        for i in range(n)
+    ]
+
+
+async def collect(async_iter):
+    return [item async for item in async_iter]
+
+
+class TestIterateDatasetItems:
+    """Test paginated dataset streaming"""
+
+    @pytest.mark.asyncio
+    async def test_yields_all_items_in_order(self):
+        """All items are yielded in dataset order"""
+        items = make_items(7)
+        result = await collect(iterate_dataset_items(FakeDatasetClient(items), page_size=3))
+        assert result == items
+
+    @pytest.mark.asyncio
+    async def test_requests_use_page_size(self):
+        """Each request asks for one page at the next offset"""
+        client = FakeDatasetClient(make_items(7))
+        await collect(iterate_dataset_items(client, page_size=3))
+        assert client.requests == [(0, 3), (3, 3), (6, 3)]
+
+    @pytest.mark.asyncio
+    async def test_exact_multiple_needs_final_empty_page(self):
+        """Dataset size that is a multiple of page size ends on an empty page"""
+        client = FakeDatasetClient(make_items(4))
+        result = await collect(iterate_dataset_items(client, page_size=2))
+        assert len(result) == 4
+        assert client.requests == [(0, 2), (2, 2), (4, 2)]
+
+    @pytest.mark.asyncio
+    async def test_empty_dataset(self):
+        """Empty dataset yields nothing"""
+        result = await collect(iterate_dataset_items(FakeDatasetClient([]), page_size=10))
+        assert result == []
+
+    @pytest.mark.asyncio
+    async def test_offset(self):
+        """Starting offset skips leading items"""
+        items = make_items(5)
+        result = await collect(iterate_dataset_items(FakeDatasetClient(items), page_size=2, offset=3))
+        assert result == items[3:]
+
+    @pytest.mark.asyncio
+    async def test_invalid_page_size(self):
+        """Page size must be positive"""
+        with pytest.raises(ValueError):
+            await collect(iterate_dataset_items(FakeDatasetClient([]), page_size=0))
+
+
+class TestStreamConversion:
+    """Test streaming conversion matches list-based conversion"""
+
+    @pytest.mark.asyncio
+    async def test_stream_matches_list(self, tmp_path):
+        """Streaming and list conversion produce the same documents"""
+        items = make_items(5)
+        items.insert(2, {'url': 'https://example.com/empty'})  # Skipped (no content)
+
+        list_docs = convert_dataset_to_documents(items, tmp_path / 'list')
+        stream_docs = await convert_dataset_stream_to_documents(
+            iterate_dataset_items(FakeDatasetClient(items), page_size=2),
+            tmp_path / 'stream'
+        )
+
+        assert [p.name for p in stream_docs] == [p.name for p in list_docs]
+        assert 'doc_0002.txt' not in [p.name for p in stream_docs]
+        for a, b in zip(list_docs, stream_docs):
+            # Bodies match (headers differ only by timestamp)
+            assert a.path.read_text().split('---\n\n', 1)[1] == b.path.read_text().split('---\n\n', 1)[1]
+
+
+class FakeRunClient:
+    """Mimics apify_client RunClientAsync.get(): scraper pushes items while RUNNING"""
+
+    def __init__(self, dataset, batches):
+        self.dataset = dataset
+        self.batches = list(batches)  # Items pushed before each status check
+
+    async def get(self):
+        if self.batches:
+            self.dataset.items.extend(self.batches.pop(0))
+            return {'status': 'RUNNING'}
+        return {'status': 'SUCCEEDED'}
+
+
+class TestIterateRunDatasetItems:
+    """Test following a live scraper run"""
+
+    @pytest.mark.asyncio
+    async def test_follows_running_scraper(self):
+        """Items pushed while the run is active are all yielded, in order"""
+        items = make_items(7)
+        dataset = FakeDatasetClient([])
+        run = FakeRunClient(dataset, [items[:2], [], items[2:6], items[6:]])
+
+        result = await collect(iterate_run_dataset_items(run, dataset, page_size=3, follow_interval=0))
+
+        assert result == items
+
+    @pytest.mark.asyncio
+    async def test_finished_run(self):
+        """A run that already finished is read once, like a static dataset"""
+        items = make_items(4)
+        dataset = FakeDatasetClient(items)
+
+        result = await collect(iterate_run_dataset_items(FakeRunClient(dataset, []), dataset, page_size=10))
+
+        assert result == items
+        assert dataset.requests == [(0, 10)]
+
+
+class TestReadDatasetFile:
+    """Test reading saved dataset exports"""
+
+    @pytest.mark.parametrize('name', ['items.jsonl', 'items.json', 'items.jsonl.gz', 'items.json.gz'])
+    def test_formats(self, tmp_path, name):
+        """JSON arrays and JSONL, plain or gzipped, read back in order"""
+        items = make_items(5)
+        text = json.dumps(items) if name.split('.')[1] == 'json' else ''.join(json.dumps(i) + '\n' for i in items)
+        path = tmp_path / name
+        path.write_bytes(gzip.compress(text.encode()) if name.endswith('.gz') else text.encode())
+
+        assert list(read_dataset_file(path)) == items
+
+    def test_not_an_array(self, tmp_path):
+        """A .json file must hold a list of items"""
+        path = tmp_path / 'items.json'
+        path.write_text('{"url": "https://example.com"}')
+        with pytest.raises(ValueError):
+            list(read_dataset_file(path))
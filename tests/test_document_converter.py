@@ -0,0 +1,136 @@
+"""
+Document Converter Tests
+
+Test coverage:
+- Single parse per page in convert_html_to_document
+- Output matches the standalone extract_title/clean_html_text helpers
+- Main-content selection over the shared tree
+- Process-pool conversion keeps naming and order deterministic
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools import html_backends
+from tools.document_converter import (
+    clean_html_text,
+    convert_dataset_stream_to_documents,
+    convert_dataset_to_documents,
+    convert_html_to_document,
+    extract_title
+)
+from tools.document_record import read_document
+from tools.token_counter import SubwordTokenCounter
+
+PAGE = """<html><head><title>Hooks Reference</title><script>track()</script></head>
+<body>
+<nav><a href="/">Home</a></nav>
+<div class="cookie-banner">Accept cookies</div>
+<main><h1>Hooks</h1><p>useState returns a pair.</p>
+<div class="ads">Buy now</div></main>
+<footer>© Example</footer>
+</body></html>"""
+
+
+def dataset(n):
+    items = [
+        {'url': f'https://example.com/page{i}', 'html': f'<html><title>Page {i}</title><body><p>{"Body " * i}</p></body></html>'}
+        for i in range(n)
+    ]
+    items[3] = {'url': 'https://example.com/empty'}
+    return items
+
+
+async def stream(items):
+    for item in items:
+        yield item
+
+
+def body_of(path: Path) -> str:
+    """Document text after the metadata header"""
+    return path.read_text(encoding='utf-8').split('---\n\n', 1)[1]
+
+
+class TestSingleParse:
+    """Test each page is parsed once"""
+
+    def test_parses_once(self, tmp_path, monkeypatch):
+        """Title, main content and text come from one BeautifulSoup tree"""
+        parses = []
+        real_soup = html_backends.BeautifulSoup
+
+        def counting_soup(*args, **kwargs):
+            parses.append(1)
+            return real_soup(*args, **kwargs)
+
+        monkeypatch.setattr(html_backends, 'BeautifulSoup', counting_soup)
+        convert_html_to_document(PAGE, 'https://example.com/hooks', tmp_path / 'doc.txt', main_content_only=True)
+
+        assert len(parses) == 1
+
+    def test_matches_standalone_helpers(self, tmp_path):
+        """Same title and text as extract_title + clean_html_text"""
+        path = convert_html_to_document(PAGE, 'https://example.com/hooks', tmp_path / 'doc.txt')
+
+        assert f"Title: {extract_title(PAGE, 'https://example.com/hooks')}" in path.read_text(encoding='utf-8')
+        assert body_of(path) == clean_html_text(PAGE)
+
+
+class TestMainContent:
+    """Test main-content selection"""
+
+    def test_main_content_only(self, tmp_path):
+        """Only the <main> area is kept, noise inside it is still stripped"""
+        path = convert_html_to_document(PAGE, 'https://example.com/hooks', tmp_path / 'doc.txt', main_content_only=True)
+
+        assert body_of(path) == 'Hooks\nuseState returns a pair.'
+        assert 'Title: Hooks Reference' in path.read_text(encoding='utf-8')
+
+    def test_no_main_content_keeps_page(self, tmp_path):
+        """Pages without a main area fall back to the whole document"""
+        html = '<html><body><p>Just text</p></body></html>'
+        path = convert_html_to_document(html, 'https://example.com/just-text', tmp_path / 'doc.txt', main_content_only=True)
+
+        assert body_of(path) == 'Just text'
+        assert 'Title: Just Text' in path.read_text(encoding='utf-8')
+
+
+class TestParallelConversion:
+    """Test process-pool conversion"""
+
+    def test_same_output_as_sequential(self, tmp_path):
+        """Names, order and text match in-process conversion"""
+        sequential = convert_dataset_to_documents(dataset(12), tmp_path / 'seq', workers=1)
+        parallel = convert_dataset_to_documents(dataset(12), tmp_path / 'par', workers=3, chunk_size=2)
+
+        assert [p.name for p in parallel] == [p.name for p in sequential]
+        assert 'doc_0003.txt' not in [p.name for p in parallel]
+        assert [body_of(p.path) for p in parallel] == [body_of(p.path) for p in sequential]
+
+    @pytest.mark.asyncio
+    async def test_stream_keeps_dataset_order(self, tmp_path):
+        """Streamed pool conversion yields documents in dataset order"""
+        docs = await convert_dataset_stream_to_documents(stream(dataset(8)), tmp_path, workers=2)
+
+        assert [p.name for p in docs] == [f'doc_{i:04d}.txt' for i in range(8) if i != 3]
+        assert body_of(docs[-1].path).startswith('Page 7')
+
+    @pytest.mark.asyncio
+    async def test_workers_count_with_installed_counter(self, tmp_path):
+        """Pool workers count tokens with the counter installed at startup"""
+        counter = SubwordTokenCounter()
+        expected = [counter.count(read_document(doc)) for doc in convert_dataset_to_documents(dataset(8), tmp_path / 'seq')]
+
+        listed = convert_dataset_to_documents(dataset(8), tmp_path / 'list', workers=2, token_counter=counter)
+        streamed = await convert_dataset_stream_to_documents(stream(dataset(8)), tmp_path / 'stream', workers=2, token_counter=counter)
+
+        assert [doc.tokens for doc in listed] == [doc.tokens for doc in streamed] == expected
+
+    def test_invalid_workers(self, tmp_path):
+        """Worker count must be positive"""
+        with pytest.raises(ValueError):
+            convert_dataset_to_documents(dataset(4), tmp_path, workers=0)
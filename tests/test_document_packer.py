@@ -0,0 +1,129 @@
+"""
+Document Packing Tests
+
+Test coverage:
+- Packs stay under the size/token targets; oversized pages pass through
+- Packed text keeps every page's Source header; page files are removed
+- Best-fit decreasing reaches the minimum pack count
+- Streaming keeps a bounded number of packs open
+- Pipeline integration (uploader receives packs)
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.document_packer import DocumentPacker, pack_documents
+from tools.document_record import DocumentRecord
+from tools.pipeline import run_document_pipeline
+
+
+def write_page(tmp_path, i, size):
+    """Page document of exactly `size` bytes (header included)"""
+    header = f'---\nSource: https://x/{i}\n---\n\n'
+    text = header + 'x' * (size - len(header))
+    path = tmp_path / f'doc_{i:04d}.txt'
+    path.write_text(text, encoding='utf-8')
+    return DocumentRecord.from_text(path, f'https://x/{i}', f'Page {i}', text, tokens=size // 5)
+
+
+def pages(tmp_path, sizes):
+    return [write_page(tmp_path, i, size) for i, size in enumerate(sizes)]
+
+
+class TestPacking:
+    """Test pack contents and limits"""
+
+    def test_packs_under_target(self, tmp_path):
+        """Every pack fits the target; every page lands in exactly one document"""
+        records = pages(tmp_path, [300, 200, 400, 100, 250, 350])
+        documents = pack_documents(records, tmp_path, max_bytes=700)
+
+        assert all(d.size <= 700 for d in documents)
+        assert all(d.size == d.path.stat().st_size for d in documents)
+        text = ''.join(d.path.read_text(encoding='utf-8') for d in documents)
+        assert sorted(text.count(f'Source: https://x/{i}\n') for i in range(6)) == [1] * 6
+
+    def test_page_files_removed(self, tmp_path):
+        """Packed pages' own files are deleted (only packs are uploaded)"""
+        records = pages(tmp_path, [100, 100])
+        documents = pack_documents(records, tmp_path, max_bytes=1000)
+
+        assert [d.name for d in documents] == ['pack_0000.txt']
+        assert not records[0].path.exists()
+        assert documents[0].url == 'https://x/0'
+        assert documents[0].tokens == 40
+
+    def test_oversized_passthrough(self, tmp_path):
+        """Pages above the target are uploaded on their own, untouched"""
+        records = pages(tmp_path, [5000, 100])
+        documents = pack_documents(records, tmp_path, max_bytes=1000)
+        assert records[0] in documents
+        assert records[0].path.exists()
+
+    def test_token_target(self, tmp_path):
+        """The token target splits packs the size target would allow"""
+        records = pages(tmp_path, [500] * 4)
+        documents = pack_documents(records, tmp_path, max_bytes=100_000, max_tokens=200)
+        assert len(documents) == 2
+        assert all(d.tokens <= 200 for d in documents)
+
+    def test_best_fit_decreasing_optimal(self, tmp_path):
+        """Sizes that pair up exactly need the minimum number of packs"""
+        sizes = [600, 400, 700, 300, 500, 500, 800, 200]
+        documents = pack_documents(pages(tmp_path, sizes), tmp_path, max_bytes=1002)
+        assert len(documents) == 4
+
+
+class TestStreaming:
+    """Test the bounded online packer"""
+
+    def test_open_packs_bounded(self, tmp_path):
+        """Never more than open_packs packs are held back"""
+        packer = DocumentPacker(tmp_path, max_bytes=1000, open_packs=2)
+        released = []
+        for record in pages(tmp_path, [600, 700, 800, 300, 200, 100]):
+            released += packer.add(record)
+            assert len(packer._open) <= 2
+        released += packer.flush()
+
+        assert packer.summary()['pages'] == 6
+        assert packer.summary()['documents'] == len(released)
+        assert all(d.size <= 1000 for d in released)
+
+    def test_full_pack_released_early(self, tmp_path):
+        """A pack filled to the target is released without waiting for flush"""
+        packer = DocumentPacker(tmp_path, max_bytes=1002)
+        assert packer.add(write_page(tmp_path, 0, 500)) == []
+        ready = packer.add(write_page(tmp_path, 1, 500))
+        assert [d.name for d in ready] == ['pack_0000.txt']
+        assert packer.packs == {'pack_0000.txt': ['https://x/0', 'https://x/1']}
+
+    def test_invalid_target(self, tmp_path):
+        """Targets must be positive"""
+        with pytest.raises(ValueError):
+            DocumentPacker(tmp_path, max_bytes=0)
+
+
+class TestPipeline:
+    """Test packing between conversion and upload"""
+
+    @pytest.mark.asyncio
+    async def test_uploader_receives_packs(self, tmp_path):
+        """Twenty small pages reach the uploader as a single pack"""
+        async def items():
+            for i in range(20):
+                yield {'url': f'https://example.com/{i}', 'html': f'<title>Page {i}</title><p>Body {i}</p>'}
+
+        async def upload(documents):
+            return [document async for document in documents]
+
+        packer = DocumentPacker(tmp_path / 'docs', max_bytes=64 * 1024)
+        result = await run_document_pipeline(items(), tmp_path / 'docs', upload, packer=packer)
+
+        assert len(result['documents']) == 20
+        assert [d.name for d in result['upload_result']] == ['pack_0000.txt']
+        assert result['upload_result'][0].path.read_text(encoding='utf-8').count('Source: https://example.com/') == 20
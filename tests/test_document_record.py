@@ -0,0 +1,151 @@
+"""
+Document Record Tests
+
+Test coverage:
+- Records measured from the written text match the files on disk
+- Records survive pool workers and boilerplate rewrites
+- Cost estimation from records without reading files
+- In-memory documents: no files written through conversion, boilerplate
+  removal, splitting, packing and the pipeline
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.boilerplate import BoilerplateFilter
+from tools.chunker import DocumentSplitter
+from tools.document_packer import DocumentPacker
+from tools.document_record import DocumentRecord, document_path, document_size, read_document
+from tools.pipeline import run_document_pipeline
+from tools.document_converter import calculate_indexing_cost, convert_dataset_to_documents, estimate_tokens
+from tools.manifest import content_hash
+from tools.token_counter import HeuristicTokenCounter, SubwordTokenCounter
+
+
+def page(i, extra=''):
+    return {
+        'url': f'https://docs.example.com/{i}',
+        'html': f'<html><title>Page {i}</title><body><p>Ünïcode text for page {i}.</p>{extra}</body></html>'
+    }
+
+
+def assert_matches_file(record: DocumentRecord, counter=None):
+    text = record.path.read_text(encoding='utf-8')
+    assert record.size == record.path.stat().st_size
+    assert record.chars == len(text)
+    assert record.content_hash == content_hash(text)
+    assert record.tokens == (counter.count(text) if counter else estimate_tokens(text))
+
+
+class TestRecords:
+    """Test records produced by the converter"""
+
+    def test_match_files(self, tmp_path):
+        """Size (bytes, not chars), chars, tokens and hash match the written file"""
+        docs = convert_dataset_to_documents([page(i) for i in range(3)], tmp_path, workers=1)
+
+        assert [d.name for d in docs] == ['doc_0000.txt', 'doc_0001.txt', 'doc_0002.txt']
+        assert docs[0].url == 'https://docs.example.com/0'
+        assert docs[0].title == 'Page 0'
+        assert docs[0].size > docs[0].chars
+        for record in docs:
+            assert_matches_file(record)
+
+    def test_pool_workers_and_counter(self, tmp_path):
+        """Records come back from pool workers, counted with the given counter"""
+        counter = SubwordTokenCounter()
+        docs = convert_dataset_to_documents([page(i) for i in range(4)], tmp_path, workers=2, token_counter=counter)
+        assert len(docs) == 4
+        for record in docs:
+            assert_matches_file(record, counter)
+
+    def test_boilerplate_rewrite_remeasured(self, tmp_path):
+        """Stripped documents get a record of the rewritten file"""
+        chrome = '<div>Shared site navigation header text</div>'
+        docs = convert_dataset_to_documents(
+            [page(i, chrome) for i in range(6)], tmp_path, workers=1,
+            boilerplate=BoilerplateFilter(min_pages=3)
+        )
+        for record in docs:
+            assert 'navigation' not in record.path.read_text(encoding='utf-8')
+            assert_matches_file(record)
+
+    def test_path_helpers(self, tmp_path):
+        """Helpers accept records and bare paths alike"""
+        path = tmp_path / 'doc.txt'
+        path.write_text('abc', encoding='utf-8')
+        record = DocumentRecord.from_text(path, 'u', 't', 'abc', 1)
+        assert document_path(record) == document_path(path) == path
+        assert document_size(record) == document_size(path) == 3
+
+
+class TestIndexingCost:
+    """Test cost estimation from records"""
+
+    def test_no_disk_reads(self, tmp_path):
+        """Recorded token counts are used as-is (files may be gone)"""
+        records = [DocumentRecord(tmp_path / f'missing_{i}.txt', 'u', 't', 0, 0, 500_000, 'h') for i in range(2)]
+        assert calculate_indexing_cost(records, HeuristicTokenCounter()) == pytest.approx(0.15)
+
+
+class TestInMemory:
+    """Test zero-disk documents"""
+
+    def test_converter_writes_nothing(self, tmp_path):
+        """Records carry the encoded document; no file is created"""
+        docs = convert_dataset_to_documents([page(i) for i in range(3)], tmp_path, workers=1, in_memory=True)
+
+        assert list(tmp_path.iterdir()) == []
+        for record in docs:
+            text = read_document(record)
+            assert record.in_memory
+            assert record.size == len(record.data)
+            assert record.content_hash == content_hash(text)
+            assert text.startswith('---\nSource: https://docs.example.com/')
+
+    def test_boilerplate_rewrite_in_memory(self, tmp_path):
+        """Stripped in-memory documents are rebuilt, not written"""
+        chrome = '<div>Shared site navigation header text</div>'
+        docs = convert_dataset_to_documents(
+            [page(i, chrome) for i in range(6)], tmp_path, workers=2, in_memory=True,
+            boilerplate=BoilerplateFilter(min_pages=3)
+        )
+        assert list(tmp_path.iterdir()) == []
+        assert all('navigation' not in read_document(record) for record in docs)
+        assert all(record.chars == len(read_document(record)) for record in docs)
+
+    def test_split_and_pack_in_memory(self, tmp_path):
+        """Parts and packs of in-memory documents stay in memory"""
+        body = '\n\n'.join(f'## Section {i}\n\n' + 'word ' * 200 for i in range(20))
+        text = '---\nSource: https://x/api\n---\n\n' + body
+        record = DocumentRecord.from_text(tmp_path / 'doc_0000.txt', 'https://x/api', 'API', text, len(text) // 5, True)
+
+        parts = DocumentSplitter(threshold=1000, max_tokens=500, overlap=50).split(record)
+        packer = DocumentPacker(tmp_path, max_bytes=len(text) * 2)
+        packs = [ready for part in parts for ready in packer.add(part)] + packer.flush()
+
+        assert len(parts) > 1 and all(part.in_memory for part in parts)
+        assert [pack.name for pack in packs] == ['pack_0000.txt']
+        assert read_document(packs[0]).count('Source: https://x/api') == len(parts)
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_pipeline_in_memory(self, tmp_path):
+        """The uploader gets in-memory records; the run keeps them without their text"""
+        async def items():
+            for i in range(3):
+                yield page(i)
+
+        async def upload(documents):
+            return [document async for document in documents]
+
+        result = await run_document_pipeline(items(), tmp_path / 'docs', upload, in_memory=True)
+
+        assert all(document.in_memory for document in result['upload_result'])
+        assert not any(document.in_memory for document in result['documents'])
+        assert result['documents'] == result['upload_result']
+        assert list((tmp_path / 'docs').iterdir()) == []
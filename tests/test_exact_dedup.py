@@ -0,0 +1,153 @@
+"""
+Exact Duplicate Removal Tests
+
+Test coverage:
+- URL normalization (case, ports, fragments, tracking params, slashes)
+- Canonical links and scraper metadata, with same-host/root guards
+- Duplicates by URL and by content hash, first page kept
+- Converter integration (skipped before parsing, manifest untouched)
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.exact_dedup import ExactDuplicateFilter, canonical_url, find_canonical_link, normalize_url
+from tools.manifest import ManifestTracker
+from tools.document_converter import convert_dataset_to_documents, convert_dataset_stream_to_documents
+
+
+def page(url, body, head=''):
+    return {'url': url, 'html': f'<html><head>{head}</head><body><p>{body}</p></body></html>'}
+
+
+async def stream(items):
+    for item in items:
+        yield item
+
+
+class TestNormalizeUrl:
+    """Test URL normalization"""
+
+    @pytest.mark.parametrize('url', [
+        'https://docs.example.com/guide',
+        'HTTPS://Docs.Example.com/guide/',
+        'https://docs.example.com:443/guide#install',
+        'https://docs.example.com/guide?utm_source=x&utm_medium=y',
+        'https://docs.example.com/guide/index.html',
+        'https://docs.example.com/guide?fbclid=abc',
+    ])
+    def test_spellings_collapse(self, url):
+        """Trivially different spellings normalize to the same URL"""
+        assert normalize_url(url) == 'https://docs.example.com/guide'
+
+    def test_query_sorted_and_kept(self):
+        """Meaningful parameters stay, in a stable order"""
+        assert normalize_url('https://a.com/s?q=x&page=2') == 'https://a.com/s?page=2&q=x'
+
+    def test_content_parameters_kept(self):
+        """ref/source often select a branch or version, so they are not tracking"""
+        assert normalize_url('https://a.com/api?ref=main') != normalize_url('https://a.com/api?ref=v2')
+        assert normalize_url('https://a.com/api?source=v2') == 'https://a.com/api?source=v2'
+
+    def test_path_case_and_port_kept(self):
+        """Paths are case sensitive; non-default ports matter"""
+        assert normalize_url('http://a.com:8080/API') == 'http://a.com:8080/API'
+
+    def test_root(self):
+        """The root keeps its slash"""
+        assert normalize_url('https://a.com') == normalize_url('https://a.com/') == 'https://a.com/'
+
+
+class TestCanonical:
+    """Test declared canonical URLs"""
+
+    def test_link_tag(self):
+        """<link rel=canonical> is found and resolved"""
+        html = '<head><link href="/docs/guide" rel="canonical"></head>'
+        assert find_canonical_link(html, 'https://a.com/x/y') == 'https://a.com/docs/guide'
+
+    def test_other_links_ignored(self):
+        """Only rel=canonical counts"""
+        assert find_canonical_link('<link rel="stylesheet" href="/s.css">', 'https://a.com/') is None
+
+    def test_metadata_preferred(self):
+        """Scraper metadata.canonicalUrl wins over the page's link"""
+        item = {'metadata': {'canonicalUrl': 'https://a.com/meta'}}
+        html = '<link rel="canonical" href="https://a.com/link">'
+        assert canonical_url('https://a.com/page', html, 'html', item) == 'https://a.com/meta'
+
+    def test_other_host_ignored(self):
+        """Cross-host canonicals are not trusted"""
+        html = '<link rel="canonical" href="https://mirror.org/guide">'
+        assert canonical_url('https://a.com/guide', html) == 'https://a.com/guide'
+
+    def test_root_canonical_ignored(self):
+        """Deep pages pointing at the site root keep their own URL"""
+        html = '<link rel="canonical" href="https://a.com/">'
+        assert canonical_url('https://a.com/guide', html) == 'https://a.com/guide'
+
+
+class TestFilter:
+    """Test duplicate detection"""
+
+    def test_url_duplicates(self):
+        """Later spellings of a URL report the first one"""
+        duplicates = ExactDuplicateFilter()
+        assert duplicates.check('https://a.com/docs/', 'one') is None
+        assert duplicates.check('https://a.com/docs?utm_source=x#intro', 'two') == 'https://a.com/docs/'
+        assert duplicates.duplicates == [
+            {'url': 'https://a.com/docs?utm_source=x#intro', 'duplicate_of': 'https://a.com/docs/', 'reason': 'url'}
+        ]
+
+    def test_content_duplicates(self):
+        """Identical content under unrelated URLs is a duplicate"""
+        duplicates = ExactDuplicateFilter()
+        duplicates.check('https://a.com/v1/guide', 'same')
+        assert duplicates.check('https://a.com/latest/guide', 'same') == 'https://a.com/v1/guide'
+        assert duplicates.summary() == {'unique': 1, 'same_url': 0, 'same_content': 1}
+
+    def test_alias_by_canonical_link(self):
+        """An alias declaring the first page as canonical is dropped"""
+        duplicates = ExactDuplicateFilter()
+        duplicates.check('https://a.com/guide', '<p>v1</p>')
+        alias = '<link rel="canonical" href="https://a.com/guide"><p>v2</p>'
+        assert duplicates.check('https://a.com/print/guide', alias) == 'https://a.com/guide'
+
+
+class TestConverterIntegration:
+    """Test skipping duplicates during conversion"""
+
+    def test_skipped_before_parsing(self, tmp_path, monkeypatch):
+        """Duplicates are never converted, written or recorded"""
+        import tools.document_converter as converter
+
+        converted = []
+        original = converter._convert_page
+        monkeypatch.setattr(converter, '_convert_page', lambda content, url, *a, **k: converted.append(url) or original(content, url, *a, **k))
+
+        items = [
+            page('https://docs.example.com/a', 'A'),
+            page('https://docs.example.com/a/?utm_source=news', 'A, tracked'),
+            page('https://docs.example.com/b', 'B'),
+            page('https://docs.example.com/b-copy', 'B'),
+        ]
+        manifest = ManifestTracker('docs')
+        duplicates = ExactDuplicateFilter()
+
+        docs = convert_dataset_to_documents(items, tmp_path, workers=1, manifest=manifest, duplicates=duplicates)
+
+        assert [d.name for d in docs] == ['doc_0000.txt', 'doc_0002.txt']
+        assert converted == ['https://docs.example.com/a', 'https://docs.example.com/b']
+        assert set(manifest.files.values()) == {'https://docs.example.com/a', 'https://docs.example.com/b'}
+        assert [d['reason'] for d in duplicates.duplicates] == ['url', 'content']
+
+    @pytest.mark.asyncio
+    async def test_streamed(self, tmp_path):
+        """The streaming converter skips duplicates too"""
+        items = [page('https://a.com/x', 'X'), page('https://A.com/x#top', 'X again'), page('https://a.com/y', 'Y')]
+        docs = await convert_dataset_stream_to_documents(stream(items), tmp_path, duplicates=ExactDuplicateFilter())
+        assert [d.name for d in docs] == ['doc_0000.txt', 'doc_0002.txt']
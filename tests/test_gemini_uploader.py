@@ -0,0 +1,599 @@
+"""
+Gemini Uploader Tests
+
+Runs the upload engine against a fake genai.Client with injectable
+upload/import latencies (no network, no API key).
+
+Test coverage:
+- Result ordering and uploaded_files metadata shape
+- Concurrency limit (semaphore) is never exceeded
+- Largest-first scheduling
+- Parallel speedup over sequential uploads
+- Retries, re-queueing and dead-lettering of failed documents
+- Incremental re-runs (store reuse, stale document deletion)
+- Store lookup by name (cached, paginated) and existing document listing
+- Token counts for the cost estimate
+- Converter records (sizes and tokens without touching the files)
+"""
+
+import asyncio
+import io
+import time
+import pytest
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from google.genai import errors
+from tools.gemini_uploader import (
+    delete_file_search_store,
+    upload_document,
+    upload_documents_to_store,
+    upload_to_gemini,
+    find_file_search_store,
+    list_file_search_stores,
+    load_store_manifest
+)
+from tools.import_poller import ImportPoller
+from tools.manifest import ManifestTracker, content_hash
+from tools.rate_limit import RetryPolicy
+from tools.token_counter import SubwordTokenCounter
+from tools.document_record import DocumentRecord
+
+
+# ========== FAKE GEMINI CLIENT ==========
+
+class FakeOperation:
+    """Stand-in for UploadToFileSearchStoreOperation"""
+
+    def __init__(self, name, ready_at, error=None):
+        self.name = name
+        self.ready_at = ready_at
+        self.error = None
+        self.pending_error = error
+        self.done = False
+        self.response = None
+
+
+class FakePager:
+    """AsyncPager double: yields items, counting one request per page"""
+
+    def __init__(self, fake, items, page_size):
+        self.fake = fake
+        self.items = items
+        self.page_size = page_size
+
+    async def __aiter__(self):
+        for i, item in enumerate(self.items):
+            if i % self.page_size == 0:
+                self.fake.list_requests += 1
+            yield item
+
+
+class FakeDocuments:
+    def __init__(self, fake):
+        self.fake = fake
+
+    async def list(self, parent, config=None):
+        return FakePager(self.fake, self.fake.documents.get(parent, []), config['page_size'])
+
+    async def delete(self, name, config=None):
+        self.fake.deleted.append(name)
+
+
+class FakeFileSearchStores:
+    def __init__(self, fake):
+        self.fake = fake
+        self.documents = FakeDocuments(fake)
+
+    async def list(self, config=None):
+        return FakePager(self.fake, self.fake.stores, config['page_size'])
+
+    async def delete(self, name, config=None):
+        self.fake.deleted_stores.append(name)
+
+    async def create(self, config=None):
+        self.fake.created.append(config['display_name'])
+        return SimpleNamespace(
+            name=f"fileSearchStores/{config['display_name']}",
+            display_name=config['display_name'],
+            create_time=None
+        )
+
+    async def upload_to_file_search_store(self, file, file_search_store_name, config=None):
+        fake = self.fake
+        name = config['display_name']
+        if isinstance(file, io.IOBase):
+            fake.uploaded_data[name] = file.read()
+
+        if fake.upload_errors.get(name):
+            fake.upload_errors[name] -= 1
+            raise errors.ClientError(429, {'error': {'code': 429, 'message': 'quota', 'status': 'RESOURCE_EXHAUSTED'}})
+
+        fake.started.append(name)
+        fake.upload_configs[name] = config
+        fake.in_flight += 1
+        fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+
+        await asyncio.sleep(fake.upload_latency.get(name, 0))
+        fake.in_flight -= 1
+
+        ready_at = time.monotonic() + fake.import_latency.get(name, 0)
+        error = None
+        if fake.failures.get(name):
+            fake.failures[name] -= 1
+            error = 'INTERNAL'
+        return FakeOperation(f'operations/{name}-{len(fake.started)}', ready_at, error)
+
+
+class FakeOperations:
+    def __init__(self, fake):
+        self.fake = fake
+
+    async def get(self, operation):
+        self.fake.polls += 1
+        if time.monotonic() >= operation.ready_at and not operation.done:
+            operation.done = True
+            operation.error = operation.pending_error
+            if operation.error is None:
+                operation.response = SimpleNamespace(document_name=f'documents/{operation.name}')
+        return operation
+
+
+class FakeGenaiClient:
+    """
+    Minimal genai.Client double exposing the client.aio surface used by the uploader.
+
+    Latencies are per document filename (seconds); unknown files are instant.
+    failures / upload_errors map filename → number of failing attempts
+    (import error / 429 on upload) before the document succeeds.
+    """
+
+    def __init__(self, upload_latency=None, import_latency=None, failures=None, upload_errors=None,
+                 stores=None, documents=None):
+        self.upload_latency = upload_latency or {}
+        self.import_latency = import_latency or {}
+        self.failures = dict(failures or {})
+        self.upload_errors = dict(upload_errors or {})
+        self.started = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.polls = 0
+        self.created = []
+        self.deleted = []
+        self.deleted_stores = []
+        self.stores = stores or []
+        self.documents = documents or {}
+        self.list_requests = 0
+        self.upload_configs = {}
+        self.uploaded_data = {}
+        self.aio = SimpleNamespace(
+            file_search_stores=FakeFileSearchStores(self),
+            operations=FakeOperations(self)
+        )
+
+
+def fast_poller(client, max_wait=300):
+    """Poller with test-friendly intervals"""
+    return ImportPoller(client, max_wait=max_wait, min_interval=0.01, max_interval=0.02)
+
+
+def make_docs(tmp_path, sizes):
+    """Create doc_XXXX.txt files with the given byte sizes"""
+    paths = []
+    for i, size in enumerate(sizes):
+        path = tmp_path / f'doc_{i:04d}.txt'
+        path.write_text('x' * size)
+        paths.append(path)
+    return paths
+
+
+# ========== TESTS ==========
+
+class TestUploadResults:
+    """Test result ordering and metadata shape"""
+
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self, tmp_path):
+        """Results follow document_paths order even when completion order differs"""
+        docs = make_docs(tmp_path, [10, 500, 50, 200])
+        client = FakeGenaiClient(import_latency={'doc_0000.txt': 0.05})
+
+        result = await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, concurrency=4, poller=fast_poller(client)
+        )
+
+        assert [r['name'] for r in result] == [d.name for d in docs]
+
+    @pytest.mark.asyncio
+    async def test_metadata_shape(self, tmp_path):
+        """Each result keeps the name/path/size/document_name/imported_at shape"""
+        docs = make_docs(tmp_path, [123])
+        client = FakeGenaiClient()
+        result = await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, poller=fast_poller(client)
+        )
+
+        assert set(result[0].keys()) == {'name', 'path', 'size', 'document_name', 'imported_at'}
+        assert result[0]['size'] == 123
+        assert result[0]['document_name'].startswith('documents/operations/doc_0000.txt')
+        assert result[0]['path'] == str(docs[0])
+
+    @pytest.mark.asyncio
+    async def test_empty_input(self, tmp_path):
+        """No documents → no uploads"""
+        client = FakeGenaiClient()
+        result = await upload_documents_to_store(client, 'fileSearchStores/test', [])
+        assert result == []
+        assert client.started == []
+
+    @pytest.mark.asyncio
+    async def test_single_document(self, tmp_path):
+        """upload_document submits with custom metadata and waits; failed imports raise"""
+        docs = make_docs(tmp_path, [40, 50])
+        client = FakeGenaiClient(failures={'doc_0001.txt': 1})
+        poller = fast_poller(client)
+
+        result = await upload_document(
+            client, 'fileSearchStores/test', docs[0], poller, metadata={'source_url': 'https://x/0'}
+        )
+        assert result['name'] == 'doc_0000.txt' and result['size'] == 40
+        assert {'key': 'source_url', 'string_value': 'https://x/0'} in client.upload_configs['doc_0000.txt']['custom_metadata']
+
+        with pytest.raises(RuntimeError, match='Import failed for doc_0001.txt'):
+            await upload_document(client, 'fileSearchStores/test', docs[1], poller)
+        await poller.close()
+
+    @pytest.mark.asyncio
+    async def test_estimated_tokens_from_counter(self, tmp_path):
+        """A token counter replaces the size / 5 estimate, and memoizes the counts"""
+        docs = make_docs(tmp_path, [12, 60])
+        counter = SubwordTokenCounter()
+
+        sized = await upload_to_gemini('key', docs, 'sized', rate_limit=0, client=FakeGenaiClient())
+        counted = await upload_to_gemini('key', docs, 'counted', rate_limit=0, client=FakeGenaiClient(), token_counter=counter)
+
+        assert sized['estimated_tokens'] == 72 // 5
+        assert counted['estimated_tokens'] == 2 + 10  # 'x' * n: one token per 6 letters
+        assert counter.count_documents(docs) == [2, 10]
+        assert counter.summary()['cache_hits'] == 2
+
+    @pytest.mark.asyncio
+    async def test_records_not_read(self, tmp_path):
+        """Records supply size and tokens: files are never stat()ed or read"""
+        records = [
+            DocumentRecord(tmp_path / f'doc_{i:04d}.txt', f'https://x/{i}', f'Page {i}', size, size, tokens, 'hash')
+            for i, (size, tokens) in enumerate([(100, 30), (500, 90)])
+        ]
+
+        corpus = await upload_to_gemini('key', records, 'docs', rate_limit=0, client=FakeGenaiClient())
+
+        assert corpus['total_size_bytes'] == 600
+        assert corpus['estimated_tokens'] == 120
+        assert corpus['uploaded_files'][0]['url'] == 'https://x/0'
+        assert corpus['uploaded_files'][1]['tokens'] == 90
+
+
+    @pytest.mark.asyncio
+    async def test_in_memory_upload(self, tmp_path):
+        """In-memory records are streamed as text/plain (from byte 0 on retries); no file needed"""
+        text = '---\nSource: https://x/0\n---\n\nÜnïcode body'
+        record = DocumentRecord.from_text(tmp_path / 'doc_0000.txt', 'https://x/0', 'Page', text, 5, in_memory=True)
+        client = FakeGenaiClient(upload_errors={'doc_0000.txt': 1})
+
+        result = await upload_documents_to_store(
+            client, 'fileSearchStores/test', [record], poller=fast_poller(client),
+            policy=RetryPolicy(base_delay=0.001, max_delay=0.001)
+        )
+
+        assert result[0]['size'] == len(text.encode('utf-8'))
+        assert client.uploaded_data['doc_0000.txt'] == text.encode('utf-8')
+        assert client.upload_configs['doc_0000.txt']['mime_type'] == 'text/plain'
+        assert not record.path.exists()
+
+
+class TestConcurrency:
+    """Test bounded parallelism and scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_respected(self, tmp_path):
+        """Never more than `concurrency` uploads in flight"""
+        docs = make_docs(tmp_path, [100] * 12)
+        client = FakeGenaiClient(upload_latency={d.name: 0.02 for d in docs})
+
+        await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, concurrency=3, poller=fast_poller(client)
+        )
+
+        assert client.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_largest_first(self, tmp_path):
+        """Uploads start in descending size order"""
+        docs = make_docs(tmp_path, [10, 400, 30, 200, 20])
+        client = FakeGenaiClient()
+
+        await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, concurrency=1, poller=fast_poller(client)
+        )
+
+        assert client.started == ['doc_0001.txt', 'doc_0003.txt', 'doc_0002.txt', 'doc_0004.txt', 'doc_0000.txt']
+
+    @pytest.mark.asyncio
+    async def test_import_wait_does_not_hold_upload_slot(self, tmp_path):
+        """Slow imports don't throttle submission (poller waits, not the semaphore)"""
+        docs = make_docs(tmp_path, [100] * 6)
+        client = FakeGenaiClient(import_latency={d.name: 0.2 for d in docs})
+
+        start = time.monotonic()
+        await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, concurrency=1, poller=fast_poller(client)
+        )
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.6  # Sequential import waits would be ≥ 1.2s
+
+    @pytest.mark.asyncio
+    async def test_parallel_faster_than_sequential(self, tmp_path):
+        """8 docs × 0.1s import at concurrency 8 takes ~0.1s, not ~0.8s"""
+        docs = make_docs(tmp_path, [100] * 8)
+        client = FakeGenaiClient(import_latency={d.name: 0.1 for d in docs})
+
+        start = time.monotonic()
+        await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, concurrency=8, poller=fast_poller(client)
+        )
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.4
+
+    @pytest.mark.asyncio
+    async def test_invalid_concurrency(self, tmp_path):
+        """Concurrency must be positive"""
+        with pytest.raises(ValueError):
+            await upload_documents_to_store(FakeGenaiClient(), 'fileSearchStores/test', [], concurrency=0)
+
+
+class TestFailures:
+    """Test retries, re-queueing and dead-lettering"""
+
+    NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001)
+
+    @pytest.mark.asyncio
+    async def test_import_error_requeued(self, tmp_path):
+        """A failed import is retried and the document still gets uploaded"""
+        docs = make_docs(tmp_path, [10, 20])
+        client = FakeGenaiClient(failures={'doc_0001.txt': 1})
+        dead_letters = []
+
+        result = await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, poller=fast_poller(client),
+            dead_letters=dead_letters
+        )
+
+        assert [r['name'] for r in result] == ['doc_0000.txt', 'doc_0001.txt']
+        assert client.started.count('doc_0001.txt') == 2
+        assert dead_letters == []
+
+    @pytest.mark.asyncio
+    async def test_persistent_failure_dead_lettered(self, tmp_path):
+        """A document failing every attempt is dead-lettered, the rest succeed"""
+        docs = make_docs(tmp_path, [10, 20, 30])
+        client = FakeGenaiClient(failures={'doc_0001.txt': 99})
+        dead_letters = []
+
+        result = await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, poller=fast_poller(client),
+            max_attempts=2, dead_letters=dead_letters
+        )
+
+        assert [r['name'] for r in result] == ['doc_0000.txt', 'doc_0002.txt']
+        assert len(dead_letters) == 1
+        assert dead_letters[0]['name'] == 'doc_0001.txt'
+        assert dead_letters[0]['attempts'] == 2
+        assert 'INTERNAL' in dead_letters[0]['error']
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_upload_retried(self, tmp_path):
+        """429s on upload are retried with backoff inside a single attempt"""
+        docs = make_docs(tmp_path, [10])
+        client = FakeGenaiClient(upload_errors={'doc_0000.txt': 2})
+        dead_letters = []
+
+        result = await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, poller=fast_poller(client),
+            policy=self.NO_WAIT, dead_letters=dead_letters
+        )
+
+        assert len(result) == 1
+        assert dead_letters == []
+
+    @pytest.mark.asyncio
+    async def test_import_timeout_dead_lettered(self, tmp_path):
+        """Import slower than max_wait on every attempt ends in dead letters"""
+        docs = make_docs(tmp_path, [10])
+        client = FakeGenaiClient(import_latency={'doc_0000.txt': 10})
+        dead_letters = []
+
+        result = await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, poller=fast_poller(client, max_wait=0.05),
+            max_attempts=2, dead_letters=dead_letters
+        )
+
+        assert result == []
+        assert 'doc_0000.txt' in dead_letters[0]['error']
+
+    @pytest.mark.asyncio
+    async def test_import_timeout_polled_not_reuploaded(self, tmp_path):
+        """An import outliving one max_wait is polled again, not uploaded twice"""
+        docs = make_docs(tmp_path, [10])
+        client = FakeGenaiClient(import_latency={'doc_0000.txt': 0.08})
+        dead_letters = []
+
+        result = await upload_documents_to_store(
+            client, 'fileSearchStores/test', docs, poller=fast_poller(client, max_wait=0.05),
+            max_attempts=3, dead_letters=dead_letters
+        )
+
+        assert [r['name'] for r in result] == ['doc_0000.txt']
+        assert client.started == ['doc_0000.txt']
+        assert dead_letters == []
+
+
+class TestIncremental:
+    """Test re-runs against an existing store"""
+
+    @staticmethod
+    def previous_manifest():
+        return {
+            'corpus_name': 'docs',
+            'file_search_store_name': 'fileSearchStores/existing',
+            'pages': {
+                'https://a': {'content_hash': 'old-a', 'document_name': 'documents/a'},
+                'https://b': {'content_hash': 'old-b', 'document_name': 'documents/b'}
+            }
+        }
+
+    @pytest.mark.asyncio
+    async def test_reuses_store_and_deletes_stale(self, tmp_path):
+        """Changed pages are re-uploaded into the same store; old versions and removed pages are deleted"""
+        client = FakeGenaiClient()
+        manifest = ManifestTracker('docs', self.previous_manifest())
+        manifest.check('https://a', 'new content')  # changed; https://b removed
+        docs = make_docs(tmp_path, [100])
+        manifest.record_document('https://a', docs[0].name)
+
+        corpus = await upload_to_gemini('key', docs, 'docs', rate_limit=0, client=client, manifest=manifest)
+
+        assert client.created == []
+        assert corpus['file_search_store_name'] == 'fileSearchStores/existing'
+        assert sorted(client.deleted) == ['documents/a', 'documents/b']
+        assert corpus['incremental']['deleted_documents'] == 2
+        assert manifest.pages['https://a']['document_name'].startswith('documents/operations/doc_0000.txt')
+
+    @pytest.mark.asyncio
+    async def test_nothing_changed(self, tmp_path):
+        """An empty stream on a re-run is not an error"""
+        client = FakeGenaiClient()
+        previous = self.previous_manifest()
+        manifest = ManifestTracker('docs', previous)
+        manifest.pages = {url: dict(entry) for url, entry in previous['pages'].items()}
+
+        async def no_documents():
+            return
+            yield
+
+        corpus = await upload_to_gemini('key', no_documents(), 'docs', rate_limit=0, client=client, manifest=manifest)
+
+        assert corpus['files_indexed'] == 0
+        assert client.started == [] and client.deleted == []
+
+    @pytest.mark.asyncio
+    async def test_first_run_creates_store(self, tmp_path):
+        """Without a previous manifest a new store is created"""
+        client = FakeGenaiClient()
+        manifest = ManifestTracker('docs')
+        manifest.check('https://a', 'content')
+        docs = make_docs(tmp_path, [10])
+        manifest.record_document('https://a', docs[0].name)
+
+        corpus = await upload_to_gemini('key', docs, 'docs', rate_limit=0, client=client, manifest=manifest)
+
+        assert client.created == ['docs']
+        assert manifest.to_manifest(corpus['file_search_store_name'])['pages']['https://a']['document_name']
+
+
+def fake_store(name, display_name, created):
+    return SimpleNamespace(name=name, display_name=display_name, create_time=created)
+
+
+def fake_document(name, url=None, digest=None, state='STATE_ACTIVE'):
+    metadata = []
+    if url:
+        metadata = [
+            SimpleNamespace(key='source_url', string_value=url),
+            SimpleNamespace(key='content_hash', string_value=digest)
+        ]
+    return SimpleNamespace(name=name, display_name=name, state=state, custom_metadata=metadata)
+
+
+class TestUpsert:
+    """Test finding and updating an existing store"""
+
+    @pytest.mark.asyncio
+    async def test_store_list_paginated_and_cached(self):
+        """All pages are listed once; later lookups hit the cache"""
+        stores = [fake_store(f'fileSearchStores/s{i}', f'corpus-{i}', datetime(2025, 1, 1, tzinfo=timezone.utc)) for i in range(45)]
+        client = FakeGenaiClient(stores=stores)
+
+        assert len(await list_file_search_stores(client)) == 45
+        assert client.list_requests == 3  # 20 + 20 + 5
+
+        assert await find_file_search_store(client, 'corpus-44') == 'fileSearchStores/s44'
+        assert await find_file_search_store(client, 'missing') is None
+        assert client.list_requests == 3
+
+    @pytest.mark.asyncio
+    async def test_newest_store_wins(self):
+        """Several stores with the same display name → most recent"""
+        client = FakeGenaiClient(stores=[
+            fake_store('fileSearchStores/old', 'docs', datetime(2024, 1, 1, tzinfo=timezone.utc)),
+            fake_store('fileSearchStores/new', 'docs', datetime(2025, 1, 1, tzinfo=timezone.utc))
+        ])
+
+        assert await find_file_search_store(client, 'docs') == 'fileSearchStores/new'
+
+    @pytest.mark.asyncio
+    async def test_created_store_added_to_cache(self, tmp_path):
+        """A store created after listing is found without re-listing"""
+        client = FakeGenaiClient()
+        await list_file_search_stores(client)
+        await upload_to_gemini('key', make_docs(tmp_path, [10]), 'docs', rate_limit=0, client=client)
+
+        assert await find_file_search_store(client, 'docs') == 'fileSearchStores/docs'
+
+    @pytest.mark.asyncio
+    async def test_deleted_store_removed_from_cache(self, tmp_path):
+        """Stores are deleted through the async client and dropped from the cache"""
+        client = FakeGenaiClient()
+        await list_file_search_stores(client)
+        await upload_to_gemini('key', make_docs(tmp_path, [10]), 'docs', rate_limit=0, client=client)
+
+        await delete_file_search_store(client, 'fileSearchStores/docs')
+
+        assert client.deleted_stores == ['fileSearchStores/docs']
+        assert await find_file_search_store(client, 'docs') is None
+
+    @pytest.mark.asyncio
+    async def test_upsert_only_uploads_changes(self, tmp_path):
+        """Existing documents are listed and matched; only changed pages are uploaded"""
+        client = FakeGenaiClient(
+            stores=[fake_store('fileSearchStores/docs', 'docs', datetime(2025, 1, 1, tzinfo=timezone.utc))],
+            documents={'fileSearchStores/docs': [
+                fake_document('documents/a', 'https://a', content_hash('same')),
+                fake_document('documents/b', 'https://b', content_hash('old')),
+                fake_document('documents/legacy')
+            ]}
+        )
+
+        previous = await load_store_manifest(client, 'docs')
+        manifest = ManifestTracker('docs', previous)
+        assert not manifest.check('https://a', 'same')
+        assert manifest.check('https://b', 'new')
+        docs = make_docs(tmp_path, [10])
+        manifest.record_document('https://b', docs[0].name)
+
+        corpus = await upload_to_gemini('key', docs, 'docs', rate_limit=0, client=client, manifest=manifest)
+
+        assert client.created == []
+        assert client.started == ['doc_0000.txt']
+        assert sorted(client.deleted) == ['documents/b', 'documents/legacy']
+        assert corpus['file_search_store_name'] == 'fileSearchStores/docs'
+
+        custom_metadata = {m['key']: m['string_value'] for m in client.upload_configs['doc_0000.txt']['custom_metadata']}
+        assert custom_metadata['source_url'] == 'https://b'
+        assert custom_metadata['content_hash'] == content_hash('new')
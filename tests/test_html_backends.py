@@ -0,0 +1,168 @@
+"""
+HTML Parser Backend Tests
+
+Test coverage:
+- lxml backend produces the same title and text as BeautifulSoup
+- Title fallbacks (<title>, <h1>, og:title, URL)
+- Main-content selection
+- Edge cases (empty pages, XML declarations, deep nesting)
+- Backend lookup by name
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.html_backends import (
+    PARSER_BACKENDS,
+    ParserBackend,
+    get_parser_backend,
+    title_from_url
+)
+from tools.noise_filter import NoiseFilter
+from tools.document_converter import convert_html_to_document
+from benchmarks.fixtures import docs_page
+
+URL = 'https://example.com/docs/getting-started'
+
+
+def extract_all(html, url=URL, **kwargs):
+    """(title, text) from every backend"""
+    return {name: backend.extract(html, url, **kwargs) for name, backend in PARSER_BACKENDS.items()}
+
+
+def assert_parity(html, url=URL, **kwargs):
+    results = extract_all(html, url, **kwargs)
+    expected = results['beautifulsoup']
+    for name, result in results.items():
+        assert result == expected, name
+    return expected
+
+
+class TestParity:
+    """Test both backends agree"""
+
+    @pytest.mark.parametrize('seed', range(3))
+    @pytest.mark.parametrize('main_content_only', [False, True])
+    def test_docs_pages(self, seed, main_content_only):
+        """Generated docs pages give identical title and text"""
+        title, text = assert_parity(docs_page(seed=seed), main_content_only=main_content_only)
+        assert title and text
+
+    def test_noise_stripped(self):
+        """Noise rules apply the same way on the lxml tree"""
+        html = """<html><body><nav>menu</nav><div class="Sidebar-Ads">ad</div>
+        <div id="cookie-banner">c</div><div role="contentinfo">f</div>
+        <p>keep <b>this</b> tail</p><script>x()</script></body></html>"""
+        _, text = assert_parity(html)
+        assert text == 'keep\nthis\ntail'
+
+    def test_custom_noise_filter(self):
+        """A configured filter is honoured by every backend"""
+        noise_filter = NoiseFilter.from_config({'tags': ['aside']})
+        _, text = assert_parity('<aside>a</aside><p>b</p>', noise_filter=noise_filter)
+        assert text == 'b'
+
+    def test_comments_and_templates_skipped(self):
+        """Comments, <template> and <style> contents are not page text"""
+        html = '<body><!-- hidden --><template>t</template><p>a</p><style>p{}</style>b</body>'
+        _, text = assert_parity(html, noise_filter=NoiseFilter(tags=[]))
+        assert text == 'a\nb'
+
+    def test_converted_documents_identical(self, tmp_path):
+        """convert_html_to_document writes the same file with either backend"""
+        html = docs_page(seed=7)
+        outputs = set()
+        for name, backend in PARSER_BACKENDS.items():
+            text = convert_html_to_document(html, URL, tmp_path / f'{name}.txt', backend=backend).read_text(encoding='utf-8')
+            # Drop the Scraped: timestamp line
+            outputs.add('\n'.join(line for line in text.splitlines() if not line.startswith('Scraped:')))
+        assert len(outputs) == 1
+
+
+class TestTitles:
+    """Test title fallbacks"""
+
+    @pytest.mark.parametrize('html,expected', [
+        ('<html><head><title> Hooks </title></head><body><h1>H</h1></body></html>', 'Hooks'),
+        ('<html><body><h1>Intro <em>Guide</em></h1></body></html>', 'IntroGuide'),
+        ('<html><head><meta property="og:title" content="OG Title"></head></html>', 'OG Title'),
+        ('<html><body><p>No title</p></body></html>', 'Getting Started'),
+    ])
+    def test_fallback_order(self, html, expected):
+        """<title> → <h1> → og:title → URL basename"""
+        title, _ = assert_parity(html)
+        assert title == expected
+
+    def test_url_fallback(self):
+        """URL basenames become title case; bare domains are Untitled"""
+        assert title_from_url('https://x.com/api_reference/') == 'Api Reference'
+        assert title_from_url('https://x.com/') == 'Untitled'
+
+
+class TestMainContent:
+    """Test main-content selection"""
+
+    @pytest.mark.parametrize('html,expected', [
+        ('<body><p>out</p><main><p>in</p></main></body>', 'in'),
+        ('<body><p>out</p><article><p>in</p></article></body>', 'in'),
+        ('<body><div class="sidebar-content">side</div><div class="main-content">main</div></body>', 'side'),
+        ('<body><div class="documentation">docs</div></body>', 'docs'),
+        ('<body><p>whole page</p></body>', 'whole page'),
+    ])
+    def test_selection(self, html, expected):
+        """<main> → <article> → content classes → whole page"""
+        _, text = assert_parity(html, main_content_only=True)
+        assert text == expected
+
+
+class TestEdgeCases:
+    """Test malformed and unusual input"""
+
+    @pytest.mark.parametrize('html', ['', '   ', '<!-- only a comment -->'])
+    def test_empty_documents(self, html):
+        """Empty pages give no text and a URL title"""
+        for title, text in extract_all(html).values():
+            assert text == ''
+            assert title == 'Getting Started'
+
+    def test_xml_declaration(self):
+        """XHTML with an encoding declaration parses as a str"""
+        html = '<?xml version="1.0" encoding="utf-8"?><html><body><p>Grüße</p></body></html>'
+        _, text = assert_parity(html)
+        assert text == 'Grüße'
+
+    def test_unclosed_tags(self):
+        """Broken markup is repaired the same way"""
+        assert_parity('<html><body><div><p>one<p>two<li>three</div>four')
+
+    def test_deep_nesting(self):
+        """Deeply nested pages don't hit the recursion limit"""
+        html = '<div>' * 1500 + 'deep' + '</div>' * 1500
+        _, text = assert_parity(html)
+        assert text == 'deep'
+
+
+class TestRegistry:
+    """Test backend lookup"""
+
+    def test_default_backend(self):
+        """No name → BeautifulSoup"""
+        assert get_parser_backend().name == 'beautifulsoup'
+        assert get_parser_backend(None) is get_parser_backend('beautifulsoup')
+
+    def test_unknown_backend(self):
+        """Unknown names list the available backends"""
+        with pytest.raises(ValueError, match='lxml'):
+            get_parser_backend('html5lib')
+
+    def test_backend_must_implement_extract(self):
+        """A backend without extract() fails when created, not mid-conversion"""
+        class Incomplete(ParserBackend):
+            name = 'incomplete'
+
+        with pytest.raises(TypeError):
+            Incomplete()
@@ -0,0 +1,188 @@
+"""
+Import Poller Tests
+
+Test coverage:
+- Futures resolve when their operation completes
+- Batched polling (one cycle serves many operations)
+- Adaptive backoff (size-scaled start, growing intervals, capped)
+- Timeouts and poll errors
+"""
+
+import asyncio
+import time
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.import_poller import ImportPoller, SMALL_FILE_BYTES
+
+
+class FakeOperation:
+    def __init__(self, name, ready_at, error=None):
+        self.name = name
+        self.ready_at = ready_at
+        self.done = False
+        self.error = error
+
+
+class FakeOperationsClient:
+    """genai.Client double: operations finish at a fixed monotonic time"""
+
+    def __init__(self, fail_names=(), transient_errors=0):
+        self.fail_names = set(fail_names)
+        self.transient_errors = transient_errors
+        self.gets = []
+        self.aio = SimpleNamespace(operations=self)
+
+    async def get(self, operation):
+        self.gets.append((operation.name, time.monotonic()))
+        if operation.name in self.fail_names:
+            raise ValueError('poll failed')
+        if self.transient_errors:
+            self.transient_errors -= 1
+            raise ConnectionError('connection reset')
+        if time.monotonic() >= operation.ready_at:
+            operation.done = True
+        return operation
+
+
+def operation(name, delay):
+    return FakeOperation(name, time.monotonic() + delay)
+
+
+class TestResolution:
+    """Test futures resolve on completion"""
+
+    @pytest.mark.asyncio
+    async def test_wait_returns_finished_operation(self):
+        """wait() returns the operation once it is done"""
+        client = FakeOperationsClient()
+        poller = ImportPoller(client, min_interval=0.01, max_interval=0.05)
+
+        result = await poller.wait(operation('op-1', 0.03))
+
+        assert result.done
+        assert poller.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_already_done_not_polled(self):
+        """Operations that are done at submit time resolve without polling"""
+        client = FakeOperationsClient()
+        poller = ImportPoller(client, min_interval=0.01)
+        op = operation('op-1', 0)
+        op.done = True
+
+        assert await poller.wait(op) is op
+        assert client.gets == []
+
+    @pytest.mark.asyncio
+    async def test_independent_completion(self):
+        """Each future resolves when its own operation completes"""
+        client = FakeOperationsClient()
+        poller = ImportPoller(client, min_interval=0.01, max_interval=0.02)
+
+        fast = poller.track(operation('fast', 0.02))
+        slow = poller.track(operation('slow', 0.15))
+
+        await fast
+        assert not slow.done()
+        await slow
+
+
+class TestBatching:
+    """Test one cadence for many operations"""
+
+    @pytest.mark.asyncio
+    async def test_many_operations_share_cycles(self):
+        """50 concurrent imports are polled in shared cycles"""
+        client = FakeOperationsClient()
+        poller = ImportPoller(client, min_interval=0.02, max_interval=0.05)
+
+        futures = [poller.track(operation(f'op-{i}', 0.1)) for i in range(50)]
+        await asyncio.gather(*futures)
+
+        # Each cycle polls every operation at once
+        assert poller.cycles * 50 == poller.polls
+        assert poller.cycles < 10
+
+
+class TestAdaptiveBackoff:
+    """Test interval selection"""
+
+    def test_small_files_start_fast(self):
+        """Small files start at min_interval, large files slower (capped)"""
+        poller = ImportPoller(FakeOperationsClient(), min_interval=0.5, max_interval=10)
+
+        assert poller.initial_interval(1000) == 0.5
+        assert poller.initial_interval(SMALL_FILE_BYTES * 4) == 2.0
+        assert poller.initial_interval(SMALL_FILE_BYTES * 1000) == 10
+
+    @pytest.mark.asyncio
+    async def test_intervals_grow(self):
+        """Gaps between polls of a long import increase"""
+        client = FakeOperationsClient()
+        poller = ImportPoller(client, min_interval=0.01, max_interval=1, backoff=2)
+
+        await poller.wait(operation('long', 0.3))
+
+        times = [t for _, t in client.gets]
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert len(gaps) >= 3
+        assert gaps[-1] > gaps[0] * 2
+
+
+class TestFailures:
+    """Test timeouts and poll errors"""
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        """Operation exceeding max_wait raises TimeoutError"""
+        poller = ImportPoller(FakeOperationsClient(), max_wait=0.05, min_interval=0.01)
+
+        with pytest.raises(TimeoutError):
+            await poller.wait(operation('stuck', 10))
+
+    @pytest.mark.asyncio
+    async def test_poll_error_propagates(self):
+        """Poll exception surfaces on that operation's future only"""
+        client = FakeOperationsClient(fail_names={'bad'})
+        poller = ImportPoller(client, min_interval=0.01)
+
+        bad = poller.track(operation('bad', 0))
+        good = poller.track(operation('good', 0))
+
+        with pytest.raises(ValueError):
+            await bad
+        assert (await good).done
+
+    @pytest.mark.asyncio
+    async def test_transient_poll_errors_retried(self):
+        """Transient poll errors are retried on later cycles"""
+        client = FakeOperationsClient(transient_errors=2)
+        poller = ImportPoller(client, min_interval=0.01, max_poll_errors=3)
+
+        assert (await poller.wait(operation('flaky', 0))).done
+
+    @pytest.mark.asyncio
+    async def test_transient_poll_errors_exhausted(self):
+        """Too many consecutive transient errors fail the operation"""
+        client = FakeOperationsClient(transient_errors=10)
+        poller = ImportPoller(client, min_interval=0.01, max_poll_errors=2)
+
+        with pytest.raises(ConnectionError):
+            await poller.wait(operation('flaky', 0))
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_waiters(self):
+        """close() cancels outstanding futures"""
+        poller = ImportPoller(FakeOperationsClient(), min_interval=0.01)
+        future = poller.track(operation('stuck', 10))
+
+        await poller.close()
+
+        assert future.cancelled()
+        assert poller.pending == 0
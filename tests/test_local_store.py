@@ -0,0 +1,110 @@
+"""
+Local File Search Store and Replay CLI Tests
+
+Test coverage:
+- Upload engine against the local store (files and in-memory documents)
+- Store lookup, document listing and deletion (upsert runs)
+- Missing stores/documents raise 404 like the API
+- Replay CLI: saved dataset → documents → local store, phase timings
+"""
+
+import asyncio
+import json
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from google.genai import errors
+from tools.gemini_uploader import upload_to_gemini, load_store_manifest
+from tools.local_store import LocalFileSearchClient
+from tools.document_record import DocumentRecord
+from src.cli import build_parser, replay, main as cli_main
+
+
+def records(count, in_memory=True, tmp_path=None):
+    documents = []
+    for i in range(count):
+        text = f'---\nSource: https://x/{i}\n---\n\nPage {i}'
+        path = (tmp_path or Path('.')) / f'doc_{i:04d}.txt'
+        if not in_memory:
+            path.write_text(text, encoding='utf-8')
+        documents.append(DocumentRecord.from_text(path, f'https://x/{i}', f'Page {i}', text, 10, in_memory=in_memory))
+    return documents
+
+
+class TestLocalStore:
+    """Test the upload engine against the local store"""
+
+    @pytest.mark.asyncio
+    async def test_upload(self, tmp_path):
+        """Files and in-memory documents land in one store with their metadata"""
+        client = LocalFileSearchClient()
+        documents = records(3) + records(2, in_memory=False, tmp_path=tmp_path)[1:]
+        corpus = await upload_to_gemini('', documents, 'docs', rate_limit=0, client=client)
+
+        assert corpus['files_indexed'] == 4
+        assert client.summary()['documents'] == 4
+        assert client.requests['upload'] == 4
+        assert client.bytes_uploaded == sum(d.size for d in documents)
+        stored = next(iter(client.documents[corpus['file_search_store_name']].values()))
+        assert {m.key for m in stored.custom_metadata} >= {'source_path', 'file_size'}
+
+    @pytest.mark.asyncio
+    async def test_store_directory(self, tmp_path):
+        """With a directory, uploaded bytes are written there"""
+        client = LocalFileSearchClient(tmp_path / 'store')
+        await upload_to_gemini('', records(2), 'docs', rate_limit=0, client=client)
+
+        written = sorted((tmp_path / 'store').rglob('*.txt'))
+        assert len(written) == 2
+        assert written[0].read_text(encoding='utf-8').endswith('Page 0')
+
+    @pytest.mark.asyncio
+    async def test_list_and_delete(self):
+        """Stores are found by name; documents list and delete like the API"""
+        client = LocalFileSearchClient()
+        corpus = await upload_to_gemini('', records(2), 'docs', rate_limit=0, client=client)
+
+        manifest = await load_store_manifest(client, 'docs')
+        assert manifest['file_search_store_name'] == corpus['file_search_store_name']
+        assert len(manifest['pages']) == 2
+
+        name = next(iter(client.documents[corpus['file_search_store_name']]))
+        await client.aio.file_search_stores.documents.delete(name=name)
+        with pytest.raises(errors.ClientError) as e:
+            await client.aio.file_search_stores.documents.delete(name=name)
+        assert e.value.code == 404
+        assert await load_store_manifest(LocalFileSearchClient(), 'docs') is None
+
+
+class TestReplayCli:
+    """Test the offline replay command"""
+
+    def write_dataset(self, tmp_path, count=5):
+        path = tmp_path / 'items.jsonl'
+        with open(path, 'w', encoding='utf-8') as f:
+            for i in range(count):
+                f.write(json.dumps({'url': f'https://x/{i}', 'html': f'<title>Page {i}</title><p>Body {i}</p>'}) + '\n')
+        return path
+
+    def test_replay(self, tmp_path):
+        """Every page is converted and uploaded; each phase is timed"""
+        args = build_parser().parse_args(['replay', '--dataset', str(self.write_dataset(tmp_path)), '--workers', '1'])
+        result = asyncio.run(replay(args, tmp_path / 'docs'))
+
+        assert result['upload_result']['files_indexed'] == 5
+        assert list(result['timings']) == ['load', 'convert', 'split', 'upload', 'cost']
+        assert result['counts']['convert'] == 5
+        assert not list((tmp_path / 'docs').iterdir())  # documents stayed in memory
+
+    def test_exit_codes(self, tmp_path, monkeypatch, capsys):
+        """The CLI returns 0 on success and 1 when the store can't be used"""
+        dataset = str(self.write_dataset(tmp_path))
+        assert cli_main(['replay', '--dataset', dataset, '--workers', '1']) == 0
+        assert 'Phase timings' in capsys.readouterr().out
+
+        monkeypatch.delenv('GEMINI_API_KEY', raising=False)
+        assert cli_main(['replay', '--dataset', dataset, '--store', 'gemini']) == 1
@@ -0,0 +1,193 @@
+"""
+Incremental Re-indexing Manifest Tests
+
+Test coverage:
+- New / changed / unchanged / removed page classification
+- Stale document selection (old versions, removed pages)
+- Failed re-uploads keep the previous entry
+- Converter skips unchanged pages
+- Key-Value Store round trip
+- Rebuilding a manifest from an existing store's documents
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.manifest import (
+    ManifestTracker,
+    content_hash,
+    manifest_key,
+    manifest_from_documents,
+    load_manifest,
+    save_manifest
+)
+from tools.document_converter import convert_dataset_to_documents
+
+
+def previous_manifest(**pages):
+    return {
+        'corpus_name': 'docs',
+        'file_search_store_name': 'fileSearchStores/abc',
+        'pages': {
+            url: {'content_hash': content_hash(content), 'document_name': f'documents/{url}'}
+            for url, content in pages.items()
+        }
+    }
+
+
+class FakeKeyValueStore:
+    def __init__(self):
+        self.records = {}
+
+    async def get_value(self, key):
+        return self.records.get(key)
+
+    async def set_value(self, key, value):
+        self.records[key] = value
+
+
+class TestClassification:
+    """Test which pages need indexing"""
+
+    def test_first_run_indexes_everything(self):
+        """Without a previous manifest every page is new"""
+        tracker = ManifestTracker('docs')
+        assert tracker.check('a', 'x')
+        assert tracker.check('b', 'y')
+        assert tracker.summary() == {'new': 2, 'changed': 0, 'unchanged': 0, 'duplicate': 0, 'removed': 0}
+
+    def test_unchanged_skipped(self):
+        """Same URL and content → skipped"""
+        tracker = ManifestTracker('docs', previous_manifest(a='x'))
+        assert not tracker.check('a', 'x')
+        assert tracker.counts['unchanged'] == 1
+
+    def test_changed_and_new(self):
+        """Different content or unknown URL → indexed"""
+        tracker = ManifestTracker('docs', previous_manifest(a='x'))
+        assert tracker.check('a', 'x2')
+        assert tracker.check('b', 'y')
+        assert tracker.counts['changed'] == 1
+        assert tracker.counts['new'] == 1
+
+    def test_duplicate_url_skipped(self):
+        """A URL seen twice in one crawl is only indexed once"""
+        tracker = ManifestTracker('docs')
+        assert tracker.check('a', 'x')
+        assert not tracker.check('a', 'x')
+
+    def test_removed_pages(self):
+        """Pages missing from the crawl are reported as removed"""
+        tracker = ManifestTracker('docs', previous_manifest(a='x', b='y'))
+        tracker.check('a', 'x')
+        assert tracker.removed_urls() == ['b']
+
+
+class TestStaleDocuments:
+    """Test deletion candidates and the saved manifest"""
+
+    def test_stale_after_upload(self):
+        """Removed pages and replaced versions are stale; unchanged aren't"""
+        tracker = ManifestTracker('docs', previous_manifest(a='x', b='y', c='z'))
+        tracker.check('a', 'x')          # unchanged
+        tracker.check('b', 'y2')         # changed
+        tracker.record_document('b', 'doc_0001.txt')
+        tracker.record_uploads([{'name': 'doc_0001.txt', 'document_name': 'documents/b2'}])
+
+        assert sorted(tracker.stale_documents()) == ['documents/b', 'documents/c']
+
+        pages = tracker.to_manifest('fileSearchStores/abc')['pages']
+        assert set(pages) == {'a', 'b'}
+        assert pages['b']['document_name'] == 'documents/b2'
+
+    def test_failed_reupload_keeps_old_version(self):
+        """A changed page whose upload failed keeps its old document and entry"""
+        tracker = ManifestTracker('docs', previous_manifest(a='x'))
+        tracker.check('a', 'x2')
+        tracker.record_document('a', 'doc_0000.txt')
+        tracker.record_uploads([])
+
+        assert tracker.stale_documents() == []
+        assert tracker.to_manifest('fileSearchStores/abc')['pages']['a']['content_hash'] == content_hash('x')
+
+    def test_failed_new_page_not_recorded(self):
+        """A new page whose upload failed is retried next run"""
+        tracker = ManifestTracker('docs')
+        tracker.check('a', 'x')
+        assert tracker.to_manifest('fileSearchStores/abc')['pages'] == {}
+
+
+class TestConverterIntegration:
+    """Test the converter honours the manifest"""
+
+    def test_only_changed_pages_converted(self, tmp_path):
+        """Unchanged pages produce no documents"""
+        html = '<html><title>A</title><body><p>Body</p></body></html>'
+        tracker = ManifestTracker('docs', previous_manifest(**{'https://a': html}))
+        items = [
+            {'url': 'https://a', 'html': html},
+            {'url': 'https://b', 'html': html}
+        ]
+
+        docs = convert_dataset_to_documents(items, tmp_path, manifest=tracker)
+
+        assert [d.name for d in docs] == ['doc_0001.txt']
+        assert tracker.files == {'doc_0001.txt': 'https://b'}
+
+
+class TestPersistence:
+    """Test Key-Value Store round trip"""
+
+    def test_manifest_key_is_valid(self):
+        """Keys only contain characters allowed by the Key-Value Store"""
+        assert manifest_key('my docs/v2') == 'manifest-my-docs-v2'
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self):
+        """Saved manifest is loaded back by corpus name"""
+        kv_store = FakeKeyValueStore()
+        assert await load_manifest(kv_store, 'docs') is None
+
+        manifest = ManifestTracker('docs').to_manifest('fileSearchStores/abc')
+        await save_manifest(kv_store, manifest)
+
+        assert await load_manifest(kv_store, 'docs') == manifest
+
+
+class TestManifestFromDocuments:
+    """Test rebuilding a manifest from a store listing"""
+
+    @staticmethod
+    def document(name, url=None, digest='h', state='STATE_ACTIVE'):
+        metadata = []
+        if url:
+            metadata = [
+                SimpleNamespace(key='source_url', string_value=url),
+                SimpleNamespace(key='content_hash', string_value=digest)
+            ]
+        return SimpleNamespace(name=name, state=state, custom_metadata=metadata)
+
+    def test_pages_keyed_by_source_url(self):
+        """Documents with page metadata become manifest pages"""
+        manifest = manifest_from_documents('docs', 'fileSearchStores/abc', [self.document('documents/1', 'https://a')])
+
+        assert manifest['pages'] == {'https://a': {'content_hash': 'h', 'document_name': 'documents/1'}}
+        assert manifest['file_search_store_name'] == 'fileSearchStores/abc'
+
+    def test_unmatched_documents_become_stale(self):
+        """Untagged, failed and duplicate documents are deleted after upload"""
+        documents = [
+            self.document('documents/1', 'https://a'),
+            self.document('documents/2', 'https://a'),
+            self.document('documents/3'),
+            self.document('documents/4', 'https://b', state='STATE_FAILED')
+        ]
+        tracker = ManifestTracker('docs', manifest_from_documents('docs', 'fileSearchStores/abc', documents))
+        tracker.check('https://a', 'unchanged?')
+
+        assert sorted(tracker.stale_documents()) == ['documents/2', 'documents/3', 'documents/4']
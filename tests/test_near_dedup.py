@@ -0,0 +1,172 @@
+"""
+Near-Duplicate Detection Tests
+
+Test coverage:
+- Signature similarity tracks shingle overlap
+- LSH parameters reach the recall target at the threshold
+- First page of a cluster is kept, later ones dropped and reported
+- Converter integration (files removed, manifest untouched, pool workers)
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.near_dedup import (
+    MinHasher,
+    NearDuplicateIndex,
+    estimate_similarity,
+    lsh_params
+)
+from tools.manifest import ManifestTracker
+from tools.document_converter import convert_dataset_to_documents, convert_dataset_stream_to_documents
+
+VOCABULARY = [f'word{i}' for i in range(5000)]
+
+
+def text(seed, words=400):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def edited(source, fraction, seed=0):
+    """Replace a fraction of the words"""
+    rng = random.Random(seed)
+    words = source.split()
+    for i in rng.sample(range(len(words)), int(len(words) * fraction)):
+        words[i] = 'changed'
+    return ' '.join(words)
+
+
+def page(i, body):
+    return {'url': f'https://docs.example.com/{i}', 'html': f'<html><title>Page {i}</title><body><p>{body}</p></body></html>'}
+
+
+async def stream(items):
+    for item in items:
+        yield item
+
+
+class TestSignatures:
+    """Test MinHash estimates"""
+
+    def test_identical_texts(self):
+        """Same text → similarity 1, case and spacing ignored"""
+        hasher = MinHasher()
+        assert estimate_similarity(hasher.signature('A b  c d e f'), hasher.signature('a B c d e\nf')) == 1.0
+
+    def test_unrelated_texts(self):
+        """Different texts → similarity near 0"""
+        hasher = MinHasher()
+        assert estimate_similarity(hasher.signature(text(1)), hasher.signature(text(2))) < 0.1
+
+    def test_small_edit_stays_similar(self):
+        """A one-word edit keeps most shingles"""
+        hasher = MinHasher()
+        source = text(3)
+        assert estimate_similarity(hasher.signature(source), hasher.signature(edited(source, 0.0025))) > 0.9
+
+    def test_short_and_empty_texts(self):
+        """Texts shorter than a shingle still get a full signature; empty ones none"""
+        hasher = MinHasher(num_perm=64)
+        assert len(hasher.signature('two words')) == 64
+        assert hasher.signature('  \n ') is None
+
+    def test_stable_across_instances(self):
+        """Signatures don't depend on the process (workers compute them)"""
+        assert MinHasher().signature(text(4)) == MinHasher().signature(text(4))
+
+
+class TestLshParams:
+    """Test band/row selection"""
+
+    @pytest.mark.parametrize('threshold', [0.5, 0.8, 0.9, 0.95])
+    def test_recall_at_threshold(self, threshold):
+        """Pairs at the threshold become candidates with probability ≥ 95%"""
+        bands, rows = lsh_params(threshold, 128)
+        assert bands * rows <= 128
+        assert 1 - (1 - threshold ** rows) ** bands >= 0.95
+
+    def test_invalid_threshold(self):
+        """Threshold must be in (0, 1]"""
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(threshold=0)
+
+
+class TestIndex:
+    """Test cluster handling"""
+
+    def test_first_page_kept(self):
+        """The first page of a cluster is canonical; copies report it"""
+        index = NearDuplicateIndex()
+        source = text(5)
+        assert index.add('a', index.hasher.signature(source)) is None
+        assert index.add('a?print=1', index.hasher.signature(source)) == 'a'
+        assert index.add('b', index.hasher.signature(text(6))) is None
+
+        assert index.duplicates == [{'url': 'a?print=1', 'duplicate_of': 'a', 'similarity': 1.0}]
+        assert index.summary() == {'canonical': 2, 'dropped': 1, 'threshold': 0.9}
+
+    def test_threshold_respected(self):
+        """Pages below the threshold are kept"""
+        index = NearDuplicateIndex(threshold=0.95)
+        source = text(7)
+        index.add('a', index.hasher.signature(source))
+        assert index.add('b', index.hasher.signature(edited(source, 0.2))) is None
+
+    def test_empty_documents_never_duplicates(self):
+        """Pages without text are left to the rest of the pipeline"""
+        index = NearDuplicateIndex()
+        assert index.add('a', None) is None
+        assert index.add('b', None) is None
+
+    def test_many_pages(self):
+        """Clusters are found among many distinct pages"""
+        index = NearDuplicateIndex()
+        sources = [text(100 + i, words=200) for i in range(300)]
+        for i, source in enumerate(sources):
+            index.add(f'page{i}', index.hasher.signature(source))
+        for i in range(0, 300, 30):
+            assert index.add(f'page{i}/v2', index.hasher.signature(sources[i])) == f'page{i}'
+        assert index.summary()['dropped'] == 10
+
+
+class TestConverterIntegration:
+    """Test dropping pages during conversion"""
+
+    def test_duplicates_not_written(self, tmp_path):
+        """Near duplicates are deleted and never reach the manifest"""
+        body = text(8)
+        items = [page(0, body), page(1, text(9)), page(2, body)]
+        index = NearDuplicateIndex()
+        manifest = ManifestTracker('docs')
+
+        docs = convert_dataset_to_documents(items, tmp_path, workers=1, manifest=manifest, near_duplicates=index)
+
+        assert [d.name for d in docs] == ['doc_0000.txt', 'doc_0001.txt']
+        assert not (tmp_path / 'doc_0002.txt').exists()
+        assert set(manifest.files.values()) == {'https://docs.example.com/0', 'https://docs.example.com/1'}
+        assert index.duplicates[0]['duplicate_of'] == 'https://docs.example.com/0'
+
+    def test_header_ignored(self, tmp_path):
+        """Pages differing only in title/URL are still duplicates"""
+        body = text(10)
+        items = [page(0, body), {**page(1, body), 'html': f'<html><title>Print view</title><p>{body}</p></html>'}]
+        docs = convert_dataset_to_documents(items, tmp_path, workers=1, near_duplicates=NearDuplicateIndex())
+        assert len(docs) == 1
+
+    @pytest.mark.asyncio
+    async def test_pool_workers(self, tmp_path):
+        """Signatures computed in pool workers match in-process ones"""
+        body = text(11)
+        items = [page(i, body if i % 2 else text(20 + i)) for i in range(6)]
+        index = NearDuplicateIndex()
+
+        docs = await convert_dataset_stream_to_documents(stream(items), tmp_path, workers=2, near_duplicates=index)
+
+        assert [d.name for d in docs] == ['doc_0000.txt', 'doc_0001.txt', 'doc_0002.txt', 'doc_0004.txt']
+        assert [d['url'] for d in index.duplicates] == ['https://docs.example.com/3', 'https://docs.example.com/5']
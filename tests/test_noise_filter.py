@@ -0,0 +1,115 @@
+"""
+Noise Filter Tests
+
+Test coverage:
+- Same result as the previous per-rule find_all sweeps
+- Tag, class, id and ARIA role rules
+- Config from actor input (extend, replace, validation)
+"""
+
+import re
+import pytest
+import sys
+from pathlib import Path
+from bs4 import BeautifulSoup
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.noise_filter import NoiseFilter, DEFAULT_NOISE_FILTER
+from benchmarks.fixtures import docs_page
+
+
+def legacy_strip(soup):
+    """Previous clean_html_text noise removal: one sweep per rule"""
+    for element in soup(['script', 'style', 'nav', 'footer', 'iframe', 'noscript']):
+        element.decompose()
+    for pattern in ['advertisement', 'ads', 'ad-container', 'sponsored',
+                    'tracking', 'analytics', 'cookie-banner', 'popup']:
+        for element in soup.find_all(class_=re.compile(pattern, re.I)):
+            element.decompose()
+
+
+def text_after(strip, html):
+    soup = BeautifulSoup(html, 'lxml')
+    strip(soup)
+    return soup.get_text(separator='\n', strip=True)
+
+
+class TestParity:
+    """Test class/tag rules behave like the old sweeps"""
+
+    @pytest.mark.parametrize('seed', range(3))
+    def test_docs_pages(self, seed):
+        """Generated docs pages lose exactly the same elements"""
+        html = docs_page(seed=seed)
+        class_only = NoiseFilter(id_patterns=[], roles=[])
+        assert text_after(class_only.strip, html) == text_after(legacy_strip, html)
+
+    def test_class_substring_match(self):
+        """Patterns match anywhere in any class token, case-insensitively"""
+        html = '<div class="x SidebarAds"><p>ad</p></div><div class="ok"><p>keep</p></div>'
+        assert text_after(DEFAULT_NOISE_FILTER.strip, html) == 'keep'
+        assert text_after(legacy_strip, html) == 'keep'
+
+
+class TestRules:
+    """Test each rule type"""
+
+    def test_id_patterns(self):
+        """Ids match on whole '-'/'_'-separated parts"""
+        html = '<div id="cookie-banner-1">cookies</div><div id="main_ads">ads</div><div id="content">keep</div>'
+        assert text_after(DEFAULT_NOISE_FILTER.strip, html) == 'keep'
+
+    def test_id_substrings_kept(self):
+        """Ids merely containing a pattern (downloads, threads) are content"""
+        html = '<div id="downloads">files</div><div id="threads">posts</div><div id="Popups-help">help</div>'
+        assert text_after(DEFAULT_NOISE_FILTER.strip, html) == 'files\nposts\nhelp'
+
+    def test_roles(self):
+        """ARIA landmark roles are dropped (any role token)"""
+        html = '<div role="Navigation menu">menu</div><div role="main">keep</div>'
+        assert text_after(DEFAULT_NOISE_FILTER.strip, html) == 'keep'
+
+    def test_matched_subtrees_not_walked(self):
+        """Only top-most noise elements are collected"""
+        soup = BeautifulSoup('<nav><div class="ads"><script></script></div></nav><p>keep</p>', 'lxml')
+        noise = DEFAULT_NOISE_FILTER.find_noise(soup)
+        assert [element.name for element in noise] == ['nav']
+
+    def test_empty_rules(self):
+        """A filter without rules removes nothing"""
+        empty = NoiseFilter(tags=[], class_patterns=[], id_patterns=[], roles=[])
+        assert text_after(empty.strip, '<nav>x</nav><p>y</p>') == 'x\ny'
+
+
+class TestConfig:
+    """Test building filters from actor input"""
+
+    def test_defaults(self):
+        """No config → default rules"""
+        noise_filter = NoiseFilter.from_config(None)
+        assert noise_filter.tags == DEFAULT_NOISE_FILTER.tags
+        assert noise_filter.class_patterns == DEFAULT_NOISE_FILTER.class_patterns
+
+    def test_extends_defaults(self):
+        """Configured rules are added to the defaults"""
+        noise_filter = NoiseFilter.from_config({'tags': ['aside'], 'class_patterns': ['promo']})
+        assert {'aside', 'script'} <= noise_filter.tags
+        html = '<aside>a</aside><div class="promo-box">b</div><script>c</script><p>keep</p>'
+        assert text_after(noise_filter.strip, html) == 'keep'
+
+    def test_replace_defaults(self):
+        """replace_defaults keeps only the configured rules"""
+        noise_filter = NoiseFilter.from_config({'tags': ['aside'], 'replace_defaults': True})
+        assert text_after(noise_filter.strip, '<aside>a</aside><nav>b</nav>') == 'b'
+
+    def test_unknown_key(self):
+        """Typos in rule names are reported"""
+        with pytest.raises(ValueError, match='class_pattern'):
+            NoiseFilter.from_config({'class_pattern': ['x']})
+
+    def test_invalid_regex(self):
+        """Invalid patterns are reported as ValueError"""
+        with pytest.raises(ValueError):
+            NoiseFilter.from_config({'id_patterns': ['(unclosed']})
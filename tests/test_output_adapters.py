@@ -0,0 +1,167 @@
+"""
+Scraper Output Adapter Tests
+
+Test coverage:
+- Adapter lookup from the scraper library's output_format
+- Field resolution order and per-dataset memo
+- Markdown/text passthrough (no HTML parsing, structure kept)
+- Default adapter keeps the original field order
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools import html_backends
+from tools.output_adapters import (
+    OutputAdapter,
+    OUTPUT_ADAPTERS,
+    DEFAULT_OUTPUT_ADAPTER,
+    get_output_adapter
+)
+from tools.document_converter import (
+    clean_markdown_text,
+    convert_dataset_to_documents,
+    convert_dataset_stream_to_documents,
+    extract_markdown_title
+)
+
+MARKDOWN = """# Hooks
+
+Hooks let you use state.
+
+```js
+function App() {
+    const [count, setCount] = useState(0);
+}
+```
+
+
+- item
+    - nested item
+"""
+
+
+def crawler_item(i, **extra):
+    """Website Content Crawler item (saveMarkdown)"""
+    item = {
+        'url': f'https://react.dev/learn/page-{i}',
+        'metadata': {'title': f'Page {i} – React'},
+        'text': 'Hooks let you use state.',
+        'markdown': MARKDOWN
+    }
+    item.update(extra)
+    return item
+
+
+async def stream(items):
+    for item in items:
+        yield item
+
+
+def body_of(path: Path) -> str:
+    return path.read_text(encoding='utf-8').split('---\n\n', 1)[1]
+
+
+class TestRegistry:
+    """Test adapter lookup"""
+
+    def test_by_output_format(self):
+        """Library scrapers get the adapter for their output_format"""
+        assert get_output_adapter('apify/website-content-crawler') is OUTPUT_ADAPTERS['markdown']
+        assert get_output_adapter('apify/cheerio-scraper') is OUTPUT_ADAPTERS['html']
+        assert get_output_adapter('janbuchar/crawl4ai') is OUTPUT_ADAPTERS['text']
+
+    def test_unknown_scraper(self):
+        """Scrapers outside the library use the html-first default"""
+        assert get_output_adapter('someone/else') is DEFAULT_OUTPUT_ADAPTER
+        assert get_output_adapter(None) is DEFAULT_OUTPUT_ADAPTER
+
+    def test_invalid_content_type(self):
+        """Adapters only route to known content types"""
+        with pytest.raises(ValueError):
+            OutputAdapter('pdf', [('pdf', 'binary')])
+
+
+class TestFieldResolution:
+    """Test which field is read"""
+
+    def test_markdown_preferred(self):
+        """The markdown adapter reads markdown even when text exists"""
+        content, content_type, title = OUTPUT_ADAPTERS['markdown'].resolver().read(crawler_item(0))
+        assert content == MARKDOWN
+        assert content_type == 'markdown'
+        assert title == 'Page 0 – React'
+
+    def test_default_order_unchanged(self):
+        """Default adapter: html_field, html, text, markdown, content, crawl.html"""
+        resolver = DEFAULT_OUTPUT_ADAPTER.resolver('body')
+        assert [path for path, _ in resolver.fields] == ['body', 'html', 'text', 'markdown', 'content', 'crawl.html']
+        assert resolver.read({'crawl': {'html': '<p>x</p>'}})[:2] == ('<p>x</p>', 'html')
+
+    def test_resolved_field_tried_first(self):
+        """Once a field has content it is tried first for later items"""
+        resolver = DEFAULT_OUTPUT_ADAPTER.resolver()
+        resolver.read({'markdown': '# A'})
+        assert resolver.field == ('markdown', 'markdown')
+
+        # Items with both fields keep using the resolved one
+        assert resolver.read({'html': '<p>b</p>', 'markdown': '# B'})[0] == '# B'
+        # Items without it fall back to the full list
+        assert resolver.read({'html': '<p>c</p>'})[0] == '<p>c</p>'
+
+    def test_no_content(self):
+        """Items without content in any field are skipped"""
+        assert DEFAULT_OUTPUT_ADAPTER.resolver().read({'url': 'x', 'html': ''}) is None
+
+
+class TestPassthrough:
+    """Test the markdown/text conversion path"""
+
+    def test_structure_kept(self):
+        """Indentation, code blocks and inner spacing survive cleanup"""
+        text = clean_markdown_text(MARKDOWN + '\r\n\r\n\r\n')
+        assert '    const [count, setCount] = useState(0);' in text
+        assert '    - nested item' in text
+        assert '\n\n\n' not in text
+        assert not text.endswith('\n')
+
+    def test_title_from_heading(self):
+        """Titles fall back to the first heading, then the URL"""
+        assert extract_markdown_title('intro\n## Setup ##\n', 'https://x.com/a') == 'Setup'
+        assert extract_markdown_title('no headings', 'https://x.com/getting-started') == 'Getting Started'
+
+    def test_no_html_parsing(self, tmp_path, monkeypatch):
+        """Markdown items never reach the HTML parser"""
+        def no_parse(*args, **kwargs):
+            raise AssertionError('HTML parser called')
+
+        for backend in html_backends.PARSER_BACKENDS.values():
+            monkeypatch.setattr(backend, 'extract', no_parse)
+
+        docs = convert_dataset_to_documents(
+            [crawler_item(i) for i in range(3)], tmp_path, workers=1,
+            adapter=get_output_adapter('apify/website-content-crawler')
+        )
+
+        assert len(docs) == 3
+        assert body_of(docs[0].path) == clean_markdown_text(MARKDOWN)
+        assert 'Title: Page 0 – React' in docs[0].path.read_text(encoding='utf-8')
+
+    @pytest.mark.asyncio
+    async def test_mixed_dataset_streamed(self, tmp_path):
+        """HTML-only items in a markdown dataset still go through the parser"""
+        items = [
+            crawler_item(0),
+            {'url': 'https://react.dev/learn/raw', 'html': '<html><title>Raw</title><nav>menu</nav><p>Body</p></html>'}
+        ]
+        docs = await convert_dataset_stream_to_documents(
+            stream(items), tmp_path, adapter=OUTPUT_ADAPTERS['markdown']
+        )
+
+        assert body_of(docs[0].path).startswith('# Hooks')
+        assert body_of(docs[1].path).endswith('Body')
+        assert 'menu' not in body_of(docs[1].path)
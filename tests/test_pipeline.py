@@ -0,0 +1,128 @@
+"""
+Streaming Pipeline Tests
+
+Test coverage:
+- Every item flows through convert → upload, in dataset order
+- Stages overlap (latency ≈ max(stage), not sum)
+- Backpressure: a slow uploader bounds how far reading runs ahead
+- Errors in any stage propagate
+"""
+
+import asyncio
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.pipeline import run_document_pipeline
+
+
+def page(i):
+    return {'url': f'https://example.com/page{i}', 'html': f'<html><title>Page {i}</title><body><p>Body {i}</p></body></html>'}
+
+
+async def slow_items(n, delay=0.0, read_log=None):
+    for i in range(n):
+        if delay:
+            await asyncio.sleep(delay)
+        if read_log is not None:
+            read_log.append(i)
+        yield page(i)
+
+
+def collecting_uploader(delay=0.0, upload_log=None):
+    async def upload(documents):
+        names = []
+        async for doc in documents:
+            if delay:
+                await asyncio.sleep(delay)
+            names.append(doc.name)
+            if upload_log is not None:
+                upload_log.append(doc.name)
+        return names
+    return upload
+
+
+class TestPipelineFlow:
+    """Test items flow through all stages"""
+
+    @pytest.mark.asyncio
+    async def test_all_items_uploaded_in_order(self, tmp_path):
+        """Every page becomes a document and reaches the uploader"""
+        result = await run_document_pipeline(slow_items(10), tmp_path, collecting_uploader())
+
+        assert result['items'] == 10
+        assert [d.name for d in result['documents']] == [f'doc_{i:04d}.txt' for i in range(10)]
+        assert result['upload_result'] == [f'doc_{i:04d}.txt' for i in range(10)]
+        assert set(result['timings']) == {'read_seconds', 'convert_seconds', 'upload_seconds', 'total_seconds'}
+
+    @pytest.mark.asyncio
+    async def test_empty_items_skipped(self, tmp_path):
+        """Items without content don't reach the uploader"""
+        async def items():
+            yield page(0)
+            yield {'url': 'https://example.com/empty'}
+            yield page(2)
+
+        result = await run_document_pipeline(items(), tmp_path, collecting_uploader())
+
+        assert result['items'] == 3
+        assert result['upload_result'] == ['doc_0000.txt', 'doc_0002.txt']
+
+    @pytest.mark.asyncio
+    async def test_stages_overlap(self, tmp_path):
+        """10 × 20ms reads + 10 × 20ms uploads take ~0.2s, not ~0.4s"""
+        start = time.monotonic()
+        await run_document_pipeline(slow_items(10, delay=0.02), tmp_path, collecting_uploader(delay=0.02))
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.35
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self, tmp_path):
+        """Reading never runs more than the queue capacity ahead of uploads"""
+        read_log, upload_log = [], []
+        queue_size = 2
+        max_lead = 0
+
+        async def upload(documents):
+            nonlocal max_lead
+            async for doc in documents:
+                max_lead = max(max_lead, len(read_log) - len(upload_log))
+                await asyncio.sleep(0.01)
+                upload_log.append(doc.name)
+
+        await run_document_pipeline(
+            slow_items(20, read_log=read_log), tmp_path, upload, queue_size=queue_size
+        )
+
+        # Two queues + conversion window (2 × workers) + items in each stage's hands
+        assert max_lead <= 2 * queue_size + 2 * 1 + 6
+        assert len(upload_log) == 20
+
+
+class TestPipelineErrors:
+    """Test stage failures propagate"""
+
+    @pytest.mark.asyncio
+    async def test_upload_error_propagates(self, tmp_path):
+        """Uploader exception aborts the pipeline"""
+        async def failing_upload(documents):
+            async for _ in documents:
+                raise RuntimeError('upload failed')
+
+        with pytest.raises(RuntimeError, match='upload failed'):
+            await run_document_pipeline(slow_items(50), tmp_path, failing_upload, queue_size=1)
+
+    @pytest.mark.asyncio
+    async def test_read_error_propagates(self, tmp_path):
+        """Dataset read exception aborts the pipeline"""
+        async def broken_items():
+            yield page(0)
+            raise ConnectionError('dataset read failed')
+
+        with pytest.raises(ConnectionError):
+            await run_document_pipeline(broken_items(), tmp_path, collecting_uploader())
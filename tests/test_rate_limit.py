@@ -0,0 +1,146 @@
+"""
+Rate Limiting and Retry Tests
+
+Test coverage:
+- Error classification (429/5xx/network retryable, other 4xx not)
+- Token bucket pacing, burst and drain
+- call_with_retry retries transient errors only, up to max_attempts
+"""
+
+import time
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from google.genai import errors
+from tools.rate_limit import (
+    TokenBucket,
+    RetryPolicy,
+    call_with_retry,
+    is_retryable
+)
+
+
+def api_error(code):
+    cls = errors.ServerError if code >= 500 else errors.ClientError
+    return cls(code, {'error': {'code': code, 'message': 'test', 'status': 'TEST'}})
+
+
+NO_WAIT = RetryPolicy(max_attempts=4, base_delay=0.001, max_delay=0.001)
+
+
+class TestIsRetryable:
+    """Test transient error classification"""
+
+    @pytest.mark.parametrize('code', [408, 429, 500, 502, 503, 504])
+    def test_transient_status_codes(self, code):
+        """Timeouts, rate limits and server errors are retryable"""
+        assert is_retryable(api_error(code))
+
+    @pytest.mark.parametrize('code', [400, 401, 403, 404])
+    def test_permanent_status_codes(self, code):
+        """Bad requests and auth errors are not retryable"""
+        assert not is_retryable(api_error(code))
+
+    def test_network_errors(self):
+        """Connection failures are retryable, programming errors are not"""
+        assert is_retryable(ConnectionResetError())
+        assert not is_retryable(ValueError())
+
+
+class TestTokenBucket:
+    """Test rate limiter pacing"""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_immediate(self):
+        """Up to `burst` acquisitions don't wait"""
+        limiter = TokenBucket(rate=10, burst=5)
+        start = time.monotonic()
+        for _ in range(5):
+            await limiter.acquire()
+        assert time.monotonic() - start < 0.05
+
+    @pytest.mark.asyncio
+    async def test_paces_after_burst(self):
+        """Acquisitions beyond the burst are paced at `rate`"""
+        limiter = TokenBucket(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            await limiter.acquire()
+        # 5 refills at 50/s ≈ 0.1s
+        assert time.monotonic() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_drain_pauses_callers(self):
+        """drain() blocks acquisitions for the given time"""
+        limiter = TokenBucket(rate=100, burst=10)
+        limiter.drain(0.1)
+        start = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - start >= 0.09
+
+    def test_invalid_rate(self):
+        """Rate must be positive"""
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestCallWithRetry:
+    """Test retry behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self):
+        """Transient failures are retried until success"""
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise api_error(503)
+            return 'ok'
+
+        assert await call_with_retry(flaky, policy=NO_WAIT) == 'ok'
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """Last error is raised once attempts are exhausted"""
+        calls = []
+
+        async def always_429():
+            calls.append(1)
+            raise api_error(429)
+
+        with pytest.raises(errors.ClientError):
+            await call_with_retry(always_429, policy=NO_WAIT, limiter=TokenBucket(rate=1000))
+        assert len(calls) == 4
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_not_retried(self):
+        """Non-retryable errors are raised immediately"""
+        calls = []
+
+        async def forbidden():
+            calls.append(1)
+            raise api_error(403)
+
+        with pytest.raises(errors.ClientError):
+            await call_with_retry(forbidden, policy=NO_WAIT)
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_passes_arguments(self):
+        """Positional and keyword arguments reach the wrapped call"""
+        async def echo(a, b=None):
+            return (a, b)
+
+        assert await call_with_retry(echo, 1, b=2) == (1, 2)
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Delays stay within the exponential ceiling"""
+        policy = RetryPolicy(max_attempts=10, base_delay=1, max_delay=8)
+        for attempt in range(1, 10):
+            assert 0 <= policy.delay(attempt) <= min(8, 2 ** (attempt - 1))
@@ -0,0 +1,206 @@
+"""
+Service Simulator Tests
+
+Runs the actor's scrape and upload code against the fake Apify platform
+and the simulated File Search (small page counts, millisecond latencies).
+
+Test coverage:
+- Synthetic pages (deterministic, sized as configured)
+- Scraper fallback chain (start errors, runs without items)
+- Live datasets (items produced over time, call(), abort())
+- Uploads under 429 bursts, 5xx errors and failed imports
+- Load test scenario and `simulate` command
+"""
+
+import random
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from src.main import execute_scraper_with_fallback
+from src.simulator.apify import FakeApifyClient, ScraperProfile, synthetic_item
+from src.simulator.file_search import SimulatedFileSearchClient
+from src.simulator.latency import FixedLatency, Latency, LogNormalLatency, UniformLatency
+from src.simulator.load_test import default_scrapers, run_load_test
+from src.tools.dataset_reader import iterate_run_dataset_items
+from src.tools.gemini_uploader import create_file_search_store, upload_documents_to_store
+from src.tools.import_poller import ImportPoller
+from src.tools.rate_limit import RetryPolicy
+from src.tools.document_record import DocumentRecord
+from src.cli import main as cli_main
+
+FAST_RETRIES = RetryPolicy(max_attempts=5, base_delay=0.01, max_delay=0.05)
+
+
+def records(count, size=1000):
+    return [
+        DocumentRecord.from_text(Path(f'doc_{i:04d}.txt'), f'https://x/{i}', f'Page {i}', 'x' * size, size // 5, in_memory=True)
+        for i in range(count)
+    ]
+
+
+async def upload(client, documents, **options):
+    store_name = await create_file_search_store(client, 'sim', policy=FAST_RETRIES)
+    poller = ImportPoller(client, min_interval=0.005, max_interval=0.02, max_poll_errors=FAST_RETRIES.max_attempts)
+    dead_letters = []
+    try:
+        uploaded = await upload_documents_to_store(
+            client, store_name, documents, poller=poller, policy=FAST_RETRIES, dead_letters=dead_letters, **options
+        )
+    finally:
+        await poller.close()
+    return uploaded, dead_letters
+
+
+class TestSyntheticData:
+    """Test generated pages and latency distributions"""
+
+    def test_items_deterministic(self):
+        """The same seed and index give the same page; sizes follow page_bytes"""
+        assert synthetic_item(3, 5000) == synthetic_item(3, 5000)
+        assert synthetic_item(3, 5000) != synthetic_item(3, 5000, seed=1)
+        item = synthetic_item(0, 50_000)
+        assert 50_000 <= len(item['html']) < 55_000
+        assert item['markdown'].startswith(f"# {item['metadata']['title']}")
+
+    def test_latencies(self):
+        """Distributions stay within their bounds"""
+        rng = random.Random(0)
+        assert FixedLatency(0.5).sample(rng) == 0.5
+        assert all(0.1 <= UniformLatency(0.1, 0.2).sample(rng) <= 0.2 for _ in range(100))
+        assert all(LogNormalLatency(1.0, sigma=2, maximum=3).sample(rng) <= 3 for _ in range(100))
+        with pytest.raises(ValueError):
+            UniformLatency(2, 1)
+        with pytest.raises(TypeError):
+            Latency()
+
+
+class TestFakeApify:
+    """Test the fake Apify platform with the actor's scraper code"""
+
+    @pytest.mark.asyncio
+    async def test_fallback_chain(self):
+        """A scraper that can't start and one without items are skipped"""
+        apify = FakeApifyClient(default_scrapers(page_bytes=2000))
+        scrapers = [{'id': actor_id} for actor_id in apify.scrapers]
+
+        result = await execute_scraper_with_fallback(apify, scrapers, 'https://docs.example.com', 50, poll_interval=0.01)
+
+        assert result['success']
+        assert result['scraper_used'] == 'sim/website-crawler'
+        assert apify.started() == ['sim/empty-crawler', 'sim/website-crawler']
+
+    @pytest.mark.asyncio
+    async def test_all_scrapers_fail(self):
+        """Every scraper failing is reported, not raised"""
+        apify = FakeApifyClient({'sim/empty': ScraperProfile(pages=0, final_status='FAILED')})
+        result = await execute_scraper_with_fallback(apify, [{'id': 'sim/empty'}, {'id': 'sim/missing'}], 'https://x', 10, poll_interval=0.01)
+
+        assert not result['success']
+        assert 'sim/missing' in result['errors'][0]
+
+    @pytest.mark.asyncio
+    async def test_live_dataset(self):
+        """Items produced over time are all streamed, in order"""
+        apify = FakeApifyClient({'sim/crawler': ScraperProfile(pages=40, page_bytes=500, pages_per_second=400)})
+        run = await apify.actor('sim/crawler').start(run_input={})
+
+        items = [item async for item in iterate_run_dataset_items(
+            apify.run(run['id']), apify.dataset(run['defaultDatasetId']), page_size=7, follow_interval=0.01
+        )]
+
+        assert [item['url'] for item in items] == [f'https://docs.example.com/page/{i}' for i in range(40)]
+        assert (await apify.run(run['id']).get())['status'] == 'SUCCEEDED'
+
+    @pytest.mark.asyncio
+    async def test_call_and_abort(self):
+        """call() waits for the run; abort() stops production"""
+        apify = FakeApifyClient({'sim/crawler': ScraperProfile(page_bytes=500, pages_per_second=1000)})
+        finished = await apify.actor('sim/crawler').call(run_input={'maxCrawlPages': 20})
+        assert finished['status'] == 'SUCCEEDED'
+        assert finished['stats']['itemCount'] == 20
+
+        run = await apify.actor('sim/crawler').start(run_input={'maxCrawlPages': 100_000})
+        aborted = await apify.run(run['id']).abort()
+        assert aborted['status'] == 'ABORTED'
+        page = await apify.dataset(run['defaultDatasetId']).list_items(offset=0, limit=None)
+        assert page.total == aborted['stats']['itemCount'] < 100_000
+
+
+class TestSimulatedFileSearch:
+    """Test the upload engine under simulated failures"""
+
+    @pytest.mark.asyncio
+    async def test_throttling_and_failures_recovered(self):
+        """429 bursts, 503s and failed imports are retried until every document lands"""
+        client = SimulatedFileSearchClient(
+            upload_latency=FixedLatency(0.002),
+            import_latency=UniformLatency(0.005, 0.02),
+            throttle_rate=0.05,
+            burst_seconds=0.01,
+            server_error_rate=0.05,
+            import_failure_rate=0.1,
+            seed=1
+        )
+        uploaded, dead_letters = await upload(client, records(60), concurrency=4, max_attempts=10)
+
+        assert len(uploaded) == 60 and not dead_letters
+        summary = client.summary()
+        assert summary['throttled'] and summary['server_errors'] and summary['import_failures']
+        # Slow or unpollable imports are polled again, never uploaded twice
+        assert summary['documents'] == 60
+        assert summary['max_in_flight'] <= 4
+
+    @pytest.mark.asyncio
+    async def test_failing_imports_dead_lettered(self):
+        """Imports that always fail end up dead-lettered after max_attempts"""
+        client = SimulatedFileSearchClient(import_failure_rate=1.0)
+        uploaded, dead_letters = await upload(client, records(5), max_attempts=2)
+
+        assert uploaded == []
+        assert [d['attempts'] for d in dead_letters] == [2] * 5
+        assert client.import_failures == 10
+
+    def test_invalid_rate(self):
+        """Failure rates must be probabilities"""
+        with pytest.raises(ValueError):
+            SimulatedFileSearchClient(throttle_rate=1.5)
+
+
+class TestLoadTest:
+    """Test the end-to-end scenario"""
+
+    @pytest.mark.asyncio
+    async def test_report(self):
+        """Scrape with fallback and upload; the report carries both services' counters"""
+        report = await run_load_test(
+            pages=100,
+            apify=FakeApifyClient(default_scrapers(page_bytes=1000, pages_per_second=5000)),
+            file_search=SimulatedFileSearchClient(import_latency=FixedLatency(0.01), import_failure_rate=0.05),
+            concurrency=16,
+            retry_base_delay=0.01,
+            min_poll_interval=0.005,
+            max_poll_interval=0.02,
+            scrape_poll_interval=0.01
+        )
+
+        assert report['scrape']['scraper_used'] == 'sim/website-crawler'
+        assert report['dataset']['items'] == 100
+        assert report['upload']['uploaded'] + report['upload']['dead_lettered'] == 100
+        assert report['file_search']['documents'] == 100 - report['upload']['dead_lettered']
+        assert report['file_search']['max_in_flight'] <= 16
+
+    def test_simulate_command(self, tmp_path, capsys):
+        """python -m src simulate prints the report and writes it as JSON"""
+        report = tmp_path / 'report.json'
+        code = cli_main([
+            'simulate', '--pages', '50', '--page-kb', '1', '--request-latency', '0', '--upload-latency', '0.001',
+            '--import-latency', '0.005', '--poll-interval', '0.005', '--json', str(report)
+        ])
+
+        assert code == 0
+        assert 'Load test: 50 pages' in capsys.readouterr().out
+        assert '"uploaded": 50' in report.read_text()
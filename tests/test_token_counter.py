@@ -0,0 +1,144 @@
+"""
+Token Counting Tests
+
+Test coverage:
+- Subword estimate per kind of piece (words, code, digits, CJK, punctuation)
+- Heuristic counter matches the original len // 5 estimate
+- Batched counting memoized by content hash (LRU bound)
+- Counter lookup and SentencePiece fallback
+- Indexing cost uses the counter
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tools.token_counter import (
+    HeuristicTokenCounter,
+    SubwordTokenCounter,
+    TokenCounter,
+    get_token_counter
+)
+from tools.document_converter import calculate_indexing_cost, estimate_tokens
+
+
+class CountingCounter(TokenCounter):
+    """Records every batch it is asked to count"""
+
+    name = 'counting'
+
+    def __init__(self, cache_size=4):
+        super().__init__(cache_size)
+        self.batches = []
+
+    def _count_batch(self, texts):
+        self.batches.append(list(texts))
+        return [len(text) for text in texts]
+
+
+class TestSubword:
+    """Test the model-free subword estimate"""
+
+    @pytest.mark.parametrize('text,tokens', [
+        ('Hello world', 2),
+        ('internationalization', 4),
+        ('parseHTTPResponse', 4),
+        ('12345', 5),
+        ('東京', 2),
+        ('a, b.', 4),
+        ('----------', 3),
+        ('', 0),
+    ])
+    def test_pieces(self, text, tokens):
+        """Each kind of piece costs what a subword tokenizer spends on it"""
+        assert SubwordTokenCounter().count(text) == tokens
+
+    def test_whitespace(self):
+        """Single spaces are free; newline runs and indentation cost one token"""
+        assert SubwordTokenCounter().count('a b\n\n    c') == 5
+
+    def test_code_denser_than_heuristic(self):
+        """Code has more tokens per character than prose"""
+        code = 'if (x[i] != y[j]) { return -1; }\n' * 20
+        assert SubwordTokenCounter().count(code) > 2 * estimate_tokens(code)
+
+
+class TestBatching:
+    """Test batched, memoized counting"""
+
+    def test_repeated_texts_counted_once(self):
+        """Duplicates within and across batches hit the cache"""
+        counter = CountingCounter()
+        assert counter.count_many(['ab', 'cde', 'ab']) == [2, 3, 2]
+        assert counter.count_many(['cde', 'f']) == [3, 1]
+        assert counter.batches == [['ab', 'cde'], ['f']]
+        assert counter.summary() == {'counter': 'counting', 'counted': 3, 'cache_hits': 2}
+
+    def test_cache_bounded(self):
+        """Least recently used counts are evicted"""
+        counter = CountingCounter(cache_size=2)
+        counter.count_many(['a', 'b'])
+        counter.count('a')
+        counter.count('c')
+        counter.count_many(['a', 'b'])
+        assert counter.batches[-1] == ['b']
+
+    def test_documents_in_batches(self, tmp_path):
+        """count_documents reads and counts batch_size files at a time"""
+        paths = []
+        for i in range(5):
+            paths.append(tmp_path / f'doc_{i}.txt')
+            paths[-1].write_text('x' * (i + 1), encoding='utf-8')
+
+        counter = CountingCounter(cache_size=0)
+        assert counter.count_documents(paths, batch_size=2) == [1, 2, 3, 4, 5]
+        assert [len(batch) for batch in counter.batches] == [2, 2, 1]
+
+
+class TestLookup:
+    """Test counter selection"""
+
+    def test_heuristic_matches_estimate(self):
+        """The heuristic counter is the original len // 5"""
+        text = 'some technical text ' * 7
+        assert HeuristicTokenCounter().count(text) == estimate_tokens(text)
+
+    def test_default(self):
+        """No name → characters / 5 heuristic"""
+        assert isinstance(get_token_counter(), HeuristicTokenCounter)
+
+    def test_unknown_counter(self):
+        """Unknown names are rejected"""
+        with pytest.raises(ValueError):
+            get_token_counter('gpt2')
+
+    def test_sentencepiece_fallback(self, tmp_path):
+        """A model that can't be loaded falls back to the default counter"""
+        assert isinstance(get_token_counter(model_path=tmp_path / 'missing.model'), HeuristicTokenCounter)
+
+    def test_sentencepiece_needs_model(self):
+        """sentencepiece without a model path is a config error"""
+        with pytest.raises(ValueError):
+            get_token_counter('sentencepiece')
+
+    def test_counter_must_implement_count_batch(self):
+        """A counter without _count_batch() fails when created"""
+        class Incomplete(TokenCounter):
+            name = 'incomplete'
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+
+class TestIndexingCost:
+    """Test the cost estimate"""
+
+    def test_uses_counter(self, tmp_path):
+        """Cost follows the counter's token count"""
+        doc = tmp_path / 'doc.txt'
+        doc.write_text('x' * 1_000_000, encoding='utf-8')
+        assert calculate_indexing_cost([doc], HeuristicTokenCounter()) == pytest.approx(0.15 / 5)
+        assert calculate_indexing_cost([doc], CountingCounter()) == pytest.approx(0.15)